@@ -0,0 +1,102 @@
+"""Execução em processo das sub-requisições de `POST /api/batch`.
+
+Cada sub-requisição passa pela aplicação ASGI completa (middlewares, roteamento,
+validação e dependências), então ganha sua própria sessão do pool exatamente como
+um GET avulso; o batch só economiza as idas e voltas HTTP do cliente.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Headers do POST do batch que não fazem sentido em um GET sem corpo.
+_DROPPED_HEADERS = {b"content-length", b"content-type", b"transfer-encoding", b"expect"}
+
+
+def validate_path(path: str, api_prefix: str, excluded: Iterable[str]) -> Tuple[str, str]:
+    """Separa rota e query string, recusando rotas fora da API ou que não terminam (streams, o próprio batch)."""
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc or not parts.path.startswith(f"{api_prefix}/"):
+        raise ValueError(f"Rota inválida no batch: {path} (use caminhos relativos em {api_prefix}/)")
+    for prefix in excluded:
+        if parts.path == prefix or parts.path.startswith(f"{prefix}/"):
+            raise ValueError(f"A rota {parts.path} não pode ser usada dentro de um batch")
+    return parts.path, parts.query
+
+
+def _sub_scope(parent: Dict[str, Any], path: str, query: str) -> Dict[str, Any]:
+    root_path = parent.get("root_path", "")
+    return {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "root_path": root_path,
+        "path": path,
+        "raw_path": f"{root_path}{path}".encode(),
+        "query_string": query.encode(),
+        # Cookies e X-Last-Write seguem adiante: o read-your-writes vale para cada sub-requisição.
+        "headers": [(name, value) for name, value in parent.get("headers", []) if name not in _DROPPED_HEADERS],
+        "client": parent.get("client"),
+        "server": parent.get("server"),
+        "state": dict(parent.get("state", {})),
+    }
+
+
+async def _call(app, scope: Dict[str, Any]) -> Dict[str, Any]:
+    status = 500
+    chunks: List[bytes] = []
+    content_type = ""
+    request_sent = False
+    never = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await never.wait()  # a sub-requisição nunca "desconecta"; é cancelada junto com o batch
+
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                if name.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:  # noqa: BLE001 - o erro fica restrito à sub-requisição
+        logger.exception("Sub-requisição do batch falhou: GET %s", scope["path"])
+        return {"status": 500, "body": {"detail": "Erro interno ao processar a sub-requisição."}}
+
+    raw = b"".join(chunks)
+    if "application/json" in content_type and raw:
+        body: Any = json.loads(raw)
+    else:
+        body = raw.decode("utf-8", errors="replace") or None
+    return {"status": status, "body": body}
+
+
+async def run_batch(
+    app, parent_scope: Dict[str, Any], items: List[Tuple[str, str, str]], concurrency: int
+) -> Dict[str, Dict[str, Any]]:
+    """Executa `(id, rota, query)` com no máximo `concurrency` em paralelo; resultados na ordem pedida."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(path: str, query: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _call(app, _sub_scope(parent_scope, path, query))
+
+    results = await asyncio.gather(*(run_one(path, query) for _, path, query in items))
+    return {item_id: result for (item_id, _, _), result in zip(items, results)}
@@ -0,0 +1,156 @@
+"""Fan-out das notificações de mudança (`LISTEN pulsehub_changes`) para os streams abertos.
+
+Cada worker mantém uma única conexão dedicada ao LISTEN, aberta na primeira inscrição e
+reaberta com backoff se cair; os eventos são distribuídos em memória para as inscrições
+da conta. Assim, milhares de dashboards abertos não seguram conexões do pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "pulsehub_changes"
+ENTITIES = frozenset({"task", "meeting", "sprint"})
+
+# Evento sintético enviado quando a fila de um cliente lento estoura ou o LISTEN reconecta:
+# eventos podem ter sido perdidos e o cliente deve recarregar o que estiver exibindo.
+RESYNC_EVENT: Dict[str, Any] = {"entity": "*", "op": "resync"}
+
+
+@dataclass(eq=False)
+class Subscription:
+    account_id: str
+    entities: FrozenSet[str] = ENTITIES
+    project_id: Optional[str] = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=100))
+    overflowed: bool = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if event.get("entity") not in self.entities:
+            return False
+        # Eventos sem projeto (ex.: mudanças em sprint_task) passam pelo filtro de projeto.
+        return not self.project_id or event.get("project_id") in (None, self.project_id)
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente lento: descarta a fila e pede um resync em vez de crescer sem limite.
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Próximo evento, ou None se nada chegar em `timeout` segundos (hora do heartbeat)."""
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is RESYNC_EVENT:
+            self.overflowed = False
+        return event
+
+
+class ChangeBroker:
+    def __init__(self, connect_kwargs: Dict[str, Any], queue_size: int = 100, reconnect_delay: float = 1.0) -> None:
+        self.connect_kwargs = connect_kwargs
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._closed = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(
+        self, account_id: str, entities: Optional[FrozenSet[str]] = None, project_id: Optional[str] = None
+    ) -> Subscription:
+        subscription = Subscription(
+            account_id=account_id,
+            entities=entities or ENTITIES,
+            project_id=project_id,
+            queue=asyncio.Queue(maxsize=self.queue_size),
+        )
+        self._subscriptions.setdefault(account_id, set()).add(subscription)
+        if self._task is None or self._task.done():
+            self._closed.clear()
+            self._task = asyncio.create_task(self._listen_forever())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.account_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.account_id]
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        for subscription in list(self._subscriptions.get(event.get("account_id"), ())):
+            if subscription.matches(event):
+                subscription.deliver(event)
+
+    def _broadcast_resync(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.deliver(RESYNC_EVENT)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning("Notificação inválida em %s: %r", channel, payload[:200])
+            return
+        self.publish(event)
+
+    async def _listen_forever(self) -> None:
+        import asyncpg  # o driver só é carregado quando alguém abre um stream
+
+        first = True
+        while not self._closed.is_set():
+            connection = None
+            try:
+                connection = await asyncpg.connect(**self.connect_kwargs)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _conn: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notification)
+                if not first:
+                    # Notificações emitidas enquanto estávamos desconectados foram perdidas.
+                    self._broadcast_resync()
+                first = False
+                closed_waiter = asyncio.create_task(self._closed.wait())
+                lost_waiter = asyncio.create_task(lost.wait())
+                try:
+                    await asyncio.wait({closed_waiter, lost_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    closed_waiter.cancel()
+                    lost_waiter.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - reconecta sempre
+                logger.warning("LISTEN %s falhou: %s", CHANNEL, exc)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            if not self._closed.is_set():
+                first = False
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def stop(self) -> None:
+        self._closed.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
@@ -0,0 +1,147 @@
+"""Single-flight para GETs idênticos simultâneos, com opt-in por rota.
+
+Quando vários clientes pedem a mesma listagem ao mesmo tempo (todos abrindo o planejamento
+do sprint), só a primeira requisição executa; as que chegam enquanto ela roda esperam e
+recebem a mesma resposta (status, headers e corpo já serializado), com `X-Coalesced: 1`.
+Não é cache: a chave sai do mapa assim que a resposta fica pronta.
+
+A rota entra com o decorator `@coalesced`, aplicado abaixo do `@router.get(...)`. Só vale
+para rotas cuja resposta depende apenas de caminho, query e conta. A chave é método, caminho,
+query normalizada e conta (ver `app.ratelimit.account_key`). Clientes dentro da janela de
+read-your-writes não entram nem puxam o single-flight: a resposta compartilhada pode ter
+começado antes da escrita deles.
+
+A execução compartilhada roda numa task própria, sem `receive` do cliente. Se um cliente
+desconecta, só a espera dele é cancelada. A execução só é cancelada quando não sobra
+ninguém esperando.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.routing import Match
+
+from .ratelimit import account_key
+from .replicas import is_pinned_to_primary
+
+logger = logging.getLogger(__name__)
+
+COALESCED_HEADER = b"x-coalesced"
+_MARK = "__coalesced__"
+
+Key = Tuple[str, str, str, str]
+
+
+def coalesced(endpoint: Callable) -> Callable:
+    """Marca o endpoint para o single-flight (ver `CoalesceMiddleware`)."""
+    setattr(endpoint, _MARK, True)
+    return endpoint
+
+
+@dataclass
+class _Response:
+    start: Dict[str, Any]
+    body: List[bytes] = field(default_factory=list)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+async def _capture(app, scope) -> _Response:
+    response: Optional[_Response] = None
+    never = asyncio.Event()
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await never.wait()  # quem desconecta é cada cliente, não a execução compartilhada
+
+    async def send(message):
+        nonlocal response
+        if message["type"] == "http.response.start":
+            response = _Response(start=message)
+        elif message["type"] == "http.response.body" and response is not None:
+            response.body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    if response is None:
+        raise RuntimeError(f"{scope['method']} {scope['path']} terminou sem resposta")
+    return response
+
+
+class CoalesceMiddleware:
+    def __init__(self, app, read_your_writes_window: float) -> None:
+        self.app = app
+        self.read_your_writes_window = read_your_writes_window
+        self.flights: Dict[Key, _Flight] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self._routes: Optional[List[Any]] = None
+
+    def _is_coalesced(self, scope) -> bool:
+        if self._routes is None:
+            # As rotas já estão todas registradas quando chega a primeira requisição
+            self._routes = [
+                route for route in scope["app"].router.routes if getattr(getattr(route, "endpoint", None), _MARK, False)
+            ]
+        return any(route.matches(scope)[0] == Match.FULL for route in self._routes)
+
+    def _key(self, scope) -> Key:
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        return scope["method"], scope["path"], query, account_key(scope)
+
+    def _land(self, key: Key, flight: _Flight) -> None:
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not self._is_coalesced(scope)
+            or is_pinned_to_primary(Headers(scope=scope), self.read_your_writes_window)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key(scope)
+        flight = self.flights.get(key)
+        follower = flight is not None
+        if flight is None:
+            flight = self.flights[key] = _Flight(asyncio.create_task(_capture(self.app, dict(scope))))
+            flight.task.add_done_callback(lambda _, flight=flight: self._land(key, flight))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            response = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Todos os clientes desistiram: libera a conexão da execução compartilhada
+                flight.task.cancel()
+                self._land(key, flight)
+
+        start = response.start
+        if follower:
+            start = {**start, "headers": [*start.get("headers", []), (COALESCED_HEADER, b"1")]}
+        await send(start)
+        body = response.body or [b""]
+        for index, chunk in enumerate(body):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(body) - 1})
@@ -1,11 +1,52 @@
 from functools import lru_cache
+import json
 import os
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Presets de pool/sessão. Variáveis de ambiente explícitas sempre têm precedência.
+DB_PROFILES: Dict[str, Dict[str, Any]] = {
+    "development": {
+        "db_pool_size": 5,
+        "db_max_overflow": 5,
+        "db_pool_recycle": 1800,
+        "db_pool_timeout": 30,
+        "db_pool_pre_ping": True,
+        "db_statement_cache_size": 100,
+        "db_prepared_statement_cache_size": 100,
+        "db_jit": "on",
+        "db_statement_timeout_ms": 0,
+    },
+    "production": {
+        "db_pool_size": 20,
+        "db_max_overflow": 10,
+        "db_pool_recycle": 900,
+        "db_pool_timeout": 10,
+        "db_pool_pre_ping": False,
+        "db_statement_cache_size": 500,
+        "db_prepared_statement_cache_size": 500,
+        "db_jit": "off",
+        "db_statement_timeout_ms": 15000,
+    },
+    # PgBouncer em modo transaction não suporta prepared statements nomeados.
+    "pgbouncer": {
+        "db_pool_size": 20,
+        "db_max_overflow": 0,
+        "db_pool_recycle": 900,
+        "db_pool_timeout": 10,
+        "db_pool_pre_ping": False,
+        "db_statement_cache_size": 0,
+        "db_prepared_statement_cache_size": 0,
+        "db_jit": "off",
+        "db_statement_timeout_ms": 15000,
+    },
+}
 
 
 class Settings(BaseModel):
+    model_config = ConfigDict(validate_default=True)
+
     pg_database: str = os.getenv("PGDATABASE", "pulsehub")
     pg_user: str = os.getenv("PGUSER", "n8ndsuprema")
     pg_password: str = os.getenv("PGPASSWORD", "a5f4a173aee84ea452e193e643fe817c")
@@ -16,6 +57,108 @@ class Settings(BaseModel):
     default_timezone: str = "America/Sao_Paulo"
     cors_origins: List[str] = Field(default_factory=lambda: ["http://localhost:3000"])
 
+    # Slow-query log: 0 desabilita a captura
+    slow_query_threshold_ms: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+    slow_query_buffer_size: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "500"))
+    slow_query_explain_sample_rate: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+    slow_query_log_path: Optional[str] = os.getenv("SLOW_QUERY_LOG_PATH")
+
+    # Pool, cache de statements e parâmetros de sessão (campos vazios vêm do preset)
+    db_profile: str = os.getenv("DB_PROFILE", "development")
+    db_pool_size: Optional[int] = os.getenv("DB_POOL_SIZE")
+    db_max_overflow: Optional[int] = os.getenv("DB_MAX_OVERFLOW")
+    db_pool_recycle: Optional[int] = os.getenv("DB_POOL_RECYCLE")
+    db_pool_timeout: Optional[float] = os.getenv("DB_POOL_TIMEOUT")
+    db_pool_pre_ping: Optional[bool] = os.getenv("DB_POOL_PRE_PING")
+    db_statement_cache_size: Optional[int] = os.getenv("DB_STATEMENT_CACHE_SIZE")
+    db_prepared_statement_cache_size: Optional[int] = os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE")
+    db_application_name: str = os.getenv("DB_APPLICATION_NAME", "pulsehub-api")
+    db_jit: Optional[str] = os.getenv("DB_JIT")
+    db_statement_timeout_ms: Optional[int] = os.getenv("DB_STATEMENT_TIMEOUT_MS")
+
+    # Réplicas de leitura (DSNs separados por vírgula) e janela de read-your-writes
+    db_replica_urls: List[str] = Field(default_factory=lambda: os.getenv("DB_REPLICA_URLS", ""))
+    db_replica_health_interval: float = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", "5"))
+    db_replica_max_lag_seconds: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "10"))
+    # Sem valor: lag máximo + um intervalo de health check (o lag medido pode ter crescido desde então)
+    read_your_writes_window_seconds: Optional[float] = os.getenv("READ_YOUR_WRITES_WINDOW_SECONDS")
+
+    # Servidor de produção (`python -m app.server`): 0 workers = automático (CPUs e orçamento de conexões)
+    web_host: str = os.getenv("WEB_HOST", "0.0.0.0")
+    web_port: int = int(os.getenv("WEB_PORT", "8080"))
+    web_workers: int = int(os.getenv("WEB_WORKERS", "0"))
+    web_graceful_timeout: float = float(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+    db_connection_budget: int = int(os.getenv("DB_CONNECTION_BUDGET", "90"))
+    warmup_enabled: bool = os.getenv("WARMUP_ENABLED", "true")
+    warmup_connections: Optional[int] = os.getenv("WARMUP_CONNECTIONS")
+    warmup_timeout: float = float(os.getenv("WARMUP_TIMEOUT", "15"))
+
+    # Stream de mudanças (GET /api/stream): fila por cliente e intervalo de heartbeat do SSE
+    change_stream_queue_size: int = int(os.getenv("CHANGE_STREAM_QUEUE_SIZE", "100"))
+    change_stream_heartbeat_seconds: float = float(os.getenv("CHANGE_STREAM_HEARTBEAT_SECONDS", "15"))
+
+    # POST /api/batch: sub-requisições por batch e quantas rodam em paralelo (cada uma usa uma conexão)
+    batch_max_requests: int = int(os.getenv("BATCH_MAX_REQUESTS", "25"))
+    batch_concurrency: int = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    # GET /api/dashboard: tempo máximo de cada painel (os demais são devolvidos mesmo se um estourar)
+    dashboard_panel_timeout_ms: int = int(os.getenv("DASHBOARD_PANEL_TIMEOUT_MS", "3000"))
+
+    # Partições mensais de meeting/doc_chunk (app.tools.retention): intervalo da manutenção no
+    # lifespan (0 desliga), meses criados adiante e se a retenção por plano descarta partições
+    partition_maintenance_interval: float = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "3600"))
+    partition_months_ahead: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    retention_enabled: bool = os.getenv("RETENTION_ENABLED", "true")
+
+    # Arquivamento de tarefas (app.tools.archive): dias desde a conclusão até sair de `task`
+    task_archive_after_days: int = int(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "180"))
+
+    # Exclusão de contas e projetos em segundo plano (app.tools.deletion): intervalo do worker no
+    # lifespan (0 desliga; rode `python -m app.tools.deletion run`), linhas por lote, pausa entre
+    # lotes e falhas seguidas até o job ficar `failed`
+    deletion_worker_interval: float = float(os.getenv("DELETION_WORKER_INTERVAL", "5"))
+    deletion_batch_size: int = int(os.getenv("DELETION_BATCH_SIZE", "500"))
+    deletion_pause_seconds: float = float(os.getenv("DELETION_PAUSE_SECONDS", "0.05"))
+    deletion_max_failures: int = int(os.getenv("DELETION_MAX_FAILURES", "5"))
+
+    # Limite de requisições (app.ratelimit): tokens/s e burst por conta, buckets extras por rota
+    # (JSON, ex.: '{"GET /api/tasks": {"per_second": 5, "burst": 10}}'), teto de requisições em
+    # andamento por worker (0 = 2× o limite do pool) e onde ficam os buckets (shared, memory ou
+    # pacote.modulo:Classe). Planos sobrescrevem os limites em `features.rate_limit`. Desligado
+    # por padrão: `RATE_LIMIT_ENABLED=true` liga.
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "false")
+    rate_limit_per_second: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "50"))
+    rate_limit_burst: float = float(os.getenv("RATE_LIMIT_BURST", "100"))
+    rate_limit_routes: Dict[str, Any] = Field(default_factory=lambda: os.getenv("RATE_LIMIT_ROUTES", "{}"))
+    rate_limit_max_in_flight: int = int(os.getenv("RATE_LIMIT_MAX_IN_FLIGHT", "0"))
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "shared")
+    rate_limit_shared_path: Optional[str] = os.getenv("RATE_LIMIT_SHARED_PATH")
+
+    # Fila justa de conexões por conta (app.fairshare): sessões por conta ao mesmo tempo
+    # (0 = metade do limite do pool); peso e teto por plano em `features.db_share`. Desligada por
+    # padrão: `DB_FAIR_SHARE_ENABLED=true` liga.
+    db_fair_share_enabled: bool = os.getenv("DB_FAIR_SHARE_ENABLED", "false")
+    db_fair_share_max_per_account: int = int(os.getenv("DB_FAIR_SHARE_MAX_PER_ACCOUNT", "0"))
+
+    # Executor de CPU (app.cpu): threads ou processos, quantos (0 = até 4, pelas CPUs) e quantas
+    # tarefas podem esperar além das que estão rodando antes de responder 503
+    cpu_executor_kind: str = os.getenv("CPU_EXECUTOR_KIND", "thread")
+    cpu_executor_workers: int = int(os.getenv("CPU_EXECUTOR_WORKERS", "0"))
+    cpu_executor_max_queue: int = int(os.getenv("CPU_EXECUTOR_MAX_QUEUE", "64"))
+
+    # Custo do scrypt para senhas (app.passwords); hashes com custo menor são regravados no login
+    password_scrypt_n: int = int(os.getenv("PASSWORD_SCRYPT_N", "32768"))
+    password_scrypt_r: int = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+    password_scrypt_p: int = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+
+    # Intervalo de recarga das features de plano usadas por requisição (app.plans)
+    plan_features_refresh_seconds: float = float(os.getenv("PLAN_FEATURES_REFRESH_SECONDS", "30"))
+
+    # statement_timeout por rota (ms), ex.: '{"GET /api/tasks": 5000, "GET /api/meetings": 3000}'
+    route_statement_timeouts: Dict[str, int] = Field(
+        default_factory=lambda: os.getenv("ROUTE_STATEMENT_TIMEOUTS", "{}")
+    )
+
     @field_validator("cors_origins", mode="before")
     @classmethod
     def parse_origins(cls, value):
@@ -25,6 +168,118 @@ class Settings(BaseModel):
             return value
         return ["http://localhost:3000"]
 
+    @field_validator("db_replica_urls", mode="before")
+    @classmethod
+    def parse_replica_urls(cls, value):
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value or []
+
+    @field_validator("route_statement_timeouts", mode="before")
+    @classmethod
+    def parse_route_timeouts(cls, value):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value or "{}")
+            except json.JSONDecodeError as exc:
+                raise ValueError("ROUTE_STATEMENT_TIMEOUTS deve ser um objeto JSON") from exc
+        return value or {}
+
+    @field_validator("route_statement_timeouts")
+    @classmethod
+    def validate_route_timeouts(cls, value: Dict[str, int]) -> Dict[str, int]:
+        for route, timeout_ms in value.items():
+            if timeout_ms <= 0:
+                raise ValueError(f"Timeout inválido para a rota {route}: {timeout_ms}")
+        return value
+
+    @field_validator("rate_limit_routes", mode="before")
+    @classmethod
+    def parse_rate_limit_routes(cls, value):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value or "{}")
+            except json.JSONDecodeError as exc:
+                raise ValueError("RATE_LIMIT_ROUTES deve ser um objeto JSON") from exc
+        return value or {}
+
+    @field_validator("slow_query_explain_sample_rate")
+    @classmethod
+    def validate_sample_rate(cls, value: float) -> float:
+        if not 0 <= value <= 1:
+            raise ValueError("slow_query_explain_sample_rate deve estar entre 0 e 1")
+        return value
+
+    @model_validator(mode="after")
+    def apply_db_profile(self) -> "Settings":
+        if self.db_profile not in DB_PROFILES:
+            raise ValueError(f"DB_PROFILE inválido: {self.db_profile} (use {', '.join(DB_PROFILES)})")
+        for field_name, value in DB_PROFILES[self.db_profile].items():
+            if getattr(self, field_name) is None:
+                setattr(self, field_name, value)
+
+        if self.db_pool_size < 1:
+            raise ValueError("DB_POOL_SIZE deve ser maior que zero")
+        if self.db_max_overflow < 0:
+            raise ValueError("DB_MAX_OVERFLOW não pode ser negativo")
+        if self.db_pool_timeout <= 0:
+            raise ValueError("DB_POOL_TIMEOUT deve ser maior que zero")
+        if self.db_statement_cache_size < 0 or self.db_prepared_statement_cache_size < 0:
+            raise ValueError("Tamanhos de cache de statements não podem ser negativos")
+        if self.db_jit not in {"on", "off"}:
+            raise ValueError("DB_JIT deve ser 'on' ou 'off'")
+        if self.db_statement_timeout_ms < 0:
+            raise ValueError("DB_STATEMENT_TIMEOUT_MS não pode ser negativo")
+        if self.warmup_connections is None:
+            self.warmup_connections = self.db_pool_size
+        if not 0 <= self.warmup_connections <= self.db_pool_size + self.db_max_overflow:
+            raise ValueError("WARMUP_CONNECTIONS deve estar entre 0 e o limite do pool")
+        if self.read_your_writes_window_seconds is None:
+            self.read_your_writes_window_seconds = self.db_replica_max_lag_seconds + self.db_replica_health_interval
+        if self.read_your_writes_window_seconds < self.db_replica_max_lag_seconds:
+            # Uma réplica ainda saudável poderia estar sem a escrita quando o pin expira
+            raise ValueError("READ_YOUR_WRITES_WINDOW_SECONDS não pode ser menor que DB_REPLICA_MAX_LAG_SECONDS")
+        if self.batch_max_requests < 1:
+            raise ValueError("BATCH_MAX_REQUESTS deve ser maior que zero")
+        if not 1 <= self.batch_concurrency <= self.db_pool_size + self.db_max_overflow:
+            raise ValueError("BATCH_CONCURRENCY deve estar entre 1 e o limite do pool")
+        if self.deletion_batch_size < 1 or self.deletion_max_failures < 1:
+            raise ValueError("DELETION_BATCH_SIZE e DELETION_MAX_FAILURES devem ser maiores que zero")
+        if self.db_fair_share_max_per_account < 0:
+            raise ValueError("DB_FAIR_SHARE_MAX_PER_ACCOUNT não pode ser negativo")
+        if self.cpu_executor_kind not in {"thread", "process"}:
+            raise ValueError("CPU_EXECUTOR_KIND deve ser 'thread' ou 'process'")
+        if self.cpu_executor_workers < 0 or self.cpu_executor_max_queue < 0:
+            raise ValueError("CPU_EXECUTOR_WORKERS e CPU_EXECUTOR_MAX_QUEUE não podem ser negativos")
+        n = self.password_scrypt_n
+        if n < 2 or n & (n - 1) or self.password_scrypt_r < 1 or self.password_scrypt_p < 1:
+            raise ValueError("PASSWORD_SCRYPT_N deve ser potência de 2 (> 1); R e P, maiores que zero")
+        if self.rate_limit_max_in_flight < 0:
+            raise ValueError("RATE_LIMIT_MAX_IN_FLIGHT não pode ser negativo")
+        if self.dashboard_panel_timeout_ms <= 0:
+            raise ValueError("DASHBOARD_PANEL_TIMEOUT_MS deve ser maior que zero")
+        if self.db_profile == "pgbouncer" and (self.db_statement_cache_size or self.db_prepared_statement_cache_size):
+            raise ValueError("O perfil pgbouncer exige caches de statements desabilitados (0)")
+        return self
+
+    @property
+    def engine_options(self) -> Dict[str, Any]:
+        server_settings = {"application_name": self.db_application_name, "jit": self.db_jit}
+        if self.db_statement_timeout_ms:
+            server_settings["statement_timeout"] = str(self.db_statement_timeout_ms)
+        return {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_pre_ping": self.db_pool_pre_ping,
+            "connect_args": {
+                "statement_cache_size": self.db_statement_cache_size,
+                "prepared_statement_cache_size": self.db_prepared_statement_cache_size,
+                "server_settings": server_settings,
+            },
+        }
+
     @property
     def database_url(self) -> str:
         return (
@@ -0,0 +1,151 @@
+"""Executor compartilhado e limitado para trabalho de CPU fora do event loop.
+
+Hash de senha (scrypt), chunking de textos grandes, slugs em lote e codificação de exports
+travariam o worker inteiro se rodassem no loop. `run_cpu(fn, *args)` manda a função para um
+pool de `CPU_EXECUTOR_WORKERS` threads (ou processos, com `CPU_EXECUTOR_KIND=process`) e
+espera o resultado sem bloquear as outras requisições.
+
+O pool é limitado: com `CPU_EXECUTOR_WORKERS + CPU_EXECUTOR_MAX_QUEUE` tarefas já aceitas,
+a próxima falha na hora com `CpuExecutorBusy`, que a API responde com `503` e `Retry-After`.
+Uma fila sem limite só transformaria a sobrecarga em latência para todo mundo.
+
+Threads bastam para código que libera o GIL, como `hashlib.scrypt` e a compressão do
+`zlib`. Python puro precisa de processos, e então a função e os argumentos têm de ser
+serializáveis com pickle (funções de módulo, não closures). Profundidade da fila e tempos
+de espera e de execução saem em `GET /api/admin/cpu-executor`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from .config import get_settings
+
+T = TypeVar("T")
+
+
+class CpuExecutorBusy(RuntimeError):
+    """O executor já tem o máximo de tarefas aceitas."""
+
+
+def _timed(fn: Callable[..., T], args: Tuple[Any, ...], submitted: float) -> Tuple[T, float, float]:
+    # Roda no worker (thread ou processo): time.time() vale entre processos
+    started = time.time()
+    result = fn(*args)
+    return result, started - submitted, time.time() - started
+
+
+def _percentile(samples: Deque[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class CpuExecutor:
+    def __init__(self, kind: str = "thread", workers: int = 0, max_queue: int = 64, samples: int = 1_000) -> None:
+        if kind not in {"thread", "process"}:
+            raise ValueError(f"CPU_EXECUTOR_KIND inválido: {kind} (use thread ou process)")
+        self.kind = kind
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.pending = 0
+        self._waits: Deque[float] = deque(maxlen=samples)
+        self._runs: Deque[float] = deque(maxlen=samples)
+        self._executor: Optional[Executor] = None
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn: o filho não herda o loop, as threads nem as conexões do worker
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="pulsehub-cpu")
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise CpuExecutorBusy(f"Executor de CPU ocupado ({self.pending} tarefas aceitas)")
+        self.pending += 1
+        self.submitted += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(self._pool(), _timed, fn, args, time.time())
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self._waits.append(waited)
+        self._runs.append(ran)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_ms_p50": _percentile(self._waits, 0.50) * 1000,
+            "queue_ms_p95": _percentile(self._waits, 0.95) * 1000,
+            "run_ms_p50": _percentile(self._runs, 0.50) * 1000,
+            "run_ms_p95": _percentile(self._runs, 0.95) * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_executor: Optional[CpuExecutor] = None
+
+
+def get_cpu_executor() -> CpuExecutor:
+    """Executor do worker, criado no primeiro uso."""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = CpuExecutor(settings.cpu_executor_kind, settings.cpu_executor_workers, settings.cpu_executor_max_queue)
+    return _executor
+
+
+def shutdown_cpu_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any) -> T:
+    """Roda `fn(*args)` no executor compartilhado; `CpuExecutorBusy` se a fila estiver cheia."""
+    return await get_cpu_executor().run(fn, *args)
+
+
+async def cpu_busy_handler(request: Request, exc: CpuExecutorBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servidor sobrecarregado. Tente novamente em instantes."},
+        headers={"Retry-After": "1"},
+    )
+
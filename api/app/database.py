@@ -1,28 +1,212 @@
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
-from .config import get_settings
+from .changes import ChangeBroker
+from .config import Settings, get_settings
+from .cpu import shutdown_cpu_executor
+from .fairshare import FairShareScheduler, ScheduledSessions
+from .plans import PlanFeatureCache
+from .quotas import get_quota_tracker
+from .ratelimit import account_key
+from .replicas import ReplicaRouter, is_pinned_to_primary
+from .slow_query import SlowQueryLog
+from .timeouts import apply_statement_timeout, statement_timeout_for
 
 
 class Base(DeclarativeBase):
     pass
 
 
-settings = get_settings()
-engine = create_async_engine(settings.database_url, future=True, echo=False, pool_pre_ping=True)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+@dataclass
+class Database:
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    replica_router: ReplicaRouter
+    slow_query_log: SlowQueryLog
+    change_broker: ChangeBroker
+    plan_features: PlanFeatureCache
+    scheduler: Optional[FairShareScheduler] = None
+
+
+def _create_scheduler(settings: Settings, name: str) -> Optional[FairShareScheduler]:
+    if not settings.db_fair_share_enabled:
+        return None
+    return FairShareScheduler(
+        name,
+        settings.db_pool_size + settings.db_max_overflow,
+        max_per_account=settings.db_fair_share_max_per_account,
+        timeout=settings.db_pool_timeout,
+    )
+
+
+_database: Optional[Database] = None
+
+
+def _create_database(settings: Settings) -> Database:
+    engine = create_async_engine(settings.database_url, future=True, echo=False, **settings.engine_options)
+    replica_router = ReplicaRouter(
+        [
+            create_async_engine(url, future=True, echo=False, **settings.engine_options)
+            for url in settings.db_replica_urls
+        ],
+        health_interval=settings.db_replica_health_interval,
+        max_lag_seconds=settings.db_replica_max_lag_seconds,
+    )
+    slow_query_log = SlowQueryLog(
+        threshold_ms=settings.slow_query_threshold_ms,
+        buffer_size=settings.slow_query_buffer_size,
+        explain_sample_rate=settings.slow_query_explain_sample_rate,
+    )
+    if slow_query_log.enabled:
+        slow_query_log.install(engine)
+        for replica in replica_router.replicas:
+            slow_query_log.install(replica.engine)
+    plan_features = PlanFeatureCache(settings.plan_features_refresh_seconds)
+    scheduler = _create_scheduler(settings, "primary")
+    for replica in replica_router.replicas:
+        replica.scheduler = _create_scheduler(settings, replica.name)
+    for pool_scheduler in [scheduler, *(replica.scheduler for replica in replica_router.replicas)]:
+        if pool_scheduler is not None:
+            plan_features.subscribe("db_share", pool_scheduler.load_plans)
+    quota_tracker = get_quota_tracker()
+    plan_features.subscribe("quotas", quota_tracker.load_limits)
+    plan_features.after_refresh(quota_tracker.load_usage)
+    return Database(
+        engine=engine,
+        sessionmaker=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        replica_router=replica_router,
+        slow_query_log=slow_query_log,
+        change_broker=ChangeBroker(
+            {
+                "host": settings.pg_host,
+                "port": int(settings.pg_port),
+                "user": settings.pg_user,
+                "password": settings.pg_password,
+                "database": settings.pg_database,
+                "server_settings": {"application_name": f"{settings.db_application_name}-listen"},
+            },
+            queue_size=settings.change_stream_queue_size,
+        ),
+        plan_features=plan_features,
+        scheduler=scheduler,
+    )
+
+
+def get_database() -> Database:
+    """Engines, réplicas e slow-query log, criados no primeiro uso (normalmente o lifespan), não no import."""
+    global _database
+    if _database is None:
+        _database = _create_database(get_settings())
+    return _database
+
+
+def get_slow_query_log() -> SlowQueryLog:
+    return get_database().slow_query_log
+
+
+def get_schedulers() -> List[FairShareScheduler]:
+    """Filas justas ativas: a do primário e a de cada réplica."""
+    database = get_database()
+    schedulers = [database.scheduler, *(replica.scheduler for replica in database.replica_router.replicas)]
+    return [scheduler for scheduler in schedulers if scheduler is not None]
+
+
+def get_change_broker() -> ChangeBroker:
+    return get_database().change_broker
 
 
 @asynccontextmanager
 async def lifespan(app):
+    global _database
+    settings = get_settings()
+    database = get_database()
+    database.slow_query_log.start()
+    database.replica_router.start()
+    if settings.warmup_enabled:
+        from .warmup import warm_up  # importa os serviços, que dependem de Base
+
+        engines = [database.engine, *(replica.engine for replica in database.replica_router.replicas)]
+        await warm_up(app, engines, settings.warmup_connections, settings.warmup_timeout)
+    maintenance = None
+    if settings.partition_maintenance_interval > 0:
+        from .tools.retention import PartitionMaintenance
+
+        maintenance = PartitionMaintenance(
+            settings.partition_maintenance_interval, settings.partition_months_ahead, settings.retention_enabled
+        )
+        maintenance.start()
+    deletion_worker = None
+    if settings.deletion_worker_interval > 0:
+        from .tools.deletion import DeletionWorker
+
+        deletion_worker = DeletionWorker(
+            settings.deletion_worker_interval,
+            settings.deletion_batch_size,
+            settings.deletion_pause_seconds,
+            settings.deletion_max_failures,
+        )
+        deletion_worker.start()
+    rate_limiter = getattr(app.state, "rate_limiter", None)
+    if rate_limiter is not None:
+        database.plan_features.subscribe("rate_limit", rate_limiter.load_plans)
+    database.plan_features.start(database.engine)
     try:
         yield
     finally:
-        await engine.dispose()
+        if maintenance is not None:
+            await maintenance.stop()
+        if deletion_worker is not None:
+            await deletion_worker.stop()
+        await database.plan_features.stop()
+        shutdown_cpu_executor()
+        await database.change_broker.stop()
+        await database.replica_router.stop()
+        await database.slow_query_log.stop()
+        if settings.slow_query_log_path:
+            database.slow_query_log.dump_jsonl(settings.slow_query_log_path)
+        await database.engine.dispose()
+        for replica in database.replica_router.replicas:
+            await replica.engine.dispose()
+        _database = None
+
+
+def _prepare_session(session: AsyncSession, request: Request) -> AsyncSession:
+    timeout_ms = statement_timeout_for(request, get_settings().route_statement_timeouts)
+    if timeout_ms:
+        apply_statement_timeout(session, timeout_ms)
+    return session
+
+
+def _scheduled(sessionmaker: async_sessionmaker, scheduler: Optional[FairShareScheduler], request: Request):
+    if scheduler is None:
+        return sessionmaker
+    return ScheduledSessions(sessionmaker, scheduler, account_key(request.scope))
+
+
+async def get_session(request: Request) -> AsyncSession:
+    """Sessão no primário; abre depois de conseguir vaga na fila justa da conta (`app.fairshare`)."""
+    database = get_database()
+    async with _scheduled(database.sessionmaker, database.scheduler, request)() as session:
+        yield _prepare_session(session, request)
+
+
+def get_read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Fábrica de sessões de leitura: uma réplica saudável, exceto logo após uma escrita do cliente."""
+    database = get_database()
+    replica = None
+    if not is_pinned_to_primary(request.headers, get_settings().read_your_writes_window_seconds):
+        replica = database.replica_router.pick()
+    if replica is not None:
+        return _scheduled(replica.sessionmaker, replica.scheduler, request)
+    return _scheduled(database.sessionmaker, database.scheduler, request)
 
 
-async def get_session() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
-        yield session
+async def get_read_session(request: Request) -> AsyncSession:
+    """Sessão para rotas somente leitura (ver `get_read_sessionmaker`)."""
+    async with get_read_sessionmaker(request)() as session:
+        yield _prepare_session(session, request)
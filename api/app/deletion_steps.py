@@ -0,0 +1,51 @@
+"""Passos dos jobs de exclusão de contas e projetos (executados por `app.tools.deletion`).
+
+Fica fora de `app.tools.deletion` para que a API leia o avanço dos jobs sem importar o
+asyncpg no import de `app.main` (ver `app.tools.importtime`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class Step:
+    table: str
+    key: str  # coluna indexada que ordena os lotes (logo depois de account_id no índice)
+    key_type: str
+    pk: Tuple[str, ...]
+    action: str = "delete"  # delete | unlink (project_id = NULL)
+
+
+# Filhos maiores primeiro e de baixo para cima nas FKs: cada lote leva pouco cascade.
+ACCOUNT_STEPS: Tuple[Step, ...] = (
+    Step("sprint_task", "sprint_id", "uuid", ("account_id", "sprint_id", "task_id")),
+    Step("sprint_task_archive", "sprint_id", "uuid", ("account_id", "sprint_id", "task_id")),
+    Step("task_comment", "task_id", "uuid", ("id",)),
+    Step("task_comment_archive", "task_id", "uuid", ("id",)),
+    Step("task", "id", "uuid", ("account_id", "id")),
+    Step("task_archive", "id", "uuid", ("account_id", "id")),
+    Step("meeting_participant", "meeting_id", "uuid", ("account_id", "meeting_id", "display_name")),
+    Step("doc_chunk", "id", "uuid", ("account_id", "id", "occurred_at", "retention_months")),
+    Step("meeting", "occurred_at", "timestamptz", ("id", "occurred_at", "retention_months")),
+    Step("user_capacity", "user_id", "uuid", ("id",)),
+    Step("sprint", "starts_at", "date", ("id",)),
+    Step("project", "key", "text", ("id",)),
+)
+
+# Reuniões, trechos e sprints sobrevivem ao projeto (FK `SET NULL`): só são desvinculados.
+PROJECT_STEPS: Tuple[Step, ...] = (
+    Step("task", "id", "uuid", ("account_id", "id")),
+    Step("task_archive", "created_at", "timestamptz", ("account_id", "id")),
+    Step("meeting", "id", "uuid", ("id", "occurred_at", "retention_months"), action="unlink"),
+    Step("doc_chunk", "id", "uuid", ("account_id", "id", "occurred_at", "retention_months"), action="unlink"),
+    Step("sprint", "id", "uuid", ("id",), action="unlink"),
+)
+
+STEPS: Dict[str, Tuple[Step, ...]] = {"account": ACCOUNT_STEPS, "project": PROJECT_STEPS}
+
+
+def step_names(kind: str) -> List[str]:
+    return [step.table for step in STEPS[kind]]
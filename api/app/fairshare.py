@@ -0,0 +1,278 @@
+"""Fila justa, por conta, para as conexões do pool.
+
+O rate limit (`app.ratelimit`) conta requisições, não o quanto cada uma segura a conexão:
+uma conta com poucas requisições pesadas (sprints inteiros, listas grandes) ainda ocupa o
+pool. `FairShareScheduler` fica na frente de cada pool (primário e réplicas) com tantas
+vagas quanto o pool tem conexões (`DB_POOL_SIZE + DB_MAX_OVERFLOW`), e toda sessão de
+requisição ocupa uma vaga até fechar:
+
+- Com vaga livre e a conta abaixo do seu teto, a sessão abre na hora (sem custo extra).
+- Sem vaga, as requisições esperam numa fila por conta. Cada vaga liberada vai para a conta
+  com menos sessões abertas por peso (`ativas / weight`); no empate, para a que menos usou o
+  pool (segundos de conexão / peso). Dentro da conta, a ordem é a de chegada.
+- Uma conta nunca passa de `max_concurrency` sessões ao mesmo tempo, mesmo com o pool livre
+  (`DB_FAIR_SHARE_MAX_PER_ACCOUNT`; 0 = metade das vagas).
+- Quem espera mais que `DB_POOL_TIMEOUT` recebe o mesmo `503` do pool esgotado.
+
+Planos ajustam peso e teto em `features.db_share`, ex.: `{"weight": 4, "max_concurrency": 12}`.
+O tempo de fila (por conta e percentis gerais) sai em `GET /api/admin/db-scheduler`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Mapping, Optional, Set
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Share:
+    weight: float = 1.0
+    max_concurrency: Optional[int] = None  # None = teto padrão do scheduler
+
+
+def parse_share(value: Any, where: str = "db_share") -> Share:
+    """Valida `{"weight": > 0, "max_concurrency": >= 1}` (ambos opcionais); ValueError se inválido."""
+    if not isinstance(value, Mapping):
+        raise ValueError(f"{where} deve ser um objeto com weight e/ou max_concurrency")
+    weight = value.get("weight", 1)
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+        raise ValueError(f"{where}.weight deve ser um número > 0")
+    max_concurrency = value.get("max_concurrency")
+    if max_concurrency is not None and (
+        isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int) or max_concurrency < 1
+    ):
+        raise ValueError(f"{where}.max_concurrency deve ser um inteiro >= 1")
+    return Share(float(weight), max_concurrency)
+
+
+@dataclass
+class TenantStats:
+    granted: int = 0
+    queued: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    held_seconds: float = 0.0
+
+
+class _Tenant:
+    __slots__ = ("account", "share", "active", "usage", "waiters", "stats")
+
+    def __init__(self, account: str, share: Share) -> None:
+        self.account = account
+        self.share = share
+        self.active = 0
+        self.usage = 0.0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.stats = TenantStats()
+
+    @property
+    def idle(self) -> bool:
+        return not self.active and not self.waiters
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FairShareScheduler:
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        *,
+        max_per_account: int = 0,
+        timeout: float = 30.0,
+        max_accounts: int = 10_000,
+        wait_samples: int = 2_000,
+    ) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.max_per_account = max_per_account or max(1, capacity // 2)
+        self.timeout = timeout
+        self.max_accounts = max_accounts
+        self.in_use = 0
+        self._shares: Dict[str, Share] = {}
+        self._tenants: "OrderedDict[str, _Tenant]" = OrderedDict()
+        self._busy: Set[_Tenant] = set()
+        self._waiting: Set[_Tenant] = set()
+        self._waits: Deque[float] = deque(maxlen=wait_samples)
+
+    def load_plans(self, values: Dict[str, Any]) -> None:
+        """Peso e teto por conta a partir de `features.db_share` (ver `app.plans.PlanFeatureCache`)."""
+        shares: Dict[str, Share] = {}
+        for account_id, value in values.items():
+            try:
+                shares[account_id] = parse_share(value)
+            except ValueError as exc:
+                logger.warning("db_share inválido no plano da conta %s: %s", account_id, exc)
+        self._shares = shares
+        for account, tenant in self._tenants.items():
+            tenant.share = shares.get(account, Share())
+
+    def limit(self, tenant: _Tenant) -> int:
+        return min(self.capacity, tenant.share.max_concurrency or self.max_per_account)
+
+    def _tenant(self, account: str) -> _Tenant:
+        tenant = self._tenants.get(account)
+        if tenant is None:
+            tenant = self._tenants[account] = _Tenant(account, self._shares.get(account, Share()))
+            self._prune()
+        else:
+            self._tenants.move_to_end(account)
+        if tenant.idle and self._busy:
+            # Quem volta depois de parado entra com o uso do menor ativo: não acumula crédito
+            tenant.usage = max(tenant.usage, min(busy.usage for busy in self._busy))
+        return tenant
+
+    def _prune(self) -> None:
+        excess = len(self._tenants) - self.max_accounts
+        for account in list(self._tenants):
+            if excess <= 0:
+                break
+            if self._tenants[account].idle:
+                del self._tenants[account]
+                excess -= 1
+
+    def _grant(self, tenant: _Tenant) -> None:
+        self.in_use += 1
+        tenant.active += 1
+        tenant.stats.granted += 1
+        self._busy.add(tenant)
+
+    def _release(self, tenant: _Tenant, held: float) -> None:
+        self.in_use -= 1
+        tenant.active -= 1
+        tenant.usage += held / tenant.share.weight
+        tenant.stats.held_seconds += held
+        if tenant.idle:
+            self._busy.discard(tenant)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.in_use < self.capacity:
+            best = None
+            for tenant in self._waiting:
+                if tenant.active >= self.limit(tenant):
+                    continue
+                key = (tenant.active / tenant.share.weight, tenant.usage)
+                if best is None or key < best[0]:
+                    best = (key, tenant)
+            if best is None:
+                return
+            tenant = best[1]
+            waiter = tenant.waiters.popleft()
+            if not tenant.waiters:
+                self._waiting.discard(tenant)
+            if waiter.done():
+                continue
+            self._grant(tenant)
+            waiter.set_result(None)
+
+    async def _wait(self, tenant: _Tenant) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        tenant.waiters.append(waiter)
+        tenant.stats.queued += 1
+        self._waiting.add(tenant)
+        self._busy.add(tenant)
+        try:
+            # Não `wait_for`: no 3.11 ele engole o cancelamento que chega junto com a vaga
+            async with asyncio.timeout(self.timeout):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A vaga chegou junto com o timeout/cancelamento: devolve para o próximo
+                self._release(tenant, 0.0)
+            else:
+                waiter.cancel()
+                try:
+                    tenant.waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if not tenant.waiters:
+                    self._waiting.discard(tenant)
+                if tenant.idle:
+                    self._busy.discard(tenant)
+            if isinstance(exc, TimeoutError):
+                tenant.stats.timeouts += 1
+                raise PoolTimeoutError(
+                    f"Conta {tenant.account} esperou mais de {self.timeout:g}s por uma conexão ({self.name})"
+                ) from None
+            raise
+
+    @asynccontextmanager
+    async def slot(self, account: str) -> AsyncIterator[None]:
+        """Ocupa uma vaga do pool em nome de `account` enquanto o bloco roda."""
+        tenant = self._tenant(account)
+        started = time.monotonic()
+        if self.in_use < self.capacity and tenant.active < self.limit(tenant) and not tenant.waiters:
+            self._grant(tenant)
+        else:
+            await self._wait(tenant)
+        granted = time.monotonic()
+        waited = granted - started
+        self._waits.append(waited)
+        tenant.stats.wait_seconds += waited
+        tenant.stats.max_wait_seconds = max(tenant.stats.max_wait_seconds, waited)
+        try:
+            yield
+        finally:
+            self._release(tenant, time.monotonic() - granted)
+
+    def stats(self, limit: int = 50) -> Dict[str, Any]:
+        """Ocupação, percentis do tempo de fila e as contas que mais esperaram."""
+        ordered = sorted(self._waits)
+        tenants = sorted(self._tenants.values(), key=lambda tenant: tenant.stats.wait_seconds, reverse=True)
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "waiting": sum(len(tenant.waiters) for tenant in self._waiting),
+            "max_per_account": self.max_per_account,
+            "wait_ms_p50": _percentile(ordered, 0.50) * 1000,
+            "wait_ms_p95": _percentile(ordered, 0.95) * 1000,
+            "wait_ms_p99": _percentile(ordered, 0.99) * 1000,
+            "accounts": [
+                {
+                    "account": tenant.account,
+                    "weight": tenant.share.weight,
+                    "max_concurrency": self.limit(tenant),
+                    "active": tenant.active,
+                    "waiting": len(tenant.waiters),
+                    "granted": tenant.stats.granted,
+                    "queued": tenant.stats.queued,
+                    "timeouts": tenant.stats.timeouts,
+                    "wait_ms_total": tenant.stats.wait_seconds * 1000,
+                    "wait_ms_max": tenant.stats.max_wait_seconds * 1000,
+                    "held_seconds": tenant.stats.held_seconds,
+                }
+                for tenant in tenants[:limit]
+            ],
+        }
+
+
+class ScheduledSessions:
+    """Fábrica de sessões (`async with factory() as session`) que passa pela fila da conta."""
+
+    def __init__(self, sessionmaker: async_sessionmaker, scheduler: FairShareScheduler, account: str) -> None:
+        self.sessionmaker = sessionmaker
+        self.scheduler = scheduler
+        self.account = account
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[AsyncSession]:
+        async with self.scheduler.slot(self.account):
+            async with self.sessionmaker() as session:
+                yield session
@@ -1,10 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 
+from .coalesce import CoalesceMiddleware
 from .config import get_settings
+from .cpu import CpuExecutorBusy, cpu_busy_handler
 from .database import lifespan
-from .routers import admin, areas
-from .routers import meeting_types, meetings, sprints, task_types, tasks
+from .quotas import QuotaExceeded, quota_exceeded_handler
+from .ratelimit import RateLimitMiddleware, rate_limiter_from_settings
+from .replicas import LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from .timeouts import CancelOnDisconnectMiddleware, database_timeout_handler
+from .routers import admin, areas, batch, dashboard
+from .routers import meeting_types, meetings, sprints, stream, task_types, tasks
 
 settings = get_settings()
 
@@ -14,19 +21,35 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Mais interno: só as rotas marcadas com @coalesced, já depois do rate limit
+app.add_middleware(CoalesceMiddleware, read_your_writes_window=settings.read_your_writes_window_seconds)
+# Antes do CORS na lista: o CORS fica por fora e também marca as respostas 429/503
+if settings.rate_limit_enabled:
+    app.state.rate_limiter = rate_limiter_from_settings(settings)
+    app.add_middleware(RateLimitMiddleware, limiter=app.state.rate_limiter)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
+app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.read_your_writes_window_seconds)
+app.add_middleware(CancelOnDisconnectMiddleware)
+app.add_exception_handler(PoolTimeoutError, database_timeout_handler)
+app.add_exception_handler(DBAPIError, database_timeout_handler)
+app.add_exception_handler(CpuExecutorBusy, cpu_busy_handler)
+app.add_exception_handler(QuotaExceeded, quota_exceeded_handler)
 
 app.include_router(admin.router, prefix=settings.api_prefix)
 app.include_router(areas.router, prefix=settings.api_prefix)
+app.include_router(batch.router, prefix=settings.api_prefix)
+app.include_router(dashboard.router, prefix=settings.api_prefix)
 app.include_router(meetings.router, prefix=settings.api_prefix)
 app.include_router(meeting_types.router, prefix=settings.api_prefix)
 app.include_router(sprints.router, prefix=settings.api_prefix)
+app.include_router(stream.router, prefix=settings.api_prefix)
 app.include_router(task_types.router, prefix=settings.api_prefix)
 app.include_router(tasks.router, prefix=settings.api_prefix)
 
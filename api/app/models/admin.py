@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
 
-from sqlalchemy import JSON, Boolean, Date, DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func, text
+from sqlalchemy import JSON, BigInteger, Boolean, Date, DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import CITEXT, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -66,6 +66,7 @@ class Account(Base):
     locale: Mapped[str] = mapped_column(Text, nullable=False, default="pt-BR")
     timezone: Mapped[str] = mapped_column(Text, nullable=False, default="America/Sao_Paulo")
     settings: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict, server_default=text("'{}'::jsonb"))
+    deletion_requested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -158,6 +159,7 @@ class Project(Base):
         PGUUID(as_uuid=True),
         ForeignKey("user_app.id", ondelete="SET NULL"),
     )
+    deletion_requested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -176,3 +178,127 @@ class Project(Base):
     meetings: Mapped[List["Meeting"]] = relationship("Meeting", back_populates="project")
     tasks: Mapped[List["Task"]] = relationship("Task", back_populates="project")
     sprints: Mapped[List["Sprint"]] = relationship("Sprint", back_populates="project")
+
+
+class ProjectRollup(Base):
+    """Agregados de tarefas por projeto, mantidos por triggers em `task` (ver migração 20250315)."""
+
+    __tablename__ = "project_rollup"
+
+    project_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("project.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("account.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    tasks_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status_backlog: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status_planned: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status_in_progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status_review: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status_blocked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    open_priority_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    open_priority_medium: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    open_priority_high: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    open_priority_critical: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    estimate_hours: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    actual_hours: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+    project: Mapped["Project"] = relationship("Project")
+
+
+class ProjectRollupDue(Base):
+    """Tarefas abertas por projeto e prazo; atrasadas = soma das linhas com prazo antes de hoje."""
+
+    __tablename__ = "project_rollup_due"
+
+    project_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("project.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    due_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    open_tasks: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class AccountUsage(Base):
+    """Estoque por conta (projetos, usuários, tarefas), mantido por triggers (ver migração 20250331)."""
+
+    __tablename__ = "account_usage"
+
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("account.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    projects: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    users: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    tasks: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+
+class AccountUsageMonthly(Base):
+    """Consumo por conta e mês (minutos de reunião, tokens de trechos); apagar não devolve."""
+
+    __tablename__ = "account_usage_monthly"
+
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("account.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    meeting_minutes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    chunk_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+
+class DeletionJob(Base):
+    """Exclusão de conta ou projeto em lotes (ver `app.tools.deletion`); sem FK, fica como histórico."""
+
+    __tablename__ = "deletion_job"
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    account_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
+    project_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default="pending")
+    step: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    cursor: Mapped[Optional[str]] = mapped_column(Text)
+    processed: Mapped[dict] = mapped_column(JSON, nullable=False, server_default=text("'{}'::jsonb"))
+    failures: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    requested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
@@ -4,9 +4,9 @@ from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
 
-from sqlalchemy import ARRAY, JSON, Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint, text
+from sqlalchemy import ARRAY, JSON, Boolean, DateTime, ForeignKey, Integer, Numeric, SmallInteger, String, Text, UniqueConstraint, and_, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship
 
 from ..database import Base
 
@@ -42,6 +42,8 @@ class MeetingType(Base):
 class Meeting(Base):
     __tablename__ = "meeting"
 
+    # Particionada por mês de occurred_at e prazo de retenção (app.tools.retention): a PK no
+    # banco é (id, occurred_at, retention_months); para o ORM basta o id.
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
@@ -64,6 +66,8 @@ class Meeting(Base):
     status: Mapped[str] = mapped_column(String, nullable=False, default="processed")
     metadata_json: Mapped[dict] = mapped_column("metadata", JSON, nullable=False, default=dict)
     notes: Mapped[Optional[str]] = mapped_column(Text)
+    # Prazo do plano da conta quando a reunião foi registrada (0 = sem prazo)
+    retention_months: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=text("now()")
     )
@@ -73,19 +77,34 @@ class Meeting(Base):
 
     meeting_type: Mapped[MeetingType] = relationship(back_populates="meetings")
     project: Mapped[Optional["Project"]] = relationship("Project", back_populates="meetings")
+    # Sem FK no banco para meeting: o cascade do ORM apaga participantes e trechos. A conta
+    # (meeting_participant, por hash) e a data (doc_chunk, por mês) no join podam as partições.
     participants: Mapped[List["MeetingParticipant"]] = relationship(
-        back_populates="meeting", cascade="all, delete-orphan"
+        back_populates="meeting",
+        primaryjoin=lambda: and_(
+            Meeting.id == foreign(MeetingParticipant.meeting_id), Meeting.account_id == MeetingParticipant.account_id
+        ),
+        cascade="all, delete-orphan",
+    )
+    chunks: Mapped[List["DocChunk"]] = relationship(
+        back_populates="meeting",
+        primaryjoin=lambda: and_(
+            Meeting.id == foreign(DocChunk.meeting_id),
+            Meeting.account_id == DocChunk.account_id,
+            Meeting.occurred_at == DocChunk.occurred_at,
+        ),
+        cascade="all, delete-orphan",
     )
-    chunks: Mapped[List["DocChunk"]] = relationship(back_populates="meeting", cascade="all, delete-orphan")
 
 
 class MeetingParticipant(Base):
     __tablename__ = "meeting_participant"
 
-    meeting_id: Mapped[UUID] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("meeting.id", ondelete="CASCADE"), primary_key=True
-    )
+    meeting_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
     display_name: Mapped[str] = mapped_column(String, primary_key=True)
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
+    )
     user_id: Mapped[Optional[UUID]] = mapped_column(
         PGUUID(as_uuid=True), ForeignKey("user_app.id", ondelete="SET NULL"), nullable=True
     )
@@ -94,23 +113,27 @@ class MeetingParticipant(Base):
     joined_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     left_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
-    meeting: Mapped[Meeting] = relationship(back_populates="participants")
+    meeting: Mapped[Meeting] = relationship(
+        back_populates="participants",
+        primaryjoin=lambda: and_(
+            Meeting.id == foreign(MeetingParticipant.meeting_id), Meeting.account_id == MeetingParticipant.account_id
+        ),
+    )
 
 
 class DocChunk(Base):
     __tablename__ = "doc_chunk"
 
+    # Mesmo layout de meeting; PK no banco (account_id, id, occurred_at, retention_months)
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
-    meeting_id: Mapped[Optional[UUID]] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("meeting.id", ondelete="CASCADE")
-    )
+    meeting_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
     project_id: Mapped[Optional[UUID]] = mapped_column(
         PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="SET NULL")
     )
     account_id: Mapped[UUID] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), nullable=False
+        PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
     )
     source_type: Mapped[str] = mapped_column(String, nullable=False)
     source_id: Mapped[Optional[str]] = mapped_column(String)
@@ -122,8 +145,18 @@ class DocChunk(Base):
     end_time: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
     participants: Mapped[Optional[list[str]]] = mapped_column(ARRAY(String))
     metadata_json: Mapped[dict] = mapped_column("metadata", JSON, nullable=False, default=dict)
+    # Copiados da reunião (ou, para trechos avulsos, a criação e o prazo do plano da conta)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    retention_months: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=text("now()")
     )
 
-    meeting: Mapped[Optional[Meeting]] = relationship(back_populates="chunks")
+    meeting: Mapped[Optional[Meeting]] = relationship(
+        back_populates="chunks",
+        primaryjoin=lambda: and_(
+            Meeting.id == foreign(DocChunk.meeting_id),
+            Meeting.account_id == DocChunk.account_id,
+            Meeting.occurred_at == DocChunk.occurred_at,
+        ),
+    )
@@ -4,9 +4,9 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, String, Text, text
+from sqlalchemy import Date, DateTime, ForeignKey, ForeignKeyConstraint, Integer, Numeric, String, Text, and_, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship
 
 from ..database import Base
 
@@ -34,8 +34,12 @@ class Sprint(Base):
 
     project: Mapped[Optional["Project"]] = relationship("Project", back_populates="sprints")
     account: Mapped["Account"] = relationship("Account")
+    # A conta no join deixa o Postgres podar as partições de sprint_task
     assignments: Mapped[List["SprintTask"]] = relationship(
-        "SprintTask", back_populates="sprint", cascade="all, delete-orphan"
+        "SprintTask",
+        back_populates="sprint",
+        primaryjoin=lambda: and_(Sprint.id == foreign(SprintTask.sprint_id), Sprint.account_id == SprintTask.account_id),
+        cascade="all, delete-orphan",
     )
     capacities: Mapped[List["UserCapacity"]] = relationship(
         "UserCapacity", back_populates="sprint", cascade="all, delete-orphan"
@@ -44,21 +48,31 @@ class Sprint(Base):
 
 class SprintTask(Base):
     __tablename__ = "sprint_task"
+    # Particionada por hash de account_id, como task
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["account_id", "task_id"], ["task.account_id", "task.id"], name="sprint_task_task_fkey", ondelete="CASCADE"
+        ),
+    )
 
     sprint_id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True), ForeignKey("sprint.id", ondelete="CASCADE"), primary_key=True
     )
-    task_id: Mapped[UUID] = mapped_column(
-        PGUUID(as_uuid=True), ForeignKey("task.id", ondelete="CASCADE"), primary_key=True
+    task_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
     )
-    account_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), nullable=False)
     planned_hours: Mapped[Optional[int]] = mapped_column(Integer)
     planned_points: Mapped[Optional[float]] = mapped_column(Numeric(6, 2))
     status: Mapped[str] = mapped_column(String, nullable=False, default="committed")
     notes: Mapped[Optional[str]] = mapped_column(Text)
     position: Mapped[Optional[int]] = mapped_column(Integer)
 
-    sprint: Mapped["Sprint"] = relationship("Sprint", back_populates="assignments")
+    sprint: Mapped["Sprint"] = relationship(
+        "Sprint",
+        back_populates="assignments",
+        primaryjoin=lambda: and_(Sprint.id == foreign(SprintTask.sprint_id), Sprint.account_id == SprintTask.account_id),
+    )
     task: Mapped["Task"] = relationship("Task", back_populates="sprint_assignments")
 
 
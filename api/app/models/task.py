@@ -4,9 +4,9 @@ from datetime import datetime, date
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint, text
+from sqlalchemy import Date, DateTime, ForeignKey, ForeignKeyConstraint, Integer, Numeric, String, Text, UniqueConstraint, and_, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship, remote
 
 from ..database import Base
 
@@ -39,10 +39,20 @@ class TaskType(Base):
 
 class Task(Base):
     __tablename__ = "task"
+    # Particionada por hash de account_id: a conta faz parte da PK e das FKs para a tarefa
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["account_id", "parent_id"], ["task.account_id", "task.id"], name="task_parent_fkey", ondelete="SET NULL"
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     project_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
-    parent_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True), ForeignKey("task.id", ondelete="SET NULL"))
+    # Desnormalizado de project.account_id (mantido também por trigger no banco); chave de partição
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
+    )
+    parent_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
     task_type_id: Mapped[Optional[UUID]] = mapped_column(
         PGUUID(as_uuid=True),
         ForeignKey("task_type.id", ondelete="SET NULL"),
@@ -71,11 +81,57 @@ class Task(Base):
     )
     task_type: Mapped[Optional["TaskType"]] = relationship("TaskType", back_populates="tasks")
 
+    # A conta é comum aos dois lados: só parent_id é escrito pelo relacionamento
     children: Mapped[List["Task"]] = relationship(
         "Task",
         back_populates="parent",
-        remote_side="Task.id",
+        primaryjoin=lambda: and_(
+            Task.account_id == remote(Task.account_id), foreign(Task.parent_id) == remote(Task.id)
+        ),
         cascade="all, delete-orphan",
         single_parent=True,
     )
-    parent: Mapped[Optional["Task"]] = relationship("Task", back_populates="children", uselist=False)
+    parent: Mapped[Optional["Task"]] = relationship(
+        "Task",
+        back_populates="children",
+        primaryjoin=lambda: and_(
+            remote(Task.account_id) == Task.account_id, remote(foreign(Task.parent_id)) == Task.id
+        ),
+        uselist=False,
+    )
+
+
+class ArchivedTask(Base):
+    """Tarefa concluída movida para `task_archive` por `app.tools.archive`; só leitura."""
+
+    __tablename__ = "task_archive"
+
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    project_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
+    account_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
+    )
+    parent_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
+    task_type_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
+    external_ref: Mapped[Optional[str]] = mapped_column(Text)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    priority: Mapped[str] = mapped_column(String, nullable=False)
+    estimate_hours: Mapped[Optional[int]] = mapped_column(Integer)
+    actual_hours: Mapped[Optional[int]] = mapped_column(Integer)
+    story_points: Mapped[Optional[float]] = mapped_column(Numeric(6, 2))
+    due_date: Mapped[Optional[date]] = mapped_column(Date)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    assignee_id: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
+    created_by: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
+    updated_by: Mapped[Optional[UUID]] = mapped_column(PGUUID(as_uuid=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+
+    # Sem FK no arquivo: um tipo apagado depois do arquivamento só deixa de aparecer
+    task_type: Mapped[Optional["TaskType"]] = relationship(
+        "TaskType", primaryjoin=lambda: foreign(ArchivedTask.task_type_id) == TaskType.id, viewonly=True
+    )
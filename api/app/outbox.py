@@ -0,0 +1,220 @@
+"""Publicação da outbox (`migrations/20250329_add_outbox.sql`) para sinks plugáveis.
+
+Cada worker do publicador repete, com uma conexão própria: abre uma transação, trava as
+próximas linhas da outbox em ordem de id (`FOR UPDATE SKIP LOCKED`, então workers em
+paralelo pegam lotes diferentes), entrega o lote ao sink e apaga as linhas no mesmo commit.
+Se o sink falhar, a transação é desfeita e o lote volta a ficar disponível: a entrega é pelo
+menos uma vez, e o consumidor deve descartar repetidos pelo `id` do evento.
+
+Com um worker, os eventos chegam em ordem de id. Com vários, a ordem vale dentro de cada
+lote; mudanças na mesma linha continuam em ordem de `version` (txid), que o consumidor pode
+usar para ignorar eventos atrasados.
+
+Um sink recebe o lote já serializado (um objeto JSON por evento, montado pelo Postgres):
+
+    class Sink(Protocol):
+        concurrent: bool  # aceita `send` de vários workers ao mesmo tempo?
+        async def send(self, events: Sequence[str]) -> None: ...
+        async def close(self) -> None: ...
+
+`sink_from_url` cria os sinks embutidos: `file:<caminho>` (NDJSON, com fsync por lote),
+`-` (saída padrão) e `http(s)://...` (webhook, POST de NDJSON por lote).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "application/x-ndjson"
+
+_NEXT_BATCH = """
+SELECT o.id, json_build_object(
+  'id', o.id,
+  'entity', o.entity,
+  'entity_id', o.entity_id,
+  'account_id', o.account_id,
+  'project_id', o.project_id,
+  'op', o.op,
+  'version', o.version,
+  'created_at', o.created_at,
+  'data', o.data
+)::text AS event
+FROM outbox o
+ORDER BY o.id
+LIMIT $1
+FOR UPDATE SKIP LOCKED
+"""
+
+
+class Sink(Protocol):
+    concurrent: bool
+
+    async def send(self, events: Sequence[str]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class FileSink:
+    """Acrescenta os eventos, um por linha, a um arquivo (ou à saída padrão com `-`)."""
+
+    concurrent = False
+
+    def __init__(self, path: str, fsync: bool = True) -> None:
+        self.path = path
+        self.fsync = fsync and path != "-"
+        self._file = sys.stdout if path == "-" else open(path, "a", encoding="utf-8")
+
+    def _write(self, payload: str) -> None:
+        self._file.write(payload)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    async def send(self, events: Sequence[str]) -> None:
+        # O commit que apaga o lote só acontece depois do fsync
+        await asyncio.to_thread(self._write, "".join(f"{event}\n" for event in events))
+
+    async def close(self) -> None:
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class WebhookSink:
+    """POST de cada lote como NDJSON; qualquer resposta fora de 2xx faz o lote ser reenviado."""
+
+    concurrent = True
+
+    def __init__(self, url: str, timeout: float = 10.0, headers: Optional[Dict[str, str]] = None) -> None:
+        import httpx  # só o publicador com webhook precisa do cliente HTTP
+
+        self.url = url
+        self._client = httpx.AsyncClient(timeout=timeout, headers={"content-type": NDJSON, **(headers or {})})
+
+    async def send(self, events: Sequence[str]) -> None:
+        response = await self._client.post(self.url, content="\n".join(events) + "\n")
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def sink_from_url(url: str, **options: Any) -> Sink:
+    if url.startswith(("http://", "https://")):
+        return WebhookSink(url, **options)
+    if url == "-":
+        return FileSink("-")
+    if url.startswith("file:"):
+        return FileSink(url[len("file:"):], **options)
+    raise ValueError(f"Sink desconhecido: {url!r} (use file:<caminho>, - ou http(s)://...)")
+
+
+@dataclass
+class PublishStats:
+    delivered: int = 0
+    batches: int = 0
+    failures: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.delivered / elapsed if elapsed > 0 else 0.0
+
+
+class OutboxPublisher:
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        sink: Sink,
+        *,
+        batch_size: int = 500,
+        workers: int = 1,
+        poll_interval: float = 0.2,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.connect = connect
+        self.sink = sink
+        self.batch_size = batch_size
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.stats = PublishStats()
+        self._stopping = asyncio.Event()
+        self._sink_lock = None if sink.concurrent else asyncio.Lock()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def publish_batch(self, conn: Any) -> int:
+        """Entrega um lote; devolve quantos eventos saíram da outbox (0 se estava vazia)."""
+        async with conn.transaction():
+            rows = await conn.fetch(_NEXT_BATCH, self.batch_size)
+            if not rows:
+                return 0
+            events: List[str] = [row["event"] for row in rows]
+            if self._sink_lock is not None:
+                async with self._sink_lock:
+                    await self.sink.send(events)
+            else:
+                await self.sink.send(events)
+            await conn.execute("DELETE FROM outbox WHERE id = ANY($1::bigint[])", [row["id"] for row in rows])
+        self.stats.delivered += len(rows)
+        self.stats.batches += 1
+        return len(rows)
+
+    async def drain(self, conn: Any) -> int:
+        """Entrega tudo o que já está na outbox e retorna (sem esperar eventos novos)."""
+        total = 0
+        while True:
+            published = await self.publish_batch(conn)
+            total += published
+            if published < self.batch_size:
+                return total
+
+    async def _worker(self, number: int) -> None:
+        backoff = self.poll_interval
+        conn = None
+        while not self._stopping.is_set():
+            try:
+                if conn is None or conn.is_closed():
+                    conn = await self.connect()
+                published = await self.publish_batch(conn)
+                backoff = self.poll_interval
+                if published < self.batch_size:
+                    # Outbox vazia (ou quase): espera um pouco; lote cheio volta na hora
+                    await self._sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - o lote volta para a fila; tenta de novo
+                self.stats.failures += 1
+                logger.warning("Publicador %d: lote não entregue (%s); nova tentativa em %.1fs", number, exc, backoff)
+                # A transação do lote já foi desfeita; reabre a conexão caso ela tenha caído no meio
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+                conn = None
+                await self._sleep(backoff)
+                backoff = min(backoff * 2 if backoff else 1.0, self.max_backoff)
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> PublishStats:
+        """Roda os workers até `stop()`; termina o lote em andamento antes de sair."""
+        try:
+            await asyncio.gather(*(self._worker(number) for number in range(self.workers)))
+        finally:
+            await self.sink.close()
+        return self.stats
@@ -0,0 +1,96 @@
+"""Hash de senhas com scrypt, reconhecendo os hashes SHA-256 antigos.
+
+Formato: `scrypt$<n>$<r>$<p>$<sal>$<hash>` (sal e hash em base64 sem padding). Os parâmetros
+vêm de `PASSWORD_SCRYPT_N/R/P`; o padrão (n=2^15, r=8, p=1) usa 32 MiB e algumas dezenas de
+ms por hash, por isso as funções daqui são síncronas e rodam no executor de CPU
+(`app.cpu.run_cpu`), nunca no event loop.
+
+Hashes antigos (SHA-256 hexadecimal, sem sal) continuam válidos em `verify_password`;
+`needs_rehash` diz quando regravar a senha, o que `admin_service.authenticate_user` faz no
+primeiro login bem-sucedido. O mesmo vale para hashes scrypt com parâmetros mais fracos que os atuais.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import re
+import secrets
+from typing import Optional, Tuple
+
+from .config import get_settings
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+_LEGACY_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(value: str) -> bytes:
+    return base64.b64decode(value + "=" * (-len(value) % 4))
+
+
+def _params() -> Tuple[int, int, int]:
+    settings = get_settings()
+    return settings.password_scrypt_n, settings.password_scrypt_r, settings.password_scrypt_p
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # maxmem padrão do OpenSSL (32 MiB) não comporta n=2^15, r=8; o custo real é 128·n·r
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r, dklen=KEY_BYTES)
+
+
+def hash_password(password: str) -> str:
+    n, r, p = _params()
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def _parse(stored: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    parts = stored.split("$")
+    if len(parts) != 6 or parts[0] != SCHEME:
+        return None
+    try:
+        return int(parts[1]), int(parts[2]), int(parts[3]), _unb64(parts[4]), _unb64(parts[5])
+    except ValueError:
+        return None
+
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    if not stored:
+        return False
+    if _LEGACY_SHA256.fullmatch(stored):
+        return hmac.compare_digest(hashlib.sha256(password.encode("utf-8")).hexdigest(), stored)
+    parsed = _parse(stored)
+    if parsed is None:
+        return False
+    n, r, p, salt, expected = parsed
+    return hmac.compare_digest(_scrypt(password, salt, n, r, p), expected)
+
+
+def needs_rehash(stored: Optional[str]) -> bool:
+    """Hash antigo (SHA-256) ou scrypt com parâmetros abaixo dos configurados."""
+    parsed = _parse(stored or "")
+    if parsed is None:
+        return True
+    n, r, p = _params()
+    return parsed[0] < n or parsed[1] < r or parsed[2] < p
+
+
+def verify_and_rehash(password: str, stored: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """(senha confere?, novo hash se o atual deve ser regravado). Uma única ida ao executor."""
+    if not verify_password(password, stored):
+        return False, None
+    return True, hash_password(password) if needs_rehash(stored) else None
+
+
+def burn(password: str) -> bool:
+    """Custo de um hash para e-mails inexistentes: o tempo de resposta não revela quais existem."""
+    n, r, p = _params()
+    _scrypt(password, b"\0" * SALT_BYTES, n, r, p)
+    return False
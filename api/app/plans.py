@@ -0,0 +1,94 @@
+"""Cache, por worker, das features de plano consultadas a cada requisição.
+
+Limites por plano (`features.rate_limit`, `features.db_share`, ...) não podem custar uma query
+por requisição: `PlanFeatureCache` carrega conta → valor das chaves registradas a cada
+`PLAN_FEATURES_REFRESH_SECONDS`, em segundo plano pelo lifespan, e entrega o mapa a quem se
+inscreveu (`subscribe`). Quem precisa de mais dados na mesma cadência (o uso das contas, em
+`app.quotas`) registra um `after_refresh`, que roda na mesma conexão logo depois dos ouvintes.
+Uma falha na recarga mantém os valores anteriores.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+PlanFeatures = Dict[str, Any]
+Listener = Callable[[Dict[str, Any]], None]
+Hook = Callable[[AsyncConnection], Awaitable[None]]
+
+_ACCOUNT_FEATURES = text(
+    """
+    SELECT a.id::text AS account_id, p.features::jsonb AS features
+    FROM account a JOIN plan p ON p.id = a.plan_id
+    WHERE p.features::jsonb ?| CAST(:keys AS text[])
+    """
+)
+
+
+class PlanFeatureCache:
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._listeners: List[Tuple[str, Listener]] = []
+        self._hooks: List[Hook] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.refresh_seconds > 0
+
+    def subscribe(self, key: str, listener: Listener) -> None:
+        """`listener` recebe {conta: features[key]} das contas cujo plano define `key`."""
+        self._listeners.append((key, listener))
+
+    def after_refresh(self, hook: Hook) -> None:
+        """`hook(conn)` roda depois dos ouvintes, na conexão da recarga."""
+        self._hooks.append(hook)
+
+    async def refresh(self, engine: AsyncEngine) -> None:
+        if not self._listeners:
+            return
+        keys = sorted({key for key, _ in self._listeners})
+        async with engine.connect() as conn:
+            rows = (await conn.execute(_ACCOUNT_FEATURES, {"keys": keys})).all()
+            by_key: Dict[str, Dict[str, Any]] = {key: {} for key in keys}
+            for account_id, features in rows:
+                if isinstance(features, str):
+                    features = json.loads(features)
+                for key in keys:
+                    if key in features:
+                        by_key[key][account_id] = features[key]
+            for key, listener in self._listeners:
+                listener(by_key[key])
+            for hook in self._hooks:
+                await hook(conn)
+
+    def start(self, engine: AsyncEngine) -> None:
+        if self.enabled and self._listeners and self._task is None:
+            self._task = asyncio.create_task(self._loop(engine))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                await self.refresh(engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha ao recarregar as features de plano; mantendo as anteriores")
+            await asyncio.sleep(self.refresh_seconds)
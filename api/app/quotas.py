@@ -0,0 +1,162 @@
+"""Quotas de plano checadas sem query extra nas escritas.
+
+O uso de cada conta é mantido por triggers nas mesmas transações das escritas
+(`account_usage` e `account_usage_monthly`, ver migração 20250331). Consultá-lo a cada
+`create_task` custaria uma ida ao banco por criação; em vez disso, `QuotaTracker` guarda em
+memória, por worker:
+
+- os limites do plano (`features.quotas`, ex.: `{"tasks": 5000, "meeting_minutes": 600}`),
+  recebidos do `PlanFeatureCache`;
+- o uso das contas com limite, relido junto com as features a cada
+  `PLAN_FEATURES_REFRESH_SECONDS` e somado localmente a cada criação confirmada.
+
+`check` é só aritmética em memória. A checagem é branda: workers diferentes só enxergam as
+criações uns dos outros na próxima recarga, então uma conta pode passar do limite por no
+máximo o que criar, em paralelo, nesse intervalo. Contas sem `features.quotas` (ou com
+`PLAN_FEATURES_REFRESH_SECONDS=0`) não têm limite.
+
+Chaves: `projects`, `users`, `tasks` (estoque, tarefas arquivadas incluídas) e
+`meeting_minutes`, `chunk_tokens` (consumo do mês corrente).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Union
+from uuid import UUID
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+STOCK_KEYS = ("projects", "users", "tasks")
+MONTHLY_KEYS = ("meeting_minutes", "chunk_tokens")
+QUOTA_KEYS = STOCK_KEYS + MONTHLY_KEYS
+
+_ACCOUNT_USAGE = text(
+    """
+    SELECT a.id::text AS account_id,
+           coalesce(u.projects, 0) AS projects,
+           coalesce(u.users, 0) AS users,
+           coalesce(u.tasks, 0) AS tasks,
+           coalesce(m.meeting_minutes, 0) AS meeting_minutes,
+           coalesce(m.chunk_tokens, 0) AS chunk_tokens
+    FROM account a
+    LEFT JOIN account_usage u ON u.account_id = a.id
+    LEFT JOIN account_usage_monthly m ON m.account_id = a.id AND m.month = :month
+    WHERE a.id = ANY(CAST(:accounts AS uuid[]))
+    """
+)
+
+
+def current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def estimate_tokens(content: Optional[str]) -> int:
+    """Tokens de um trecho sem `token_count`: ceil(caracteres / 4), como os triggers de uso."""
+    return math.ceil(len(content) / 4) if content else 0
+
+
+def parse_quotas(value: Any, where: str = "quotas") -> Dict[str, int]:
+    """Valida `{chave: inteiro >= 0}` com chaves de `QUOTA_KEYS`; ValueError se inválido."""
+    if not isinstance(value, Mapping):
+        raise ValueError(f"{where} deve ser um objeto {{chave: limite}}")
+    quotas: Dict[str, int] = {}
+    for key, limit in value.items():
+        if key not in QUOTA_KEYS:
+            raise ValueError(f"{where}: chave desconhecida {key} (use {', '.join(QUOTA_KEYS)})")
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 0:
+            raise ValueError(f"{where}.{key} deve ser um inteiro >= 0")
+        quotas[key] = limit
+    return quotas
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, key: str, limit: int, used: int) -> None:
+        super().__init__(f"Limite do plano atingido para {key}: {used} de {limit}")
+        self.key = key
+        self.limit = limit
+        self.used = used
+
+
+class QuotaTracker:
+    def __init__(self) -> None:
+        self.limits: Dict[str, Dict[str, int]] = {}
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self.month = current_month()
+
+    def load_limits(self, values: Dict[str, Any]) -> None:
+        """Limites por conta a partir de `features.quotas` (ver `app.plans.PlanFeatureCache`)."""
+        limits: Dict[str, Dict[str, int]] = {}
+        for account_id, value in values.items():
+            try:
+                limits[account_id] = parse_quotas(value)
+            except ValueError as exc:
+                logger.warning("quotas inválidas no plano da conta %s: %s", account_id, exc)
+        self.limits = limits
+
+    async def load_usage(self, conn: AsyncConnection) -> None:
+        """Relê o uso das contas com limite; roda depois de `load_limits` em cada recarga."""
+        month = current_month()
+        if not self.limits:
+            self.usage, self.month = {}, month
+            return
+        rows = (
+            await conn.execute(_ACCOUNT_USAGE, {"month": month, "accounts": sorted(self.limits)})
+        ).mappings().all()
+        self.usage = {row["account_id"]: {key: int(row[key]) for key in QUOTA_KEYS} for row in rows}
+        self.month = month
+
+    def _roll_month(self) -> None:
+        month = current_month()
+        if month != self.month:
+            # Virou o mês antes da próxima recarga: o consumo recomeça do zero
+            for usage in self.usage.values():
+                for key in MONTHLY_KEYS:
+                    usage[key] = 0
+            self.month = month
+
+    def used(self, account_id: Union[UUID, str], key: str) -> int:
+        self._roll_month()
+        return self.usage.get(str(account_id), {}).get(key, 0)
+
+    def check(self, account_id: Union[UUID, str], key: str, amount: int = 1) -> None:
+        """QuotaExceeded se `amount` a mais passaria do limite do plano; sem limite, não faz nada."""
+        limit = self.limits.get(str(account_id), {}).get(key)
+        if limit is None or amount <= 0:
+            return
+        used = self.used(account_id, key)
+        if used + amount > limit:
+            raise QuotaExceeded(key, limit, used)
+
+    def record(self, account_id: Union[UUID, str], key: str, amount: int = 1) -> None:
+        """Soma uma criação já confirmada ao uso local, até a próxima recarga."""
+        account = str(account_id)
+        if account not in self.limits or not amount:
+            return
+        self._roll_month()
+        usage = self.usage.setdefault(account, dict.fromkeys(QUOTA_KEYS, 0))
+        usage[key] = usage.get(key, 0) + amount
+
+
+_tracker: Optional[QuotaTracker] = None
+
+
+def get_quota_tracker() -> QuotaTracker:
+    global _tracker
+    if _tracker is None:
+        _tracker = QuotaTracker()
+    return _tracker
+
+
+async def quota_exceeded_handler(request: Request, exc: QuotaExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_403_FORBIDDEN,
+        content={"detail": str(exc), "quota": exc.key, "limit": exc.limit, "used": exc.used},
+    )
@@ -0,0 +1,361 @@
+"""Limite de requisições por conta e por rota, e teto de requisições em andamento.
+
+`RateLimitMiddleware` decide antes do roteamento, portanto antes de qualquer sessão sair do
+pool:
+
+1. Requisições em andamento no worker acima de `max_in_flight` (padrão: 2× o limite do
+   pool) recebem `503` com `Retry-After: 1`: melhor recusar na hora do que enfileirar até o
+   `DB_POOL_TIMEOUT`.
+2. Cada conta tem um token bucket (`per_second` tokens/s, até `burst` acumulados) e, para as
+   rotas configuradas, um bucket por conta e rota. Sem token, `429` com `Retry-After` em
+   segundos até o próximo.
+
+A conta vem de `?account_id=`, do header `X-Account-Id` ou de `/accounts/{id}/` no caminho;
+sem nenhum deles, o bucket é o do IP do cliente. Os limites padrão vêm de
+`RATE_LIMIT_PER_SECOND`/`RATE_LIMIT_BURST`/`RATE_LIMIT_ROUTES`, e cada plano pode
+sobrescrevê-los em `features.rate_limit`:
+
+    {"rate_limit": {"per_second": 20, "burst": 40,
+                    "routes": {"GET /api/tasks": {"per_second": 5, "burst": 10}}}}
+
+(`per_second: 0` desliga aquele bucket.) O mapa conta → plano fica em memória e é recarregado
+em segundo plano por `app.plans.PlanFeatureCache`, fora do caminho da requisição.
+
+Os buckets ficam num backend plugável (`RATE_LIMIT_BACKEND`): `shared` (padrão) é uma tabela
+num arquivo mapeado em memória (`/dev/shm`), com `flock`, compartilhada pelos workers do
+mesmo host; `memory` é por processo; `pacote.modulo:Classe` carrega outro backend com
+`take(key, per_second, burst, now) -> float`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Pattern, Protocol, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.routing import compile_path
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_HEADER = b"x-account-id"
+_ACCOUNT_IN_PATH = re.compile(r"/accounts/([0-9a-fA-F-]{36})(?:/|$)")
+
+
+@dataclass(frozen=True)
+class Limit:
+    per_second: float
+    burst: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_second > 0
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    account: Limit
+    routes: Dict[str, Limit] = field(default_factory=dict)
+
+    def merged(self, override: Optional["RateLimits"]) -> "RateLimits":
+        if override is None:
+            return self
+        return RateLimits(account=override.account, routes={**self.routes, **override.routes})
+
+
+def _parse_limit(value: Any, where: str, default: Optional[Limit] = None) -> Limit:
+    if not isinstance(value, Mapping):
+        raise ValueError(f"{where} deve ser um objeto com per_second e burst")
+    per_second = value.get("per_second", default.per_second if default else None)
+    if isinstance(per_second, bool) or not isinstance(per_second, (int, float)) or per_second < 0:
+        raise ValueError(f"{where}.per_second deve ser um número >= 0")
+    burst = value.get("burst", default.burst if default and default.per_second else max(per_second, 1))
+    if isinstance(burst, bool) or not isinstance(burst, (int, float)) or burst < 1:
+        raise ValueError(f"{where}.burst deve ser um número >= 1")
+    return Limit(float(per_second), float(burst))
+
+
+def parse_rate_limits(value: Any, where: str = "rate_limit", default: Optional[Limit] = None) -> RateLimits:
+    """Valida `{"per_second", "burst", "routes": {"MÉTODO /rota": {...}}}` (ValueError se inválido)."""
+    if not isinstance(value, Mapping):
+        raise ValueError(f"{where} deve ser um objeto")
+    account = _parse_limit(value, where, default)
+    routes = value.get("routes") or {}
+    if not isinstance(routes, Mapping):
+        raise ValueError(f"{where}.routes deve ser um objeto")
+    parsed: Dict[str, Limit] = {}
+    for route, limit in routes.items():
+        method, _, path = str(route).partition(" ")
+        if not method.isupper() or not path.startswith("/"):
+            raise ValueError(f"{where}.routes: use chaves como 'GET /api/tasks' (recebido {route!r})")
+        parsed[route] = _parse_limit(limit, f"{where}.routes[{route!r}]")
+    return RateLimits(account=account, routes=parsed)
+
+
+@lru_cache(maxsize=256)
+def _route_pattern(route: str) -> Tuple[str, Pattern[str]]:
+    method, _, path = route.partition(" ")
+    return method, compile_path(path)[0]
+
+
+def match_route(routes: Mapping[str, Limit], method: str, path: str) -> Optional[str]:
+    for route in routes:
+        route_method, pattern = _route_pattern(route)
+        if route_method == method and pattern.match(path):
+            return route
+    return None
+
+
+def account_key(scope: Mapping[str, Any]) -> str:
+    for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1")):
+        if name == "account_id" and value:
+            return value.lower()
+    for name, value in scope.get("headers", ()):
+        if name == ACCOUNT_HEADER and value:
+            return value.decode("latin-1").lower()
+    found = _ACCOUNT_IN_PATH.search(scope.get("path", ""))
+    if found:
+        return found.group(1).lower()
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+# ===== Backends =====
+
+
+class RateLimitBackend(Protocol):
+    def take(self, key: str, per_second: float, burst: float, now: float) -> float:
+        """Consome um token; devolve 0 se havia, ou os segundos até o próximo."""
+        ...
+
+
+def _refill(tokens: float, updated: float, per_second: float, burst: float, now: float) -> Tuple[float, float]:
+    """Novo saldo do bucket e a espera (0 = token consumido)."""
+    if updated <= 0 or now < updated:
+        tokens = burst
+    else:
+        tokens = min(burst, tokens + (now - updated) * per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / per_second
+
+
+class MemoryBackend:
+    """Buckets no processo; os menos usados saem quando passam de `max_keys`."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, per_second: float, burst: float, now: float) -> float:
+        tokens, updated = self._buckets.pop(key, (0.0, 0.0))
+        tokens, wait = _refill(tokens, updated, per_second, burst, now)
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class SharedMemoryBackend:
+    """Tabela de buckets num arquivo mapeado em memória, compartilhada pelos workers do host.
+
+    Cada slot guarda (hash da chave, tokens, último acesso por `time.monotonic()`, que no
+    Linux é o mesmo relógio para todos os processos). Endereçamento aberto com `probes`
+    tentativas; com todas ocupadas, o slot menos recente é reaproveitado (o bucket despejado
+    volta cheio, o que só afrouxa o limite). Um `flock` no arquivo protege cada atualização.
+    """
+
+    _SLOT = struct.Struct("<Qdd")
+
+    def __init__(self, path: Optional[str] = None, slots: int = 65_536, probes: int = 8) -> None:
+        import fcntl  # só POSIX; em outros sistemas use o backend `memory`
+
+        self._fcntl = fcntl
+        self.path = path or os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "pulsehub-ratelimit")
+        self.slots = slots
+        self.probes = probes
+        size = slots * self._SLOT.size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def _hash(self, key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") | 1
+
+    def take(self, key: str, per_second: float, burst: float, now: float) -> float:
+        digest = self._hash(key)
+        start = digest % self.slots
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            chosen, tokens, updated = None, 0.0, 0.0
+            oldest, oldest_updated = start, math.inf
+            for probe in range(self.probes):
+                slot = (start + probe) % self.slots
+                stored, stored_tokens, stored_updated = self._SLOT.unpack_from(self._map, slot * self._SLOT.size)
+                if stored == digest:
+                    chosen, tokens, updated = slot, stored_tokens, stored_updated
+                    break
+                if stored == 0:
+                    chosen = slot
+                    break
+                if stored_updated < oldest_updated:
+                    oldest, oldest_updated = slot, stored_updated
+            if chosen is None:
+                chosen = oldest
+            tokens, wait = _refill(tokens, updated, per_second, burst, now)
+            self._SLOT.pack_into(self._map, chosen * self._SLOT.size, digest, tokens, now)
+            return wait
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+def load_backend(name: str, path: Optional[str] = None) -> RateLimitBackend:
+    if name == "memory":
+        return MemoryBackend()
+    if name == "shared":
+        try:
+            return SharedMemoryBackend(path)
+        except (ImportError, OSError) as exc:
+            logger.warning("Backend de rate limit compartilhado indisponível (%s); usando memória do processo", exc)
+            return MemoryBackend()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"RATE_LIMIT_BACKEND inválido: {name!r} (use memory, shared ou pacote.modulo:Classe)")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# ===== Limitador =====
+
+
+@dataclass
+class Rejection:
+    status: int
+    retry_after: int
+    detail: str
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        defaults: RateLimits,
+        backend: RateLimitBackend,
+        max_in_flight: int,
+        exempt_prefixes: Tuple[str, ...] = (),
+    ) -> None:
+        self.defaults = defaults
+        self.backend = backend
+        self.max_in_flight = max_in_flight
+        self.exempt_prefixes = exempt_prefixes
+        self.in_flight = 0
+        self.rejected = {429: 0, 503: 0}
+        self._plans: Dict[str, RateLimits] = {}
+
+    def is_exempt(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(f"{prefix}/") for prefix in self.exempt_prefixes)
+
+    def limits_for(self, account: str) -> RateLimits:
+        return self.defaults.merged(self._plans.get(account))
+
+    def check(self, scope: Mapping[str, Any]) -> Optional[Rejection]:
+        """Rejeição para a requisição, ou None se ela pode seguir (e então conta como em andamento)."""
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            self.rejected[503] += 1
+            return Rejection(503, 1, "Servidor sobrecarregado, tente novamente em instantes")
+
+        account = account_key(scope)
+        limits = self.limits_for(account)
+        now = time.monotonic()
+        route = match_route(limits.routes, scope["method"], scope["path"])
+        checks = [(f"{account}|{route}", limits.routes[route])] if route else []
+        checks.append((account, limits.account))
+        for key, limit in checks:
+            if not limit.enabled:
+                continue
+            wait = self.backend.take(key, limit.per_second, limit.burst, now)
+            if wait > 0:
+                self.rejected[429] += 1
+                return Rejection(429, max(1, math.ceil(wait)), "Limite de requisições excedido para a conta")
+        return None
+
+    def load_plans(self, values: Dict[str, Any]) -> None:
+        """Limites por conta a partir de `features.rate_limit` (ver `app.plans.PlanFeatureCache`)."""
+        plans: Dict[str, RateLimits] = {}
+        for account_id, value in values.items():
+            try:
+                plans[account_id] = parse_rate_limits(value, default=self.defaults.account)
+            except ValueError as exc:
+                logger.warning("rate_limit inválido no plano da conta %s: %s", account_id, exc)
+        self._plans = plans
+
+
+def rate_limiter_from_settings(settings) -> RateLimiter:
+    defaults = parse_rate_limits(
+        {
+            "per_second": settings.rate_limit_per_second,
+            "burst": settings.rate_limit_burst,
+            "routes": settings.rate_limit_routes,
+        },
+        where="RATE_LIMIT",
+    )
+    max_in_flight = settings.rate_limit_max_in_flight
+    if max_in_flight == 0:
+        max_in_flight = 2 * (settings.db_pool_size + settings.db_max_overflow)
+    prefix = settings.api_prefix
+    return RateLimiter(
+        defaults,
+        load_backend(settings.rate_limit_backend, settings.rate_limit_shared_path),
+        max_in_flight=max(max_in_flight, 0),
+        # Streams não usam o pool; o batch é contado pelas sub-requisições
+        exempt_prefixes=("/health", f"{prefix}/stream", f"{prefix}/batch"),
+    )
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: RateLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or self.limiter.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        rejection = self.limiter.check(scope)
+        if rejection is not None:
+            body = json.dumps({"detail": rejection.detail}, ensure_ascii=False).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": rejection.status,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", str(rejection.retry_after).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        self.limiter.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.in_flight -= 1
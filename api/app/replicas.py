@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from http.cookies import SimpleCookie
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_HEADER = "X-Last-Write"
+LAST_WRITE_COOKIE = "pulsehub_last_write"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Fora de recovery (ex.: testes com duas instâncias independentes) ou com o WAL recebido
+# totalmente aplicado, a réplica não tem atraso.
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+      WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+      ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.lag_seconds = 0.0
+        self.scheduler = None  # FairShareScheduler do pool da réplica (ver app.database)
+
+    @property
+    def name(self) -> str:
+        url = self.engine.url
+        return f"{url.host}:{url.port}/{url.database}"
+
+
+class ReplicaRouter:
+    """Round-robin entre réplicas saudáveis, com health check periódico e limite de lag."""
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        health_interval: float = 5.0,
+        health_timeout: float = 2.0,
+        max_lag_seconds: float = 10.0,
+    ) -> None:
+        self.replicas: List[Replica] = [Replica(engine) for engine in engines]
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_lag_seconds = max_lag_seconds
+        self._cursor = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._cursor) % len(healthy)]
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.health_timeout):
+                async with replica.engine.connect() as conn:
+                    lag = await conn.scalar(_LAG_QUERY)
+        except Exception as exc:  # noqa: BLE001 - qualquer falha tira a réplica de rotação
+            if replica.healthy:
+                logger.warning("Réplica %s fora de rotação: %s", replica.name, exc)
+            replica.healthy = False
+            return
+        replica.lag_seconds = float(lag or 0)
+        healthy = replica.lag_seconds <= self.max_lag_seconds
+        if healthy != replica.healthy:
+            logger.warning(
+                "Réplica %s %s (lag %.1fs)",
+                replica.name,
+                "de volta à rotação" if healthy else "fora de rotação",
+                replica.lag_seconds,
+            )
+        replica.healthy = healthy
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.health_interval)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._health_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def last_write_from_headers(headers) -> Optional[float]:
+    """Timestamp (epoch em segundos) da última escrita do cliente, via header ou cookie."""
+    raw = headers.get(LAST_WRITE_HEADER.lower())
+    if raw is None and "cookie" in headers:
+        cookie = SimpleCookie()
+        cookie.load(headers["cookie"])
+        if LAST_WRITE_COOKIE in cookie:
+            raw = cookie[LAST_WRITE_COOKIE].value
+    try:
+        return float(raw) / 1000 if raw is not None else None
+    except ValueError:
+        return None
+
+
+def is_pinned_to_primary(headers, window_seconds: float) -> bool:
+    last_write = last_write_from_headers(headers)
+    return last_write is not None and time.time() - last_write < window_seconds
+
+
+class ReadYourWritesMiddleware:
+    """Marca respostas de escrita bem-sucedidas com o instante da escrita (header + cookie).
+
+    O cliente devolve o valor (cookie automaticamente ou header explicitamente) e as
+    leituras dentro da janela configurada são servidas pelo primário.
+    """
+
+    def __init__(self, app, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                stamp = str(int(time.time() * 1000))
+                headers = list(message.get("headers", []))
+                headers.append((LAST_WRITE_HEADER.lower().encode(), stamp.encode()))
+                headers.append(
+                    (
+                        b"set-cookie",
+                        (
+                            f"{LAST_WRITE_COOKIE}={stamp}; Max-Age={int(self.window_seconds) + 1}; "
+                            "Path=/; HttpOnly; SameSite=Lax"
+                        ).encode(),
+                    )
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
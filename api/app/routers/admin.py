@@ -3,27 +3,39 @@ from __future__ import annotations
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..cpu import get_cpu_executor
+from ..database import get_read_session, get_schedulers, get_session, get_slow_query_log
 from ..schemas.admin import (
     AccountCreate,
     AccountOut,
     AccountUpdate,
+    AccountUsageOut,
+    CpuExecutorOut,
+    DbSchedulerOut,
+    DeletionAcceptedOut,
+    DeletionJobOut,
     Message,
     PlanCreate,
     PlanOut,
     PlanUpdate,
+    SlowQueryOut,
     ProjectCreate,
     ProjectOut,
+    ProjectRollupOut,
     ProjectUpdate,
     UserCreate,
+    UserCredentials,
     UserOut,
     UserUpdate,
 )
 from ..services import admin as admin_service
+from ..services import rollup as rollup_service
+from ..services import usage as usage_service
 
 SCHEMA_NOT_READY_MESSAGE = "Schema de administração não inicializado. Execute pulsehub-db-schema.sql no banco antes de usar o módulo."
 
@@ -34,7 +46,7 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/plans", response_model=List[PlanOut])
-async def list_plans(session: AsyncSession = Depends(get_session)):
+async def list_plans(session: AsyncSession = Depends(get_read_session)):
     """Lista todos os planos disponíveis."""
     plans = await admin_service.list_plans(session)
     return plans
@@ -91,14 +103,14 @@ async def delete_plan(plan_id: UUID, session: AsyncSession = Depends(get_session
 
 
 @router.get("/accounts", response_model=List[AccountOut])
-async def list_accounts(session: AsyncSession = Depends(get_session)):
+async def list_accounts(session: AsyncSession = Depends(get_read_session)):
     """Lista todas as contas cadastradas."""
     accounts = await admin_service.list_accounts(session)
     return accounts
 
 
 @router.get("/accounts/{account_id}", response_model=AccountOut)
-async def get_account(account_id: UUID, session: AsyncSession = Depends(get_session)):
+async def get_account(account_id: UUID, session: AsyncSession = Depends(get_read_session)):
     """Retorna os detalhes de uma conta."""
     account = await admin_service.get_account(session, account_id)
     if not account:
@@ -150,11 +162,13 @@ async def update_account(
     return account
 
 
-@router.delete("/accounts/{account_id}", response_model=Message)
+@router.delete("/accounts/{account_id}", response_model=DeletionAcceptedOut, status_code=status.HTTP_202_ACCEPTED)
 async def delete_account(account_id: UUID, session: AsyncSession = Depends(get_session)):
-    """Remove uma conta."""
+    """Tira a conta das leituras na hora e apaga os dados em segundo plano (acompanhe pelo job)."""
     try:
-        await admin_service.delete_account(session, account_id)
+        job = await admin_service.delete_account(session, account_id)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conta não encontrada") from exc
     except SQLAlchemyError as exc:
         if admin_service.is_missing_admin_schema(exc):
             raise HTTPException(
@@ -162,11 +176,30 @@ async def delete_account(account_id: UUID, session: AsyncSession = Depends(get_s
                 detail=SCHEMA_NOT_READY_MESSAGE,
             ) from exc
         raise
-    return Message(detail="Conta removida com sucesso")
+    return DeletionAcceptedOut(
+        detail="Exclusão da conta agendada", job=admin_service.deletion_job_progress(job)
+    )
+
+
+@router.get("/accounts/{account_id}/deletion-jobs", response_model=List[DeletionJobOut])
+async def list_deletion_jobs(account_id: UUID, session: AsyncSession = Depends(get_session)):
+    """Jobs de exclusão da conta e dos projetos dela, mais recentes primeiro (também depois de a conta sumir)."""
+    jobs = await admin_service.list_deletion_jobs(session, account_id)
+    return [admin_service.deletion_job_progress(job) for job in jobs]
+
+
+@router.get("/deletion-jobs/{job_id}", response_model=DeletionJobOut)
+async def get_deletion_job(job_id: UUID, session: AsyncSession = Depends(get_session)):
+    """Status e avanço de um job de exclusão: passo atual e linhas apagadas por tabela."""
+    try:
+        job = await admin_service.get_deletion_job(session, job_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return admin_service.deletion_job_progress(job)
 
 
 @router.get("/accounts/{account_id}/projects", response_model=List[ProjectOut])
-async def list_projects(account_id: UUID, session: AsyncSession = Depends(get_session)):
+async def list_projects(account_id: UUID, session: AsyncSession = Depends(get_read_session)):
     """Lista projetos associados a uma conta."""
     try:
         projects = await admin_service.list_projects(session, account_id)
@@ -180,6 +213,29 @@ async def list_projects(account_id: UUID, session: AsyncSession = Depends(get_se
     return projects
 
 
+@router.get("/accounts/{account_id}/usage", response_model=AccountUsageOut)
+async def get_account_usage(account_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    """Projetos, usuários, tarefas e consumo do mês da conta, com os limites do plano."""
+    try:
+        return await usage_service.get_account_usage(session, account_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+@router.get("/accounts/{account_id}/projects/rollup", response_model=List[ProjectRollupOut])
+async def list_project_rollups(account_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    """Saúde, progresso e contagens de tarefas por projeto, lidos do rollup mantido por triggers."""
+    return await rollup_service.list_project_rollups(session, account_id)
+
+
+@router.get("/accounts/{account_id}/projects/{project_id}/rollup", response_model=ProjectRollupOut)
+async def get_project_rollup(account_id: UUID, project_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    try:
+        return await rollup_service.get_project_rollup(session, account_id, project_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
 @router.post(
     "/accounts/{account_id}/projects",
     response_model=ProjectOut,
@@ -230,11 +286,12 @@ async def update_project(
 
 @router.delete(
     "/accounts/{account_id}/projects/{project_id}",
-    response_model=Message,
+    response_model=DeletionAcceptedOut,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def delete_project(account_id: UUID, project_id: UUID, session: AsyncSession = Depends(get_session)):
     try:
-        await admin_service.delete_project(session, account_id, project_id)
+        job = await admin_service.delete_project(session, account_id, project_id)
     except NoResultFound as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado") from exc
     except SQLAlchemyError as exc:
@@ -244,11 +301,13 @@ async def delete_project(account_id: UUID, project_id: UUID, session: AsyncSessi
                 detail=SCHEMA_NOT_READY_MESSAGE,
             ) from exc
         raise
-    return Message(detail="Projeto removido com sucesso")
+    return DeletionAcceptedOut(
+        detail="Exclusão do projeto agendada", job=admin_service.deletion_job_progress(job)
+    )
 
 
 @router.get("/accounts/{account_id}/users", response_model=List[UserOut])
-async def list_users(account_id: UUID, session: AsyncSession = Depends(get_session)):
+async def list_users(account_id: UUID, session: AsyncSession = Depends(get_read_session)):
     """Lista usuários pertencentes a uma conta."""
     try:
         users = await admin_service.list_users(session, account_id)
@@ -282,6 +341,25 @@ async def create_user(account_id: UUID, payload: UserCreate, session: AsyncSessi
     return user
 
 
+@router.post("/accounts/{account_id}/users/authenticate", response_model=UserOut)
+async def authenticate_user(
+    account_id: UUID, payload: UserCredentials, session: AsyncSession = Depends(get_session)
+):
+    """Confere e-mail e senha do usuário da conta (e atualiza hashes antigos para o scrypt atual)."""
+    try:
+        user = await admin_service.authenticate_user(session, account_id, payload.email, payload.password)
+    except SQLAlchemyError as exc:
+        if admin_service.is_missing_admin_schema(exc):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=SCHEMA_NOT_READY_MESSAGE,
+            ) from exc
+        raise
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="E-mail ou senha inválidos")
+    return user
+
+
 @router.put("/accounts/{account_id}/users/{user_id}", response_model=UserOut)
 async def update_user(
     account_id: UUID,
@@ -327,3 +405,41 @@ async def delete_user(account_id: UUID, user_id: UUID, session: AsyncSession = D
             ) from exc
         raise
     return Message(detail="Usuário removido com sucesso")
+
+
+# ===== Diagnostics =====
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryOut])
+async def list_slow_queries(limit: int = Query(100, ge=1, le=1000)):
+    """Lista as queries mais recentes acima do limiar configurado (mais novas primeiro)."""
+    return get_slow_query_log().entries(limit)
+
+
+@router.get("/slow-queries/export")
+async def export_slow_queries():
+    """Exporta o ring buffer de queries lentas em JSONL."""
+    return StreamingResponse(
+        get_slow_query_log().iter_jsonl(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="slow-queries.jsonl"'},
+    )
+
+
+@router.delete("/slow-queries", response_model=Message)
+async def clear_slow_queries():
+    """Limpa o ring buffer de queries lentas."""
+    get_slow_query_log().clear()
+    return Message(detail="Registro de queries lentas limpo")
+
+
+@router.get("/db-scheduler", response_model=List[DbSchedulerOut])
+async def db_scheduler_stats(limit: int = Query(50, ge=1, le=1000)):
+    """Ocupação da fila justa de cada pool e as contas que mais esperaram por conexão (neste worker)."""
+    return [scheduler.stats(limit) for scheduler in get_schedulers()]
+
+
+@router.get("/cpu-executor", response_model=CpuExecutorOut)
+async def cpu_executor_stats():
+    """Fila, execução e rejeições do executor de CPU (neste worker)."""
+    return get_cpu_executor().stats()
@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.schemas.area import AreaCreate, AreaResponse, AreaUpdate
 from app.services import area as area_service
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/areas", tags=["areas"])
 @router.get("", response_model=List[AreaResponse])
 async def list_areas(
     account_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """List all areas for a given account"""
     areas = await area_service.list_areas(session, account_id)
@@ -25,7 +25,7 @@ async def list_areas(
 async def get_area(
     area_id: UUID,
     account_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """Get a specific area by ID"""
     area = await area_service.get_area(session, area_id, account_id)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from ..batch import run_batch, validate_path
+from ..config import get_settings
+from ..schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(payload: BatchRequest, request: Request):
+    """Executa vários GETs da API em uma única requisição.
+
+    As sub-requisições rodam em paralelo (até `BATCH_CONCURRENCY` por batch), cada uma com
+    sua própria conexão do pool, e os resultados voltam em `responses[id]` com `status` e
+    `body`. Falhas de uma sub-requisição não afetam as demais.
+    """
+    settings = get_settings()
+    if len(payload.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"O batch aceita no máximo {settings.batch_max_requests} sub-requisições",
+        )
+    excluded = [f"{settings.api_prefix}{prefix}" for prefix in (router.prefix, "/stream")]
+    try:
+        items = [(item.id, *validate_path(item.path, settings.api_prefix, excluded)) for item in payload.requests]
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    responses = await run_batch(request.app, request.scope, items, settings.batch_concurrency)
+    return {"responses": responses}
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..config import get_settings
+from ..database import get_read_sessionmaker
+from ..schemas.dashboard import DashboardOut
+from ..services import dashboard as dashboard_service
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardOut)
+async def get_dashboard(
+    account_id: UUID = Query(..., description="Identificador da conta"),
+    panels: Optional[str] = Query(None, description="Painéis separados por vírgula (padrão: todos)"),
+    sessionmaker: async_sessionmaker = Depends(get_read_sessionmaker),
+):
+    """Painéis do dashboard em uma única ida: cada painel roda em paralelo na sua própria conexão.
+
+    Um painel que exceder `DASHBOARD_PANEL_TIMEOUT_MS` ou falhar volta como `null`, com o motivo em
+    `errors`; os demais são devolvidos normalmente.
+    """
+    selected = [name.strip() for name in panels.split(",") if name.strip()] if panels else None
+    try:
+        return await dashboard_service.build_dashboard(
+            sessionmaker,
+            account_id,
+            timeout_ms=get_settings().dashboard_panel_timeout_ms,
+            panels=selected,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
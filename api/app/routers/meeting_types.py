@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..database import get_read_session, get_session
 from ..schemas.meeting_type import MeetingTypeCreate, MeetingTypeOut, MeetingTypeUpdate
 from ..services import meeting_type as meeting_type_service
 
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/meeting-types", tags=["meeting_types"])
 async def list_meeting_types(
     account_id: UUID = Query(..., description="Filtra tipos por conta"),
     include_inactive: bool = Query(True),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     meeting_types = await meeting_type_service.list_meeting_types(
         session, account_id=account_id, include_inactive=include_inactive
@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..database import get_read_session, get_session
 from ..schemas.meeting import MeetingCreate, MeetingOut, MeetingUpdate
 from ..services import meeting as meeting_service
 
@@ -48,7 +48,7 @@ async def list_meetings(
     project_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     meetings = await meeting_service.list_meetings(
         session,
@@ -60,7 +60,7 @@ async def list_meetings(
     )
     result: List[MeetingOut] = []
     for mt in meetings:
-        chunk_count = await meeting_service.count_chunks_for_meeting(session, mt.id)
+        chunk_count = await meeting_service.count_chunks_for_meeting(session, mt.id, mt.account_id)
         result.append(MeetingOut.model_validate(serialize_meeting(mt, chunk_count)))
     return result
 
@@ -68,13 +68,13 @@ async def list_meetings(
 @router.get("/{meeting_id}", response_model=MeetingOut)
 async def get_meeting(
     meeting_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     try:
         meeting = await meeting_service.get_meeting(session, meeting_id)
     except LookupError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
-    chunk_count = await meeting_service.count_chunks_for_meeting(session, meeting_id)
+    chunk_count = await meeting_service.count_chunks_for_meeting(session, meeting_id, meeting.account_id)
     return MeetingOut.model_validate(serialize_meeting(meeting, chunk_count))
 
 
@@ -85,7 +85,7 @@ async def create_meeting(payload: MeetingCreate, session: AsyncSession = Depends
         meeting = await meeting_service.create_meeting(session, payload.model_dump())
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    chunk_count = await meeting_service.count_chunks_for_meeting(session, meeting.id)
+    chunk_count = await meeting_service.count_chunks_for_meeting(session, meeting.id, meeting.account_id)
     return MeetingOut.model_validate(serialize_meeting(meeting, chunk_count))
 
 
@@ -104,7 +104,7 @@ async def update_meeting_endpoint(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    chunk_count = await meeting_service.count_chunks_for_meeting(session, meeting.id)
+    chunk_count = await meeting_service.count_chunks_for_meeting(session, meeting.id, meeting.account_id)
     return MeetingOut.model_validate(serialize_meeting(meeting, chunk_count))
 
 
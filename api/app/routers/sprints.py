@@ -6,7 +6,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..coalesce import coalesced
+from ..database import get_read_session, get_session
 from ..schemas.sprint import SprintCreate, SprintOut, SprintUpdate
 from ..schemas.task import TaskSummary
 from ..services import sprint as sprint_service
@@ -16,12 +17,13 @@ router = APIRouter(prefix="/sprints", tags=["sprints"])
 
 @router.get("", response_model=List[SprintOut])
 @router.get("/", response_model=List[SprintOut])
+@coalesced
 async def list_sprints(
     account_id: UUID = Query(..., description="Identificador da conta"),
     project_id: Optional[UUID] = Query(None, description="Projeto ao qual o sprint pertence"),
     without_project: bool = Query(False, description="Retorna somente sprints sem projeto"),
     status: Optional[str] = Query(None, description="Filtra por status"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     sprints = await sprint_service.list_sprints(
         session,
@@ -44,7 +46,7 @@ async def create_sprint(payload: SprintCreate, session: AsyncSession = Depends(g
 
 
 @router.get("/{sprint_id}", response_model=SprintOut)
-async def get_sprint(sprint_id: UUID, session: AsyncSession = Depends(get_session)):
+async def get_sprint(sprint_id: UUID, session: AsyncSession = Depends(get_read_session)):
     try:
         sprint = await sprint_service.get_sprint(session, sprint_id)
     except LookupError as exc:
@@ -78,7 +80,7 @@ async def list_available_tasks(
     account_id: UUID = Query(..., description="Identificador da conta"),
     project_id: Optional[UUID] = Query(None, description="Projeto ao qual as tarefas pertencem"),
     status: Optional[str] = Query(None, description="Filtra por status da tarefa"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     tasks = await sprint_service.list_tasks_for_project(
         session,
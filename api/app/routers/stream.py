@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, FrozenSet, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from ..changes import ENTITIES, RESYNC_EVENT, Subscription
+from ..config import get_settings
+from ..database import get_change_broker
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+_EVENT_FIELDS = ("entity", "id", "project_id", "op", "version")
+
+
+def _parse_entities(value: Optional[str]) -> FrozenSet[str]:
+    if not value:
+        return ENTITIES
+    entities = frozenset(item.strip() for item in value.split(",") if item.strip())
+    invalid = entities - ENTITIES
+    if invalid:
+        raise ValueError(f"Entidades inválidas: {', '.join(sorted(invalid))} (use {', '.join(sorted(ENTITIES))})")
+    return entities
+
+
+def _compact(event: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: event[key] for key in _EVENT_FIELDS if event.get(key) is not None}
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    if event is RESYNC_EVENT:
+        return "event: resync\ndata: {}\n\n"
+    data = json.dumps(_compact(event), separators=(",", ":"))
+    return f"id: {event.get('version', '')}\nevent: change\ndata: {data}\n\n"
+
+
+@router.get("")
+async def stream_changes(
+    account_id: UUID = Query(..., description="Identificador da conta"),
+    entities: Optional[str] = Query(None, description="Entidades separadas por vírgula (task, meeting, sprint)"),
+    project_id: Optional[UUID] = Query(None, description="Filtrar por projeto"),
+):
+    """Server-Sent Events com as mudanças de tarefas, reuniões e sprints da conta.
+
+    Cada evento `change` traz `entity`, `id`, `op` e `version`; um evento `resync` indica
+    que eventos podem ter sido perdidos e o cliente deve recarregar seus dados.
+    """
+    try:
+        parsed_entities = _parse_entities(entities)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    broker = get_change_broker()
+    heartbeat = get_settings().change_stream_heartbeat_seconds
+
+    async def events():
+        subscription = broker.subscribe(str(account_id), parsed_entities, str(project_id) if project_id else None)
+        try:
+            yield f"retry: 3000\nevent: ready\ndata: {json.dumps({'account_id': str(account_id)})}\n\n"
+            while True:
+                event = await subscription.next_event(heartbeat)
+                # Comentário SSE como heartbeat: mantém proxies e balanceadores com a conexão aberta.
+                yield ": ping\n\n" if event is None else _sse(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _receive_filters(websocket: WebSocket, subscription: Subscription) -> None:
+    """Aplica filtros enviados pelo cliente: {"entities": [...], "project_id": "..." | null}."""
+    while True:
+        message = await websocket.receive_json()
+        try:
+            if "entities" in message:
+                subscription.entities = _parse_entities(",".join(message["entities"] or []))
+            if "project_id" in message:
+                subscription.project_id = str(UUID(message["project_id"])) if message["project_id"] else None
+        except (TypeError, ValueError) as exc:
+            await websocket.send_json({"op": "error", "detail": str(exc)})
+
+
+@router.websocket("/ws")
+async def stream_changes_ws(
+    websocket: WebSocket,
+    account_id: UUID,
+    entities: Optional[str] = None,
+    project_id: Optional[UUID] = None,
+):
+    """Variante WebSocket do stream; os filtros podem ser trocados enviando JSON pela conexão."""
+    try:
+        parsed_entities = _parse_entities(entities)
+    except ValueError as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc))
+        return
+
+    await websocket.accept()
+    broker = get_change_broker()
+    subscription = broker.subscribe(str(account_id), parsed_entities, str(project_id) if project_id else None)
+    receiver = asyncio.create_task(_receive_filters(websocket, subscription))
+    try:
+        await websocket.send_json({"op": "ready", "account_id": str(account_id)})
+        while not receiver.done():
+            next_event = asyncio.create_task(subscription.next_event(get_settings().change_stream_heartbeat_seconds))
+            await asyncio.wait({next_event, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                break
+            event = next_event.result()
+            if event is not None:
+                await websocket.send_json({"op": "resync"} if event is RESYNC_EVENT else _compact(event))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        broker.unsubscribe(subscription)
@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..database import get_read_session, get_session
 from ..schemas.task import TaskTypeCreate, TaskTypeOut, TaskTypeUpdate
 from ..services import task as task_service
 
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/task-types", tags=["task-types"])
 @router.get("", response_model=List[TaskTypeOut])
 async def list_task_types(
     account_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await task_service.list_task_types(session, account_id)
 
@@ -6,7 +6,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..coalesce import coalesced
+from ..database import get_read_session, get_session
 from ..schemas.task import TaskCreate, TaskOut, TaskUpdate
 from ..services import task as task_service
 
@@ -14,12 +15,14 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.get("", response_model=List[TaskOut])
+@coalesced
 async def list_tasks(
     account_id: UUID = Query(..., description="Identificador da conta"),
     project_id: Optional[UUID] = Query(None, description="Filtrar por projeto"),
     status: Optional[str] = Query(None, description="Filtrar por status"),
     priority: Optional[str] = Query(None, description="Filtrar por prioridade"),
-    session: AsyncSession = Depends(get_session),
+    include_archived: bool = Query(False, description="Inclui tarefas concluídas arquivadas (só leitura)"),
+    session: AsyncSession = Depends(get_read_session),
 ):
     try:
         return await task_service.list_tasks(
@@ -28,6 +31,7 @@ async def list_tasks(
             project_id=project_id,
             status=status,
             priority=priority,
+            include_archived=include_archived,
         )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -37,7 +41,7 @@ async def list_tasks(
 async def get_task(
     task_id: UUID,
     account_id: UUID = Query(..., description="Identificador da conta"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     try:
         return await task_service.get_task(session, task_id, account_id)
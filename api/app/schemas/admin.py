@@ -1,11 +1,47 @@
 from __future__ import annotations
 
 from datetime import datetime, date
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
+from ..fairshare import parse_share
+from ..quotas import parse_quotas
+from ..ratelimit import parse_rate_limits
+
+
+def _check_retention(features: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """`retention_months`: meses que reuniões e trechos ficam guardados (ausente ou 0 = sem prazo)."""
+    value = (features or {}).get("retention_months")
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= 32767):
+        raise ValueError("features.retention_months deve ser um inteiro de meses >= 0")
+    return features
+
+
+def _check_rate_limit(features: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """`rate_limit`: tokens/s e burst da conta e, opcionalmente, por rota (ver `app.ratelimit`)."""
+    value = (features or {}).get("rate_limit")
+    if value is not None:
+        parse_rate_limits(value, where="features.rate_limit")
+    return features
+
+
+def _check_db_share(features: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """`db_share`: peso e teto de conexões simultâneas da conta na fila do pool (ver `app.fairshare`)."""
+    value = (features or {}).get("db_share")
+    if value is not None:
+        parse_share(value, where="features.db_share")
+    return features
+
+
+def _check_quotas(features: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """`quotas`: limites de estoque e de consumo mensal da conta (ver `app.quotas`)."""
+    value = (features or {}).get("quotas")
+    if value is not None:
+        parse_quotas(value, where="features.quotas")
+    return features
+
 
 class PlanBase(BaseModel):
     key: str
@@ -17,6 +53,11 @@ class PlanBase(BaseModel):
     features: Dict[str, Any] = Field(default_factory=dict)
     is_active: bool = True
 
+    _retention = field_validator("features")(_check_retention)
+    _rate_limit = field_validator("features")(_check_rate_limit)
+    _db_share = field_validator("features")(_check_db_share)
+    _quotas = field_validator("features")(_check_quotas)
+
 
 class PlanCreate(PlanBase):
     pass
@@ -31,6 +72,11 @@ class PlanUpdate(BaseModel):
     features: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
 
+    _retention = field_validator("features")(_check_retention)
+    _rate_limit = field_validator("features")(_check_rate_limit)
+    _db_share = field_validator("features")(_check_db_share)
+    _quotas = field_validator("features")(_check_quotas)
+
 
 class PlanOut(PlanBase):
     id: UUID
@@ -111,6 +157,64 @@ class ProjectOut(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectRollupOut(BaseModel):
+    project_id: UUID
+    account_id: UUID
+    name: str
+    status: str
+    health: str
+    progress: float
+    effort: float
+    due: Optional[date] = None
+    owner: Optional[str] = None
+    tasks_total: int
+    tasks_open: int
+    tasks_overdue: int
+    tasks_by_status: Dict[str, int]
+    open_by_priority: Dict[str, int]
+    estimate_hours: int
+    actual_hours: int
+    updated_at: datetime
+
+
+class DeletionJobOut(BaseModel):
+    id: UUID
+    kind: str
+    account_id: UUID
+    project_id: Optional[UUID] = None
+    status: str
+    step: int
+    steps_total: int
+    current_table: Optional[str] = None
+    processed: Dict[str, int] = Field(default_factory=dict)
+    failures: int
+    error: Optional[str] = None
+    requested_at: datetime
+    started_at: Optional[datetime] = None
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class DeletionAcceptedOut(BaseModel):
+    detail: str
+    job: DeletionJobOut
+
+
+class UsageItemOut(BaseModel):
+    key: str
+    period: str
+    used: int
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+
+
+class AccountUsageOut(BaseModel):
+    account_id: UUID
+    month: date
+    updated_at: Optional[datetime] = None
+    usage: List[UsageItemOut]
+
+
 class UserOut(BaseModel):
     id: UUID
     account_id: UUID
@@ -150,3 +254,62 @@ class UserUpdate(BaseModel):
     phone: Optional[str] = None
     is_root: Optional[bool] = None
     password: Optional[str] = Field(default=None, min_length=6)
+
+
+class UserCredentials(BaseModel):
+    email: EmailStr
+    password: str
+
+
+class SlowQueryOut(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameter_shapes: List[str] = Field(default_factory=list)
+    caller: Optional[str] = None
+    plan: Optional[Any] = None
+    plan_error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DbSchedulerAccountOut(BaseModel):
+    account: str
+    weight: float
+    max_concurrency: int
+    active: int
+    waiting: int
+    granted: int
+    queued: int
+    timeouts: int
+    wait_ms_total: float
+    wait_ms_max: float
+    held_seconds: float
+
+
+class DbSchedulerOut(BaseModel):
+    name: str
+    capacity: int
+    in_use: int
+    waiting: int
+    max_per_account: int
+    wait_ms_p50: float
+    wait_ms_p95: float
+    wait_ms_p99: float
+    accounts: List[DbSchedulerAccountOut] = Field(default_factory=list)
+
+
+class CpuExecutorOut(BaseModel):
+    kind: str
+    workers: int
+    max_queue: int
+    running: int
+    queued: int
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    queue_ms_p50: float
+    queue_ms_p95: float
+    run_ms_p50: float
+    run_ms_p95: float
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class BatchItem(BaseModel):
+    id: str = Field(..., min_length=1, max_length=100, description="Identificador da sub-requisição na resposta")
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., min_length=1, description="Rota com query string, ex.: /api/tasks?account_id=...")
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1)
+
+    @field_validator("requests")
+    @classmethod
+    def unique_ids(cls, value: List[BatchItem]) -> List[BatchItem]:
+        ids = [item.id for item in value]
+        duplicated = sorted({item_id for item_id in ids if ids.count(item_id) > 1})
+        if duplicated:
+            raise ValueError(f"Ids repetidos no batch: {', '.join(duplicated)}")
+        return value
+
+
+class BatchItemResult(BaseModel):
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: Dict[str, BatchItemResult]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ProjectHealthOut(BaseModel):
+    id: UUID
+    name: str
+    status: str
+    health: str = Field(..., description="on-track | at-risk | critical")
+    progress: float
+    effort: float
+    due: Optional[date] = None
+    owner: Optional[str] = None
+    tasks_total: int
+    tasks_done: int
+    tasks_blocked: int
+    tasks_overdue: int
+
+
+class SprintCapacityOut(BaseModel):
+    id: UUID
+    name: str
+    project_id: Optional[UUID] = None
+    starts_at: date
+    ends_at: date
+    committed: float
+    remaining: float
+    velocity: float
+    capacity_hours: int
+    focus: float
+
+
+class TaskRowOut(BaseModel):
+    id: UUID
+    title: str
+    status: str
+    priority: str
+    project_id: UUID
+    task_type: Optional[str] = None
+    estimate_hours: Optional[int] = None
+    story_points: Optional[float] = None
+    assignee: Optional[str] = None
+    due: Optional[date] = None
+
+
+class MeetingSliceOut(BaseModel):
+    id: UUID
+    title: str
+    type: str
+    project_id: Optional[UUID] = None
+    occurred_at: datetime
+    duration_minutes: Optional[int] = None
+    sentiment: Optional[float] = None
+    status: str
+    participants: int
+
+
+class InsightOut(BaseModel):
+    id: str
+    kind: str
+    impact: str
+    title: str
+    entity: str
+    entity_id: UUID
+    assignee: Optional[str] = None
+    due: Optional[date] = None
+
+
+class DashboardPanels(BaseModel):
+    project_health: Optional[List[ProjectHealthOut]] = None
+    sprint_capacity: Optional[List[SprintCapacityOut]] = None
+    task_grid: Optional[List[TaskRowOut]] = None
+    meeting_timeline: Optional[List[MeetingSliceOut]] = None
+    insight_stream: Optional[List[InsightOut]] = None
+
+
+class DashboardOut(BaseModel):
+    account_id: UUID
+    generated_at: datetime
+    panels: DashboardPanels
+    errors: Dict[str, str] = Field(default_factory=dict, description="Painéis que falharam ou excederam o tempo")
@@ -66,6 +66,8 @@ class TaskOut(TaskSummary):
     updated_at: datetime
     task_type_id: Optional[UUID] = None
     task_type: Optional[TaskTypeOut] = None
+    # Preenchido só para tarefas arquivadas (só leitura)
+    archived_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,84 @@
+"""Launcher de produção: `python -m app.server`.
+
+Sobe o uvicorn com vários workers, uvloop e httptools (quando instalados). O número de
+workers vem de `WEB_WORKERS` ou, se 0, do menor entre a quantidade de CPUs e quantos
+pools do primário (`DB_POOL_SIZE + DB_MAX_OVERFLOW`) cabem em `DB_CONNECTION_BUDGET`; os pools
+das réplicas ficam fora da conta, porque abrem conexões em outros servidores.
+
+No SIGTERM o uvicorn para de aceitar conexões, espera as requisições em andamento por até
+`WEB_GRACEFUL_TIMEOUT` segundos e então roda o shutdown do lifespan (que fecha os pools).
+Cada worker passa pelo warmup (`app.warmup`) antes de começar a receber tráfego.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+
+from .config import Settings, get_settings
+
+
+def connections_per_worker(settings: Settings) -> int:
+    # Cada réplica tem o próprio pool, mas em outro servidor: o orçamento considera só o primário.
+    return settings.db_pool_size + settings.db_max_overflow
+
+
+def compute_workers(settings: Settings, cpu_count: Optional[int] = None) -> int:
+    if settings.web_workers > 0:
+        return settings.web_workers
+    cpus = cpu_count or os.cpu_count() or 1
+    by_budget = settings.db_connection_budget // connections_per_worker(settings)
+    return max(1, min(cpus, by_budget))
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def build_options(settings: Settings, args: argparse.Namespace) -> Dict[str, Any]:
+    return dict(
+        host=args.host or settings.web_host,
+        port=args.port or settings.web_port,
+        workers=args.workers or compute_workers(settings),
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
+        lifespan="on",
+        timeout_graceful_shutdown=settings.web_graceful_timeout,
+        proxy_headers=True,
+        log_level=args.log_level,
+        access_log=args.access_log,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Padrão: WEB_HOST")
+    parser.add_argument("--port", type=int, help="Padrão: WEB_PORT")
+    parser.add_argument("--workers", type=int, help="Padrão: WEB_WORKERS ou automático")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action="store_true", help="Liga o access log do uvicorn")
+    parser.add_argument("--print-config", action="store_true", help="Mostra a configuração calculada e sai")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    options = build_options(settings, args)
+    summary = (
+        f"workers={options['workers']} (cpus={os.cpu_count()}, conexões/worker={connections_per_worker(settings)}, "
+        f"orçamento={settings.db_connection_budget}) loop={options['loop']} http={options['http']} "
+        f"graceful={settings.web_graceful_timeout:.0f}s warmup={'on' if settings.warmup_enabled else 'off'}"
+    )
+    print(summary, file=sys.stderr)
+    if args.print_config:
+        return 0
+
+    uvicorn.run("app.main:app", **options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,17 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-import hashlib
-
 from slugify import slugify
-from sqlalchemy import delete, select
+from sqlalchemy import ColumnElement, and_, delete, func, or_, select, update
 from sqlalchemy.exc import IntegrityError, NoResultFound, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from ..models.admin import Account, Plan, Project, UserApp
+from ..cpu import run_cpu
+from ..deletion_steps import step_names
+from ..models.admin import Account, DeletionJob, Plan, Project, UserApp
+from ..passwords import burn, hash_password, verify_and_rehash
+from ..quotas import get_quota_tracker
 
 PROJECT_STATUS_ALLOWED = {"draft", "active", "on_hold", "completed", "archived"}
 
@@ -60,13 +62,22 @@ async def delete_plan(session: AsyncSession, plan_id: UUID) -> None:
 
 
 async def list_accounts(session: AsyncSession) -> List[Account]:
-    stmt = select(Account).order_by(Account.created_at.desc()).options(selectinload(Account.plan))
+    stmt = (
+        select(Account)
+        .where(Account.deletion_requested_at.is_(None))
+        .order_by(Account.created_at.desc())
+        .options(selectinload(Account.plan))
+    )
     result = await session.scalars(stmt)
     return list(result.all())
 
 
 async def get_account(session: AsyncSession, account_id: UUID) -> Optional[Account]:
-    stmt = select(Account).where(Account.id == account_id).options(selectinload(Account.plan))
+    stmt = (
+        select(Account)
+        .where(Account.id == account_id, Account.deletion_requested_at.is_(None))
+        .options(selectinload(Account.plan))
+    )
     result = await session.scalars(stmt)
     return result.first()
 
@@ -102,7 +113,11 @@ async def create_account(session: AsyncSession, payload: Dict[str, Any]) -> Acco
 
 
 async def update_account(session: AsyncSession, account_id: UUID, payload: Dict[str, Any]) -> Account:
-    stmt = select(Account).where(Account.id == account_id).options(selectinload(Account.plan))
+    stmt = (
+        select(Account)
+        .where(Account.id == account_id, Account.deletion_requested_at.is_(None))
+        .options(selectinload(Account.plan))
+    )
     result = await session.scalars(stmt)
     account = result.one()
 
@@ -121,23 +136,45 @@ async def update_account(session: AsyncSession, account_id: UUID, payload: Dict[
     return account
 
 
-async def delete_account(session: AsyncSession, account_id: UUID) -> None:
-    stmt = delete(Account).where(Account.id == account_id)
-    await session.execute(stmt)
-    await session.commit()
+async def delete_account(session: AsyncSession, account_id: UUID) -> DeletionJob:
+    """Marca a conta como em exclusão (some das leituras) e enfileira o job que apaga os dados em lotes."""
+    marked = await session.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(deletion_requested_at=func.coalesce(Account.deletion_requested_at, func.now()))
+        .returning(Account.id)
+    )
+    if marked.first() is None:
+        raise NoResultFound
+    return await _enqueue_deletion(session, "account", account_id)
 
 
 # ===== Projects =====
 
 
+async def _assert_account_active(session: AsyncSession, account_id: UUID) -> None:
+    """Projetos e usuários novos só em contas existentes e sem exclusão pedida."""
+    stmt = select(Account.id).where(Account.id == account_id, Account.deletion_requested_at.is_(None))
+    if await session.scalar(stmt) is None:
+        raise ValueError("Conta não encontrada ou em exclusão")
+
+
 async def list_projects(session: AsyncSession, account_id: UUID) -> List[Project]:
-    stmt = select(Project).where(Project.account_id == account_id).order_by(Project.created_at.desc())
+    stmt = (
+        select(Project)
+        .where(Project.account_id == account_id, Project.deletion_requested_at.is_(None))
+        .order_by(Project.created_at.desc())
+    )
     result = await session.scalars(stmt)
     return list(result.all())
 
 
 async def list_users(session: AsyncSession, account_id: UUID) -> List[UserApp]:
-    stmt = select(UserApp).where(UserApp.account_id == account_id).order_by(UserApp.full_name.asc())
+    stmt = (
+        select(UserApp)
+        .where(UserApp.account_id == account_id, not_pending_deletion(UserApp.account_id))
+        .order_by(UserApp.full_name.asc())
+    )
     result = await session.scalars(stmt)
     return list(result.all())
 
@@ -146,6 +183,9 @@ async def create_project(session: AsyncSession, account_id: UUID, payload: Dict[
     status = (payload.get("status") or "active").strip()
     if status not in PROJECT_STATUS_ALLOWED:
         raise ValueError("Status de projeto inválido")
+    quotas = get_quota_tracker()
+    quotas.check(account_id, "projects")
+    await _assert_account_active(session, account_id)
 
     project = Project(
         account_id=account_id,
@@ -166,6 +206,7 @@ async def create_project(session: AsyncSession, account_id: UUID, payload: Dict[
             raise ValueError("Já existe um projeto com essa chave nesta conta") from exc
         raise
 
+    quotas.record(account_id, "projects")
     await session.refresh(project)
     return project
 
@@ -176,7 +217,9 @@ async def update_project(
     project_id: UUID,
     payload: Dict[str, Any],
 ) -> Project:
-    stmt = select(Project).where(Project.id == project_id, Project.account_id == account_id)
+    stmt = select(Project).where(
+        Project.id == project_id, Project.account_id == account_id, Project.deletion_requested_at.is_(None)
+    )
     result = await session.scalars(stmt)
     project = result.one()
 
@@ -202,24 +245,114 @@ async def update_project(
     return project
 
 
-async def delete_project(session: AsyncSession, account_id: UUID, project_id: UUID) -> None:
-    stmt = select(Project).where(Project.id == project_id, Project.account_id == account_id)
-    result = await session.scalars(stmt)
-    project = result.first()
-    if not project:
+async def delete_project(session: AsyncSession, account_id: UUID, project_id: UUID) -> DeletionJob:
+    """Marca o projeto como em exclusão e enfileira o job; tarefas saem em lotes, sem carregar nada no ORM."""
+    marked = await session.execute(
+        update(Project)
+        .where(Project.id == project_id, Project.account_id == account_id)
+        .values(deletion_requested_at=func.coalesce(Project.deletion_requested_at, func.now()))
+        .returning(Project.id)
+    )
+    if marked.first() is None:
         raise NoResultFound
-
-    await session.delete(project)
+    return await _enqueue_deletion(session, "project", account_id, project_id)
+
+
+# ===== Deletion jobs =====
+
+
+def not_pending_deletion(
+    account_id: ColumnElement, project_id: Optional[ColumnElement] = None
+) -> ColumnElement[bool]:
+    """Condição que esconde linhas filhas de contas e projetos com exclusão pedida.
+
+    O job apaga os filhos aos poucos; até ele chegar, as leituras de tarefas, reuniões e
+    sprints filtram por aqui. Os conjuntos pendentes são pequenos e lidos pelos índices
+    parciais em `deletion_requested_at`.
+    """
+    condition = account_id.not_in(select(Account.id).where(Account.deletion_requested_at.is_not(None)))
+    if project_id is None:
+        return condition
+    pending_projects = select(Project.id).where(Project.deletion_requested_at.is_not(None))
+    return and_(condition, or_(project_id.is_(None), project_id.not_in(pending_projects)))
+
+
+async def _enqueue_deletion(
+    session: AsyncSession, kind: str, account_id: UUID, project_id: Optional[UUID] = None
+) -> DeletionJob:
+    # A linha marcada fica travada até o commit: pedidos simultâneos caem no mesmo job
+    stmt = (
+        select(DeletionJob)
+        .where(
+            DeletionJob.kind == kind,
+            DeletionJob.account_id == account_id,
+            DeletionJob.project_id == project_id if project_id else DeletionJob.project_id.is_(None),
+            DeletionJob.status.in_(("pending", "running", "failed")),
+        )
+        .order_by(DeletionJob.requested_at.desc())
+        .limit(1)
+    )
+    job = (await session.scalars(stmt)).first()
+    if job is None:
+        job = DeletionJob(kind=kind, account_id=account_id, project_id=project_id)
+        session.add(job)
+    elif job.status == "failed":
+        job.status, job.failures, job.error = "pending", 0, None
     await session.commit()
+    await session.refresh(job)
+    return job
+
+
+def deletion_job_progress(job: DeletionJob) -> Dict[str, Any]:
+    """Job com o avanço legível: passo atual (tabela) e total de passos do tipo."""
+    names = step_names(job.kind)
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "account_id": job.account_id,
+        "project_id": job.project_id,
+        "status": job.status,
+        "step": job.step,
+        "steps_total": len(names),
+        "current_table": names[job.step] if job.status != "done" and job.step < len(names) else None,
+        "processed": job.processed or {},
+        "failures": job.failures,
+        "error": job.error,
+        "requested_at": job.requested_at,
+        "started_at": job.started_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+
+
+async def get_deletion_job(session: AsyncSession, job_id: UUID) -> DeletionJob:
+    job = await session.get(DeletionJob, job_id)
+    if job is None:
+        raise LookupError("Job de exclusão não encontrado")
+    return job
+
+
+async def list_deletion_jobs(session: AsyncSession, account_id: UUID, limit: int = 50) -> List[DeletionJob]:
+    stmt = (
+        select(DeletionJob)
+        .where(DeletionJob.account_id == account_id)
+        .order_by(DeletionJob.requested_at.desc())
+        .limit(limit)
+    )
+    return list((await session.scalars(stmt)).all())
 
 
-def _hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+async def _hash_password(password: str) -> str:
+    # scrypt leva dezenas de ms: fora do event loop
+    return await run_cpu(hash_password, password)
 
 
 async def create_user(session: AsyncSession, account_id: UUID, payload: Dict[str, Any]) -> UserApp:
     data = payload.copy()
     password = data.pop("password", None)
+    quotas = get_quota_tracker()
+    quotas.check(account_id, "users")
+    await _assert_account_active(session, account_id)
 
     user = UserApp(
         account_id=account_id,
@@ -234,7 +367,7 @@ async def create_user(session: AsyncSession, account_id: UUID, payload: Dict[str
     )
 
     if password:
-        user.password_hash = _hash_password(password)
+        user.password_hash = await _hash_password(password)
 
     session.add(user)
 
@@ -246,6 +379,7 @@ async def create_user(session: AsyncSession, account_id: UUID, payload: Dict[str
             raise ValueError("E-mail já está em uso") from exc
         raise
 
+    quotas.record(account_id, "users")
     await session.refresh(user)
     return user
 
@@ -267,7 +401,7 @@ async def update_user(
         setattr(user, key, value)
 
     if password:
-        user.password_hash = _hash_password(password)
+        user.password_hash = await _hash_password(password)
 
     try:
         await session.commit()
@@ -281,6 +415,26 @@ async def update_user(
     return user
 
 
+async def authenticate_user(session: AsyncSession, account_id: UUID, email: str, password: str) -> Optional[UserApp]:
+    """Confere e-mail e senha; hashes antigos (SHA-256) ou mais fracos são regravados com o scrypt atual."""
+    stmt = select(UserApp).where(
+        UserApp.account_id == account_id, UserApp.email == email, not_pending_deletion(UserApp.account_id)
+    )
+    user = (await session.scalars(stmt)).first()
+    if user is None or not user.password_hash:
+        await run_cpu(burn, password)
+        return None
+
+    valid, new_hash = await run_cpu(verify_and_rehash, password, user.password_hash)
+    if not valid:
+        return None
+    if new_hash:
+        user.password_hash = new_hash
+        await session.commit()
+        await session.refresh(user)
+    return user
+
+
 async def delete_user(session: AsyncSession, account_id: UUID, user_id: UUID) -> None:
     stmt = select(UserApp).where(UserApp.id == user_id, UserApp.account_id == account_id)
     result = await session.scalars(stmt)
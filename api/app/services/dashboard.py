@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..models.admin import UserApp
+from ..models.meeting import Meeting, MeetingParticipant, MeetingType
+from ..models.sprint import Sprint, SprintTask, UserCapacity
+from ..models.task import Task, TaskType
+from ..timeouts import QUERY_CANCELED_SQLSTATE, apply_statement_timeout
+from . import rollup as rollup_service
+from .admin import not_pending_deletion
+
+logger = logging.getLogger(__name__)
+
+OPEN_PROJECT_STATUSES = ("active", "on_hold")
+PRIORITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+Panel = Callable[[AsyncSession, UUID], Awaitable[List[Dict[str, Any]]]]
+
+
+def _ratio(part: Optional[float], whole: Optional[float]) -> float:
+    return round(float(part or 0) / float(whole), 2) if whole else 0.0
+
+
+# ===== Painéis =====
+
+
+async def project_health(session: AsyncSession, account_id: UUID) -> List[Dict[str, Any]]:
+    rollups = await rollup_service.list_project_rollups(session, account_id, statuses=OPEN_PROJECT_STATUSES)
+    return [
+        {
+            "id": rollup["project_id"],
+            "name": rollup["name"],
+            "status": rollup["status"],
+            "health": rollup["health"],
+            "progress": rollup["progress"],
+            "effort": rollup["effort"],
+            "due": rollup["due"],
+            "owner": rollup["owner"],
+            "tasks_total": rollup["tasks_total"],
+            "tasks_done": rollup["tasks_by_status"]["done"],
+            "tasks_blocked": rollup["tasks_by_status"]["blocked"],
+            "tasks_overdue": rollup["tasks_overdue"],
+        }
+        for rollup in rollups
+    ]
+
+
+async def sprint_capacity(session: AsyncSession, account_id: UUID) -> List[Dict[str, Any]]:
+    committed = (
+        select(
+            SprintTask.sprint_id,
+            func.sum(SprintTask.planned_points).label("committed"),
+            func.sum(SprintTask.planned_points).filter(Task.status != "done").label("remaining"),
+            func.sum(SprintTask.planned_hours).label("planned_hours"),
+        )
+        .join(Task, (Task.account_id == SprintTask.account_id) & (Task.id == SprintTask.task_id))
+        .where(SprintTask.account_id == account_id, Task.account_id == account_id)
+        .group_by(SprintTask.sprint_id)
+        .subquery()
+    )
+    capacity = (
+        select(UserCapacity.sprint_id, func.sum(UserCapacity.hours).label("capacity_hours"))
+        .where(UserCapacity.account_id == account_id)
+        .group_by(UserCapacity.sprint_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            Sprint.id,
+            Sprint.name,
+            Sprint.project_id,
+            Sprint.starts_at,
+            Sprint.ends_at,
+            committed.c.committed,
+            committed.c.remaining,
+            committed.c.planned_hours,
+            capacity.c.capacity_hours,
+        )
+        .outerjoin(committed, committed.c.sprint_id == Sprint.id)
+        .outerjoin(capacity, capacity.c.sprint_id == Sprint.id)
+        .where(
+            Sprint.account_id == account_id,
+            Sprint.status == "active",
+            not_pending_deletion(Sprint.account_id, Sprint.project_id),
+        )
+        .order_by(Sprint.starts_at.asc())
+    )
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        return []
+
+    # Velocidade: média de pontos entregues nos três últimos sprints encerrados da conta.
+    recent_closed = (
+        select(Sprint.id)
+        .where(Sprint.account_id == account_id, Sprint.status == "closed")
+        .order_by(Sprint.ends_at.desc())
+        .limit(3)
+    )
+    delivered = (
+        select(func.coalesce(func.sum(SprintTask.planned_points).filter(Task.status == "done"), 0).label("points"))
+        .select_from(SprintTask)
+        .join(Task, (Task.account_id == SprintTask.account_id) & (Task.id == SprintTask.task_id))
+        .where(
+            SprintTask.account_id == account_id,
+            Task.account_id == account_id,
+            SprintTask.sprint_id.in_(recent_closed),
+        )
+        .group_by(SprintTask.sprint_id)
+        .subquery()
+    )
+    velocity = await session.scalar(select(func.avg(delivered.c.points)))
+
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "project_id": row.project_id,
+            "starts_at": row.starts_at,
+            "ends_at": row.ends_at,
+            "committed": float(row.committed or 0),
+            "remaining": float(row.remaining or 0),
+            "velocity": round(float(velocity or 0), 1),
+            "capacity_hours": int(row.capacity_hours or 0),
+            "focus": _ratio(row.planned_hours, row.capacity_hours),
+        }
+        for row in rows
+    ]
+
+
+async def task_grid(session: AsyncSession, account_id: UUID, limit: int = 50) -> List[Dict[str, Any]]:
+    priority_rank = case(PRIORITY_RANK, value=Task.priority, else_=len(PRIORITY_RANK))
+    stmt = (
+        select(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.priority,
+            Task.project_id,
+            Task.estimate_hours,
+            Task.story_points,
+            Task.due_date,
+            TaskType.name.label("task_type"),
+            UserApp.full_name.label("assignee"),
+        )
+        .outerjoin(TaskType, TaskType.id == Task.task_type_id)
+        .outerjoin(UserApp, UserApp.id == Task.assignee_id)
+        .where(
+            Task.account_id == account_id,
+            Task.status != "done",
+            not_pending_deletion(Task.account_id, Task.project_id),
+        )
+        .order_by(priority_rank, Task.due_date.asc().nulls_last(), Task.created_at.desc())
+        .limit(limit)
+    )
+    rows = (await session.execute(stmt)).all()
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "status": row.status,
+            "priority": row.priority,
+            "project_id": row.project_id,
+            "task_type": row.task_type,
+            "estimate_hours": row.estimate_hours,
+            "story_points": float(row.story_points) if row.story_points is not None else None,
+            "assignee": row.assignee,
+            "due": row.due_date,
+        }
+        for row in rows
+    ]
+
+
+async def meeting_timeline(session: AsyncSession, account_id: UUID, limit: int = 10) -> List[Dict[str, Any]]:
+    participants = (
+        select(func.count())
+        .where(MeetingParticipant.account_id == account_id, MeetingParticipant.meeting_id == Meeting.id)
+        .correlate(Meeting)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Meeting.id,
+            Meeting.title,
+            Meeting.project_id,
+            Meeting.occurred_at,
+            Meeting.duration_minutes,
+            Meeting.sentiment_score,
+            Meeting.status,
+            MeetingType.name.label("type"),
+            participants.label("participants"),
+        )
+        .join(MeetingType, MeetingType.id == Meeting.meeting_type_id)
+        .where(Meeting.account_id == account_id, not_pending_deletion(Meeting.account_id, Meeting.project_id))
+        .order_by(Meeting.occurred_at.desc())
+        .limit(limit)
+    )
+    rows = (await session.execute(stmt)).all()
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "type": row.type,
+            "project_id": row.project_id,
+            "occurred_at": row.occurred_at,
+            "duration_minutes": row.duration_minutes,
+            "sentiment": float(row.sentiment_score) if row.sentiment_score is not None else None,
+            "status": row.status,
+            "participants": row.participants,
+        }
+        for row in rows
+    ]
+
+
+async def insight_stream(session: AsyncSession, account_id: UUID, limit: int = 10) -> List[Dict[str, Any]]:
+    """Sinais de atenção derivados dos dados: tarefas bloqueadas/atrasadas e reuniões com sentimento negativo."""
+    today = date.today()
+    task_rows = (
+        await session.execute(
+            select(Task.id, Task.title, Task.status, Task.priority, Task.due_date, UserApp.full_name.label("assignee"))
+            .outerjoin(UserApp, UserApp.id == Task.assignee_id)
+            .where(
+                Task.account_id == account_id,
+                not_pending_deletion(Task.account_id, Task.project_id),
+                Task.priority.in_(("critical", "high")),
+                (Task.status == "blocked") | ((Task.status != "done") & (Task.due_date < today)),
+            )
+            .order_by(Task.due_date.asc().nulls_last())
+            .limit(limit)
+        )
+    ).all()
+    meeting_rows = (
+        await session.execute(
+            select(Meeting.id, Meeting.title, Meeting.occurred_at, Meeting.sentiment_score)
+            .where(
+                Meeting.account_id == account_id,
+                not_pending_deletion(Meeting.account_id, Meeting.project_id),
+                Meeting.occurred_at >= datetime.now(timezone.utc) - timedelta(days=14),
+                Meeting.sentiment_score < 0,
+            )
+            .order_by(Meeting.sentiment_score.asc())
+            .limit(limit)
+        )
+    ).all()
+
+    insights: List[Dict[str, Any]] = []
+    for row in task_rows:
+        blocked = row.status == "blocked"
+        insights.append(
+            {
+                "id": f"task:{row.id}",
+                "kind": "task_blocked" if blocked else "task_overdue",
+                "impact": "high" if row.priority == "critical" else "medium",
+                "title": f"{'Tarefa bloqueada' if blocked else 'Tarefa atrasada'}: {row.title}",
+                "entity": "task",
+                "entity_id": row.id,
+                "assignee": row.assignee,
+                "due": row.due_date,
+            }
+        )
+    for row in meeting_rows:
+        insights.append(
+            {
+                "id": f"meeting:{row.id}",
+                "kind": "meeting_sentiment",
+                "impact": "medium",
+                "title": f"Sentimento negativo em {row.title}",
+                "entity": "meeting",
+                "entity_id": row.id,
+                "assignee": None,
+                "due": None,
+            }
+        )
+    insights.sort(key=lambda item: item["impact"] != "high")
+    return insights[:limit]
+
+
+PANELS: Dict[str, Panel] = {
+    "project_health": project_health,
+    "sprint_capacity": sprint_capacity,
+    "task_grid": task_grid,
+    "meeting_timeline": meeting_timeline,
+    "insight_stream": insight_stream,
+}
+
+
+# ===== Montagem =====
+
+
+async def _run_panel(
+    sessionmaker: async_sessionmaker, panel: Panel, account_id: UUID, timeout_ms: int
+) -> List[Dict[str, Any]]:
+    # Sessão (e conexão) própria por painel; o statement_timeout encerra a query no servidor
+    # mesmo que o cancelamento do lado do cliente não chegue a tempo. O prazo também cobre a
+    # espera pela vaga da fila justa e pelo checkout do pool: uma conta saturada não segura
+    # o dashboard inteiro.
+    async def load() -> List[Dict[str, Any]]:
+        async with sessionmaker() as session:
+            apply_statement_timeout(session, timeout_ms)
+            return await panel(session, account_id)
+
+    return await asyncio.wait_for(load(), timeout_ms / 1000)
+
+
+async def build_dashboard(
+    sessionmaker: async_sessionmaker,
+    account_id: UUID,
+    *,
+    timeout_ms: int,
+    panels: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """Roda os painéis em paralelo; painéis lentos ou com erro voltam como `None` e aparecem em `errors`."""
+    names = list(panels) if panels is not None else list(PANELS)
+    unknown = [name for name in names if name not in PANELS]
+    if unknown:
+        raise ValueError(f"Painéis inválidos: {', '.join(unknown)} (use {', '.join(PANELS)})")
+
+    results = await asyncio.gather(
+        *(_run_panel(sessionmaker, PANELS[name], account_id, timeout_ms) for name in names),
+        return_exceptions=True,
+    )
+    data: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for name, result in zip(names, results):
+        timed_out = isinstance(result, asyncio.TimeoutError) or (
+            isinstance(result, DBAPIError) and getattr(result.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE
+        )
+        if timed_out:
+            data[name] = None
+            errors[name] = f"Tempo limite de {timeout_ms} ms excedido"
+        elif isinstance(result, Exception):
+            logger.warning("Painel %s falhou para a conta %s: %s", name, account_id, result)
+            data[name] = None
+            errors[name] = "Falha ao carregar o painel"
+        else:
+            data[name] = result
+    return {
+        "account_id": account_id,
+        "generated_at": datetime.now(timezone.utc),
+        "panels": data,
+        "errors": errors,
+    }
@@ -4,11 +4,22 @@ from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import Select, delete, func, select
+from sqlalchemy import Select, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from ..models.meeting import DocChunk, Meeting, MeetingParticipant, MeetingType
+from ..quotas import estimate_tokens, get_quota_tracker
+from .admin import not_pending_deletion
+
+
+async def account_retention_months(session: AsyncSession, account_id: UUID) -> int:
+    """Prazo de retenção do plano da conta (`plan.features.retention_months`; 0 = sem prazo).
+
+    Gravado em cada reunião e trecho na criação: é coluna de partição (ver app.tools.retention).
+    """
+    result = await session.execute(select(func.account_retention_months(account_id)))
+    return int(result.scalar() or 0)
 
 
 async def list_meetings(
@@ -21,13 +32,13 @@ async def list_meetings(
 ) -> List[Meeting]:
     stmt = (
         select(Meeting)
-        .where(Meeting.account_id == account_id)
+        .where(Meeting.account_id == account_id, not_pending_deletion(Meeting.account_id, Meeting.project_id))
         .order_by(Meeting.occurred_at.desc())
         .limit(limit)
         .offset(offset)
         .options(
             selectinload(Meeting.meeting_type),
-            selectinload(Meeting.participants),
+            selectinload(Meeting.participants.and_(MeetingParticipant.account_id == account_id)),
         )
     )
     if meeting_type_id is not None:
@@ -41,7 +52,7 @@ async def list_meetings(
 async def get_meeting(session: AsyncSession, meeting_id: UUID) -> Meeting:
     stmt: Select[Meeting] = (
         select(Meeting)
-        .where(Meeting.id == meeting_id)
+        .where(Meeting.id == meeting_id, not_pending_deletion(Meeting.account_id, Meeting.project_id))
         .options(
             selectinload(Meeting.meeting_type),
             selectinload(Meeting.participants),
@@ -61,6 +72,11 @@ async def create_meeting(session: AsyncSession, payload: dict) -> Meeting:
 
     meeting_type_id = payload["meeting_type_id"]
     account_id = payload["account_id"]
+    minutes = payload.get("duration_minutes") or 0
+    tokens = estimate_tokens(notes)
+    quotas = get_quota_tracker()
+    quotas.check(account_id, "meeting_minutes", minutes)
+    quotas.check(account_id, "chunk_tokens", tokens)
 
     mt_stmt = select(MeetingType).where(
         MeetingType.id == meeting_type_id,
@@ -72,6 +88,7 @@ async def create_meeting(session: AsyncSession, payload: dict) -> Meeting:
         raise ValueError("Tipo de reunião inválido para esta conta")
 
     meeting = Meeting(**payload)
+    meeting.retention_months = await account_retention_months(session, account_id)
     meeting.metadata_json = metadata or {}
     meeting.notes = notes
     session.add(meeting)
@@ -80,6 +97,7 @@ async def create_meeting(session: AsyncSession, payload: dict) -> Meeting:
     for participant in participants or []:
         mp = MeetingParticipant(
             meeting_id=meeting.id,
+            account_id=meeting.account_id,
             display_name=participant.get("display_name"),
             email=participant.get("email"),
             role=participant.get("role"),
@@ -96,18 +114,24 @@ async def create_meeting(session: AsyncSession, payload: dict) -> Meeting:
             chunk_index=0,
             content=notes,
             language=payload.get("transcript_language") or meeting.transcript_language,
+            occurred_at=meeting.occurred_at,
+            retention_months=meeting.retention_months,
         )
         session.add(chunk)
 
     await session.commit()
+    quotas.record(account_id, "meeting_minutes", minutes)
+    quotas.record(account_id, "chunk_tokens", tokens)
     await session.refresh(meeting)
     await session.refresh(meeting, attribute_names=["meeting_type", "participants"])
     return meeting
 
 
-async def count_chunks_for_meeting(session: AsyncSession, meeting_id: UUID) -> int:
+async def count_chunks_for_meeting(session: AsyncSession, meeting_id: UUID, account_id: UUID) -> int:
     result = await session.execute(
-        select(func.count()).select_from(DocChunk).where(DocChunk.meeting_id == meeting_id)
+        select(func.count())
+        .select_from(DocChunk)
+        .where(DocChunk.account_id == account_id, DocChunk.meeting_id == meeting_id)
     )
     return int(result.scalar() or 0)
 
@@ -120,7 +144,7 @@ async def update_meeting(session: AsyncSession, meeting_id: UUID, payload: dict)
 
     stmt: Select[Meeting] = (
         select(Meeting)
-        .where(Meeting.id == meeting_id)
+        .where(Meeting.id == meeting_id, not_pending_deletion(Meeting.account_id, Meeting.project_id))
         .options(
             selectinload(Meeting.meeting_type),
             selectinload(Meeting.participants),
@@ -146,6 +170,14 @@ async def update_meeting(session: AsyncSession, meeting_id: UUID, payload: dict)
     for field, value in payload.items():
         setattr(meeting, field, value)
 
+    if "occurred_at" in payload:
+        # A reunião muda de partição no UPDATE; os trechos acompanham (mesma chave de partição)
+        await session.execute(
+            update(DocChunk)
+            .where(DocChunk.account_id == meeting.account_id, DocChunk.meeting_id == meeting.id)
+            .values(occurred_at=meeting.occurred_at)
+        )
+
     if metadata is not None:
         meeting.metadata_json = metadata or {}
 
@@ -153,6 +185,7 @@ async def update_meeting(session: AsyncSession, meeting_id: UUID, payload: dict)
         meeting.notes = notes
         await session.execute(
             delete(DocChunk).where(
+                DocChunk.account_id == meeting.account_id,
                 DocChunk.meeting_id == meeting.id,
                 DocChunk.source_type == "meeting_notes",
             )
@@ -167,14 +200,22 @@ async def update_meeting(session: AsyncSession, meeting_id: UUID, payload: dict)
                 chunk_index=0,
                 content=notes,
                 language=meeting.transcript_language,
+                occurred_at=meeting.occurred_at,
+                retention_months=meeting.retention_months,
             )
             session.add(chunk)
 
     if participants is not None:
-        await session.execute(delete(MeetingParticipant).where(MeetingParticipant.meeting_id == meeting.id))
+        await session.execute(
+            delete(MeetingParticipant).where(
+                MeetingParticipant.account_id == meeting.account_id,
+                MeetingParticipant.meeting_id == meeting.id,
+            )
+        )
         for participant in participants:
             mp = MeetingParticipant(
                 meeting_id=meeting.id,
+                account_id=meeting.account_id,
                 display_name=participant.get("display_name"),
                 email=participant.get("email"),
                 role=participant.get("role"),
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.admin import Project, ProjectRollup, ProjectRollupDue, UserApp
+
+ROLLUP_STATUSES = ("backlog", "planned", "in_progress", "review", "blocked", "done")
+ROLLUP_PRIORITIES = ("low", "medium", "high", "critical")
+
+
+def _ratio(part: Optional[float], whole: Optional[float]) -> float:
+    return round(float(part or 0) / float(whole), 2) if whole else 0.0
+
+
+def project_health(open_tasks: int, blocked: int, overdue: int) -> str:
+    if not open_tasks:
+        return "on-track"
+    if (blocked + overdue) / open_tasks >= 0.25:
+        return "critical"
+    if blocked or overdue:
+        return "at-risk"
+    return "on-track"
+
+
+def _rollup_dict(
+    rollup: ProjectRollup, name: str, status: str, due: Optional[date], owner: Optional[str], overdue: int
+) -> Dict[str, Any]:
+    by_status = {key: getattr(rollup, f"status_{key}") for key in ROLLUP_STATUSES}
+    tasks_open = rollup.tasks_total - rollup.status_done
+    return {
+        "project_id": rollup.project_id,
+        "account_id": rollup.account_id,
+        "name": name,
+        "status": status,
+        "health": project_health(tasks_open, rollup.status_blocked, overdue),
+        "progress": _ratio(rollup.status_done, rollup.tasks_total),
+        "effort": _ratio(rollup.actual_hours, rollup.estimate_hours),
+        "due": due,
+        "owner": owner,
+        "tasks_total": rollup.tasks_total,
+        "tasks_open": tasks_open,
+        "tasks_overdue": overdue,
+        "tasks_by_status": by_status,
+        "open_by_priority": {key: getattr(rollup, f"open_priority_{key}") for key in ROLLUP_PRIORITIES},
+        "estimate_hours": rollup.estimate_hours,
+        "actual_hours": rollup.actual_hours,
+        "updated_at": rollup.updated_at,
+    }
+
+
+async def list_project_rollups(
+    session: AsyncSession,
+    account_id: UUID,
+    *,
+    project_id: Optional[UUID] = None,
+    statuses: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Saúde e progresso dos projetos lidos só do rollup (nenhuma varredura em `task`)."""
+    overdue = (
+        select(ProjectRollupDue.project_id, func.sum(ProjectRollupDue.open_tasks).label("overdue"))
+        .join(ProjectRollup, ProjectRollup.project_id == ProjectRollupDue.project_id)
+        .where(ProjectRollup.account_id == account_id, ProjectRollupDue.due_date < date.today())
+        .group_by(ProjectRollupDue.project_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            ProjectRollup,
+            Project.name,
+            Project.status,
+            Project.end_date,
+            UserApp.full_name,
+            func.coalesce(overdue.c.overdue, 0),
+        )
+        .join(Project, Project.id == ProjectRollup.project_id)
+        .outerjoin(UserApp, UserApp.id == Project.created_by)
+        .outerjoin(overdue, overdue.c.project_id == ProjectRollup.project_id)
+        .where(ProjectRollup.account_id == account_id, Project.deletion_requested_at.is_(None))
+        .order_by(Project.name.asc())
+    )
+    if project_id:
+        stmt = stmt.where(ProjectRollup.project_id == project_id)
+    if statuses:
+        stmt = stmt.where(Project.status.in_(list(statuses)))
+
+    rows = (await session.execute(stmt)).all()
+    return [
+        _rollup_dict(rollup, name, status, due, owner, int(overdue_count))
+        for rollup, name, status, due, owner, overdue_count in rows
+    ]
+
+
+async def get_project_rollup(session: AsyncSession, account_id: UUID, project_id: UUID) -> Dict[str, Any]:
+    rollups = await list_project_rollups(session, account_id, project_id=project_id)
+    if not rollups:
+        raise LookupError("Rollup do projeto não encontrado")
+    return rollups[0]
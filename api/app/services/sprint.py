@@ -12,6 +12,7 @@ from sqlalchemy.orm import selectinload
 from ..models.sprint import HolidayCalendar, Sprint, SprintTask, UserCapacity
 from ..models.task import Task
 from ..schemas.sprint import SprintCreate, SprintTaskInput, SprintUpdate
+from .admin import not_pending_deletion
 
 
 def _validate_dates(starts_at: date, ends_at: date) -> None:
@@ -29,9 +30,9 @@ async def list_sprints(
 ) -> List[Sprint]:
     stmt = (
         select(Sprint)
-        .where(Sprint.account_id == account_id)
+        .where(Sprint.account_id == account_id, not_pending_deletion(Sprint.account_id, Sprint.project_id))
         .options(
-            selectinload(Sprint.assignments).selectinload(SprintTask.task),
+            selectinload(Sprint.assignments.and_(SprintTask.account_id == account_id)).selectinload(SprintTask.task),
             selectinload(Sprint.capacities),
         )
         .order_by(Sprint.starts_at.asc())
@@ -50,7 +51,7 @@ async def list_sprints(
 async def get_sprint(session: AsyncSession, sprint_id: UUID) -> Sprint:
     stmt = (
         select(Sprint)
-        .where(Sprint.id == sprint_id)
+        .where(Sprint.id == sprint_id, not_pending_deletion(Sprint.account_id, Sprint.project_id))
         .options(
             selectinload(Sprint.assignments).selectinload(SprintTask.task),
             selectinload(Sprint.capacities),
@@ -90,7 +91,7 @@ async def create_sprint(session: AsyncSession, payload: SprintCreate) -> Sprint:
 
     if payload.tasks:
         task_ids = [item.task_id for item in payload.tasks]
-        stmt = select(Task).where(Task.id.in_(task_ids))
+        stmt = select(Task).where(Task.id.in_(task_ids), Task.account_id == payload.account_id)
         tasks = await session.scalars(stmt)
         tasks_by_id = {task.id: task for task in tasks}
         missing = [task_id for task_id in task_ids if task_id not in tasks_by_id]
@@ -161,7 +162,7 @@ async def update_sprint(session: AsyncSession, sprint_id: UUID, payload: SprintU
     if payload.tasks is not None:
         if payload.tasks:
             task_ids = [item.task_id for item in payload.tasks]
-            stmt = select(Task).where(Task.id.in_(task_ids))
+            stmt = select(Task).where(Task.id.in_(task_ids), Task.account_id == sprint.account_id)
             tasks = await session.scalars(stmt)
             tasks_by_id = {task.id: task for task in tasks}
             missing = [task_id for task_id in task_ids if task_id not in tasks_by_id]
@@ -173,7 +174,9 @@ async def update_sprint(session: AsyncSession, sprint_id: UUID, payload: SprintU
             if not sprint.project_id:
                 raise ValueError("Defina um projeto antes de associar tarefas ao sprint")
         # Remove tarefas existentes
-        await session.execute(delete(SprintTask).where(SprintTask.sprint_id == sprint.id))
+        await session.execute(
+            delete(SprintTask).where(SprintTask.account_id == sprint.account_id, SprintTask.sprint_id == sprint.id)
+        )
         for assignment in _build_assignments(payload.tasks, sprint.account_id, sprint.id):
             session.add(assignment)
 
@@ -200,7 +203,11 @@ async def update_sprint(session: AsyncSession, sprint_id: UUID, payload: SprintU
 
 
 async def delete_sprint(session: AsyncSession, sprint_id: UUID) -> None:
-    await session.execute(delete(SprintTask).where(SprintTask.sprint_id == sprint_id))
+    account_id = await session.scalar(select(Sprint.account_id).where(Sprint.id == sprint_id))
+    if account_id is not None:
+        await session.execute(
+            delete(SprintTask).where(SprintTask.account_id == account_id, SprintTask.sprint_id == sprint_id)
+        )
     await session.execute(delete(UserCapacity).where(UserCapacity.sprint_id == sprint_id))
     await session.execute(delete(Sprint).where(Sprint.id == sprint_id))
     await session.commit()
@@ -215,7 +222,11 @@ async def list_tasks_for_project(
 ) -> List[Task]:
     if project_id is None:
         return []
-    stmt = select(Task).where(Task.project_id == project_id)
+    stmt = select(Task).where(
+        Task.account_id == account_id,
+        Task.project_id == project_id,
+        not_pending_deletion(Task.account_id, Task.project_id),
+    )
     if status:
         stmt = stmt.where(Task.status == status)
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import heapq
+from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
 from sqlalchemy import delete, select
@@ -9,12 +10,16 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
 from ..models.admin import Project
-from ..models.task import Task, TaskType
+from ..models.task import ArchivedTask, Task, TaskType
+from ..quotas import get_quota_tracker
 from ..schemas.task import TASK_PRIORITY_ALLOWED, TASK_STATUS_ALLOWED
+from .admin import not_pending_deletion
 
 
 async def _assert_project_belongs_to_account(session: AsyncSession, account_id: UUID, project_id: UUID) -> Project:
-    stmt = select(Project).where(Project.id == project_id, Project.account_id == account_id)
+    stmt = select(Project).where(
+        Project.id == project_id, Project.account_id == account_id, Project.deletion_requested_at.is_(None)
+    )
     result = await session.scalars(stmt)
     project = result.first()
     if not project:
@@ -121,39 +126,80 @@ async def list_tasks(
     project_id: Optional[UUID] = None,
     status: Optional[str] = None,
     priority: Optional[str] = None,
-) -> List[Task]:
+    include_archived: bool = False,
+) -> List[Union[Task, ArchivedTask]]:
+    if status and status not in TASK_STATUS_ALLOWED:
+        raise ValueError("Status de tarefa inválido")
+    if priority and priority not in TASK_PRIORITY_ALLOWED:
+        raise ValueError("Prioridade inválida")
+
+    models = [Task]
+    # Só tarefas concluídas são arquivadas
+    if include_archived and status in (None, "done"):
+        models.append(ArchivedTask)
+
+    results = []
+    for model in models:
+        stmt = (
+            select(model)
+            .where(model.account_id == account_id, not_pending_deletion(model.account_id, model.project_id))
+            .options(joinedload(model.task_type))
+            .order_by(model.created_at.desc())
+        )
+        if project_id:
+            stmt = stmt.where(model.project_id == project_id)
+        if status:
+            stmt = stmt.where(model.status == status)
+        if priority:
+            stmt = stmt.where(model.priority == priority)
+        result = await session.scalars(stmt)
+        results.append(result.unique().all())
+
+    return list(heapq.merge(*results, key=lambda task: task.created_at, reverse=True))
+
+
+async def _get_archived_task(session: AsyncSession, task_id: UUID, account_id: UUID) -> Optional[ArchivedTask]:
     stmt = (
-        select(Task)
-        .join(Project, Task.project_id == Project.id)
-        .where(Project.account_id == account_id)
-        .options(joinedload(Task.task_type))
-        .order_by(Task.created_at.desc())
+        select(ArchivedTask)
+        .where(
+            ArchivedTask.id == task_id,
+            ArchivedTask.account_id == account_id,
+            not_pending_deletion(ArchivedTask.account_id, ArchivedTask.project_id),
+        )
+        .options(joinedload(ArchivedTask.task_type))
     )
+    result = await session.scalars(stmt)
+    return result.first()
 
-    if project_id:
-        stmt = stmt.where(Task.project_id == project_id)
-    if status:
-        if status not in TASK_STATUS_ALLOWED:
-            raise ValueError("Status de tarefa inválido")
-        stmt = stmt.where(Task.status == status)
-    if priority:
-        if priority not in TASK_PRIORITY_ALLOWED:
-            raise ValueError("Prioridade inválida")
-        stmt = stmt.where(Task.priority == priority)
 
+async def _get_active_task(session: AsyncSession, task_id: UUID, account_id: UUID) -> Task:
+    """Tarefa de `task`, para escrita; as arquivadas são só leitura."""
+    stmt = (
+        select(Task)
+        .where(
+            Task.id == task_id, Task.account_id == account_id, not_pending_deletion(Task.account_id, Task.project_id)
+        )
+        .options(joinedload(Task.task_type))
+    )
     result = await session.scalars(stmt)
-    return list(result.unique().all())
+    task = result.first()
+    if not task:
+        if await _get_archived_task(session, task_id, account_id):
+            raise ValueError("Tarefa arquivada não pode ser alterada")
+        raise ValueError("Tarefa não encontrada")
+    return task
 
 
-async def get_task(session: AsyncSession, task_id: UUID, account_id: UUID) -> Task:
+async def get_task(session: AsyncSession, task_id: UUID, account_id: UUID) -> Union[Task, ArchivedTask]:
     stmt = (
         select(Task)
-        .join(Project, Task.project_id == Project.id)
-        .where(Task.id == task_id, Project.account_id == account_id)
+        .where(
+            Task.id == task_id, Task.account_id == account_id, not_pending_deletion(Task.account_id, Task.project_id)
+        )
         .options(joinedload(Task.task_type))
     )
     result = await session.scalars(stmt)
-    task = result.first()
+    task = result.first() or await _get_archived_task(session, task_id, account_id)
     if not task:
         raise ValueError("Tarefa não encontrada")
     return task
@@ -162,6 +208,8 @@ async def get_task(session: AsyncSession, task_id: UUID, account_id: UUID) -> Ta
 async def create_task(session: AsyncSession, payload: Dict[str, Any]) -> Task:
     data = payload.copy()
     account_id: UUID = data.pop("account_id")
+    quotas = get_quota_tracker()
+    quotas.check(account_id, "tasks")
     project_id: UUID = data["project_id"]
     project = await _assert_project_belongs_to_account(session, account_id, project_id)
 
@@ -170,11 +218,12 @@ async def create_task(session: AsyncSession, payload: Dict[str, Any]) -> Task:
 
     parent_id = data.get("parent_id")
     if parent_id:
-        parent_task = await get_task(session, parent_id, account_id)
+        parent_task = await _get_active_task(session, parent_id, account_id)
         data["parent_id"] = parent_task.id
 
     task = Task(
         project_id=project.id,
+        account_id=project.account_id,
         parent_id=data.get("parent_id"),
         task_type_id=task_type_id,
         external_ref=data.get("external_ref"),
@@ -194,22 +243,24 @@ async def create_task(session: AsyncSession, payload: Dict[str, Any]) -> Task:
     )
     session.add(task)
     await session.commit()
+    quotas.record(account_id, "tasks")
     await session.refresh(task, attribute_names=["task_type"])
     return task
 
 
 async def update_task(session: AsyncSession, task_id: UUID, account_id: UUID, payload: Dict[str, Any]) -> Task:
-    task = await get_task(session, task_id, account_id)
+    task = await _get_active_task(session, task_id, account_id)
 
     if "project_id" in payload and payload["project_id"] and payload["project_id"] != task.project_id:
-        await _assert_project_belongs_to_account(session, account_id, payload["project_id"])
-        task.project_id = payload["project_id"]
+        project = await _assert_project_belongs_to_account(session, account_id, payload["project_id"])
+        task.project_id = project.id
+        task.account_id = project.account_id
 
     if "task_type_id" in payload:
         await _assert_task_type_belongs_to_account(session, account_id, payload.get("task_type_id"))
 
     if "parent_id" in payload and payload["parent_id"]:
-        parent_task = await get_task(session, payload["parent_id"], account_id)
+        parent_task = await _get_active_task(session, payload["parent_id"], account_id)
         payload["parent_id"] = parent_task.id
 
     for key, value in payload.items():
@@ -223,7 +274,7 @@ async def update_task(session: AsyncSession, task_id: UUID, account_id: UUID, pa
 
 
 async def delete_task(session: AsyncSession, task_id: UUID, account_id: UUID) -> None:
-    task = await get_task(session, task_id, account_id)
+    task = await _get_active_task(session, task_id, account_id)
     await session.delete(task)
     await session.commit()
 
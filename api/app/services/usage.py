@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..models.admin import Account, AccountUsage, AccountUsageMonthly
+from ..quotas import MONTHLY_KEYS, QUOTA_KEYS, STOCK_KEYS, current_month, parse_quotas
+
+
+async def get_account_usage(session: AsyncSession, account_id: UUID) -> Dict[str, Any]:
+    """Uso da conta lido dos contadores mantidos por triggers, com os limites do plano atual."""
+    account = await session.scalar(
+        select(Account)
+        .where(Account.id == account_id, Account.deletion_requested_at.is_(None))
+        .options(selectinload(Account.plan))
+    )
+    if account is None:
+        raise LookupError("Conta não encontrada")
+    month = current_month()
+    stock = await session.get(AccountUsage, account_id)
+    monthly = await session.get(AccountUsageMonthly, (account_id, month))
+    try:
+        quotas = parse_quotas((account.plan.features or {}).get("quotas", {}) if account.plan else {})
+    except ValueError:
+        quotas = {}
+
+    used = {key: getattr(stock, key) if stock else 0 for key in STOCK_KEYS}
+    used.update({key: getattr(monthly, key) if monthly else 0 for key in MONTHLY_KEYS})
+    updated = [row.updated_at for row in (stock, monthly) if row is not None]
+    return {
+        "account_id": account_id,
+        "month": month,
+        "updated_at": max(updated) if updated else None,
+        "usage": [
+            {
+                "key": key,
+                "period": "month" if key in MONTHLY_KEYS else "total",
+                "used": used[key],
+                "limit": quotas.get(key),
+                "remaining": max(quotas[key] - used[key], 0) if key in quotas else None,
+            }
+            for key in QUOTA_KEYS
+        ],
+    }
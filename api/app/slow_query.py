@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Sequence
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Só capturamos EXPLAIN ANALYZE para leituras: ANALYZE executa o statement de verdade.
+_EXPLAINABLE_PREFIXES = ("select", "with")
+_SKIP_OPTION = "skip_slow_query_log"
+_SERVICES_PACKAGE = f"{__package__}.services."
+
+
+@dataclass
+class SlowQueryEntry:
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameter_shapes: List[str]
+    caller: Optional[str]
+    plan: Optional[Any] = None
+    plan_error: Optional[str] = None
+    parameters: Optional[Sequence[Any]] = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("parameters")
+        data["recorded_at"] = self.recorded_at.isoformat()
+        return data
+
+
+def _shape_of(value: Any) -> str:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    return type(value).__name__
+
+
+def _parameter_shapes(parameters: Any) -> List[str]:
+    if parameters is None:
+        return []
+    if isinstance(parameters, dict):
+        return [f"{key}:{_shape_of(value)}" for key, value in parameters.items()]
+    if isinstance(parameters, (list, tuple)):
+        return [_shape_of(value) for value in parameters]
+    return [_shape_of(parameters)]
+
+
+def _caller_frames() -> Iterator[FrameType]:
+    """Frames de quem executou a query, atravessando o `greenlet_spawn` do SQLAlchemy.
+
+    Os eventos do engine rodam num greenlet filho, cuja pilha termina no `greenlet_spawn`. O
+    coroutine do serviço fica na pilha do greenlet pai, suspenso em `gr_frame` enquanto o
+    filho roda (por isso `asyncio.current_task().get_stack()` também não o alcança).
+    """
+    frame: Optional[FrameType] = sys._getframe(2)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def _find_service_caller() -> Optional[str]:
+    for frame in _caller_frames():
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_SERVICES_PACKAGE):
+            return f"{module}.{frame.f_code.co_name}"
+    return None
+
+
+class SlowQueryLog:
+    """Ring buffer de queries lentas com captura amostrada de EXPLAIN (ANALYZE, BUFFERS)."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        buffer_size: int = 500,
+        explain_sample_rate: float = 0.0,
+        queue_size: int = 100,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: Deque[SlowQueryEntry] = deque(maxlen=buffer_size)
+        self._queue: asyncio.Queue[SlowQueryEntry] = asyncio.Queue(maxsize=queue_size)
+        self._engine: Optional[AsyncEngine] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    # ===== Captura (caminho da requisição) =====
+
+    def install(self, engine: AsyncEngine) -> None:
+        # Os planos são capturados no primeiro engine instalado (o primário)
+        if self._engine is None:
+            self._engine = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def _handle_error(self, context) -> None:
+        # Statement que falhou não passa pelo after_cursor_execute: descarta o início dele
+        # para a lista não crescer nas conexões reaproveitadas do pool
+        conn = context.connection
+        if conn is not None and context.statement is not None:
+            started = conn.info.get("slow_query_started")
+            if started:
+                started.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["slow_query_started"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms or conn.get_execution_options().get(_SKIP_OPTION):
+            return
+
+        entry = SlowQueryEntry(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=round(duration_ms, 3),
+            statement=statement,
+            parameter_shapes=_parameter_shapes(parameters),
+            caller=_find_service_caller(),
+        )
+        self._entries.append(entry)
+
+        if (
+            not executemany
+            and statement.lstrip().lower().startswith(_EXPLAINABLE_PREFIXES)
+            and random.random() < self.explain_sample_rate
+        ):
+            entry.parameters = parameters
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                entry.parameters = None
+
+    # ===== EXPLAIN fora do caminho da requisição =====
+
+    def start(self) -> None:
+        if self._worker is None and self._engine is not None and self.explain_sample_rate > 0:
+            self._worker = asyncio.create_task(self._explain_worker())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _explain_worker(self) -> None:
+        while True:
+            entry = await self._queue.get()
+            try:
+                entry.plan = await self._explain(entry)
+            except Exception as exc:  # noqa: BLE001 - o plano é best-effort
+                entry.plan_error = str(exc)
+                logger.debug("Falha ao capturar EXPLAIN de query lenta", exc_info=True)
+            finally:
+                entry.parameters = None
+
+    async def _explain(self, entry: SlowQueryEntry) -> Any:
+        assert self._engine is not None
+        async with self._engine.connect() as conn:
+            conn = await conn.execution_options(**{_SKIP_OPTION: True})
+            async with conn.begin() as transaction:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {entry.statement}",
+                    tuple(entry.parameters or ()),
+                )
+                plan = result.scalar()
+                await transaction.rollback()
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+    # ===== Leitura =====
+
+    def entries(self, limit: Optional[int] = None) -> List[SlowQueryEntry]:
+        items = list(reversed(self._entries))
+        return items[:limit] if limit else items
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def iter_jsonl(self) -> Iterable[str]:
+        for entry in list(self._entries):
+            yield json.dumps(entry.to_dict(), default=str) + "\n"
+
+    def dump_jsonl(self, path: str) -> int:
+        count = 0
+        with open(path, "a", encoding="utf-8") as fh:
+            for line in self.iter_jsonl():
+                fh.write(line)
+                count += 1
+        return count
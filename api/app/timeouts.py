@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+QUERY_CANCELED_SQLSTATE = "57014"
+# Só cancelamos leituras: abortar uma escrita no meio deixaria o cliente sem saber se ela foi aplicada.
+CANCELLABLE_METHODS = {"GET", "HEAD"}
+
+
+def route_key(request: Request) -> Optional[str]:
+    route = request.scope.get("route")
+    if route is None:
+        return None
+    return f"{request.method} {route.path}"
+
+
+def statement_timeout_for(request: Request, timeouts: Dict[str, int]) -> Optional[int]:
+    if not timeouts:
+        return None
+    key = route_key(request)
+    return timeouts.get(key) if key else None
+
+
+def apply_statement_timeout(session: AsyncSession, timeout_ms: int) -> None:
+    """Aplica `SET LOCAL statement_timeout` em toda transação aberta pela sessão."""
+
+    def _set_local_timeout(sync_session, transaction, connection) -> None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+    event.listen(session.sync_session, "after_begin", _set_local_timeout)
+
+
+class CancelOnDisconnectMiddleware:
+    """Cancela o processamento de leituras quando o cliente desconecta.
+
+    O cancelamento da task propaga `CancelledError` até o `await` da query, e o asyncpg
+    envia o cancel request ao servidor, liberando a conexão do pool.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in CANCELLABLE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        # Único consumidor do `receive` original: repassa o corpo para a aplicação e
+        # continua escutando para detectar a desconexão enquanto a resposta é montada.
+        async def pump():
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        async def wrapped_receive():
+            if disconnected.is_set() and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        pump_task = asyncio.create_task(pump())
+        app_task = asyncio.create_task(self.app(scope, wrapped_receive, send))
+        disconnect_waiter = asyncio.create_task(disconnected.wait())
+        try:
+            await asyncio.wait({app_task, disconnect_waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if not app_task.done():
+                logger.info("Cliente desconectou; cancelando %s %s", scope["method"], scope["path"])
+                app_task.cancel()
+            try:
+                await app_task
+            except asyncio.CancelledError:
+                if not disconnected.is_set():
+                    raise
+        finally:
+            for task in (app_task, pump_task, disconnect_waiter):
+                if not task.done():
+                    task.cancel()
+
+
+async def database_timeout_handler(request: Request, exc: Exception):
+    if isinstance(exc, PoolTimeoutError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Banco de dados sobrecarregado. Tente novamente em instantes."},
+            headers={"Retry-After": "1"},
+        )
+    if isinstance(exc, DBAPIError) and getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE:
+        return JSONResponse(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            content={"detail": "A consulta excedeu o tempo limite."},
+        )
+    raise exc
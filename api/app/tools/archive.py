@@ -0,0 +1,246 @@
+"""Arquivamento de tarefas concluídas: `task` → `task_archive` (arquivo frio no próprio Postgres).
+
+Uso (a partir de `api/`, tipicamente num cron diário):
+
+    python -m app.tools.archive status                  # tamanho de task × arquivo e linhas arquivadas
+    python -m app.tools.archive run --dry-run           # quantas tarefas seriam arquivadas
+    python -m app.tools.archive run                     # concluídas há mais de TASK_ARCHIVE_AFTER_DAYS
+    python -m app.tools.archive run --older-than-days 365 --account-id <uuid> --batch-size 500
+
+Elegíveis: `status = 'done'`, `completed_at` anterior ao corte e sem subtarefas em `task`
+(arquivar o pai esvaziaria o `parent_id` dos filhos). `task` é percorrida pela PK
+`(account_id, id)` em janelas de `--batch-size` linhas; cada janela é uma transação curta que
+trava as elegíveis (`FOR UPDATE SKIP LOCKED`, sem esperar por quem estiver editando), copia
+tarefas, `sprint_task` e comentários para `*_archive` e apaga as tarefas (o resto sai pelo
+cascade). A transação liga `pulsehub.archiving` (o rollup do projeto não desconta as
+tarefas, ver `migrations/20250326_add_task_archive.sql`), `pulsehub.skip_notify` e
+`pulsehub.skip_outbox`.
+
+Tarefas arquivadas são só leitura: `get_task` e `list_tasks(include_archived=True)` leem
+de `task_archive` (ver `app.services.task`). O espaço liberado nos índices de `task` volta a
+ser usado pelas próximas inserções; para encolhê-los depois de um primeiro arquivamento
+grande, `REINDEX INDEX CONCURRENTLY` em cada partição.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Sequence
+from uuid import UUID
+
+import asyncpg
+
+from ..config import get_settings
+from .migrate import connect
+
+# (origem, arquivo); tarefas primeiro, pelas FKs do arquivo
+ARCHIVES = (
+    ("task", "task_archive"),
+    ("sprint_task", "sprint_task_archive"),
+    ("task_comment", "task_comment_archive"),
+)
+
+_ELIGIBLE = """
+t.status = 'done' AND t.completed_at < {cutoff}
+AND NOT EXISTS (SELECT 1 FROM task c WHERE c.account_id = t.account_id AND c.parent_id = t.id)
+"""
+
+
+@dataclass
+class ArchiveResult:
+    tasks: int = 0
+    sprint_rows: int = 0
+    comments: int = 0
+    scanned: int = 0
+    batches: int = 0
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def archive_columns(conn: asyncpg.Connection, source: str, archive: str) -> List[str]:
+    """Colunas de `source`, na ordem da tabela; falha se o arquivo não tiver alguma."""
+    rows = await conn.fetch(
+        """
+        SELECT s.attname AS name, a.attname IS NOT NULL AS archived
+        FROM pg_attribute s
+        LEFT JOIN pg_attribute a
+          ON a.attrelid = CAST($2 AS regclass) AND a.attname = s.attname AND a.attnum > 0 AND NOT a.attisdropped
+        WHERE s.attrelid = CAST($1 AS regclass) AND s.attnum > 0 AND NOT s.attisdropped
+        ORDER BY s.attnum
+        """,
+        source,
+        archive,
+    )
+    missing = [row["name"] for row in rows if not row["archived"]]
+    if missing:
+        raise RuntimeError(f"{archive} não tem as colunas {', '.join(missing)} de {source}: crie-as antes de arquivar")
+    return [row["name"] for row in rows]
+
+
+def _copy(archive: str, columns: Sequence[str], source: str) -> str:
+    names = ", ".join(_ident(column) for column in columns)
+    values = ", ".join(f"s.{_ident(column)}" for column in columns)
+    return f"INSERT INTO {_ident(archive)} ({names}, archived_at) SELECT {values}, now() FROM {source} RETURNING 1"
+
+
+async def _move_sql(conn: asyncpg.Connection) -> str:
+    tasks, sprints, comments = [await archive_columns(conn, source, archive) for source, archive in ARCHIVES]
+    # As tarefas são copiadas de `batch`, a versão travada; o snapshot do statement pode ser
+    # mais antigo se alguém a editou enquanto o lote esperava
+    return f"""
+    WITH scanned AS (
+      SELECT account_id, id FROM task
+      WHERE (account_id, id) > ($1, $2) AND ($3::uuid IS NULL OR account_id = $3)
+      ORDER BY account_id, id
+      LIMIT $4
+    ), batch AS (
+      SELECT t.*
+      FROM task t
+      JOIN scanned s ON s.account_id = t.account_id AND s.id = t.id
+      WHERE {_ELIGIBLE.format(cutoff="$5")}
+      FOR UPDATE OF t SKIP LOCKED
+    ), archived_tasks AS (
+      {_copy("task_archive", tasks, "batch s")}
+    ), archived_sprints AS (
+      {_copy("sprint_task_archive", sprints, "sprint_task s JOIN batch b ON s.account_id = b.account_id AND s.task_id = b.id")}
+    ), archived_comments AS (
+      {_copy("task_comment_archive", comments, "task_comment s JOIN batch b ON s.account_id = b.account_id AND s.task_id = b.id")}
+    ), moved AS (
+      DELETE FROM task t USING batch b WHERE t.account_id = b.account_id AND t.id = b.id RETURNING 1
+    )
+    SELECT last.account_id, last.id,
+           (SELECT count(*) FROM scanned) AS scanned,
+           (SELECT count(*) FROM moved) AS tasks,
+           (SELECT count(*) FROM archived_sprints) AS sprint_rows,
+           (SELECT count(*) FROM archived_comments) AS comments,
+           (SELECT count(*) FROM archived_tasks) AS archived
+    FROM (SELECT account_id, id FROM scanned ORDER BY account_id DESC, id DESC LIMIT 1) AS last
+    """
+
+
+async def count_eligible(conn: asyncpg.Connection, cutoff: datetime, account_id: Optional[UUID] = None) -> int:
+    return await conn.fetchval(
+        f"SELECT count(*) FROM task t WHERE ($2::uuid IS NULL OR t.account_id = $2) AND {_ELIGIBLE.format(cutoff='$1')}",
+        cutoff,
+        account_id,
+    )
+
+
+async def archive_tasks(
+    conn: asyncpg.Connection,
+    cutoff: datetime,
+    *,
+    account_id: Optional[UUID] = None,
+    batch_size: int = 1_000,
+    pause_seconds: float = 0.0,
+    on_batch: Optional[Callable[[ArchiveResult], None]] = None,
+) -> ArchiveResult:
+    """Arquiva as tarefas concluídas antes de `cutoff`, uma transação por janela da PK."""
+    sql = await _move_sql(conn)
+    result = ArchiveResult()
+    last_account = last_id = UUID(int=0)
+    while True:
+        async with conn.transaction():
+            await conn.execute("SET LOCAL pulsehub.archiving = 'on'")
+            await conn.execute("SET LOCAL pulsehub.skip_notify = 'on'")
+            await conn.execute("SET LOCAL pulsehub.skip_outbox = 'on'")
+            row = await conn.fetchrow(sql, last_account, last_id, account_id, batch_size, cutoff)
+            if row is not None and row["archived"] != row["tasks"]:
+                raise RuntimeError(f"lote após {last_account}/{last_id}: {row['archived']} arquivadas, {row['tasks']} apagadas")
+        if row is None:
+            return result
+        result.batches += 1
+        result.scanned += row["scanned"]
+        result.tasks += row["tasks"]
+        result.sprint_rows += row["sprint_rows"]
+        result.comments += row["comments"]
+        last_account, last_id = row["account_id"], row["id"]
+        if on_batch:
+            on_batch(result)
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
+
+
+def _cutoff(args: argparse.Namespace) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
+
+
+def _print_progress(result: ArchiveResult) -> None:
+    print(f"  {result.scanned:,} tarefas percorridas, {result.tasks:,} arquivadas", end="\r", flush=True)
+
+
+async def cmd_status(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    rows = await conn.fetch(
+        """
+        SELECT t.name,
+               (SELECT coalesce(sum(greatest(c.reltuples, 0)), 0)::bigint FROM pg_partition_tree(CAST(t.name AS regclass)) AS tree
+                JOIN pg_class c ON c.oid = tree.relid WHERE tree.isleaf) AS rows,
+               (SELECT coalesce(sum(pg_indexes_size(tree.relid)), 0)::bigint
+                FROM pg_partition_tree(CAST(t.name AS regclass)) AS tree WHERE tree.isleaf) AS index_bytes
+        FROM unnest($1::text[]) AS t(name)
+        """,
+        [name for pair in ARCHIVES for name in pair],
+    )
+    for row in rows:
+        print(f"  {row['name']:<22} ~{row['rows']:>12,} linhas  índices {row['index_bytes'] / 1024 / 1024:>10,.1f} MB")
+    return 0
+
+
+async def cmd_run(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    cutoff = _cutoff(args)
+    if args.dry_run:
+        eligible = await count_eligible(conn, cutoff, args.account_id)
+        print(f"{eligible:,} tarefas concluídas antes de {cutoff:%Y-%m-%d} seriam arquivadas")
+        return 0
+    started = time.perf_counter()
+    result = await archive_tasks(
+        conn,
+        cutoff,
+        account_id=args.account_id,
+        batch_size=args.batch_size,
+        pause_seconds=args.pause_seconds,
+        on_batch=_print_progress,
+    )
+    print(
+        f"{result.tasks:,} tarefas arquivadas ({result.sprint_rows:,} linhas de sprint, {result.comments:,} comentários) "
+        f"em {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+COMMANDS = {"status": cmd_status, "run": cmd_run}
+
+
+async def main(args: argparse.Namespace) -> int:
+    conn = await connect()
+    try:
+        return await COMMANDS[args.command](conn, args)
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS), help="status ou run")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=get_settings().task_archive_after_days,
+        help="Dias desde a conclusão para arquivar",
+    )
+    parser.add_argument("--account-id", type=UUID, help="Limita a uma conta")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Tarefas percorridas por transação")
+    parser.add_argument("--pause-seconds", type=float, default=0.0, help="Pausa entre lotes")
+    parser.add_argument("--dry-run", action="store_true", help="run: só conta as tarefas elegíveis")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,180 @@
+"""Backfill online em lotes ordenados pela chave, com pausa entre lotes e retomada.
+
+Uso típico dentro de uma migração Python não transacional (ver `app.tools.migrate`):
+
+    from app.tools.backfill import Backfill, run_backfill
+
+    TRANSACTIONAL = False
+
+    async def upgrade(conn):
+        await run_backfill(
+            conn,
+            Backfill(
+                name="task_account_id",
+                table="task",
+                set_sql="account_id = p.account_id",
+                from_sql="project p",
+                where="p.id = t.project_id AND t.account_id IS NULL",
+            ),
+        )
+
+Cada lote é uma transação curta: seleciona as próximas `batch_size` chaves depois da
+última processada, atualiza as que casam com `where` e grava o progresso em
+`schema_backfill` no mesmo commit. Se o processo cair, a próxima execução continua do
+último lote confirmado. `set_sql`, `where` e `from_sql` referenciam a tabela pelo alias `t`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import asyncpg
+
+PROGRESS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS schema_backfill (
+  name          text PRIMARY KEY,
+  table_name    text NOT NULL,
+  last_key      text,
+  rows_updated  bigint NOT NULL DEFAULT 0,
+  batches       integer NOT NULL DEFAULT 0,
+  completed_at  timestamptz,
+  updated_at    timestamptz NOT NULL DEFAULT now()
+)
+"""
+
+_SAVE_PROGRESS = """
+INSERT INTO schema_backfill (name, table_name, last_key, rows_updated, batches, completed_at, updated_at)
+VALUES ($1, $2, $3, $4, 1, CASE WHEN $5 THEN now() END, now())
+ON CONFLICT (name) DO UPDATE SET
+  last_key = COALESCE(EXCLUDED.last_key, schema_backfill.last_key),
+  rows_updated = schema_backfill.rows_updated + EXCLUDED.rows_updated,
+  batches = schema_backfill.batches + 1,
+  completed_at = EXCLUDED.completed_at,
+  updated_at = now()
+"""
+
+
+@dataclass
+class Backfill:
+    name: str
+    table: str
+    set_sql: str
+    where: str = "TRUE"
+    from_sql: Optional[str] = None
+    key: str = "id"
+    batch_size: int = 5_000
+    pause_seconds: float = 0.1
+    lock_timeout_ms: int = 2_000
+    lock_retries: int = 5
+
+
+@dataclass
+class BackfillResult:
+    name: str
+    batches: int
+    rows_updated: int
+    last_key: Optional[str]
+    completed: bool
+
+
+async def _key_type(conn: asyncpg.Connection, table: str, key: str) -> str:
+    key_type = await conn.fetchval(
+        """
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = CAST($1 AS regclass) AND attname = $2 AND NOT attisdropped
+        """,
+        table,
+        key,
+    )
+    if key_type is None:
+        raise ValueError(f"Coluna {key} não encontrada em {table}")
+    return key_type
+
+
+def _batch_sql(spec: Backfill, key_type: str, first: bool) -> str:
+    lower_bound = "" if first else f"WHERE {spec.key} > CAST($2::text AS {key_type})"
+    from_sql = f", {spec.from_sql}" if spec.from_sql else ""
+    return f"""
+    WITH batch AS (
+      SELECT {spec.key} AS k FROM {spec.table} {lower_bound} ORDER BY {spec.key} LIMIT $1
+    ), updated AS (
+      UPDATE {spec.table} AS t SET {spec.set_sql}
+      FROM batch{from_sql}
+      WHERE t.{spec.key} = batch.k AND ({spec.where})
+      RETURNING 1
+    )
+    SELECT
+      (SELECT k::text FROM batch ORDER BY k DESC LIMIT 1) AS last_key,
+      (SELECT count(*) FROM updated) AS updated
+    """
+
+
+async def run_backfill(
+    conn: asyncpg.Connection,
+    spec: Backfill,
+    *,
+    max_batches: Optional[int] = None,
+    restart: bool = False,
+    on_batch: Optional[Callable[[BackfillResult], None]] = None,
+) -> BackfillResult:
+    """Executa (ou retoma) o backfill até o fim da tabela ou até `max_batches` lotes."""
+    if conn.is_in_transaction():
+        raise RuntimeError("run_backfill precisa de uma conexão fora de transação (um commit por lote)")
+    await conn.execute(PROGRESS_TABLE_DDL)
+    if restart:
+        await conn.execute("DELETE FROM schema_backfill WHERE name = $1", spec.name)
+
+    state = await conn.fetchrow("SELECT last_key, completed_at FROM schema_backfill WHERE name = $1", spec.name)
+    result = BackfillResult(spec.name, 0, 0, state["last_key"] if state else None, False)
+    if state and state["completed_at"] is not None:
+        result.completed = True
+        return result
+
+    key_type = await _key_type(conn, spec.table, spec.key)
+    first_sql = _batch_sql(spec, key_type, first=True)
+    next_sql = _batch_sql(spec, key_type, first=False)
+
+    while max_batches is None or result.batches < max_batches:
+        for attempt in range(spec.lock_retries + 1):
+            try:
+                async with conn.transaction():
+                    await conn.execute(f"SET LOCAL lock_timeout = {int(spec.lock_timeout_ms)}")
+                    # Backfill não é mudança de negócio: não dispara o stream nem a outbox.
+                    await conn.execute("SET LOCAL pulsehub.skip_notify = 'on'")
+                    await conn.execute("SET LOCAL pulsehub.skip_outbox = 'on'")
+                    if result.last_key is None:
+                        row = await conn.fetchrow(first_sql, spec.batch_size)
+                    else:
+                        row = await conn.fetchrow(next_sql, spec.batch_size, result.last_key)
+                    done = row["last_key"] is None
+                    await conn.execute(
+                        _SAVE_PROGRESS, spec.name, spec.table, row["last_key"], row["updated"], done
+                    )
+                break
+            except asyncpg.exceptions.LockNotAvailableError:
+                if attempt == spec.lock_retries:
+                    raise
+                # Alguém segura lock nas linhas do lote: recua e tenta de novo em vez de enfileirar.
+                await asyncio.sleep(spec.pause_seconds * 2 ** (attempt + 1))
+
+        result.batches += 1
+        result.rows_updated += row["updated"]
+        if done:
+            result.completed = True
+        else:
+            result.last_key = row["last_key"]
+        if on_batch:
+            on_batch(result)
+        if done:
+            break
+        await asyncio.sleep(spec.pause_seconds)
+    return result
+
+
+def print_progress(result: BackfillResult) -> None:
+    """Callback simples para `on_batch` que imprime o andamento."""
+    status = "concluído" if result.completed else f"até {result.last_key}"
+    print(f"  backfill {result.name}: lote {result.batches}, {result.rows_updated:,} linhas ({status})")
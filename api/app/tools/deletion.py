@@ -0,0 +1,333 @@
+"""Exclusão de contas e projetos em lotes, em segundo plano.
+
+Uso (a partir de `api/`):
+
+    python -m app.tools.deletion status              # jobs ativos e os últimos concluídos
+    python -m app.tools.deletion run                 # processa os jobs pendentes até o fim
+    python -m app.tools.deletion run <job_id> --batch-size 200
+    python -m app.tools.deletion retry <job_id>      # volta um job `failed` para a fila
+
+`DELETE /api/admin/accounts/{id}` e `DELETE .../projects/{id}` só marcam a linha com
+`deletion_requested_at`, o que a tira das leituras, e criam um `deletion_job` (ver
+`migrations/20250402_add_deletion_jobs.sql`). O job percorre `STEPS[kind]`
+(`app.deletion_steps`): em cada tabela filha, apaga (ou, onde a FK é `SET NULL`, desvincula
+do projeto) até `--batch-size` linhas na ordem de uma chave indexada. Cada lote é uma transação curta que também grava o passo, o
+cursor e as linhas por tabela no job. Depois de uma queda, o job continua do último lote
+confirmado. O cursor é inclusivo (`chave >= último`): as linhas do lote anterior já sumiram e
+as que empataram na chave ainda entram. Os lotes ligam `pulsehub.skip_notify`, mas não
+`pulsehub.skip_outbox`: o stream não é inundado e a outbox recebe um evento por linha apagada
+ou desvinculada. O `DELETE` final da conta ou do projeto sai normalmente no stream e leva pelo
+cascade só o que sobrou (inclusive linhas criadas durante a exclusão).
+
+A API roda os jobs em segundo plano (`DeletionWorker`, ver `DELETION_WORKER_INTERVAL`). Um
+advisory lock por job garante um só executor; se o processo cai, o lock cai com a conexão.
+Um erro devolve o job para a fila; depois de `DELETION_MAX_FAILURES` falhas seguidas ele fica
+`failed` até um `retry` ou um novo pedido de exclusão.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import asyncpg
+
+from ..config import get_settings
+from ..deletion_steps import STEPS, Step, step_names
+from .migrate import connect
+
+logger = logging.getLogger(__name__)
+
+_LOCK_PREFIX = "pulsehub_deletion_job:"
+
+
+_FINAL = {
+    "account": "DELETE FROM account WHERE id = $1",
+    "project": "DELETE FROM project WHERE account_id = $1 AND id = $2",
+}
+
+_QUEUE = """
+SELECT id FROM deletion_job
+WHERE status IN ('pending', 'running') AND ($1::uuid IS NULL OR id = $1)
+ORDER BY requested_at
+LIMIT 100
+"""
+
+_START = """
+UPDATE deletion_job
+SET status = 'running', started_at = coalesce(started_at, now()), updated_at = now()
+WHERE id = $1 AND status IN ('pending', 'running')
+RETURNING kind, account_id, project_id, step, cursor
+"""
+
+_PROGRESS = """
+UPDATE deletion_job
+SET step = $2, cursor = $3,
+    processed = jsonb_set(processed, ARRAY[$4::text], to_jsonb(coalesce((processed ->> $4::text)::bigint, 0) + $5)),
+    updated_at = now()
+WHERE id = $1
+"""
+
+_FINISH = """
+UPDATE deletion_job
+SET status = 'done', cursor = NULL, error = NULL, failures = 0, finished_at = now(), updated_at = now()
+WHERE id = $1
+"""
+
+_FAIL = """
+UPDATE deletion_job
+SET failures = failures + 1, error = $2, updated_at = now(),
+    status = CASE WHEN failures + 1 >= $3 THEN 'failed' ELSE 'pending' END
+WHERE id = $1
+RETURNING status
+"""
+
+
+def batch_sql(kind: str, step: Step) -> str:
+    """Um lote de `step`: trava, apaga/desvincula e devolve quantas linhas e a última chave."""
+    scope = "account_id = $1" if kind == "account" else "account_id = $1 AND project_id = $2"
+    cursor, limit = ("$2", "$3") if kind == "account" else ("$3", "$4")
+    columns = ", ".join(dict.fromkeys((step.key, *step.pk)))
+    pk = ", ".join(step.pk)
+    if step.action == "unlink":
+        change = f"UPDATE {step.table} SET project_id = NULL"
+    else:
+        change = f"DELETE FROM {step.table}"
+    return f"""
+    WITH batch AS (
+      SELECT {columns} FROM {step.table}
+      WHERE {scope} AND ({cursor}::text IS NULL OR {step.key} >= CAST({cursor}::text AS {step.key_type}))
+      ORDER BY {step.key}
+      LIMIT {limit}
+      FOR UPDATE
+    ),
+    changed AS (
+      {change} WHERE {scope} AND ({pk}) IN (SELECT {pk} FROM batch) RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM batch) AS selected,
+           (SELECT count(*) FROM changed) AS changed,
+           (SELECT {step.key}::text FROM batch ORDER BY {step.key} DESC LIMIT 1) AS last_key
+    """
+
+
+ProgressCallback = Callable[[UUID, str, int], None]
+
+
+async def run_job(
+    conn: asyncpg.Connection,
+    job_id: UUID,
+    *,
+    batch_size: int,
+    pause_seconds: float = 0.0,
+    max_failures: int = 5,
+    on_batch: Optional[ProgressCallback] = None,
+) -> Optional[str]:
+    """Executa o job do ponto salvo até o fim; devolve o status final (None se não está ativo)."""
+    job = await conn.fetchrow(_START, job_id)
+    if job is None:
+        return None
+    kind = job["kind"]
+    steps = STEPS[kind]
+    target: Sequence[UUID] = (job["account_id"],) if kind == "account" else (job["account_id"], job["project_id"])
+    step, cursor = job["step"], job["cursor"]
+    try:
+        while step < len(steps):
+            current = steps[step]
+            async with conn.transaction():
+                await conn.execute("SET LOCAL pulsehub.skip_notify = 'on'")
+                row = await conn.fetchrow(batch_sql(kind, current), *target, cursor, batch_size)
+                if row["selected"] < batch_size:
+                    step, cursor = step + 1, None
+                else:
+                    cursor = row["last_key"]
+                await conn.execute(_PROGRESS, job_id, step, cursor, current.table, row["changed"])
+            if on_batch:
+                on_batch(job_id, current.table, row["changed"])
+            if pause_seconds and row["selected"]:
+                await asyncio.sleep(pause_seconds)
+        async with conn.transaction():
+            await conn.execute(_FINAL[kind], *target)
+            await conn.execute(_FINISH, job_id)
+        logger.info("Exclusão %s concluída (%s %s)", job_id, kind, target[-1])
+        return "done"
+    except (asyncio.CancelledError, asyncpg.exceptions.ConnectionDoesNotExistError):
+        raise
+    except Exception as exc:
+        status = await conn.fetchval(_FAIL, job_id, str(exc), max_failures)
+        logger.exception("Exclusão %s falhou no passo %s (%s)", job_id, step, status)
+        return status
+
+
+async def run_pending(
+    conn: asyncpg.Connection,
+    *,
+    job_id: Optional[UUID] = None,
+    batch_size: int,
+    pause_seconds: float = 0.0,
+    max_failures: int = 5,
+    on_batch: Optional[ProgressCallback] = None,
+) -> Dict[str, int]:
+    """Roda os jobs ativos que nenhum outro executor está rodando; conta os status finais."""
+    results: Dict[str, int] = {}
+    for row in await conn.fetch(_QUEUE, job_id):
+        lock = f"{_LOCK_PREFIX}{row['id']}"
+        if not await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", lock):
+            continue
+        try:
+            status = await run_job(
+                conn,
+                row["id"],
+                batch_size=batch_size,
+                pause_seconds=pause_seconds,
+                max_failures=max_failures,
+                on_batch=on_batch,
+            )
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", lock)
+        if status:
+            results[status] = results.get(status, 0) + 1
+    return results
+
+
+class DeletionWorker:
+    """Roda os jobs de exclusão pendentes em segundo plano, dentro da API."""
+
+    def __init__(self, interval: float, batch_size: int, pause_seconds: float = 0.0, max_failures: int = 5):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.max_failures = max_failures
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> Dict[str, int]:
+        conn = await connect()
+        try:
+            return await run_pending(
+                conn,
+                batch_size=self.batch_size,
+                pause_seconds=self.pause_seconds,
+                max_failures=self.max_failures,
+            )
+        finally:
+            await conn.close()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Worker de exclusão falhou; nova tentativa em %.0fs", self.interval)
+            await asyncio.sleep(self.interval)
+
+
+async def cmd_status(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    rows = await conn.fetch(
+        """
+        SELECT * FROM deletion_job
+        WHERE status IN ('pending', 'running', 'failed') OR finished_at > now() - interval '7 days'
+        ORDER BY requested_at DESC
+        LIMIT $1
+        """,
+        args.limit,
+    )
+    if not rows:
+        print("Nenhum job de exclusão recente")
+    for row in rows:
+        names = step_names(row["kind"])
+        current = names[row["step"]] if row["step"] < len(names) else "final"
+        processed = json.loads(row["processed"]) if isinstance(row["processed"], str) else row["processed"]
+        print(
+            f"  {row['id']} {row['kind']} {row['project_id'] or row['account_id']}: {row['status']}, "
+            f"passo {min(row['step'] + 1, len(names))}/{len(names)} ({current}), "
+            f"{sum(processed.values()):,} linhas, {row['failures']} falhas"
+        )
+        if row["error"]:
+            print(f"    último erro: {row['error']}")
+    return 0
+
+
+def _print_progress(job_id: UUID, table: str, rows: int) -> None:
+    print(f"  {job_id}: {table} -{rows:,}", end="\r", flush=True)
+
+
+async def cmd_run(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    settings = get_settings()
+    results = await run_pending(
+        conn,
+        job_id=args.job_id,
+        batch_size=args.batch_size or settings.deletion_batch_size,
+        pause_seconds=args.pause_seconds,
+        max_failures=settings.deletion_max_failures,
+        on_batch=_print_progress,
+    )
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(results.items())) or "nenhum job"
+    print(f"Jobs processados: {summary}")
+    return 1 if set(results) - {"done"} else 0
+
+
+async def cmd_retry(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    status = await conn.fetchval(
+        """
+        UPDATE deletion_job SET status = 'pending', failures = 0, error = NULL, updated_at = now()
+        WHERE id = $1 AND status = 'failed'
+        RETURNING status
+        """,
+        args.job_id,
+    )
+    if status is None:
+        print(f"Job {args.job_id} não encontrado ou não está failed")
+        return 1
+    print(f"Job {args.job_id} de volta à fila")
+    return 0
+
+
+COMMANDS = {"status": cmd_status, "run": cmd_run, "retry": cmd_retry}
+
+
+async def main(args: argparse.Namespace) -> int:
+    conn = await connect()
+    try:
+        return await COMMANDS[args.command](conn, args)
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS), help="status, run ou retry")
+    parser.add_argument("job_id", nargs="?", type=UUID, help="run: só este job; retry: o job failed")
+    parser.add_argument("--batch-size", type=int, default=0, help="run: linhas por lote (padrão: DELETION_BATCH_SIZE)")
+    parser.add_argument("--pause-seconds", type=float, default=0.0, help="run: pausa entre lotes")
+    parser.add_argument("--limit", type=int, default=50, help="status: jobs listados")
+    args = parser.parse_args(argv)
+    if args.command == "retry" and args.job_id is None:
+        parser.error("retry exige o id do job")
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,102 @@
+"""Checagem de regressão do tempo de import de `app.main`.
+
+Uso (a partir de `api/`; não precisa de banco):
+
+    python -m app.tools.importtime
+    python -m app.tools.importtime --budget-ms 1500 --runs 7 --top 15
+
+Roda `python -X importtime -c "import app.main"` em `--runs` processos novos, usa a mediana
+do tempo cumulativo de `app.main` e falha (exit 1) se passar de `--budget-ms` ou se algum
+módulo de `--forbid` for carregado no import (o driver asyncpg, por exemplo, só deve ser
+importado quando o lifespan cria o engine). Lista também os módulos mais caros.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+API_DIR = Path(__file__).resolve().parents[2]
+TARGET = "app.main"
+DEFAULT_FORBIDDEN = ("asyncpg", "app.warmup", "httpx")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int, int]]:
+    """Módulo -> (self µs, cumulativo µs, profundidade)."""
+    modules: Dict[str, Tuple[int, int, int]] = {}
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def measure_once() -> Dict[str, Tuple[int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def loaded_forbidden(forbidden: List[str]) -> List[str]:
+    code = (
+        f"import json, sys, {TARGET}; "
+        f"print(json.dumps([m for m in {forbidden!r} if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="Orçamento para o import de app.main")
+    parser.add_argument("--runs", type=int, default=5, help="Processos medidos (usa a mediana)")
+    parser.add_argument("--top", type=int, default=10, help="Quantos módulos caros listar")
+    parser.add_argument(
+        "--forbid",
+        default=",".join(DEFAULT_FORBIDDEN),
+        help="Módulos que não podem ser carregados no import (separados por vírgula)",
+    )
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.runs)]
+    total_ms = statistics.median(run[TARGET][1] for run in runs) / 1000
+    names = set.intersection(*(set(run) for run in runs))
+    self_ms = {name: statistics.median(run[name][0] for run in runs) / 1000 for name in names}
+
+    print(f"{TARGET}: {total_ms:.0f} ms (mediana de {args.runs}, orçamento {args.budget_ms:.0f} ms)")
+    print("\nMódulos do app (self):")
+    for name, ms in sorted(((n, ms) for n, ms in self_ms.items() if n.startswith("app.")), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(f"  {ms:8.1f} ms  {name}")
+    print("\nTodos os módulos (self):")
+    for name, ms in sorted(self_ms.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import de {TARGET} levou {total_ms:.0f} ms (orçamento {args.budget_ms:.0f} ms)")
+    forbidden = [name.strip() for name in args.forbid.split(",") if name.strip()]
+    for name in loaded_forbidden(forbidden):
+        failures.append(f"{name} é carregado no import de {TARGET}")
+    for failure in failures:
+        print(f"FALHA {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Runner de migrações versionadas da pasta `migrations/`.
+
+Uso (a partir de `api/`, com as variáveis PG* apontando para o banco de destino):
+
+    python -m app.tools.migrate                  # aplica as pendentes (mesmo que `up`)
+    python -m app.tools.migrate status           # lista aplicadas, pendentes e alteradas
+    python -m app.tools.migrate up --to 20250212_add_sprint_support
+    python -m app.tools.migrate baseline 20250212_add_sprint_support   # banco migrado à mão
+
+A versão é o nome do arquivo sem extensão; a ordem é a alfabética. Cada migração aplicada
+fica registrada em `schema_migration` com o checksum do arquivo, e arquivos já aplicados
+que forem editados bloqueiam o `up` (use `--allow-changed` para seguir mesmo assim).
+
+- `.sql`: roda inteiro em uma transação, junto com o registro da versão. Arquivos com a
+  linha `-- migrate: no-transaction` (necessária para `CREATE INDEX CONCURRENTLY` ou
+  procedures com `COMMIT`) rodam statement a statement em autocommit; devem ser idempotentes,
+  pois uma falha no meio deixa os statements anteriores aplicados.
+- `.py`: define `async def upgrade(conn)` recebendo uma conexão asyncpg e, opcionalmente,
+  `TRANSACTIONAL = False` para controlar os commits (ex.: `app.tools.backfill.run_backfill`).
+
+Todo statement roda com `lock_timeout` (`--lock-timeout-ms`), para que uma migração não
+fique enfileirada atrás de uma transação longa bloqueando as leituras de `task` ou `doc_chunk`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional
+
+import asyncpg
+
+from ..config import get_settings
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "migrations"
+ADVISORY_LOCK_ID = 7_244_517_301  # identifica o runner em pg_locks
+
+VERSIONS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migration (
+  version        text PRIMARY KEY,
+  checksum       text NOT NULL,
+  transactional  boolean NOT NULL DEFAULT true,
+  execution_ms   integer,
+  applied_at     timestamptz NOT NULL DEFAULT now()
+)
+"""
+
+_NO_TRANSACTION = re.compile(r"^--\s*migrate:\s*no-transaction\b", re.MULTILINE | re.IGNORECASE)
+_CONCURRENTLY = re.compile(r"\bCONCURRENTLY\b", re.IGNORECASE)
+_DOLLAR_TAG = re.compile(r"\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$")
+
+
+@dataclass
+class Migration:
+    version: str
+    path: Path
+    checksum: str
+    transactional: bool
+
+    @property
+    def is_python(self) -> bool:
+        return self.path.suffix == ".py"
+
+
+def _load_module(path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(f"migrations.{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Não foi possível carregar {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not callable(getattr(module, "upgrade", None)):
+        raise ValueError(f"{path.name} não define `async def upgrade(conn)`")
+    return module
+
+
+def discover(directory: Path) -> List[Migration]:
+    migrations: List[Migration] = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix not in {".sql", ".py"} or path.name.startswith(("_", ".")):
+            continue
+        content = path.read_bytes()
+        if path.suffix == ".py":
+            transactional = bool(getattr(_load_module(path), "TRANSACTIONAL", True))
+        else:
+            sql = content.decode("utf-8")
+            transactional = not _NO_TRANSACTION.search(sql)
+            if transactional and _CONCURRENTLY.search("\n".join(split_statements(sql))):
+                raise ValueError(
+                    f"{path.name} usa CONCURRENTLY: adicione a linha `-- migrate: no-transaction` ao arquivo"
+                )
+        migrations.append(Migration(path.stem, path, hashlib.sha256(content).hexdigest(), transactional))
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """Separa um script em statements, respeitando comentários, strings e blocos `$$`."""
+    statements: List[str] = []
+    start, i, n = 0, 0, len(sql)
+    has_code = False
+    while i < n:
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = n if end == -1 else end + 1
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if char in ("'", '"'):
+            has_code = True
+            i += 1
+            while i < n:
+                if sql[i] == char:
+                    if i + 1 < n and sql[i + 1] == char:
+                        i += 2
+                        continue
+                    break
+                i += 1
+            i += 1
+            continue
+        if char == "$":
+            match = _DOLLAR_TAG.match(sql, i)
+            if match:
+                has_code = True
+                end = sql.find(match.group(0), match.end())
+                i = n if end == -1 else end + len(match.group(0))
+                continue
+        if char == ";":
+            if has_code:
+                statements.append(_strip_leading_comments(sql[start:i]))
+            start, has_code = i + 1, False
+        elif not char.isspace():
+            has_code = True
+        i += 1
+    if has_code:
+        statements.append(_strip_leading_comments(sql[start:]))
+    return statements
+
+
+def _strip_leading_comments(statement: str) -> str:
+    statement = statement.strip()
+    while statement.startswith(("--", "/*")):
+        if statement.startswith("--"):
+            end = statement.find("\n")
+            statement = "" if end == -1 else statement[end + 1 :].lstrip()
+        else:
+            end = statement.find("*/")
+            statement = "" if end == -1 else statement[end + 2 :].lstrip()
+    return statement
+
+
+async def connect() -> asyncpg.Connection:
+    settings = get_settings()
+    conn = await asyncpg.connect(
+        host=settings.pg_host,
+        port=int(settings.pg_port),
+        user=settings.pg_user,
+        password=settings.pg_password,
+        database=settings.pg_database,
+        server_settings={"application_name": "pulsehub-migrate"},
+    )
+    # Migrações e backfills podem ser longos: sem o statement_timeout do perfil da API.
+    await conn.execute("SET statement_timeout = 0")
+    return conn
+
+
+async def applied_versions(conn: asyncpg.Connection) -> Dict[str, str]:
+    await conn.execute(VERSIONS_TABLE_DDL)
+    rows = await conn.fetch("SELECT version, checksum FROM schema_migration")
+    return {row["version"]: row["checksum"] for row in rows}
+
+
+async def _record(conn: asyncpg.Connection, migration: Migration, execution_ms: Optional[int]) -> None:
+    await conn.execute(
+        "INSERT INTO schema_migration (version, checksum, transactional, execution_ms) VALUES ($1, $2, $3, $4)",
+        migration.version,
+        migration.checksum,
+        migration.transactional,
+        execution_ms,
+    )
+
+
+async def apply(conn: asyncpg.Connection, migration: Migration, lock_timeout_ms: int) -> int:
+    """Aplica uma migração e registra a versão; devolve a duração em ms."""
+    started = time.perf_counter()
+    if migration.transactional:
+        async with conn.transaction():
+            await conn.execute(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}")
+            if migration.is_python:
+                await _load_module(migration.path).upgrade(conn)
+            else:
+                await conn.execute(migration.path.read_text(encoding="utf-8"))
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            await _record(conn, migration, elapsed_ms)
+        return elapsed_ms
+
+    await conn.execute(f"SET lock_timeout = {int(lock_timeout_ms)}")
+    try:
+        if migration.is_python:
+            await _load_module(migration.path).upgrade(conn)
+        else:
+            for statement in split_statements(migration.path.read_text(encoding="utf-8")):
+                await conn.execute(statement)
+    finally:
+        await conn.execute("RESET lock_timeout")
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+    await _record(conn, migration, elapsed_ms)
+    return elapsed_ms
+
+
+def changed_migrations(migrations: List[Migration], applied: Dict[str, str]) -> List[Migration]:
+    return [m for m in migrations if m.version in applied and applied[m.version] != m.checksum]
+
+
+async def cmd_status(conn: asyncpg.Connection, migrations: List[Migration], args: argparse.Namespace) -> int:
+    applied = await applied_versions(conn)
+    for migration in migrations:
+        if migration.version not in applied:
+            state = "pendente"
+        elif applied[migration.version] != migration.checksum:
+            state = "ALTERADA"
+        else:
+            state = "aplicada"
+        mode = "" if migration.transactional else " (sem transação)"
+        print(f"{state:<9} {migration.path.name}{mode}")
+    known = {migration.version for migration in migrations}
+    for version in sorted(set(applied) - known):
+        print(f"{'órfã':<9} {version} (registrada no banco, arquivo ausente)")
+    return 0
+
+
+async def cmd_up(conn: asyncpg.Connection, migrations: List[Migration], args: argparse.Namespace) -> int:
+    applied = await applied_versions(conn)
+    changed = changed_migrations(migrations, applied)
+    for migration in changed:
+        print(f"Migração já aplicada foi alterada: {migration.path.name}", file=sys.stderr)
+    if changed and not args.allow_changed:
+        return 1
+
+    pending = [m for m in migrations if m.version not in applied and (not args.to or m.version <= args.to)]
+    if not pending:
+        print("Nenhuma migração pendente.")
+        return 0
+    for migration in pending:
+        if args.dry_run:
+            print(f"pendente {migration.path.name}")
+            continue
+        print(f"aplicando {migration.path.name}...", flush=True)
+        try:
+            elapsed_ms = await apply(conn, migration, args.lock_timeout_ms)
+        except (asyncpg.PostgresError, OSError, ValueError) as exc:
+            hint = "" if migration.transactional else " (sem transação: corrija e rode de novo, os passos são idempotentes)"
+            print(f"Falha em {migration.path.name}: {exc}{hint}", file=sys.stderr)
+            return 1
+        print(f"  ok em {elapsed_ms} ms")
+    return 0
+
+
+async def cmd_baseline(conn: asyncpg.Connection, migrations: List[Migration], args: argparse.Namespace) -> int:
+    if args.version not in {migration.version for migration in migrations}:
+        print(f"Versão desconhecida: {args.version}", file=sys.stderr)
+        return 1
+    applied = await applied_versions(conn)
+    async with conn.transaction():
+        for migration in migrations:
+            if migration.version > args.version:
+                break
+            if migration.version not in applied:
+                await _record(conn, migration, None)
+                print(f"marcada {migration.path.name}")
+    return 0
+
+
+COMMANDS = {"up": cmd_up, "status": cmd_status, "baseline": cmd_baseline}
+
+
+async def main(args: argparse.Namespace) -> int:
+    migrations = discover(Path(args.dir))
+    conn = await connect()
+    try:
+        if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", ADVISORY_LOCK_ID):
+            print("Outra execução do runner de migrações está em andamento.", file=sys.stderr)
+            return 1
+        try:
+            return await COMMANDS[args.command](conn, migrations, args)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", ADVISORY_LOCK_ID)
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=str(MIGRATIONS_DIR), help="Pasta com as migrações")
+    parser.add_argument(
+        "--lock-timeout-ms",
+        type=int,
+        default=5_000,
+        help="lock_timeout de cada migração (0 = esperar indefinidamente)",
+    )
+    commands = parser.add_subparsers(dest="command")
+    up = commands.add_parser("up", help="Aplica as migrações pendentes")
+    up.add_argument("--to", help="Para na versão informada (inclusive)")
+    up.add_argument("--dry-run", action="store_true", help="Apenas lista as pendentes")
+    up.add_argument("--allow-changed", action="store_true", help="Segue mesmo com migrações aplicadas alteradas")
+    commands.add_parser("status", help="Lista o estado de cada migração")
+    baseline = commands.add_parser("baseline", help="Marca como aplicadas, sem executar, as versões até VERSION")
+    baseline.add_argument("version")
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args([*(argv if argv is not None else sys.argv[1:]), "up"])
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
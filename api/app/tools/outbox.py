@@ -0,0 +1,154 @@
+"""Publicador da outbox de mudanças e um receptor de webhook para testes locais.
+
+Uso (a partir de `api/`):
+
+    python -m app.tools.outbox status                                  # pendentes e atraso do mais antigo
+    python -m app.tools.outbox publish --sink file:events.ndjson       # NDJSON local, até Ctrl+C
+    python -m app.tools.outbox publish --sink http://localhost:8099/events --workers 4 --batch-size 1000
+    python -m app.tools.outbox publish --sink - --once                 # drena o que houver e sai
+    python -m app.tools.outbox stub --port 8099 --output received.ndjson --fail-rate 0.1
+
+`publish` roda até SIGINT/SIGTERM, terminando o lote em andamento (ver `app.outbox` para a
+semântica de entrega). `stub` sobe um webhook mínimo que grava o que recebe e, com
+`--fail-rate`, responde 503 a uma fração dos lotes para exercitar o reenvio.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import signal
+import sys
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI, Request, Response
+
+from ..outbox import OutboxPublisher, sink_from_url
+from .migrate import connect
+
+
+async def cmd_status(args: argparse.Namespace) -> int:
+    conn = await connect()
+    try:
+        row = await conn.fetchrow(
+            """
+            SELECT count(*) AS pending, min(created_at) AS oldest, min(id) AS first_id, max(id) AS last_id
+            FROM outbox
+            """
+        )
+        by_entity = await conn.fetch("SELECT entity, count(*) AS pending FROM outbox GROUP BY entity ORDER BY entity")
+    finally:
+        await conn.close()
+    lag = f", mais antigo de {row['oldest']:%Y-%m-%d %H:%M:%S%z}" if row["oldest"] else ""
+    print(f"{row['pending']:,} eventos pendentes{lag}")
+    for entity in by_entity:
+        print(f"  {entity['entity']:<10} {entity['pending']:>10,}")
+    return 0
+
+
+async def _report(publisher: OutboxPublisher, every: float) -> None:
+    while True:
+        await asyncio.sleep(every)
+        stats = publisher.stats
+        print(
+            f"  {stats.delivered:,} eventos em {stats.batches:,} lotes ({stats.rate:,.0f}/s), {stats.failures} falhas",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+async def cmd_publish(args: argparse.Namespace) -> int:
+    publisher = OutboxPublisher(
+        connect,
+        sink_from_url(args.sink),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        poll_interval=args.poll_interval,
+    )
+    if args.once:
+        conn = await connect()
+        try:
+            delivered = await publisher.drain(conn)
+        finally:
+            await conn.close()
+            await publisher.sink.close()
+        print(f"{delivered:,} eventos entregues", file=sys.stderr)
+        return 0
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, publisher.stop)
+    reporter = asyncio.create_task(_report(publisher, args.report_seconds)) if args.report_seconds > 0 else None
+    try:
+        stats = await publisher.run()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+    print(f"{stats.delivered:,} eventos entregues ({stats.rate:,.0f}/s), {stats.failures} falhas", file=sys.stderr)
+    return 0
+
+
+def _stub_app(output: Optional[str], fail_rate: float) -> FastAPI:
+    app = FastAPI(title="Outbox webhook stub")
+    received = {"events": 0, "batches": 0, "rejected": 0, "started": time.perf_counter()}
+    sink = open(output, "a", encoding="utf-8") if output else None
+
+    @app.post("/{path:path}")
+    async def receive(path: str, request: Request) -> Response:
+        if fail_rate and random.random() < fail_rate:
+            received["rejected"] += 1
+            return Response(status_code=503)
+        body = await request.body()
+        received["events"] += body.count(b"\n")
+        received["batches"] += 1
+        if sink is not None:
+            sink.write(body.decode("utf-8"))
+            sink.flush()
+        return Response(status_code=204)
+
+    @app.get("/stats")
+    async def stats() -> dict:
+        elapsed = time.perf_counter() - received["started"]
+        return {**received, "per_second": received["events"] / elapsed if elapsed else 0.0}
+
+    return app
+
+
+def cmd_stub(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    uvicorn.run(_stub_app(args.output, args.fail_rate), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+COMMANDS = {"status": cmd_status, "publish": cmd_publish}
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.command == "stub":
+        return cmd_stub(args)
+    return asyncio.run(COMMANDS[args.command](args))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted([*COMMANDS, "stub"]), help="status, publish ou stub")
+    parser.add_argument("--sink", default="-", help="publish: file:<caminho>, - (stdout) ou http(s)://...")
+    parser.add_argument("--batch-size", type=int, default=500, help="publish: eventos por lote (uma transação)")
+    parser.add_argument("--workers", type=int, default=1, help="publish: lotes em paralelo (ordem só dentro do lote)")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="publish: espera com a outbox vazia (s)")
+    parser.add_argument("--report-seconds", type=float, default=10.0, help="publish: intervalo do progresso (0 desliga)")
+    parser.add_argument("--once", action="store_true", help="publish: drena o que houver e sai")
+    parser.add_argument("--host", default="127.0.0.1", help="stub: endereço")
+    parser.add_argument("--port", type=int, default=8099, help="stub: porta")
+    parser.add_argument("--output", help="stub: arquivo NDJSON onde gravar o recebido")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="stub: fração de lotes respondidos com 503")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(parse_args()))
@@ -0,0 +1,678 @@
+"""Conversão online de uma tabela para um novo particionamento.
+
+Dois layouts: `HashPartitioning` (hash por conta) e `MonthlyPartitioning` (faixa mensal de
+data e, em cada mês, uma partição por prazo de retenção, ver `app.tools.retention`). A
+tabela de origem pode ser comum ou já particionada em outro layout. Uso típico dentro de uma
+migração Python não transacional (ver `app.tools.migrate`):
+
+    from app.tools.partition import HashPartitioning, partition_table
+
+    TRANSACTIONAL = False
+
+    async def upgrade(conn):
+        await partition_table(conn, HashPartitioning(table="task", primary_key=("id",)))
+
+Passos (cada um idempotente; se o processo cair, a próxima execução continua):
+
+1. Cria `<tabela>_partitioned` (`LIKE` a original) já com as partições do layout, PK
+   `<primary_key>` acrescida das colunas de partição, os mesmos índices e as FKs para
+   outras tabelas.
+2. Instala na tabela original um trigger que espelha inserts, updates e deletes na nova.
+3. Copia as linhas em lotes pela PK antiga (`FOR SHARE` + `ON CONFLICT DO NOTHING`), com o
+   progresso em `schema_backfill`, como `app.tools.backfill`.
+4. Troca as tabelas em uma transação curta (com `lock_timeout` e novas tentativas): a original
+   vira `<tabela><retired_suffix>` (`_unpartitioned` por padrão), os triggers e as funções que recebem o tipo da linha
+   (ex.: `project_rollup_apply(task[])`) passam para a nova, e as FKs que apontavam para a
+   original são recriadas `NOT VALID` apontando para a nova.
+5. Valida essas FKs fora da transação da troca e roda `ANALYZE`.
+
+FKs que referenciam a tabela precisam já incluir as colunas de partição (ver
+`migrations/20250318_add_account_keys_for_partitioning.sql`). A tabela aposentada fica para
+conferência e rollback; descarte com `DROP TABLE` depois de validar.
+Requer PostgreSQL 13+ (triggers BEFORE ROW em tabelas particionadas).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from .backfill import PROGRESS_TABLE_DDL, _SAVE_PROGRESS
+
+
+@dataclass
+class Partitioning:
+    table: str
+    primary_key: Sequence[str]
+    batch_size: int = 5_000
+    pause_seconds: float = 0.05
+    lock_timeout_ms: int = 2_000
+    lock_retries: int = 10
+    retired_suffix: str = "_unpartitioned"
+
+    # Definidos por cada layout
+    strategy = ""
+    partition_key = ""
+
+    @property
+    def partition_columns(self) -> List[str]:
+        return [self.partition_key]
+
+    @property
+    def partition_clause(self) -> str:
+        """Como `pg_get_partkeydef` descreve o layout; também identifica uma conversão já feita."""
+        return f"{self.strategy} ({self.partition_key})"
+
+    @property
+    def progress_name(self) -> str:
+        return f"partition_{self.table}"
+
+    @property
+    def shadow(self) -> str:
+        return f"{self.table}_partitioned"
+
+    @property
+    def retired(self) -> str:
+        return f"{self.table}{self.retired_suffix}"
+
+    @property
+    def mirror_trigger(self) -> str:
+        return f"trg_{self.table}_partition_mirror"
+
+    @property
+    def mirror_function(self) -> str:
+        return f"{self.table}_partition_mirror"
+
+    @property
+    def new_primary_key(self) -> List[str]:
+        return [*self.primary_key, *(column for column in self.partition_columns if column not in self.primary_key)]
+
+    async def create_partitions(self, conn: asyncpg.Connection) -> None:
+        raise NotImplementedError
+
+
+@dataclass
+class HashPartitioning(Partitioning):
+    partitions: int = 16
+    key: str = "account_id"
+
+    strategy = "HASH"
+
+    @property
+    def partition_key(self) -> str:
+        return self.key
+
+    @property
+    def new_primary_key(self) -> List[str]:
+        return [self.key, *(column for column in self.primary_key if column != self.key)]
+
+    async def create_partitions(self, conn: asyncpg.Connection) -> None:
+        for remainder in range(self.partitions):
+            await conn.execute(
+                f"CREATE TABLE {_ident(f'{self.table}_p{remainder:02d}')} PARTITION OF {_ident(self.shadow)} "
+                f"FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {remainder})"
+            )
+
+
+@dataclass
+class MonthlyPartitioning(Partitioning):
+    """`RANGE (column)` por mês e, em cada mês, `LIST (tier_column)` por prazo de retenção.
+
+    Cria os meses desde o mais antigo da origem até `months_ahead` meses à frente; datas fora
+    disso caem em `<tabela>_default` (ver `app.tools.retention`).
+    """
+
+    column: str = "occurred_at"
+    tier_column: str = "retention_months"
+    tiers: Sequence[int] = (0,)
+    months_ahead: int = 3
+
+    strategy = "RANGE"
+
+    @property
+    def partition_key(self) -> str:
+        return self.column
+
+    @property
+    def partition_columns(self) -> List[str]:
+        return [self.column, self.tier_column]
+
+    @property
+    def progress_name(self) -> str:
+        return f"partition_{self.table}_monthly"
+
+    async def create_partitions(self, conn: asyncpg.Connection) -> None:
+        oldest = await conn.fetchval(f"SELECT min({_ident(self.column)}) FROM {_ident(self.table)}")
+        current = month_start(date.today())
+        month = month_start(oldest.date()) if oldest is not None else current
+        while month <= add_months(current, self.months_ahead):
+            await add_month_partition(
+                conn, self.shadow, month, self.tiers, self.tier_column, self.column, partition_name=self.table
+            )
+            month = add_months(month, 1)
+        await conn.execute(
+            f"CREATE TABLE {_ident(f'{self.table}_default')} PARTITION OF {_ident(self.shadow)} DEFAULT"
+        )
+
+
+@dataclass
+class PartitionResult:
+    table: str
+    rows_copied: int
+    batches: int
+    swapped: bool
+    validated: List[str]
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _columns(columns: Sequence[str]) -> str:
+    return ", ".join(_ident(column) for column in columns)
+
+
+def _index_name(name: str, suffix: str) -> str:
+    return f"{name[: 63 - len(suffix)]}{suffix}"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def tier_partition_name(table: str, month: date, tier: int) -> str:
+    return f"{month_partition_name(table, month)}_r{int(tier)}"
+
+
+def _month_bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def _attach_moving_default(
+    conn: asyncpg.Connection, parent: str, partition: str, default: str, predicate: str, bound: str
+) -> int:
+    """Traz de `default` as linhas que pertencem à nova partição e a anexa; devolve quantas vieram.
+
+    A partição é criada solta e anexada com ATTACH, que trava a mãe só em SHARE UPDATE
+    EXCLUSIVE (leituras e escritas seguem), em vez do ACCESS EXCLUSIVE de `PARTITION OF`.
+    """
+    moved = 0
+    if await _relkind(conn, default) is not None:
+        status = await conn.execute(
+            f"WITH moved AS (DELETE FROM {_ident(default)} WHERE {predicate} RETURNING *) "
+            f"INSERT INTO {_ident(partition)} SELECT * FROM moved"
+        )
+        moved = int(status.split()[-1])
+    await conn.execute(f"ALTER TABLE {_ident(parent)} ATTACH PARTITION {_ident(partition)} {bound}")
+    return moved
+
+
+async def add_month_partition(
+    conn: asyncpg.Connection,
+    table: str,
+    month: date,
+    tiers: Sequence[int],
+    tier_column: str = "retention_months",
+    column: str = "occurred_at",
+    *,
+    partition_name: Optional[str] = None,
+) -> int:
+    """Cria o mês em `table` com uma partição por prazo de retenção e uma DEFAULT.
+
+    `partition_name` é o nome-base das partições quando `table` é a tabela-sombra. Rodar
+    dentro de uma transação; devolve as linhas trazidas de `<tabela>_default`.
+    """
+    base = partition_name or table
+    name = month_partition_name(base, month)
+    lower, upper = _month_bound(month), _month_bound(add_months(month, 1))
+    await conn.execute(
+        f"CREATE TABLE {_ident(name)} (LIKE {_ident(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY LIST ({_ident(tier_column)})"
+    )
+    for tier in sorted(set(tiers)):
+        await conn.execute(
+            f"CREATE TABLE {_ident(tier_partition_name(base, month, tier))} PARTITION OF {_ident(name)} "
+            f"FOR VALUES IN ({int(tier)})"
+        )
+    await conn.execute(f"CREATE TABLE {_ident(f'{name}_default')} PARTITION OF {_ident(name)} DEFAULT")
+    return await _attach_moving_default(
+        conn,
+        table,
+        name,
+        f"{base}_default",
+        f"{_ident(column)} >= {lower} AND {_ident(column)} < {upper}",
+        f"FOR VALUES FROM ({lower}) TO ({upper})",
+    )
+
+
+async def add_tier_partition(
+    conn: asyncpg.Connection, table: str, month: date, tier: int, tier_column: str = "retention_months"
+) -> int:
+    """Acrescenta a um mês existente a partição de um prazo novo (ex.: plano criado depois do mês)."""
+    name = tier_partition_name(table, month, tier)
+    await conn.execute(f"CREATE TABLE {_ident(name)} (LIKE {_ident(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    return await _attach_moving_default(
+        conn,
+        month_partition_name(table, month),
+        name,
+        f"{month_partition_name(table, month)}_default",
+        f"{_ident(tier_column)} = {int(tier)}",
+        f"FOR VALUES IN ({int(tier)})",
+    )
+
+
+async def _relkind(conn: asyncpg.Connection, table: str) -> Optional[str]:
+    return await conn.fetchval(
+        "SELECT relkind::text FROM pg_class WHERE oid = to_regclass($1)", table
+    )
+
+
+async def _column_types(conn: asyncpg.Connection, table: str, columns: Sequence[str]) -> List[str]:
+    rows = await conn.fetch(
+        """
+        SELECT attname, format_type(atttypid, atttypmod) AS type
+        FROM pg_attribute
+        WHERE attrelid = CAST($1 AS regclass) AND attname = ANY($2::text[]) AND NOT attisdropped
+        """,
+        table,
+        list(columns),
+    )
+    types = {row["attname"]: row["type"] for row in rows}
+    missing = [column for column in columns if column not in types]
+    if missing:
+        raise ValueError(f"Colunas {', '.join(missing)} não encontradas em {table}")
+    return [types[column] for column in columns]
+
+
+async def _indexes(conn: asyncpg.Connection, table: str) -> List[asyncpg.Record]:
+    """Índices da tabela (exceto a PK), com as colunas quando o índice é só de colunas."""
+    return await conn.fetch(
+        """
+        SELECT c.relname AS name, i.indisunique AS is_unique, pg_get_indexdef(i.indexrelid) AS definition,
+               CASE WHEN i.indexprs IS NULL AND i.indpred IS NULL THEN (
+                 SELECT array_agg(a.attname ORDER BY k.ord)
+                 FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                 JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+               ) END AS columns
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = CAST($1 AS regclass) AND NOT i.indisprimary
+        ORDER BY c.relname
+        """,
+        table,
+    )
+
+
+async def _outgoing_foreign_keys(conn: asyncpg.Connection, table: str) -> List[asyncpg.Record]:
+    """FKs da tabela para outras tabelas (a FK para ela mesma é tratada na troca)."""
+    return await conn.fetch(
+        """
+        SELECT conname AS name, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = CAST($1 AS regclass) AND contype = 'f' AND confrelid <> conrelid
+          AND conparentid = 0  -- sem os clones internos por partição da tabela referenciada
+        ORDER BY conname
+        """,
+        table,
+    )
+
+
+async def create_shadow(conn: asyncpg.Connection, spec: Partitioning) -> None:
+    """Passo 1: tabela particionada vazia com PK, índices e FKs de saída."""
+    if await _relkind(conn, spec.shadow) is not None:
+        return
+    table, shadow = _ident(spec.table), _ident(spec.shadow)
+    new_pk = spec.new_primary_key
+    indexes = await _indexes(conn, spec.table)
+    for index in indexes:
+        if index["is_unique"] and (
+            index["columns"] is None or any(column not in index["columns"] for column in spec.partition_columns)
+        ):
+            raise ValueError(
+                f"Índice único {index['name']} não inclui {', '.join(spec.partition_columns)}; ajuste antes de particionar"
+            )
+    foreign_keys = await _outgoing_foreign_keys(conn, spec.table)
+
+    async with conn.transaction():
+        await conn.execute(
+            f"CREATE TABLE {shadow} (LIKE {table} INCLUDING ALL EXCLUDING INDEXES) "
+            f"PARTITION BY {spec.strategy} ({_ident(spec.partition_key)})"
+        )
+        await spec.create_partitions(conn)
+        await conn.execute(
+            f"ALTER TABLE {shadow} ADD CONSTRAINT {_ident(_index_name(spec.table, '_partitioned_pkey'))} "
+            f"PRIMARY KEY ({_columns(new_pk)})"
+        )
+        for index in indexes:
+            if index["columns"] is not None and list(index["columns"]) == new_pk:
+                continue  # já coberto pela nova PK (ex.: uq_task_account_id)
+            definition = re.sub(
+                rf"^CREATE (UNIQUE )?INDEX {re.escape(index['name'])} ON (ONLY )?\S+",
+                lambda m: f"CREATE {m.group(1) or ''}INDEX {_ident(_index_name(index['name'], '_partitioned'))} ON {shadow}",
+                index["definition"],
+            )
+            await conn.execute(definition)
+        for fk in foreign_keys:
+            await conn.execute(f"ALTER TABLE {shadow} ADD CONSTRAINT {_ident(fk['name'])} {fk['definition']}")
+
+
+async def install_mirror(conn: asyncpg.Connection, spec: Partitioning) -> None:
+    """Passo 2: espelha na tabela nova toda escrita feita na original durante a cópia."""
+    old_key = " AND ".join(f"{_ident(column)} = OLD.{_ident(column)}" for column in spec.new_primary_key)
+    async with conn.transaction():
+        await conn.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {_ident(spec.mirror_function)}() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+              IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {_ident(spec.shadow)} WHERE {old_key};
+              END IF;
+              IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {_ident(spec.shadow)} SELECT NEW.*;
+              END IF;
+              RETURN NULL;
+            END
+            $$
+            """
+        )
+        await conn.execute(f"DROP TRIGGER IF EXISTS {_ident(spec.mirror_trigger)} ON {_ident(spec.table)}")
+        await conn.execute(
+            f"CREATE TRIGGER {_ident(spec.mirror_trigger)} AFTER INSERT OR UPDATE OR DELETE ON {_ident(spec.table)} "
+            f"FOR EACH ROW EXECUTE FUNCTION {_ident(spec.mirror_function)}()"
+        )
+
+
+def _copy_sql(spec: Partitioning, key_types: Sequence[str], first: bool) -> str:
+    key = _columns(spec.primary_key)
+    bound = ", ".join(
+        f"CAST($2::jsonb ->> {position} AS {key_type})" for position, key_type in enumerate(key_types)
+    )
+    lower_bound = "" if first else f"WHERE ({key}) > ({bound})"
+    order_desc = ", ".join(f"{_ident(column)} DESC" for column in spec.primary_key)
+    # FOR SHARE: uma escrita concorrente na linha espera o lote confirmar e então é espelhada,
+    # em vez de o lote gravar uma versão que o trigger já removeu.
+    return f"""
+    WITH batch AS (
+      SELECT * FROM {_ident(spec.table)} {lower_bound} ORDER BY {key} LIMIT $1 FOR SHARE
+    ), copied AS (
+      INSERT INTO {_ident(spec.shadow)} SELECT * FROM batch ON CONFLICT DO NOTHING RETURNING 1
+    )
+    SELECT
+      (SELECT jsonb_build_array({key})::text FROM batch ORDER BY {order_desc} LIMIT 1) AS last_key,
+      (SELECT count(*) FROM copied) AS copied
+    """
+
+
+async def _retry_locked(conn: asyncpg.Connection, spec: Partitioning, work: Callable):
+    for attempt in range(spec.lock_retries + 1):
+        try:
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL lock_timeout = {int(spec.lock_timeout_ms)}")
+                return await work()
+        except asyncpg.exceptions.LockNotAvailableError:
+            if attempt == spec.lock_retries:
+                raise
+            # Alguém segura lock: recua e tenta de novo em vez de enfileirar as leituras atrás de nós.
+            await asyncio.sleep(spec.pause_seconds * 2 ** (attempt + 1))
+
+
+async def copy_rows(
+    conn: asyncpg.Connection,
+    spec: Partitioning,
+    on_batch: Optional[Callable[[str, int, int], None]] = None,
+) -> Tuple[int, int]:
+    """Passo 3: copia as linhas existentes em lotes; devolve (lotes, linhas copiadas)."""
+    await conn.execute(PROGRESS_TABLE_DDL)
+    name = spec.progress_name
+    state = await conn.fetchrow("SELECT last_key, completed_at FROM schema_backfill WHERE name = $1", name)
+    if state and state["completed_at"] is not None:
+        return 0, 0
+    last_key = state["last_key"] if state else None
+    key_types = await _column_types(conn, spec.table, spec.primary_key)
+    first_sql = _copy_sql(spec, key_types, first=True)
+    next_sql = _copy_sql(spec, key_types, first=False)
+    batches = copied = 0
+
+    while True:
+        async def batch():
+            if last_key is None:
+                row = await conn.fetchrow(first_sql, spec.batch_size)
+            else:
+                row = await conn.fetchrow(next_sql, spec.batch_size, last_key)
+            await conn.execute(
+                _SAVE_PROGRESS, name, spec.table, row["last_key"], row["copied"], row["last_key"] is None
+            )
+            return row
+
+        row = await _retry_locked(conn, spec, batch)
+        batches += 1
+        copied += row["copied"]
+        if on_batch:
+            on_batch(spec.table, batches, copied)
+        if row["last_key"] is None:
+            return batches, copied
+        last_key = row["last_key"]
+        await asyncio.sleep(spec.pause_seconds)
+
+
+async def _leaves(conn: asyncpg.Connection, table: str) -> List[str]:
+    rows = await conn.fetch(
+        "SELECT relid::text AS name FROM pg_partition_tree(CAST($1 AS regclass)) WHERE isleaf ORDER BY relid::text",
+        table,
+    )
+    return [row["name"] for row in rows]
+
+
+async def create_index_concurrently(conn: asyncpg.Connection, table: str, name: str, definition: str) -> None:
+    """`CREATE INDEX CONCURRENTLY` numa tabela particionada, que o Postgres não aceita no pai.
+
+    Cria o índice `ON ONLY` (inválido) em cada nível não folha, constrói o de cada partição
+    folha com CONCURRENTLY e anexa de baixo para cima: o do pai fica válido quando todas as
+    partições têm o seu. `definition` é o trecho após o nome da tabela, ex.:
+    `(account_id, parent_id) WHERE parent_id IS NOT NULL`. Idempotente.
+    """
+    tree = await conn.fetch(
+        """
+        SELECT c.relname AS relation, p.relname AS parent, tree.isleaf, tree.level
+        FROM pg_partition_tree(CAST($1 AS regclass)) AS tree
+        JOIN pg_class c ON c.oid = tree.relid
+        LEFT JOIN pg_class p ON p.oid = tree.parentrelid
+        ORDER BY tree.level, c.relname
+        """,
+        table,
+    )
+
+    def index_for(relation: str) -> str:
+        return name if relation == table else _index_name(f"{name}_{relation}", "")
+
+    for row in tree:
+        if not row["isleaf"]:
+            await conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_ident(index_for(row['relation']))} ON ONLY {_ident(row['relation'])} {definition}"
+            )
+    for row in tree:
+        if not row["isleaf"]:
+            continue
+        index = index_for(row["relation"])
+        # Um build concorrente interrompido deixa o índice INVALID: refaz do zero
+        invalid = await conn.fetchval(
+            "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", _ident(index)
+        )
+        if invalid:
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_ident(index)}")
+        await conn.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_ident(index)} ON {_ident(row['relation'])} {definition}"
+        )
+    for row in reversed(tree):
+        if row["parent"] is not None:
+            await conn.execute(
+                f"ALTER INDEX {_ident(index_for(row['parent']))} ATTACH PARTITION {_ident(index_for(row['relation']))}"
+            )
+
+
+async def _swap(conn: asyncpg.Connection, spec: Partitioning) -> None:
+    """Passo 4, dentro da transação da troca."""
+    table, retired, shadow = _ident(spec.table), _ident(spec.retired), _ident(spec.shadow)
+    await conn.execute(f"LOCK TABLE {table}, {shadow} IN ACCESS EXCLUSIVE MODE")
+    await conn.execute(f"DROP TRIGGER {_ident(spec.mirror_trigger)} ON {table}")
+    await conn.execute(f"DROP FUNCTION {_ident(spec.mirror_function)}()")
+
+    old_indexes = await conn.fetch(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = CAST($1 AS regclass)",
+        spec.table,
+    )
+    new_indexes = await conn.fetch(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = CAST($1 AS regclass)",
+        spec.shadow,
+    )
+    await conn.execute(f"ALTER TABLE {table} RENAME TO {retired}")
+    for row in old_indexes:
+        await conn.execute(
+            f"ALTER INDEX {_ident(row['relname'])} RENAME TO {_ident(_index_name(row['relname'], spec.retired_suffix))}"
+        )
+    await conn.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+    for row in new_indexes:
+        if row["relname"].endswith("_partitioned_pkey"):
+            final = f"{spec.table}_pkey"
+        else:
+            final = row["relname"][: -len("_partitioned")]
+        await conn.execute(f"ALTER INDEX {_ident(row['relname'])} RENAME TO {_ident(final)}")
+
+    # Triggers de negócio (rollup, notify, preenchimento de conta) passam para a tabela nova
+    triggers = await conn.fetch(
+        """
+        SELECT tgname, pg_get_triggerdef(oid) AS definition
+        FROM pg_trigger
+        WHERE tgrelid = CAST($1 AS regclass) AND NOT tgisinternal
+        ORDER BY tgname
+        """,
+        spec.retired,
+    )
+    on_retired = re.compile(rf"\bON (\w+\.)?{re.escape(spec.retired)}\b")
+    for trigger in triggers:
+        await conn.execute(f"DROP TRIGGER {_ident(trigger['tgname'])} ON {retired}")
+        await conn.execute(on_retired.sub(f"ON {table}", trigger["definition"], count=1))
+
+    # Funções que recebem ou devolvem o tipo da linha seguem o tipo renomeado: recria para o novo
+    functions = await conn.fetch(
+        """
+        SELECT p.oid::regprocedure::text AS signature, pg_get_functiondef(p.oid) AS definition
+        FROM pg_proc p, pg_type t
+        WHERE t.typrelid = CAST($1 AS regclass)
+          AND (t.oid = ANY(p.proargtypes::oid[]) OR t.typarray = ANY(p.proargtypes::oid[])
+               OR p.prorettype IN (t.oid, t.typarray))
+        """,
+        spec.retired,
+    )
+    retired_type = re.compile(rf"\b(\w+\.)?{re.escape(spec.retired)}\b")
+    for function in functions:
+        await conn.execute(retired_type.sub(spec.table, function["definition"]))
+        await conn.execute(f"DROP FUNCTION {function['signature']}")
+
+    # Recria as funções dos triggers com o mesmo texto: isso invalida o cache do plpgsql nas
+    # sessões abertas, que compilaram variáveis como `task[]` com o tipo da tabela antiga.
+    trigger_functions = await conn.fetch(
+        """
+        SELECT DISTINCT pg_get_functiondef(tgfoid) AS definition
+        FROM pg_trigger
+        WHERE tgrelid = CAST($1 AS regclass) AND NOT tgisinternal
+        """,
+        spec.table,
+    )
+    for function in trigger_functions:
+        await conn.execute(function["definition"])
+
+    # FKs que apontavam para a tabela antiga (inclusive a dela para ela mesma)
+    referencing = await conn.fetch(
+        """
+        SELECT c.conname AS name, c.conrelid::regclass::text AS table_name, c.conrelid = c.confrelid AS self_reference,
+               pg_get_constraintdef(c.oid) AS definition,
+               ARRAY(SELECT a.attname FROM pg_attribute a
+                     WHERE a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)) AS columns
+        FROM pg_constraint c
+        WHERE c.confrelid = CAST($1 AS regclass) AND c.contype = 'f' AND c.conparentid = 0
+        ORDER BY c.conname
+        """,
+        spec.retired,
+    )
+    references_retired = re.compile(rf"REFERENCES (\w+\.)?{re.escape(spec.retired)}\(")
+    for fk in referencing:
+        if any(column not in fk["columns"] for column in spec.partition_columns):
+            raise ValueError(
+                f"FK {fk['name']} em {fk['table_name']} não inclui {', '.join(spec.partition_columns)}; "
+                "migre-a para chave composta antes"
+            )
+        definition = references_retired.sub(f"REFERENCES {table}(", fk["definition"]).replace(" NOT VALID", "")
+        source = spec.table if fk["self_reference"] else fk["table_name"]
+        if not fk["self_reference"]:
+            await conn.execute(f"ALTER TABLE {_ident(source)} DROP CONSTRAINT {_ident(fk['name'])}")
+        # Tabela particionada não aceita FK NOT VALID: cria em cada partição, que valida depois
+        targets = await _leaves(conn, source) if await _relkind(conn, source) == "p" else [source]
+        for target in targets:
+            await conn.execute(
+                f"ALTER TABLE {_ident(target)} ADD CONSTRAINT {_ident(fk['name'])} {definition} NOT VALID"
+            )
+
+
+async def _validate_references(conn: asyncpg.Connection, table: str) -> List[str]:
+    """Passo 5: valida as FKs `NOT VALID` que apontam para a tabela (lock leve, sem bloquear escritas)."""
+    rows = await conn.fetch(
+        """
+        SELECT conrelid::regclass::text AS table_name, conname AS name
+        FROM pg_constraint
+        WHERE confrelid = CAST($1 AS regclass) AND contype = 'f' AND NOT convalidated
+        ORDER BY 1, 2
+        """,
+        table,
+    )
+    for row in rows:
+        await conn.execute(f"ALTER TABLE {_ident(row['table_name'])} VALIDATE CONSTRAINT {_ident(row['name'])}")
+    return [f"{row['table_name']}.{row['name']}" for row in rows]
+
+
+async def partition_table(
+    conn: asyncpg.Connection,
+    spec: Partitioning,
+    *,
+    on_batch: Optional[Callable[[str, int, int], None]] = None,
+) -> PartitionResult:
+    """Executa (ou retoma) todos os passos para uma tabela."""
+    if conn.is_in_transaction():
+        raise RuntimeError("partition_table precisa de uma conexão fora de transação (um commit por lote)")
+    result = PartitionResult(spec.table, 0, 0, False, [])
+    kind = await _relkind(conn, spec.table)
+    if kind is None:
+        raise ValueError(f"Tabela {spec.table} não encontrada")
+    layout = await conn.fetchval("SELECT pg_get_partkeydef(CAST($1 AS regclass))", spec.table)
+    if layout != spec.partition_clause:
+        await create_shadow(conn, spec)
+        await install_mirror(conn, spec)
+        result.batches, result.rows_copied = await copy_rows(conn, spec, on_batch)
+        await _retry_locked(conn, spec, lambda: _swap(conn, spec))
+        result.swapped = True
+
+    # Também retoma uma execução que caiu entre a troca e a validação
+    result.validated = await _validate_references(conn, spec.table)
+    if result.swapped:
+        await conn.execute(f"ANALYZE {_ident(spec.table)}")
+    return result
+
+
+def print_progress(table: str, batches: int, copied: int) -> None:
+    """Callback simples para `on_batch` que imprime o andamento da cópia."""
+    print(f"  particionamento {table}: lote {batches}, {copied:,} linhas copiadas")
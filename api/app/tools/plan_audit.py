@@ -0,0 +1,223 @@
+"""Auditoria de planos das queries de leitura dos serviços.
+
+Uso (a partir de `api/`, contra um banco populado com `python -m app.tools.seed`):
+
+    python -m app.tools.plan_audit
+    python -m app.tools.plan_audit --account-id <uuid> --min-rows 5000 --analyze
+
+Executa as funções de leitura de `app/services` com filtros representativos, captura
+todo SQL emitido (inclusive os `selectinload`), roda `EXPLAIN (FORMAT JSON)` em cada
+statement e falha (exit 1) se algum plano fizer `Seq Scan` em uma tabela grande.
+Sem `--account-id`, usa a conta com mais tarefas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from ..config import get_settings
+from ..services import admin as admin_service
+from ..services import meeting as meeting_service
+from ..services import sprint as sprint_service
+from ..services import task as task_service
+
+LARGE_TABLES = ("task", "sprint_task", "meeting", "meeting_participant", "doc_chunk", "user_capacity", "sprint", "user_app")
+
+_SAMPLE_QUERY = text(
+    """
+    WITH target AS (
+      SELECT p.account_id, t.project_id, count(*) AS tasks
+      FROM task t JOIN project p ON p.id = t.project_id
+      WHERE CAST(:account_id AS uuid) IS NULL OR p.account_id = CAST(:account_id AS uuid)
+      GROUP BY p.account_id, t.project_id
+      ORDER BY tasks DESC
+      LIMIT 1
+    )
+    SELECT
+      target.account_id,
+      target.project_id,
+      (SELECT id FROM task WHERE project_id = target.project_id AND parent_id IS NOT NULL LIMIT 1) AS task_id,
+      (SELECT id FROM meeting WHERE account_id = target.account_id LIMIT 1) AS meeting_id,
+      (SELECT meeting_type_id FROM meeting WHERE account_id = target.account_id LIMIT 1) AS meeting_type_id,
+      (SELECT id FROM sprint WHERE project_id = target.project_id LIMIT 1) AS sprint_id
+    FROM target
+    """
+)
+
+
+@dataclass
+class Sample:
+    account_id: UUID
+    project_id: UUID
+    task_id: Optional[UUID]
+    meeting_id: Optional[UUID]
+    meeting_type_id: Optional[UUID]
+    sprint_id: Optional[UUID]
+
+
+@dataclass
+class Finding:
+    case: str
+    statement: str
+    relation: str
+    estimated_rows: float
+    plan: Any = field(repr=False)
+
+
+def build_cases(sample: Sample) -> List[Tuple[str, Callable[[AsyncSession], Awaitable[Any]]]]:
+    """Chamadas de leitura dos serviços cobrindo as combinações de filtro usadas pelas rotas."""
+    a, p = sample.account_id, sample.project_id
+    cases: List[Tuple[str, Callable[[AsyncSession], Awaitable[Any]]]] = [
+        ("admin.list_projects", lambda s: admin_service.list_projects(s, a)),
+        ("admin.list_users", lambda s: admin_service.list_users(s, a)),
+        ("admin.get_account", lambda s: admin_service.get_account(s, a)),
+        ("task.list_task_types", lambda s: task_service.list_task_types(s, a)),
+        ("task.list_tasks[account]", lambda s: task_service.list_tasks(s, account_id=a)),
+        ("task.list_tasks[project]", lambda s: task_service.list_tasks(s, account_id=a, project_id=p)),
+        ("task.list_tasks[status]", lambda s: task_service.list_tasks(s, account_id=a, status="blocked")),
+        ("task.list_tasks[priority]", lambda s: task_service.list_tasks(s, account_id=a, priority="critical")),
+        (
+            "task.list_tasks[project,status]",
+            lambda s: task_service.list_tasks(s, account_id=a, project_id=p, status="in_progress"),
+        ),
+        ("meeting.list_meetings", lambda s: meeting_service.list_meetings(s, a)),
+        ("meeting.list_meetings[project]", lambda s: meeting_service.list_meetings(s, a, project_id=p)),
+        ("sprint.list_sprints", lambda s: sprint_service.list_sprints(s, account_id=a)),
+        ("sprint.list_sprints[project]", lambda s: sprint_service.list_sprints(s, account_id=a, project_id=p)),
+        (
+            "sprint.list_tasks_for_project",
+            lambda s: sprint_service.list_tasks_for_project(s, account_id=a, project_id=p),
+        ),
+        ("sprint.list_holidays", lambda s: sprint_service.list_holidays(s, a, p)),
+    ]
+    if sample.task_id:
+        cases.append(("task.get_task", lambda s: task_service.get_task(s, sample.task_id, a)))
+    if sample.meeting_id:
+        cases.append(("meeting.get_meeting", lambda s: meeting_service.get_meeting(s, sample.meeting_id)))
+        cases.append(
+            ("meeting.count_chunks_for_meeting", lambda s: meeting_service.count_chunks_for_meeting(s, sample.meeting_id, a))
+        )
+    if sample.meeting_type_id:
+        cases.append(
+            (
+                "meeting.list_meetings[type]",
+                lambda s: meeting_service.list_meetings(s, a, meeting_type_id=sample.meeting_type_id),
+            )
+        )
+    if sample.sprint_id:
+        cases.append(("sprint.get_sprint", lambda s: sprint_service.get_sprint(s, sample.sprint_id)))
+    return cases
+
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def seq_scans(
+    plan: Any, large_tables: Dict[str, Tuple[str, float]], min_rows: float
+) -> Iterator[Tuple[str, float]]:
+    root = plan[0]["Plan"] if isinstance(plan, list) else plan["Plan"]
+    for node in _walk(root):
+        table, rows = large_tables.get(node.get("Relation Name"), ("", 0.0))
+        if node.get("Node Type") == "Seq Scan" and rows >= min_rows:
+            yield table, rows
+
+
+async def audit(args: argparse.Namespace) -> List[Finding]:
+    settings = get_settings()
+    engine = create_async_engine(settings.database_url, **settings.engine_options)
+    captured: List[Tuple[str, Any]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().lower().startswith(("select", "with")):
+            captured.append((statement, parameters))
+
+    findings: List[Finding] = []
+    try:
+        async with engine.connect() as conn:
+            if args.analyze:
+                await conn.execute(text("ANALYZE " + ", ".join(LARGE_TABLES)))
+                await conn.commit()
+            # Tabelas particionadas aparecem no plano pelas partições: mapeia cada uma para a raiz
+            # (meeting e doc_chunk têm dois níveis: mês e prazo de retenção)
+            rows = await conn.execute(
+                text(
+                    """
+                    SELECT c.relname, coalesce(root.relname, c.relname), c.reltuples
+                    FROM pg_class c
+                    LEFT JOIN pg_class root ON root.oid = pg_partition_root(c.oid)
+                    WHERE c.relkind = 'r' AND coalesce(root.relname, c.relname) = ANY(:names)
+                    """
+                ),
+                {"names": list(LARGE_TABLES)},
+            )
+            large_tables = {name: (table, float(tuples)) for name, table, tuples in rows}
+            sample_row = (await conn.execute(_SAMPLE_QUERY, {"account_id": args.account_id})).mappings().first()
+        if not sample_row:
+            raise SystemExit("Nenhuma tarefa encontrada: popule o banco com `python -m app.tools.seed` antes.")
+        sample = Sample(**sample_row)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        for case, call in build_cases(sample):
+            captured.clear()
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                await call(session)
+                await session.rollback()
+            statements = list(captured)
+            async with engine.connect() as conn:
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    plan = result.scalar()
+                    plan = json.loads(plan) if isinstance(plan, str) else plan
+                    for relation, rows_estimate in seq_scans(plan, large_tables, args.min_rows):
+                        findings.append(Finding(case, statement, relation, rows_estimate, plan))
+            status = "FAIL" if any(finding.case == case for finding in findings) else "ok"
+            print(f"{status:<4} {case} ({len(statements)} statements)")
+    finally:
+        if event.contains(engine.sync_engine, "before_cursor_execute", _capture):
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+        await engine.dispose()
+    return findings
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--account-id", type=UUID, help="Conta usada nas chamadas (padrão: a com mais tarefas)")
+    parser.add_argument(
+        "--min-rows",
+        type=float,
+        default=10_000,
+        help="Tabelas (ou partições) com ao menos esse número estimado de linhas são consideradas grandes",
+    )
+    parser.add_argument("--analyze", action="store_true", help="Roda ANALYZE nas tabelas grandes antes da auditoria")
+    parser.add_argument("--show-plans", action="store_true", help="Imprime o plano JSON de cada falha")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    findings = asyncio.run(audit(args))
+    for finding in findings:
+        print(
+            f"\nSeq Scan em {finding.relation} (~{finding.estimated_rows:,.0f} linhas) em {finding.case}:\n"
+            f"  {finding.statement.strip()}",
+            file=sys.stderr,
+        )
+        if args.show_plans:
+            print(json.dumps(finding.plan, indent=2), file=sys.stderr)
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""Partições mensais de `meeting`/`doc_chunk`: criação antecipada e retenção por plano.
+
+Uso (a partir de `api/`):
+
+    python -m app.tools.retention status            # partições, linhas estimadas e quando expiram
+    python -m app.tools.retention ensure            # cria os próximos meses (PARTITION_MONTHS_AHEAD)
+    python -m app.tools.retention apply --dry-run   # lista o que seria descartado
+    python -m app.tools.retention apply
+
+Layout (ver `migrations/20250324_partition_meetings_by_month.py`): cada tabela tem um mês
+`<tabela>_AAAA_MM` por `RANGE (occurred_at)`, em UTC, e dentro dele uma partição por prazo de
+retenção `<tabela>_AAAA_MM_r<meses>` (`LIST (retention_months)`, 0 = sem prazo) mais uma
+`<tabela>_AAAA_MM_default`. Datas fora dos meses criados caem em `<tabela>_default`.
+
+O prazo vem de `plan.features.retention_months` e é gravado na linha quando a reunião é
+registrada; trocar o plano da conta vale para as reuniões seguintes. Quando a partição de
+um prazo fica inteira mais velha que ele, `apply` apaga os participantes das reuniões dela
+(em lotes), faz `DETACH` e `DROP` das partições de `doc_chunk` e `meeting` daquele mês e
+prazo, sem `DELETE` em massa. Linhas que caíram em partições DEFAULT (prazo sem partição
+própria) saem com `DELETE`; `ensure` cria as partições que faltam para os prazos dos planos
+e move para elas o que estiver no DEFAULT, então esse caminho fica para exceções.
+
+A API roda `ensure` e `apply` periodicamente (`PartitionMaintenance`, ver
+`PARTITION_MAINTENANCE_INTERVAL`), com advisory lock para que só um worker trabalhe por vez.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+
+from ..config import get_settings
+from .migrate import connect
+from .partition import (
+    MonthlyPartitioning,
+    _retry_locked,
+    add_month_partition,
+    add_months,
+    add_tier_partition,
+    month_partition_name,
+    month_start,
+    tier_partition_name,
+)
+
+logger = logging.getLogger(__name__)
+
+# Trechos antes das reuniões: nada referencia doc_chunk, e as reuniões saem por último
+TABLES = ("doc_chunk", "meeting")
+
+PARTICIPANTS = "meeting_participant"
+
+MONTHS_AHEAD = 3
+
+_LAYOUT = "RANGE (occurred_at)"
+
+_LOCK_NAME = "pulsehub_partition_maintenance"
+
+# Linha expirada: mais velha que o prazo, contado a partir do início do mês corrente ($1)
+_EXPIRED = "retention_months > 0 AND occurred_at < $1::timestamptz - make_interval(months => retention_months::int)"
+
+
+@dataclass
+class Partition:
+    table: str
+    name: str
+    parent: str
+    month: Optional[date]
+    tier: Optional[int]
+    rows: int
+
+    @property
+    def expires_on(self) -> Optional[date]:
+        """Primeiro mês em que a partição inteira está fora do prazo."""
+        if self.month is None or not self.tier:
+            return None
+        return add_months(self.month, 1 + self.tier)
+
+
+@dataclass
+class RetentionResult:
+    dropped: List[str] = field(default_factory=list)
+    rows_deleted: int = 0
+
+
+def _options(table: str) -> MonthlyPartitioning:
+    """Só para `lock_timeout`/tentativas de `_retry_locked`."""
+    return MonthlyPartitioning(table=table, primary_key=("id",))
+
+
+async def plan_tiers(conn: asyncpg.Connection) -> List[int]:
+    """Prazos em uso pelos planos, sempre com o 0 (sem prazo)."""
+    rows = await conn.fetch("SELECT DISTINCT plan_retention_months(features) AS tier FROM plan")
+    return sorted({0, *(row["tier"] for row in rows)})
+
+
+async def _is_monthly(conn: asyncpg.Connection, table: str) -> bool:
+    layout = await conn.fetchval("SELECT pg_get_partkeydef(to_regclass($1))", table)
+    return layout == _LAYOUT
+
+
+async def list_partitions(conn: asyncpg.Connection, table: str) -> List[Partition]:
+    rows = await conn.fetch(
+        """
+        SELECT c.relname AS name, p.relname AS parent, greatest(c.reltuples, 0)::bigint AS rows
+        FROM pg_partition_tree(CAST($1 AS regclass)) AS tree
+        JOIN pg_class c ON c.oid = tree.relid
+        JOIN pg_class p ON p.oid = tree.parentrelid
+        WHERE tree.isleaf
+        ORDER BY c.relname
+        """,
+        table,
+    )
+    pattern = re.compile(rf"^{re.escape(table)}_(\d{{4}})_(\d{{2}})_(?:r(\d+)|default)$")
+    partitions = []
+    for row in rows:
+        match = pattern.match(row["name"])
+        month = date(int(match.group(1)), int(match.group(2)), 1) if match else None
+        tier = int(match.group(3)) if match and match.group(3) is not None else None
+        partitions.append(Partition(table, row["name"], row["parent"], month, tier, row["rows"]))
+    return partitions
+
+
+async def ensure_partitions(
+    conn: asyncpg.Connection,
+    months_ahead: int = MONTHS_AHEAD,
+    *,
+    today: Optional[date] = None,
+) -> List[str]:
+    """Cria o mês corrente e os `months_ahead` seguintes, com uma partição por prazo dos planos."""
+    tiers = await plan_tiers(conn)
+    current = month_start(today or date.today())
+    created: List[str] = []
+    for table in TABLES:
+        if not await _is_monthly(conn, table):
+            continue
+        partitions = await list_partitions(conn, table)
+        existing = {p.name for p in partitions} | {p.parent for p in partitions}
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = month_partition_name(table, month)
+            if name not in existing:
+                moved = await _retry_locked(
+                    conn, _options(table), lambda: add_month_partition(conn, table, month, tiers)
+                )
+                created.append(name)
+                if moved:
+                    logger.info("%s: %d linhas trazidas de %s_default", name, moved, table)
+                continue
+            for tier in tiers:
+                leaf = tier_partition_name(table, month, tier)
+                if leaf not in existing:
+                    await _retry_locked(conn, _options(table), lambda: add_tier_partition(conn, table, month, tier))
+                    created.append(leaf)
+    return created
+
+
+async def _purge_participants(conn: asyncpg.Connection, meetings: str, cutoff: datetime, batch_size: int) -> int:
+    """Apaga em lotes os participantes das reuniões expiradas de `meetings`."""
+    sql = f"""
+    WITH batch AS (
+      SELECT id, account_id FROM "{meetings}" WHERE {_EXPIRED} AND id > $2 ORDER BY id LIMIT $3
+    ), purged AS (
+      DELETE FROM {PARTICIPANTS} mp USING batch b
+      WHERE mp.account_id = b.account_id AND mp.meeting_id = b.id
+      RETURNING 1
+    )
+    SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id, (SELECT count(*) FROM purged) AS purged
+    """
+    last_id = UUID(int=0)
+    total = 0
+    while True:
+        row = await conn.fetchrow(sql, cutoff, last_id, batch_size)
+        total += row["purged"]
+        if row["last_id"] is None:
+            return total
+        last_id = row["last_id"]
+
+
+async def apply_retention(
+    conn: asyncpg.Connection,
+    *,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+    batch_size: int = 5_000,
+) -> RetentionResult:
+    """Descarta as partições (mês, prazo) inteiramente expiradas e as linhas expiradas dos DEFAULT."""
+    current = month_start(today or date.today())
+    cutoff = datetime(current.year, current.month, 1, tzinfo=timezone.utc)
+    result = RetentionResult()
+    expired: Dict[Tuple[date, int], Dict[str, Partition]] = {}
+    defaults: List[Partition] = []
+    for table in TABLES:
+        if not await _is_monthly(conn, table):
+            continue
+        for partition in await list_partitions(conn, table):
+            if partition.tier is None:
+                defaults.append(partition)
+            elif partition.expires_on is not None and partition.expires_on <= current:
+                expired.setdefault((partition.month, partition.tier), {})[table] = partition
+
+    for key in sorted(expired):
+        for table in TABLES:
+            partition = expired[key].get(table)
+            if partition is None:
+                continue
+            result.dropped.append(partition.name)
+            if dry_run:
+                continue
+            if table == "meeting":
+                result.rows_deleted += await _purge_participants(conn, partition.name, cutoff, batch_size)
+            await _retry_locked(
+                conn,
+                _options(table),
+                lambda: conn.execute(f'ALTER TABLE "{partition.parent}" DETACH PARTITION "{partition.name}"'),
+            )
+            await conn.execute(f'DROP TABLE "{partition.name}"')
+            logger.info("Retenção: %s descartada (~%d linhas)", partition.name, partition.rows)
+
+    for partition in defaults:
+        if dry_run:
+            result.rows_deleted += await conn.fetchval(
+                f'SELECT count(*) FROM "{partition.name}" WHERE {_EXPIRED}', cutoff
+            )
+            continue
+        if partition.table == "meeting":
+            result.rows_deleted += await _purge_participants(conn, partition.name, cutoff, batch_size)
+        status = await conn.execute(f'DELETE FROM "{partition.name}" WHERE {_EXPIRED}', cutoff)
+        result.rows_deleted += int(status.split()[-1])
+    return result
+
+
+class PartitionMaintenance:
+    """Roda `ensure_partitions` e `apply_retention` em segundo plano, dentro da API."""
+
+    def __init__(self, interval: float, months_ahead: int = MONTHS_AHEAD, retention: bool = True):
+        self.interval = interval
+        self.months_ahead = months_ahead
+        self.retention = retention
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> bool:
+        """Uma rodada; devolve False se outro worker já está com o lock."""
+        conn = await connect()
+        try:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", _LOCK_NAME):
+                return False
+            try:
+                created = await ensure_partitions(conn, self.months_ahead)
+                if created:
+                    logger.info("Partições criadas: %s", ", ".join(created))
+                if self.retention:
+                    await apply_retention(conn)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", _LOCK_NAME)
+            return True
+        finally:
+            await conn.close()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Manutenção de partições falhou; nova tentativa em %.0fs", self.interval)
+            await asyncio.sleep(self.interval)
+
+
+async def cmd_status(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    for table in TABLES:
+        if not await _is_monthly(conn, table):
+            print(f"{table}: ainda não particionada por mês")
+            continue
+        for partition in await list_partitions(conn, table):
+            expires = partition.expires_on.isoformat() if partition.expires_on else "-"
+            print(f"  {partition.name:<40} ~{partition.rows:>12,} linhas  expira em {expires}")
+    return 0
+
+
+async def cmd_ensure(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    created = await ensure_partitions(conn, args.months_ahead)
+    print(f"{len(created)} partições criadas" + (f": {', '.join(created)}" if created else ""))
+    return 0
+
+
+async def cmd_apply(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    result = await apply_retention(conn, dry_run=args.dry_run, batch_size=args.batch_size)
+    verb = "seriam descartadas" if args.dry_run else "descartadas"
+    print(f"{len(result.dropped)} partições {verb}" + (f": {', '.join(result.dropped)}" if result.dropped else ""))
+    print(f"{result.rows_deleted:,} linhas {'expiradas' if args.dry_run else 'apagadas'} fora delas")
+    return 0
+
+
+COMMANDS = {"status": cmd_status, "ensure": cmd_ensure, "apply": cmd_apply}
+
+
+async def main(args: argparse.Namespace) -> int:
+    conn = await connect()
+    try:
+        return await COMMANDS[args.command](conn, args)
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS), help="status, ensure ou apply")
+    parser.add_argument(
+        "--months-ahead", type=int, default=get_settings().partition_months_ahead, help="Meses futuros em ensure"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="apply: só lista o que seria descartado")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Reuniões por lote ao apagar participantes")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,144 @@
+"""Verificação e reparo do rollup de projetos (`project_rollup` / `project_rollup_due`).
+
+Uso (a partir de `api/`):
+
+    python -m app.tools.rollup check                  # lista projetos com divergência (exit 1 se houver)
+    python -m app.tools.rollup repair                 # recalcula todos os projetos a partir das tarefas
+    python -m app.tools.rollup repair --account-id <uuid> --batch-size 100
+
+O reparo percorre os projetos em lotes ordenados por id e chama `project_rollup_rebuild`
+em uma transação curta por lote: as linhas do lote ficam travadas só durante o recálculo,
+e escritas concorrentes nesses projetos esperam e aplicam o delta depois, sem perda.
+A checagem roda sem travas; com escrita concorrente pode acusar divergências transitórias.
+Tarefas arquivadas (`task_archive`, ver `app.tools.archive`) continuam contando no rollup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+from uuid import UUID
+
+import asyncpg
+
+from .migrate import connect
+
+_NEXT_PROJECTS = """
+SELECT id FROM project
+WHERE ($1::uuid IS NULL OR id > $1) AND ($2::uuid IS NULL OR account_id = $2)
+ORDER BY id
+LIMIT $3
+"""
+
+_DRIFT = """
+WITH fresh AS (
+  SELECT
+    p.id AS project_id,
+    count(t.id) AS tasks_total,
+    count(t.id) FILTER (WHERE t.status = 'backlog') AS status_backlog,
+    count(t.id) FILTER (WHERE t.status = 'planned') AS status_planned,
+    count(t.id) FILTER (WHERE t.status = 'in_progress') AS status_in_progress,
+    count(t.id) FILTER (WHERE t.status = 'review') AS status_review,
+    count(t.id) FILTER (WHERE t.status = 'blocked') AS status_blocked,
+    count(t.id) FILTER (WHERE t.status = 'done') AS status_done,
+    count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'low') AS open_priority_low,
+    count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'medium') AS open_priority_medium,
+    count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'high') AS open_priority_high,
+    count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'critical') AS open_priority_critical,
+    coalesce(sum(t.estimate_hours), 0) AS estimate_hours,
+    coalesce(sum(t.actual_hours), 0) AS actual_hours,
+    count(t.id) FILTER (WHERE t.status <> 'done' AND t.due_date IS NOT NULL) AS open_with_due
+  FROM project p
+  LEFT JOIN (
+    SELECT id, project_id, account_id, status, priority, due_date, estimate_hours, actual_hours FROM task
+    UNION ALL
+    SELECT id, project_id, account_id, status, priority, due_date, estimate_hours, actual_hours FROM task_archive
+  ) AS t ON t.project_id = p.id AND t.account_id = p.account_id
+  WHERE p.id = ANY($1::uuid[])
+  GROUP BY p.id
+),
+stored AS (
+  SELECT r.*, (SELECT coalesce(sum(d.open_tasks), 0) FROM project_rollup_due d WHERE d.project_id = r.project_id)
+    AS open_with_due
+  FROM project_rollup r
+  WHERE r.project_id = ANY($1::uuid[])
+)
+SELECT f.project_id, s.project_id IS NULL AS missing, f.tasks_total AS expected_total, s.tasks_total AS stored_total
+FROM fresh f
+LEFT JOIN stored s ON s.project_id = f.project_id
+WHERE s.project_id IS NULL
+   OR (f.tasks_total, f.status_backlog, f.status_planned, f.status_in_progress, f.status_review, f.status_blocked,
+       f.status_done, f.open_priority_low, f.open_priority_medium, f.open_priority_high, f.open_priority_critical,
+       f.estimate_hours, f.actual_hours, f.open_with_due)
+      IS DISTINCT FROM
+      (s.tasks_total, s.status_backlog, s.status_planned, s.status_in_progress, s.status_review, s.status_blocked,
+       s.status_done, s.open_priority_low, s.open_priority_medium, s.open_priority_high, s.open_priority_critical,
+       s.estimate_hours, s.actual_hours, s.open_with_due)
+ORDER BY f.project_id
+"""
+
+
+async def _batches(conn: asyncpg.Connection, account_id: Optional[UUID], batch_size: int):
+    last: Optional[UUID] = None
+    while True:
+        ids = [row["id"] for row in await conn.fetch(_NEXT_PROJECTS, last, account_id, batch_size)]
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+async def cmd_check(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    checked = drifted = 0
+    async for ids in _batches(conn, args.account_id, args.batch_size):
+        checked += len(ids)
+        for row in await conn.fetch(_DRIFT, ids):
+            drifted += 1
+            if row["missing"]:
+                print(f"  {row['project_id']}: sem linha no rollup ({row['expected_total']} tarefas)")
+            else:
+                print(
+                    f"  {row['project_id']}: divergente (tarefas: rollup {row['stored_total']}, "
+                    f"real {row['expected_total']})"
+                )
+    print(f"{checked} projetos verificados, {drifted} divergentes")
+    return 1 if drifted else 0
+
+
+async def cmd_repair(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    rebuilt = 0
+    async for ids in _batches(conn, args.account_id, args.batch_size):
+        rebuilt += await conn.fetchval("SELECT project_rollup_rebuild($1::uuid[])", ids)
+        print(f"  {rebuilt} projetos recalculados", end="\r", flush=True)
+        if args.pause_seconds:
+            await asyncio.sleep(args.pause_seconds)
+    print(f"{rebuilt} projetos recalculados em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+COMMANDS = {"check": cmd_check, "repair": cmd_repair}
+
+
+async def main(args: argparse.Namespace) -> int:
+    conn = await connect()
+    try:
+        return await COMMANDS[args.command](conn, args)
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS), help="check: só compara; repair: recalcula")
+    parser.add_argument("--account-id", type=UUID, help="Limita a uma conta")
+    parser.add_argument("--batch-size", type=int, default=200, help="Projetos por transação")
+    parser.add_argument("--pause-seconds", type=float, default=0.0, help="Pausa entre lotes do reparo")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,453 @@
+"""Gerador determinístico de tenants sintéticos com carga via COPY.
+
+Uso (a partir de `api/`, com as variáveis PG* apontando para o banco de destino):
+
+    python -m app.tools.seed --profile small
+    python -m app.tools.seed --profile whale --tenants 1 --seed 7
+    python -m app.tools.seed --profile large --tenants 3 --dry-run
+
+Cada tenant é gerado a partir de `--seed` e do índice do tenant, então a mesma
+combinação sempre produz os mesmos dados (inclusive UUIDs). Como slugs e e-mails são
+únicos no banco, repetir a mesma combinação no mesmo banco falha: use outra semente.
+Cada tenant é carregado em uma transação, tabela a tabela, com `COPY` binário.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import asyncpg
+
+from ..config import get_settings
+
+
+@dataclass(frozen=True)
+class Profile:
+    users: int
+    areas: int
+    projects: int
+    epics_per_project: int
+    stories_per_epic: int
+    subtasks_per_story: int
+    sprints_per_project: int
+    tasks_per_sprint: int
+    meetings: int
+    participants_per_meeting: int
+    chunks_per_meeting: int
+
+
+PROFILES: Dict[str, Profile] = {
+    "small": Profile(
+        users=20, areas=3, projects=5, epics_per_project=5, stories_per_epic=4, subtasks_per_story=3,
+        sprints_per_project=6, tasks_per_sprint=15, meetings=200, participants_per_meeting=5, chunks_per_meeting=8,
+    ),
+    "large": Profile(
+        users=200, areas=10, projects=40, epics_per_project=20, stories_per_epic=5, subtasks_per_story=4,
+        sprints_per_project=12, tasks_per_sprint=40, meetings=5_000, participants_per_meeting=6, chunks_per_meeting=20,
+    ),
+    "whale": Profile(
+        users=2_000, areas=25, projects=200, epics_per_project=50, stories_per_epic=6, subtasks_per_story=5,
+        sprints_per_project=26, tasks_per_sprint=60, meetings=60_000, participants_per_meeting=8, chunks_per_meeting=30,
+    ),
+}
+
+TASK_STATUSES = ["backlog", "planned", "in_progress", "review", "blocked", "done"]
+TASK_STATUS_WEIGHTS = [25, 15, 15, 8, 5, 32]
+TASK_PRIORITIES = ["low", "medium", "high", "critical"]
+TASK_PRIORITY_WEIGHTS = [25, 45, 22, 8]
+TASK_TYPES = [("epic", "Épico"), ("story", "História"), ("subtask", "Subtarefa"), ("bug", "Bug")]
+MEETING_TYPES = [("daily", "Daily"), ("planning", "Planning"), ("review", "Review"), ("retro", "Retrospectiva")]
+WORDS = (
+    "sprint entrega cliente prazo backlog revisão risco integração deploy métrica meta escopo "
+    "qualidade teste bloqueio dependência estimativa capacidade release feedback prioridade "
+    "arquitetura banco api frontend performance incidente migração documentação acordo"
+).split()
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CHUNK_SECONDS = Decimal("60.00")
+
+
+class TenantGenerator:
+    """Gera os registros de um tenant na ordem das dependências de FK."""
+
+    def __init__(self, profile: Profile, seed: int, index: int) -> None:
+        self.profile = profile
+        self.rng = random.Random(f"{seed}:{index}")
+        self.slug = f"seed-{seed}-{index}"
+        self.account_id = self._uuid()
+        self.area_ids: List[uuid.UUID] = []
+        self.user_ids: List[uuid.UUID] = []
+        self.user_names: List[str] = []
+        self.project_ids: List[uuid.UUID] = []
+        self.task_type_ids: Dict[str, uuid.UUID] = {}
+        self.leaf_tasks: Dict[uuid.UUID, List[uuid.UUID]] = {}
+        self.sprints: Dict[uuid.UUID, List[Tuple[uuid.UUID, date]]] = {}
+        self.meeting_type_ids: List[uuid.UUID] = []
+        self.meetings: List[Tuple[uuid.UUID, uuid.UUID, datetime]] = []
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _sentence(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def _timestamp(self, max_days: int = 365) -> datetime:
+        return BASE_TIME + timedelta(seconds=self.rng.randint(0, max_days * 86_400))
+
+    # ===== Tabelas =====
+
+    def accounts(self) -> Iterator[tuple]:
+        yield (self.account_id, f"Tenant {self.slug}", self.slug, BASE_TIME, BASE_TIME)
+
+    def areas(self) -> Iterator[tuple]:
+        for i in range(self.profile.areas):
+            area_id = self._uuid()
+            self.area_ids.append(area_id)
+            yield (area_id, self.account_id, f"area-{i}", f"Área {i}", True, BASE_TIME, BASE_TIME)
+
+    def users(self) -> Iterator[tuple]:
+        for i in range(self.profile.users):
+            user_id = self._uuid()
+            name = f"Usuário {i:05d} {self.slug}"
+            self.user_ids.append(user_id)
+            self.user_names.append(name)
+            area_id = self.area_ids[i % len(self.area_ids)] if self.area_ids else None
+            created = self._timestamp(30)
+            yield (user_id, self.account_id, area_id, f"u{i}.{self.slug}@seed.pulsehub.local", name, created, created)
+
+    def projects(self) -> Iterator[tuple]:
+        for i in range(self.profile.projects):
+            project_id = self._uuid()
+            self.project_ids.append(project_id)
+            created = self._timestamp(60)
+            status = self.rng.choices(["active", "on_hold", "completed"], weights=[80, 10, 10])[0]
+            yield (project_id, self.account_id, f"P{i:04d}", f"Projeto {i}", status, created, created)
+
+    def task_types(self) -> Iterator[tuple]:
+        for key, name in TASK_TYPES:
+            type_id = self._uuid()
+            self.task_type_ids[key] = type_id
+            yield (type_id, self.account_id, key, name)
+
+    def tasks(self) -> Iterator[tuple]:
+        profile = self.profile
+        for project_id in self.project_ids:
+            leaves = self.leaf_tasks.setdefault(project_id, [])
+            for _ in range(profile.epics_per_project):
+                epic_id = self._uuid()
+                yield self._task(epic_id, project_id, None, "epic", 0)
+                for _ in range(profile.stories_per_epic):
+                    story_id = self._uuid()
+                    yield self._task(story_id, project_id, epic_id, "story", 1)
+                    if not profile.subtasks_per_story:
+                        leaves.append(story_id)
+                    for _ in range(profile.subtasks_per_story):
+                        subtask_id = self._uuid()
+                        leaves.append(subtask_id)
+                        yield self._task(subtask_id, project_id, story_id, "subtask", 2)
+
+    def _task(self, task_id: uuid.UUID, project_id: uuid.UUID, parent_id, type_key: str, level: int) -> tuple:
+        rng = self.rng
+        status = rng.choices(TASK_STATUSES, weights=TASK_STATUS_WEIGHTS)[0]
+        created = self._timestamp()
+        estimate = rng.randint(1, 8) * (3 - level)
+        actual = rng.randint(0, estimate * 2) if status in {"in_progress", "review", "done"} else None
+        due = (created + timedelta(days=rng.randint(7, 120))).date() if rng.random() < 0.7 else None
+        started = created + timedelta(days=rng.randint(0, 10)) if actual is not None else None
+        completed = started + timedelta(days=rng.randint(1, 20)) if status == "done" and started else None
+        return (
+            task_id,
+            project_id,
+            self.account_id,
+            parent_id,
+            self.task_type_ids[type_key] if rng.random() > 0.05 else self.task_type_ids["bug"],
+            self._sentence(rng.randint(3, 8)),
+            status,
+            rng.choices(TASK_PRIORITIES, weights=TASK_PRIORITY_WEIGHTS)[0],
+            estimate,
+            actual,
+            Decimal(rng.choice([1, 2, 3, 5, 8, 13])),
+            due,
+            started,
+            completed,
+            rng.choice(self.user_ids) if rng.random() < 0.85 else None,
+            created,
+            completed or created,
+        )
+
+    def sprints_rows(self) -> Iterator[tuple]:
+        for project_id in self.project_ids:
+            calendar = self.sprints.setdefault(project_id, [])
+            for number in range(self.profile.sprints_per_project):
+                sprint_id = self._uuid()
+                starts_at = BASE_TIME.date() + timedelta(weeks=2 * number)
+                calendar.append((sprint_id, starts_at))
+                status = "completed" if number < self.profile.sprints_per_project - 2 else "active"
+                yield (
+                    sprint_id,
+                    project_id,
+                    self.account_id,
+                    f"Sprint {number + 1}",
+                    self._sentence(6),
+                    number + 1,
+                    starts_at,
+                    starts_at + timedelta(days=13),
+                    status,
+                )
+
+    def sprint_tasks(self) -> Iterator[tuple]:
+        for project_id, calendar in self.sprints.items():
+            leaves = self.leaf_tasks.get(project_id, [])
+            for sprint_id, _ in calendar:
+                sample = self.rng.sample(leaves, min(self.profile.tasks_per_sprint, len(leaves)))
+                for position, task_id in enumerate(sample):
+                    yield (
+                        sprint_id,
+                        task_id,
+                        self.account_id,
+                        self.rng.randint(1, 16),
+                        Decimal(self.rng.choice([1, 2, 3, 5, 8])),
+                        self.rng.choice(["committed", "committed", "stretch", "done"]),
+                        position,
+                    )
+
+    def user_capacities(self) -> Iterator[tuple]:
+        # (account_id, user_id, week_start) é único: cada usuário segue o calendário de um projeto.
+        if not self.project_ids:
+            return
+        for i, user_id in enumerate(self.user_ids):
+            calendar = self.sprints[self.project_ids[i % len(self.project_ids)]]
+            for sprint_id, starts_at in calendar:
+                for week in range(2):
+                    yield (
+                        self._uuid(),
+                        self.account_id,
+                        user_id,
+                        sprint_id,
+                        starts_at + timedelta(weeks=week),
+                        self.rng.choice([20, 30, 40, 40, 40]),
+                    )
+
+    def meeting_types(self) -> Iterator[tuple]:
+        for key, name in MEETING_TYPES:
+            type_id = self._uuid()
+            self.meeting_type_ids.append(type_id)
+            yield (type_id, self.account_id, key, name, True)
+
+    def meetings_rows(self) -> Iterator[tuple]:
+        for i in range(self.profile.meetings):
+            meeting_id = self._uuid()
+            project_id = self.rng.choice(self.project_ids) if self.project_ids and self.rng.random() < 0.9 else None
+            occurred_at = self._timestamp()
+            self.meetings.append((meeting_id, project_id, occurred_at))
+            yield (
+                meeting_id,
+                self.account_id,
+                self.rng.choice(self.meeting_type_ids),
+                project_id,
+                f"Reunião {i:06d}",
+                occurred_at,
+                self.rng.choice([15, 30, 45, 60, 90]),
+                "pt-BR",
+                "seed",
+                "processed",
+                0,  # retention_months: as contas do seed não têm plano
+                occurred_at,
+                occurred_at,
+            )
+
+    def participants(self) -> Iterator[tuple]:
+        count = min(self.profile.participants_per_meeting, len(self.user_ids))
+        for meeting_id, _, _ in self.meetings:
+            for user_index in self.rng.sample(range(len(self.user_ids)), count):
+                yield (
+                    meeting_id,
+                    self.account_id,
+                    self.user_names[user_index],
+                    self.user_ids[user_index],
+                    self.rng.choice(["host", "participant", "participant", "guest"]),
+                )
+
+    def chunks(self) -> Iterator[tuple]:
+        for meeting_id, project_id, occurred_at in self.meetings:
+            for index in range(self.profile.chunks_per_meeting):
+                content = self._sentence(self.rng.randint(40, 160))
+                start = CHUNK_SECONDS * index
+                yield (
+                    self._uuid(),
+                    meeting_id,
+                    project_id,
+                    self.account_id,
+                    "transcript",
+                    index,
+                    content,
+                    len(content.split()),
+                    "pt-BR",
+                    start,
+                    start + CHUNK_SECONDS,
+                    occurred_at,
+                    0,
+                    BASE_TIME,
+                )
+
+    def plan(self) -> List[Tuple[str, Sequence[str], Iterable[tuple]]]:
+        """Tabelas na ordem de carga, com colunas e geradores de registros."""
+        return [
+            ("account", ("id", "name", "slug", "created_at", "updated_at"), self.accounts()),
+            ("area", ("id", "account_id", "key", "name", "is_active", "created_at", "updated_at"), self.areas()),
+            ("user_app", ("id", "account_id", "area_id", "email", "full_name", "created_at", "updated_at"), self.users()),
+            ("project", ("id", "account_id", "key", "name", "status", "created_at", "updated_at"), self.projects()),
+            ("task_type", ("id", "account_id", "key", "name"), self.task_types()),
+            (
+                "task",
+                (
+                    "id", "project_id", "account_id", "parent_id", "task_type_id", "title", "status", "priority",
+                    "estimate_hours", "actual_hours", "story_points", "due_date", "started_at",
+                    "completed_at", "assignee_id", "created_at", "updated_at",
+                ),
+                self.tasks(),
+            ),
+            (
+                "sprint",
+                ("id", "project_id", "account_id", "name", "goal", "sprint_number", "starts_at", "ends_at", "status"),
+                self.sprints_rows(),
+            ),
+            (
+                "sprint_task",
+                ("sprint_id", "task_id", "account_id", "planned_hours", "planned_points", "status", "position"),
+                self.sprint_tasks(),
+            ),
+            (
+                "user_capacity",
+                ("id", "account_id", "user_id", "sprint_id", "week_start", "hours"),
+                self.user_capacities(),
+            ),
+            ("meeting_type", ("id", "account_id", "key", "name", "is_active"), self.meeting_types()),
+            (
+                "meeting",
+                (
+                    "id", "account_id", "meeting_type_id", "project_id", "title", "occurred_at",
+                    "duration_minutes", "transcript_language", "source", "status", "retention_months",
+                    "created_at", "updated_at",
+                ),
+                self.meetings_rows(),
+            ),
+            (
+                "meeting_participant",
+                ("meeting_id", "account_id", "display_name", "user_id", "role"),
+                self.participants(),
+            ),
+            (
+                "doc_chunk",
+                (
+                    "id", "meeting_id", "project_id", "account_id", "source_type", "chunk_index", "content",
+                    "token_count", "language", "start_time", "end_time", "occurred_at", "retention_months",
+                    "created_at",
+                ),
+                self.chunks(),
+            ),
+        ]
+
+
+class _Counted:
+    """Iterador que conta registros e os entrega ao COPY em lotes, sem materializar a tabela."""
+
+    def __init__(self, records: Iterable[tuple]) -> None:
+        self._records = iter(records)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> tuple:
+        record = next(self._records)
+        self.count += 1
+        return record
+
+
+async def load_tenant(conn: asyncpg.Connection, generator: TenantGenerator, batch_size: int) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    async with conn.transaction():
+        for table, columns, records in generator.plan():
+            counted = _Counted(records)
+            while True:
+                batch = [record for _, record in zip(range(batch_size), counted)]
+                if not batch:
+                    break
+                await conn.copy_records_to_table(table, records=batch, columns=list(columns))
+            counts[table] = counted.count
+    return counts
+
+
+def count_tenant(generator: TenantGenerator) -> Dict[str, int]:
+    return {table: sum(1 for _ in records) for table, _, records in generator.plan()}
+
+
+async def main(args: argparse.Namespace) -> None:
+    profile = PROFILES[args.profile]
+    settings = get_settings()
+    totals: Dict[str, int] = {}
+    conn = None
+    if not args.dry_run:
+        conn = await asyncpg.connect(
+            host=settings.pg_host,
+            port=int(settings.pg_port),
+            user=settings.pg_user,
+            password=settings.pg_password,
+            database=settings.pg_database,
+        )
+        # Carga em massa: não esperamos o flush do WAL a cada commit nem publicamos mudanças.
+        await conn.execute("SET synchronous_commit = off")
+        await conn.execute("SET pulsehub.skip_notify = 'on'")
+        await conn.execute("SET pulsehub.skip_outbox = 'on'")
+
+    started = time.perf_counter()
+    try:
+        for index in range(args.tenants):
+            generator = TenantGenerator(profile, args.seed, index)
+            tenant_started = time.perf_counter()
+            if conn is None:
+                counts = count_tenant(generator)
+            else:
+                counts = await load_tenant(conn, generator, args.batch_size)
+            for table, count in counts.items():
+                totals[table] = totals.get(table, 0) + count
+            print(
+                f"tenant {generator.slug} ({generator.account_id}): {sum(counts.values()):,} linhas "
+                f"em {time.perf_counter() - tenant_started:.1f}s"
+            )
+    finally:
+        if conn is not None:
+            await conn.close()
+
+    elapsed = time.perf_counter() - started
+    total_rows = sum(totals.values())
+    for table, count in totals.items():
+        print(f"  {table:<20} {count:>12,}")
+    print(f"Total: {total_rows:,} linhas em {elapsed:.1f}s ({total_rows / max(elapsed, 1e-9):,.0f} linhas/s)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small", help="Escala de cada tenant")
+    parser.add_argument("--tenants", type=int, default=1, help="Quantidade de tenants a gerar")
+    parser.add_argument("--seed", type=int, default=1, help="Semente base (mesma semente, mesmos dados)")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Registros por chamada de COPY")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta as linhas que seriam geradas")
+    parser.add_argument("--show-profile", action="store_true", help="Mostra os parâmetros do perfil e sai")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.show_profile:
+        print(asdict(PROFILES[arguments.profile]))
+    else:
+        asyncio.run(main(arguments))
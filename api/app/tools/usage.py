@@ -0,0 +1,123 @@
+"""Verificação e reparo do estoque por conta (`account_usage`).
+
+Uso (a partir de `api/`):
+
+    python -m app.tools.usage check                   # lista contas com divergência (exit 1 se houver)
+    python -m app.tools.usage repair                  # recalcula todas as contas a partir das tabelas
+    python -m app.tools.usage repair --account-id <uuid> --batch-size 100
+
+Como em `app.tools.rollup`: o reparo percorre as contas em lotes ordenados por id e chama
+`account_usage_rebuild` numa transação curta por lote; escritas concorrentes nessas contas
+esperam a trava e aplicam o delta depois. A checagem roda sem travas e pode acusar
+divergências transitórias com escrita concorrente.
+
+O consumo mensal (`account_usage_monthly`) não é reparado: apagar reuniões e trechos não
+devolve consumo, então não há como recalculá-lo a partir do que sobrou.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+from uuid import UUID
+
+import asyncpg
+
+from .migrate import connect
+
+_NEXT_ACCOUNTS = """
+SELECT id FROM account
+WHERE ($1::uuid IS NULL OR id > $1) AND ($2::uuid IS NULL OR id = $2)
+ORDER BY id
+LIMIT $3
+"""
+
+_DRIFT = """
+WITH fresh AS (
+  SELECT
+    a.id AS account_id,
+    (SELECT count(*) FROM project p WHERE p.account_id = a.id) AS projects,
+    (SELECT count(*) FROM user_app x WHERE x.account_id = a.id) AS users,
+    (SELECT count(*) FROM task t WHERE t.account_id = a.id)
+      + (SELECT count(*) FROM task_archive t WHERE t.account_id = a.id) AS tasks
+  FROM account a
+  WHERE a.id = ANY($1::uuid[])
+)
+SELECT f.account_id, u.account_id IS NULL AS missing,
+       f.projects AS expected_projects, f.users AS expected_users, f.tasks AS expected_tasks,
+       u.projects AS stored_projects, u.users AS stored_users, u.tasks AS stored_tasks
+FROM fresh f
+LEFT JOIN account_usage u ON u.account_id = f.account_id
+WHERE u.account_id IS NULL OR (f.projects, f.users, f.tasks) IS DISTINCT FROM (u.projects, u.users, u.tasks)
+ORDER BY f.account_id
+"""
+
+
+async def _batches(conn: asyncpg.Connection, account_id: Optional[UUID], batch_size: int):
+    last: Optional[UUID] = None
+    while True:
+        ids = [row["id"] for row in await conn.fetch(_NEXT_ACCOUNTS, last, account_id, batch_size)]
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def _counts(row: asyncpg.Record, prefix: str) -> str:
+    return f"{row[prefix + 'projects']}/{row[prefix + 'users']}/{row[prefix + 'tasks']}"
+
+
+async def cmd_check(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    checked = drifted = 0
+    async for ids in _batches(conn, args.account_id, args.batch_size):
+        checked += len(ids)
+        for row in await conn.fetch(_DRIFT, ids):
+            drifted += 1
+            if row["missing"]:
+                print(f"  {row['account_id']}: sem linha de uso (projetos/usuários/tarefas {_counts(row, 'expected_')})")
+            else:
+                print(
+                    f"  {row['account_id']}: divergente (projetos/usuários/tarefas: "
+                    f"contador {_counts(row, 'stored_')}, real {_counts(row, 'expected_')})"
+                )
+    print(f"{checked} contas verificadas, {drifted} divergentes")
+    return 1 if drifted else 0
+
+
+async def cmd_repair(conn: asyncpg.Connection, args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    rebuilt = 0
+    async for ids in _batches(conn, args.account_id, args.batch_size):
+        rebuilt += await conn.fetchval("SELECT account_usage_rebuild($1::uuid[])", ids)
+        print(f"  {rebuilt} contas recalculadas", end="\r", flush=True)
+        if args.pause_seconds:
+            await asyncio.sleep(args.pause_seconds)
+    print(f"{rebuilt} contas recalculadas em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+COMMANDS = {"check": cmd_check, "repair": cmd_repair}
+
+
+async def main(args: argparse.Namespace) -> int:
+    conn = await connect()
+    try:
+        return await COMMANDS[args.command](conn, args)
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS), help="check: só compara; repair: recalcula")
+    parser.add_argument("--account-id", type=UUID, help="Limita a uma conta")
+    parser.add_argument("--batch-size", type=int, default=200, help="Contas por transação")
+    parser.add_argument("--pause-seconds", type=float, default=0.0, help="Pausa entre lotes do reparo")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
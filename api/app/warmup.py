@@ -0,0 +1,123 @@
+"""Aquecimento do worker antes de aceitar tráfego.
+
+Chamado pelo lifespan (o uvicorn só abre a porta do worker depois do startup):
+
+1. abre `WARMUP_CONNECTIONS` conexões em cada pool (primário e réplicas);
+2. executa as leituras quentes dos serviços em cada uma delas, o que compila os
+   statements no cache do SQLAlchemy e prepara os statements no cache do asyncpg;
+3. termina de construir os validadores Pydantic pendentes e o schema OpenAPI.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterator, List, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from .services import admin as admin_service
+from .services import meeting as meeting_service
+from .services import sprint as sprint_service
+from .services import task as task_service
+
+logger = logging.getLogger(__name__)
+
+# Nenhuma linha tem esse id: as queries rodam de verdade, mas devolvem vazio.
+_NIL = UUID(int=0)
+
+HOT_READS: List[Tuple[str, Callable[[AsyncSession], Awaitable[Any]]]] = [
+    ("admin.get_account", lambda s: admin_service.get_account(s, _NIL)),
+    ("admin.list_projects", lambda s: admin_service.list_projects(s, _NIL)),
+    ("admin.list_users", lambda s: admin_service.list_users(s, _NIL)),
+    ("task.list_task_types", lambda s: task_service.list_task_types(s, _NIL)),
+    ("task.list_tasks", lambda s: task_service.list_tasks(s, account_id=_NIL)),
+    ("task.list_tasks[project]", lambda s: task_service.list_tasks(s, account_id=_NIL, project_id=_NIL)),
+    ("task.list_tasks[status]", lambda s: task_service.list_tasks(s, account_id=_NIL, status="backlog")),
+    ("task.get_task", lambda s: task_service.get_task(s, _NIL, _NIL)),
+    ("meeting.list_meetings", lambda s: meeting_service.list_meetings(s, _NIL)),
+    ("meeting.get_meeting", lambda s: meeting_service.get_meeting(s, _NIL)),
+    ("sprint.list_sprints", lambda s: sprint_service.list_sprints(s, account_id=_NIL)),
+    ("sprint.get_sprint", lambda s: sprint_service.get_sprint(s, _NIL)),
+]
+
+
+@dataclass
+class WarmupReport:
+    connections: int = 0
+    statements: int = 0
+    models: int = 0
+    errors: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+async def _warm_connection(engine: AsyncEngine, report: WarmupReport) -> None:
+    async with engine.connect() as conn:
+        report.connections += 1
+        async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+            for name, call in HOT_READS:
+                try:
+                    await call(session)
+                except (LookupError, ValueError):
+                    pass  # "não encontrado" é o esperado com o id nulo
+                except Exception as exc:  # noqa: BLE001 - aquecimento nunca derruba o worker
+                    report.errors.append(f"{name}: {exc}")
+                    await session.rollback()
+                    continue
+                report.statements += 1
+            await session.rollback()
+
+
+async def warm_pools(engines: List[AsyncEngine], connections: int, report: WarmupReport) -> None:
+    """Abre `connections` conexões simultâneas por engine e roda as leituras quentes em cada uma."""
+    results = await asyncio.gather(
+        *(_warm_connection(engine, report) for engine in engines for _ in range(connections)),
+        return_exceptions=True,
+    )
+    report.errors.extend(str(result) for result in results if isinstance(result, BaseException))
+
+
+def _schema_models() -> Iterator[Type[BaseModel]]:
+    pending = list(BaseModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending.extend(model.__subclasses__())
+        if model.__module__.startswith("app.schemas"):
+            yield model
+
+
+def build_validators(app) -> int:
+    """Resolve modelos com referências adiadas e gera o OpenAPI (cacheado pelo FastAPI)."""
+    models = 0
+    for model in _schema_models():
+        if not model.__pydantic_complete__:
+            model.model_rebuild()
+        models += 1
+    app.openapi()
+    return models
+
+
+async def warm_up(app, engines: List[AsyncEngine], connections: int, timeout: float) -> WarmupReport:
+    report = WarmupReport()
+    started = time.perf_counter()
+    if connections:
+        try:
+            await asyncio.wait_for(warm_pools(engines, connections, report), timeout)
+        except asyncio.TimeoutError:
+            report.errors.append(f"pools não aquecidos em {timeout:.0f}s; seguindo sem completar")
+    report.models = build_validators(app)
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        "Warmup: %d conexões, %d leituras, %d modelos em %.0f ms",
+        report.connections,
+        report.statements,
+        report.models,
+        report.elapsed_ms,
+    )
+    for error in dict.fromkeys(report.errors):
+        logger.warning("Warmup: %s", error)
+    return report
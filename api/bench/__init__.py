@@ -0,0 +1 @@
+"""Benchmarks de desempenho da API PulseHub (executar a partir de `api/`)."""
@@ -0,0 +1,111 @@
+"""Latência das primeiras requisições após o start de um worker, com e sem warmup.
+
+Uso (a partir de `api/`, com as variáveis PG* apontando para um Postgres local):
+
+    python -m bench.cold_start --rounds 5
+    python -m bench.cold_start --rounds 3 --output cold-start.json
+
+Cria uma conta pequena via API, depois sobe a API `--rounds` vezes com `WARMUP_ENABLED=0`
+e `--rounds` vezes com `WARMUP_ENABLED=1`. Em cada subida mede o tempo até o `/health`
+responder, a latência da primeira requisição de cada rota quente e o p50 das `--repeat`
+requisições seguintes (regime estável), para comparar o pico pós-deploy com o normal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from .server import running_app
+from .stats import percentile
+from .workload import Scale, SeedState, seed
+
+
+def hot_routes(state: SeedState) -> Dict[str, str]:
+    project_id = state.project_ids[0]
+    return {
+        "GET /api/tasks": f"/api/tasks?account_id={state.account_id}&project_id={project_id}",
+        "GET /api/tasks/{task_id}": f"/api/tasks/{state.task_ids[project_id][0]}?account_id={state.account_id}",
+        "GET /api/meetings": f"/api/meetings?account_id={state.account_id}",
+        "GET /api/sprints": f"/api/sprints?account_id={state.account_id}",
+        "GET /api/admin/accounts/{account_id}/projects": f"/api/admin/accounts/{state.account_id}/projects",
+    }
+
+
+async def _timed_get(client: httpx.AsyncClient, url: str) -> float:
+    started = time.perf_counter()
+    response = await client.get(url)
+    response.raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+async def measure_round(port: int, warmup: bool, routes: Dict[str, str], repeat: int) -> dict:
+    started = time.perf_counter()
+    async with running_app(port, env={"WARMUP_ENABLED": "1" if warmup else "0"}) as base_url:
+        startup_s = time.perf_counter() - started
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+            first = {route: await _timed_get(client, url) for route, url in routes.items()}
+            steady = {}
+            for route, url in routes.items():
+                samples = [await _timed_get(client, url) for _ in range(repeat)]
+                steady[route] = percentile(samples, 50)
+    return {"startup_s": startup_s, "first_ms": first, "steady_p50_ms": steady}
+
+
+def aggregate(rounds: List[dict], routes: Dict[str, str]) -> dict:
+    return {
+        "startup_s": round(statistics.median(r["startup_s"] for r in rounds), 3),
+        "routes": {
+            route: {
+                "first_ms": round(statistics.median(r["first_ms"][route] for r in rounds), 2),
+                "steady_p50_ms": round(statistics.median(r["steady_p50_ms"][route] for r in rounds), 2),
+            }
+            for route in routes
+        },
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    async with running_app(args.port, env={"WARMUP_ENABLED": "0"}) as base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+            scale = Scale(projects=2, tasks_per_project=50, meetings=20, sprints_per_project=1)
+            state = await seed(client, scale, random.Random(args.seed))
+    routes = hot_routes(state)
+
+    result = {}
+    for label, warmup in (("cold", False), ("warm", True)):
+        rounds = [await measure_round(args.port, warmup, routes, args.repeat) for _ in range(args.rounds)]
+        result[label] = aggregate(rounds, routes)
+
+    print(f"{'rota':<48} {'1ª sem warmup':>14} {'1ª com warmup':>14} {'p50 estável':>12}")
+    for route in routes:
+        cold, warm = result["cold"]["routes"][route], result["warm"]["routes"][route]
+        print(f"{route:<48} {cold['first_ms']:>12.1f}ms {warm['first_ms']:>12.1f}ms {warm['steady_p50_ms']:>10.1f}ms")
+    print(f"{'startup (até /health)':<48} {result['cold']['startup_s']:>13.2f}s {result['warm']['startup_s']:>13.2f}s")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--rounds", type=int, default=5, help="Subidas da API por modo")
+    parser.add_argument("--repeat", type=int, default=20, help="Requisições por rota após a primeira")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,173 @@
+"""Benchmark de carga end-to-end com percentis de latência por rota.
+
+Uso (a partir de `api/`, com as variáveis PG* apontando para um Postgres local):
+
+    python -m bench.load --duration 30 --concurrency 32 --output bench-result.json
+    python -m bench.load --baseline bench/baselines/local.json        # falha se houver regressão
+    python -m bench.load --save-baseline bench/baselines/local.json   # grava o resultado como baseline
+
+Por padrão sobe a API em um subprocesso uvicorn; `--base-url` usa uma instância já no ar.
+O resultado é um JSON com vazão e p50/p95/p99 por rota e no total.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from .server import running_app
+from .stats import summarize
+from .workload import MIXED_WORKLOAD, Scale, SeedState, seed
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    state: SeedState,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    rng_seed: int,
+) -> Dict[str, dict]:
+    operations = MIXED_WORKLOAD
+    weights = [operation.weight for operation in operations]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+
+    async def _worker(worker_id: int) -> None:
+        rng = random.Random(rng_seed + worker_id)
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            operation = rng.choices(operations, weights=weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await operation.run(client, state, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if started < measure_from:
+                continue
+            if failed:
+                errors[operation.route] += 1
+            else:
+                latencies[operation.route].append(elapsed_ms)
+
+    await asyncio.gather(*(_worker(i) for i in range(concurrency)))
+
+    routes = {
+        operation.route: {**summarize(latencies[operation.route], duration), "errors": errors[operation.route]}
+        for operation in operations
+    }
+    all_latencies = [value for samples in latencies.values() for value in samples]
+    return {
+        "routes": routes,
+        "total": {**summarize(all_latencies, duration), "errors": sum(errors.values())},
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Lista as regressões (p95 maior ou vazão menor que a baseline além da tolerância)."""
+    regressions = []
+    for route, current in result["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous or not current["requests"]:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms")
+        if current["errors"] > previous.get("errors", 0) and current["errors"] > current["requests"] * 0.01:
+            regressions.append(f"{route}: erros {previous.get('errors', 0)} -> {current['errors']}")
+    previous_total = baseline.get("total", {}).get("throughput_rps")
+    if previous_total and result["total"]["throughput_rps"] < previous_total * (1 - tolerance):
+        regressions.append(
+            f"total: vazão {previous_total:.1f} rps -> {result['total']['throughput_rps']:.1f} rps"
+        )
+    return regressions
+
+
+@asynccontextmanager
+async def _target(args: argparse.Namespace) -> AsyncIterator[str]:
+    if args.base_url:
+        yield args.base_url
+        return
+    async with running_app(args.port, workers=args.workers) as base_url:
+        yield base_url
+
+
+async def main(args: argparse.Namespace) -> int:
+    scale = Scale(
+        users=args.users,
+        projects=args.projects,
+        tasks_per_project=args.tasks_per_project,
+        meetings=args.meetings,
+        sprints_per_project=args.sprints_per_project,
+    )
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with _target(args) as base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            seed_started = time.perf_counter()
+            state = await seed(client, scale, random.Random(args.seed))
+            seed_seconds = time.perf_counter() - seed_started
+            result = await drive(client, state, args.concurrency, args.duration, args.warmup, args.seed)
+
+    result["config"] = {
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "workers": args.workers,
+        "scale": vars(scale),
+        "seed_seconds": round(seed_seconds, 2),
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(output + "\n", encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare(result, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSÃO {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Usa uma API já em execução em vez de subir uma nova")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Workers uvicorn ao subir a API")
+    parser.add_argument("--concurrency", type=int, default=32, help="Clientes concorrentes")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos de medição")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Segundos de aquecimento (descartados)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por requisição")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador (dados e mix)")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--tasks-per-project", type=int, default=50)
+    parser.add_argument("--meetings", type=int, default=50)
+    parser.add_argument("--sprints-per-project", type=int, default=2)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    parser.add_argument("--baseline", help="JSON de baseline para comparação")
+    parser.add_argument("--save-baseline", help="Grava o resultado como nova baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Tolerância relativa para regressões")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
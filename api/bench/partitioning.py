@@ -0,0 +1,239 @@
+"""Tamanho de índice e latência: tabela única × particionada por hash de `account_id`.
+
+Uso (a partir de `api/`, contra um Postgres local; a carga padrão de 50M linhas leva tempo e
+ocupa dezenas de GB, então reduza `--rows` para uma rodada rápida):
+
+    python -m bench.partitioning
+    python -m bench.partitioning --rows 5000000 --partitions 16 --output partitioning.json
+    python -m bench.partitioning --keep            # mantém o schema para inspeção com EXPLAIN
+
+Cria no schema `--schema` duas cópias de uma tabela no formato de `task` (mesmas colunas
+consultadas e os mesmos índices por conta), uma comum e outra com `PARTITION BY HASH
+(account_id)`, com as linhas distribuídas entre `--accounts` contas de forma enviesada (poucas
+contas muito grandes, muitas pequenas). Mede o tamanho dos índices (total e da maior partição)
+e p50/p95/p99 das queries por conta para a maior conta e uma conta mediana. No fim, remove o
+schema (exceto com `--keep`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from app.tools.migrate import connect
+
+from .stats import summarize
+
+_ACCOUNT = "('00000000-0000-0000-0000-' || lpad(to_hex({n}), 12, '0'))::uuid"
+
+_COLUMNS = """
+  id          uuid NOT NULL DEFAULT gen_random_uuid(),
+  account_id  uuid NOT NULL,
+  project_id  uuid NOT NULL,
+  title       text NOT NULL,
+  status      text NOT NULL,
+  priority    text NOT NULL,
+  due_date    date,
+  created_at  timestamptz NOT NULL
+"""
+
+# Mesmos índices por conta de `task` (migrations/20250305_add_task_account_id.sql)
+_INDEXES = {
+    "project_created": "(project_id, created_at DESC)",
+    "account_created": "(account_id, created_at DESC)",
+    "account_status_created": "(account_id, status, created_at DESC)",
+    "account_priority_created": "(account_id, priority, created_at DESC)",
+}
+
+QUERIES = {
+    "get_by_id": "SELECT * FROM {table} WHERE account_id = $1 AND id = $2",
+    "list_recent": "SELECT * FROM {table} WHERE account_id = $1 ORDER BY created_at DESC LIMIT 50",
+    "list_status": (
+        "SELECT * FROM {table} WHERE account_id = $1 AND status = 'blocked' ORDER BY created_at DESC LIMIT 50"
+    ),
+    "count_by_status": "SELECT status, count(*) FROM {table} WHERE account_id = $1 GROUP BY status",
+}
+
+
+async def create_tables(conn: asyncpg.Connection, schema: str, partitions: int) -> None:
+    await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"CREATE TABLE {schema}.task_single ({_COLUMNS}, PRIMARY KEY (id))")
+    await conn.execute(
+        f"CREATE TABLE {schema}.task_hash ({_COLUMNS}, PRIMARY KEY (account_id, id)) PARTITION BY HASH (account_id)"
+    )
+    for remainder in range(partitions):
+        await conn.execute(
+            f"CREATE TABLE {schema}.task_hash_p{remainder:02d} PARTITION OF {schema}.task_hash "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+
+
+async def load(conn: asyncpg.Connection, schema: str, rows: int, accounts: int, chunk: int) -> None:
+    """Gera as linhas na tabela comum e copia para a particionada; índices só depois da carga."""
+    # random()^3 concentra as linhas nas primeiras contas: a conta 0 é a "baleia"
+    account = _ACCOUNT.format(n=f"floor({accounts} * power(random(), 3))::int")
+    loaded = 0
+    started = time.perf_counter()
+    while loaded < rows:
+        size = min(chunk, rows - loaded)
+        await conn.execute(
+            f"""
+            INSERT INTO {schema}.task_single (account_id, project_id, title, status, priority, due_date, created_at)
+            SELECT account_id,
+                   md5(account_id::text || (g % 20))::uuid,
+                   'Tarefa ' || g,
+                   (ARRAY['backlog','planned','in_progress','review','blocked','done'])[1 + (g % 6)::int],
+                   (ARRAY['low','medium','high','critical'])[1 + (g % 4)::int],
+                   CASE WHEN g % 3 = 0 THEN DATE '2024-01-01' + (g % 400)::int END,
+                   TIMESTAMPTZ '2023-01-01' + (g % 63072000) * INTERVAL '1 second'
+            FROM (SELECT g, {account} AS account_id FROM generate_series($1::bigint, $2::bigint) AS g) AS generated
+            """,
+            loaded,
+            loaded + size - 1,
+        )
+        loaded += size
+        print(f"  {loaded:,}/{rows:,} linhas ({time.perf_counter() - started:.0f}s)", end="\r", flush=True)
+    print()
+    await conn.execute(f"INSERT INTO {schema}.task_hash SELECT * FROM {schema}.task_single")
+    for table in ("task_single", "task_hash"):
+        for name, columns in _INDEXES.items():
+            await conn.execute(f"CREATE INDEX {table}_{name} ON {schema}.{table} {columns}")
+        await conn.execute(f"VACUUM (ANALYZE) {schema}.{table}")
+
+
+async def index_sizes(conn: asyncpg.Connection, schema: str) -> Dict[str, Dict[str, Any]]:
+    """Tamanho total dos índices e o da maior partição (o que uma query podada percorre)."""
+    rows = await conn.fetch(
+        """
+        SELECT tree.relid::regclass::text AS leaf,
+               pg_relation_size(tree.relid) AS heap_bytes,
+               pg_indexes_size(tree.relid) AS index_bytes
+        FROM pg_partition_tree(to_regclass($1)) AS tree
+        WHERE tree.isleaf
+        """,
+        f"{schema}.task_hash",
+    )
+    single = await conn.fetchrow(
+        "SELECT pg_relation_size(to_regclass($1)) AS heap_bytes, pg_indexes_size(to_regclass($1)) AS index_bytes",
+        f"{schema}.task_single",
+    )
+    largest = max(rows, key=lambda row: row["index_bytes"])
+    return {
+        "single": {"heap_bytes": single["heap_bytes"], "index_bytes": single["index_bytes"]},
+        "hash": {
+            "heap_bytes": sum(row["heap_bytes"] for row in rows),
+            "index_bytes": sum(row["index_bytes"] for row in rows),
+            "largest_partition": largest["leaf"],
+            "largest_partition_index_bytes": largest["index_bytes"],
+        },
+    }
+
+
+async def pick_accounts(conn: asyncpg.Connection, schema: str) -> Dict[str, asyncpg.Record]:
+    rows = await conn.fetch(
+        f"""
+        WITH sizes AS (
+          SELECT account_id, count(*) AS tasks, (array_agg(id))[1] AS sample_id
+          FROM {schema}.task_single GROUP BY account_id
+        )
+        SELECT * FROM (
+          (SELECT 'whale' AS label, * FROM sizes ORDER BY tasks DESC LIMIT 1)
+          UNION ALL
+          (SELECT 'median' AS label, * FROM sizes ORDER BY tasks
+           OFFSET (SELECT count(*) / 2 FROM sizes) LIMIT 1)
+        ) AS picked
+        """
+    )
+    return {row["label"]: row for row in rows}
+
+
+async def measure(
+    conn: asyncpg.Connection, sql: str, args: List[Any], iterations: int, warmup: int
+) -> Dict[str, float]:
+    statement = await conn.prepare(sql)
+    latencies: List[float] = []
+    for i in range(warmup + iterations):
+        started = time.perf_counter()
+        await statement.fetch(*args)
+        if i >= warmup:
+            latencies.append((time.perf_counter() - started) * 1000)
+    return summarize(latencies, sum(latencies) / 1000)
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:,.1f} MB"
+
+
+async def main(args: argparse.Namespace) -> int:
+    conn = await connect()
+    results: Dict[str, Any] = {}
+    try:
+        await create_tables(conn, args.schema, args.partitions)
+        await load(conn, args.schema, args.rows, args.accounts, args.chunk)
+
+        sizes = await index_sizes(conn, args.schema)
+        print(
+            f"índices: tabela única {_mb(sizes['single']['index_bytes'])} | "
+            f"particionada {_mb(sizes['hash']['index_bytes'])} no total, "
+            f"maior partição {_mb(sizes['hash']['largest_partition_index_bytes'])}"
+        )
+
+        accounts = await pick_accounts(conn, args.schema)
+        latency: Dict[str, Any] = {}
+        for label, account in accounts.items():
+            for query, template in QUERIES.items():
+                params = [account["account_id"]] + ([account["sample_id"]] if "$2" in template else [])
+                single = await measure(
+                    conn, template.format(table=f"{args.schema}.task_single"), params, args.iterations, args.warmup
+                )
+                hashed = await measure(
+                    conn, template.format(table=f"{args.schema}.task_hash"), params, args.iterations, args.warmup
+                )
+                case = f"{label}:{query}"
+                latency[case] = {"tasks": account["tasks"], "single": single, "hash": hashed}
+                print(
+                    f"{case:<26} ({account['tasks']:>10,} tarefas) única p50={single['p50_ms']:>8.2f}ms "
+                    f"p95={single['p95_ms']:>8.2f}ms | hash p50={hashed['p50_ms']:>8.2f}ms p95={hashed['p95_ms']:>8.2f}ms"
+                )
+        results = {
+            "rows": args.rows,
+            "accounts": args.accounts,
+            "partitions": args.partitions,
+            "iterations": args.iterations,
+            "sizes": sizes,
+            "latency": latency,
+        }
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE")
+        await conn.close()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000_000, help="Linhas geradas")
+    parser.add_argument("--accounts", type=int, default=2_000, help="Contas entre as quais as linhas se distribuem")
+    parser.add_argument("--partitions", type=int, default=16, help="Partições da tabela particionada")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="Linhas por INSERT na carga")
+    parser.add_argument("--iterations", type=int, default=200, help="Execuções medidas por query")
+    parser.add_argument("--warmup", type=int, default=20, help="Execuções descartadas por query")
+    parser.add_argument("--schema", default="bench_partitioning", help="Schema descartável usado pelo benchmark")
+    parser.add_argument("--keep", action="store_true", help="Não remove o schema ao final")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
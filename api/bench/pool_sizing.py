@@ -0,0 +1,91 @@
+"""Vazão versus tamanho do pool sob carga concorrente.
+
+Uso (a partir de `api/`, contra um Postgres local):
+
+    PGHOST=localhost PGPORT=5432 python -m bench.pool_sizing --pool-sizes 2,5,10,20 --concurrency 64
+
+Para cada tamanho de pool cria um engine com as opções de `Settings.engine_options`
+(sem overflow, para que o tamanho medido seja o efetivo), dispara `--concurrency`
+workers executando `--query` durante `--duration` segundos e imprime um JSON com
+vazão e percentis de latência (incluindo a espera pelo checkout da conexão).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+
+from .stats import summarize
+
+DEFAULT_QUERY = "SELECT pg_sleep(0.002), count(*) FROM pg_class"
+
+
+async def _run_for_pool_size(pool_size: int, concurrency: int, duration: float, query: str) -> Dict[str, float]:
+    settings = get_settings()
+    options = settings.engine_options
+    options.update(pool_size=pool_size, max_overflow=0, pool_timeout=max(duration * 2, 30))
+    engine = create_async_engine(settings.database_url, **options)
+    stmt = text(query)
+
+    # Aquece o pool para não medir o custo de abrir conexões
+    async def _warm() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_warm() for _ in range(pool_size)))
+
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def _worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(stmt)
+            except Exception:  # noqa: BLE001 - contabiliza e segue medindo
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    return {"pool_size": pool_size, "concurrency": concurrency, "errors": errors, **summarize(latencies, elapsed)}
+
+
+async def main(args: argparse.Namespace) -> List[Dict[str, float]]:
+    results = []
+    for pool_size in args.pool_sizes:
+        results.append(await _run_for_pool_size(pool_size, args.concurrency, args.duration, args.query))
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--pool-sizes",
+        type=lambda value: [int(item) for item in value.split(",") if item.strip()],
+        default=[2, 5, 10, 20, 40],
+        help="Lista de tamanhos de pool separados por vírgula",
+    )
+    parser.add_argument("--concurrency", type=int, default=64, help="Workers concorrentes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos por tamanho de pool")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="Query executada por cada worker")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(parse_args())), indent=2))
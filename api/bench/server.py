@@ -0,0 +1,68 @@
+"""Sobe a API em um subprocesso uvicorn para os benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+
+@asynccontextmanager
+async def running_app(
+    port: int,
+    workers: int = 1,
+    env: Optional[Dict[str, str]] = None,
+    startup_timeout: float = 30.0,
+) -> AsyncIterator[str]:
+    """Inicia `app.main:app` (usando as variáveis PG* do ambiente) e devolve a URL base."""
+    command: List[str] = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    process = subprocess.Popen(command, cwd=API_DIR, env={**os.environ, **(env or {})})
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_until_healthy(base_url, process, startup_timeout)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=1.0) as client:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"API encerrou durante a inicialização (exit code {process.returncode})")
+            try:
+                response = await client.get("/health")
+                if response.status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"API não respondeu em {timeout:.0f}s")
+            await asyncio.sleep(0.2)
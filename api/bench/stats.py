@@ -0,0 +1,25 @@
+"""Estatísticas compartilhadas pelos benchmarks."""
+
+from __future__ import annotations
+
+import statistics
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies_ms: List[float], elapsed_s: float) -> Dict[str, float]:
+    return {
+        "requests": len(latencies_ms),
+        "throughput_rps": round(len(latencies_ms) / elapsed_s, 2) if elapsed_s else 0.0,
+        "mean_ms": round(statistics.fmean(latencies_ms), 3) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+    }
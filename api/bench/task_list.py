@@ -0,0 +1,128 @@
+"""Latência da listagem de tarefas: filtro via join em project × `task.account_id`.
+
+Uso (a partir de `api/`, com um tenant grande carregado por `python -m app.tools.seed --profile whale`):
+
+    python -m bench.task_list --iterations 50
+    python -m bench.task_list --account-id <uuid> --limit 200 --output task-list.json
+
+Para cada combinação de filtro usada por `GET /api/tasks`, executa a query no formato
+antigo (`JOIN project ... WHERE project.account_id = ?`) e no atual (`WHERE task.account_id = ?`)
+e imprime p50/p95/p99 de cada uma. Sem `--account-id`, usa a conta com mais tarefas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import get_settings
+from app.models import area, meeting, sprint  # noqa: F401  registra os mapeamentos relacionados
+from app.models.admin import Project
+from app.models.task import Task
+
+from .stats import summarize
+
+_WHALE_QUERY = text(
+    """
+    SELECT account_id, (
+      SELECT project_id FROM task t2 WHERE t2.account_id = t.account_id
+      GROUP BY project_id ORDER BY count(*) DESC LIMIT 1
+    ) AS project_id
+    FROM task t
+    WHERE CAST(:account_id AS uuid) IS NULL OR t.account_id = CAST(:account_id AS uuid)
+    GROUP BY account_id
+    ORDER BY count(*) DESC
+    LIMIT 1
+    """
+)
+
+
+def _legacy(account_id: UUID) -> Select:
+    return select(Task).join(Project, Task.project_id == Project.id).where(Project.account_id == account_id)
+
+
+def _denormalized(account_id: UUID) -> Select:
+    return select(Task).where(Task.account_id == account_id)
+
+
+def build_cases(project_id: UUID) -> Dict[str, Dict[str, Any]]:
+    return {
+        "account": {},
+        "account+status": {"status": "blocked"},
+        "account+priority": {"priority": "critical"},
+        "account+project": {"project_id": project_id},
+        "account+project+status": {"project_id": project_id, "status": "in_progress"},
+    }
+
+
+def _apply(stmt: Select, filters: Dict[str, Any], limit: int) -> Select:
+    for column, value in filters.items():
+        stmt = stmt.where(getattr(Task, column) == value)
+    stmt = stmt.order_by(Task.created_at.desc())
+    return stmt.limit(limit) if limit else stmt
+
+
+async def _measure(engine: AsyncEngine, stmt: Select, iterations: int, warmup: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    async with engine.connect() as conn:
+        for i in range(warmup + iterations):
+            started = time.perf_counter()
+            result = await conn.execute(stmt)
+            result.fetchall()
+            if i >= warmup:
+                latencies.append((time.perf_counter() - started) * 1000)
+    return summarize(latencies, sum(latencies) / 1000)
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    engine = create_async_engine(settings.database_url, **settings.engine_options)
+    try:
+        async with engine.connect() as conn:
+            row = (await conn.execute(_WHALE_QUERY, {"account_id": args.account_id})).first()
+        if not row:
+            raise SystemExit("Nenhuma tarefa encontrada: popule o banco com `python -m app.tools.seed` antes.")
+        account_id, project_id = row
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for case, filters in build_cases(project_id).items():
+            legacy = await _measure(engine, _apply(_legacy(account_id), filters, args.limit), args.iterations, args.warmup)
+            current = await _measure(
+                engine, _apply(_denormalized(account_id), filters, args.limit), args.iterations, args.warmup
+            )
+            speedup = legacy["p50_ms"] / current["p50_ms"] if current["p50_ms"] else 0.0
+            results[case] = {"join_project": legacy, "account_id": current, "p50_speedup": round(speedup, 2)}
+            print(
+                f"{case:<24} join p50={legacy['p50_ms']:>8.2f}ms p95={legacy['p95_ms']:>8.2f}ms | "
+                f"account_id p50={current['p50_ms']:>8.2f}ms p95={current['p95_ms']:>8.2f}ms | x{speedup:.1f}"
+            )
+    finally:
+        await engine.dispose()
+
+    if args.output:
+        payload = {"account_id": str(account_id), "limit": args.limit, "iterations": args.iterations, "cases": results}
+        Path(args.output).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--account-id", type=UUID, help="Conta medida (padrão: a com mais tarefas)")
+    parser.add_argument("--iterations", type=int, default=50, help="Execuções medidas por query")
+    parser.add_argument("--warmup", type=int, default=5, help="Execuções descartadas por query")
+    parser.add_argument("--limit", type=int, default=500, help="LIMIT aplicado às listagens (0 = sem limite, como a rota)")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,238 @@
+"""Carga de dados via API e mix de operações do benchmark end-to-end."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+TASK_STATUSES = ["backlog", "planned", "in_progress", "review", "blocked", "done"]
+TASK_PRIORITIES = ["low", "medium", "high", "critical"]
+
+
+@dataclass
+class Scale:
+    users: int = 10
+    projects: int = 5
+    tasks_per_project: int = 50
+    meetings: int = 50
+    sprints_per_project: int = 2
+    concurrency: int = 16
+
+
+@dataclass
+class SeedState:
+    account_id: str
+    user_ids: List[str] = field(default_factory=list)
+    project_ids: List[str] = field(default_factory=list)
+    task_ids: Dict[str, List[str]] = field(default_factory=dict)
+    meeting_type_id: str = ""
+    meeting_ids: List[str] = field(default_factory=list)
+    sprint_ids: List[str] = field(default_factory=list)
+
+    def all_task_ids(self) -> List[str]:
+        return [task_id for ids in self.task_ids.values() for task_id in ids]
+
+
+async def _post(client: httpx.AsyncClient, url: str, payload: dict, **params) -> dict:
+    response = await client.post(url, json=payload, params=params or None)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _bounded(concurrency: int, coros: List[Awaitable]) -> List:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(coro) for coro in coros))
+
+
+async def seed(client: httpx.AsyncClient, scale: Scale, rng: random.Random) -> SeedState:
+    """Cria uma conta isolada com usuários, projetos, tarefas, reuniões e sprints."""
+    suffix = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    account = await _post(client, "/api/admin/accounts", {"name": f"Bench {suffix}"})
+    state = SeedState(account_id=account["id"])
+    account_path = f"/api/admin/accounts/{state.account_id}"
+
+    users = await _bounded(
+        scale.concurrency,
+        [
+            _post(client, f"{account_path}/users", {"email": f"user{i}-{suffix}@bench.local", "full_name": f"User {i:04d}"})
+            for i in range(scale.users)
+        ],
+    )
+    state.user_ids = [user["id"] for user in users]
+
+    projects = await _bounded(
+        scale.concurrency,
+        [
+            _post(client, f"{account_path}/projects", {"key": f"P{i}", "name": f"Projeto {i}"})
+            for i in range(scale.projects)
+        ],
+    )
+    state.project_ids = [project["id"] for project in projects]
+
+    for project_id in state.project_ids:
+        tasks = await _bounded(
+            scale.concurrency,
+            [
+                _post(client, "/api/tasks", _task_payload(state, project_id, rng, i))
+                for i in range(scale.tasks_per_project)
+            ],
+        )
+        state.task_ids[project_id] = [task["id"] for task in tasks]
+
+    meeting_type = await _post(
+        client, "/api/meeting-types", {"account_id": state.account_id, "name": "Daily", "key": "daily"}
+    )
+    state.meeting_type_id = meeting_type["id"]
+    meetings = await _bounded(
+        scale.concurrency,
+        [_post(client, "/api/meetings", _meeting_payload(state, rng, i)) for i in range(scale.meetings)],
+    )
+    state.meeting_ids = [meeting["id"] for meeting in meetings]
+
+    sprint_payloads = []
+    for project_id in state.project_ids:
+        for number in range(scale.sprints_per_project):
+            starts_at = date(2025, 1, 6) + timedelta(weeks=2 * number)
+            sample = rng.sample(state.task_ids[project_id], min(10, len(state.task_ids[project_id])))
+            sprint_payloads.append(
+                {
+                    "account_id": state.account_id,
+                    "project_id": project_id,
+                    "name": f"Sprint {number + 1}",
+                    "sprint_number": number + 1,
+                    "starts_at": starts_at.isoformat(),
+                    "ends_at": (starts_at + timedelta(days=13)).isoformat(),
+                    "tasks": [{"task_id": task_id} for task_id in sample],
+                }
+            )
+    sprints = await _bounded(scale.concurrency, [_post(client, "/api/sprints", payload) for payload in sprint_payloads])
+    state.sprint_ids = [sprint["id"] for sprint in sprints]
+    return state
+
+
+def _task_payload(state: SeedState, project_id: str, rng: random.Random, index: int) -> dict:
+    return {
+        "account_id": state.account_id,
+        "project_id": project_id,
+        "title": f"Tarefa {index:05d}",
+        "status": rng.choice(TASK_STATUSES),
+        "priority": rng.choice(TASK_PRIORITIES),
+        "estimate_hours": rng.randint(1, 16),
+        "assignee_id": rng.choice(state.user_ids) if state.user_ids else None,
+    }
+
+
+def _meeting_payload(state: SeedState, rng: random.Random, index: int) -> dict:
+    occurred_at = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=rng.randint(0, 24 * 180))
+    return {
+        "account_id": state.account_id,
+        "meeting_type_id": state.meeting_type_id,
+        "project_id": rng.choice(state.project_ids),
+        "title": f"Reunião {index:05d}",
+        "occurred_at": occurred_at.isoformat(),
+        "duration_minutes": rng.choice([15, 30, 45, 60]),
+        "notes": "Notas da reunião " * rng.randint(5, 50),
+        "participants": [{"display_name": f"User {i:04d}"} for i in rng.sample(range(20), 4)],
+    }
+
+
+# ===== Mix de operações =====
+
+Operation = Callable[[httpx.AsyncClient, SeedState, random.Random], Awaitable[httpx.Response]]
+
+
+@dataclass
+class WeightedOperation:
+    route: str
+    weight: int
+    run: Operation
+
+
+def _list_tasks(client, state, rng):
+    return client.get("/api/tasks", params={"account_id": state.account_id, "project_id": rng.choice(state.project_ids)})
+
+
+def _list_tasks_filtered(client, state, rng):
+    return client.get("/api/tasks", params={"account_id": state.account_id, "status": rng.choice(TASK_STATUSES)})
+
+
+def _get_task(client, state, rng):
+    return client.get(f"/api/tasks/{rng.choice(state.all_task_ids())}", params={"account_id": state.account_id})
+
+
+def _create_task(client, state, rng):
+    project_id = rng.choice(state.project_ids)
+    return client.post("/api/tasks", json=_task_payload(state, project_id, rng, rng.randint(0, 99999)))
+
+
+def _update_task(client, state, rng):
+    return client.put(
+        f"/api/tasks/{rng.choice(state.all_task_ids())}",
+        params={"account_id": state.account_id},
+        json={"status": rng.choice(TASK_STATUSES), "actual_hours": rng.randint(0, 20)},
+    )
+
+
+def _list_meetings(client, state, rng):
+    return client.get("/api/meetings", params={"account_id": state.account_id})
+
+
+def _get_meeting(client, state, rng):
+    return client.get(f"/api/meetings/{rng.choice(state.meeting_ids)}")
+
+
+def _create_meeting(client, state, rng):
+    return client.post("/api/meetings", json=_meeting_payload(state, rng, rng.randint(0, 99999)))
+
+
+def _list_sprints(client, state, rng):
+    return client.get("/api/sprints", params={"account_id": state.account_id})
+
+
+def _get_sprint(client, state, rng):
+    return client.get(f"/api/sprints/{rng.choice(state.sprint_ids)}")
+
+
+def _update_sprint(client, state, rng):
+    return client.put(f"/api/sprints/{rng.choice(state.sprint_ids)}", json={"goal": f"Meta {rng.randint(0, 999)}"})
+
+
+def _list_projects(client, state, rng):
+    return client.get(f"/api/admin/accounts/{state.account_id}/projects")
+
+
+def _list_users(client, state, rng):
+    return client.get(f"/api/admin/accounts/{state.account_id}/users")
+
+
+def _get_account(client, state, rng):
+    return client.get(f"/api/admin/accounts/{state.account_id}")
+
+
+MIXED_WORKLOAD: List[WeightedOperation] = [
+    WeightedOperation("GET /api/tasks", 20, _list_tasks),
+    WeightedOperation("GET /api/tasks?status", 5, _list_tasks_filtered),
+    WeightedOperation("GET /api/tasks/{task_id}", 15, _get_task),
+    WeightedOperation("POST /api/tasks", 5, _create_task),
+    WeightedOperation("PUT /api/tasks/{task_id}", 8, _update_task),
+    WeightedOperation("GET /api/meetings", 8, _list_meetings),
+    WeightedOperation("GET /api/meetings/{meeting_id}", 6, _get_meeting),
+    WeightedOperation("POST /api/meetings", 2, _create_meeting),
+    WeightedOperation("GET /api/sprints", 8, _list_sprints),
+    WeightedOperation("GET /api/sprints/{sprint_id}", 5, _get_sprint),
+    WeightedOperation("PUT /api/sprints/{sprint_id}", 2, _update_sprint),
+    WeightedOperation("GET /api/admin/accounts/{account_id}/projects", 6, _list_projects),
+    WeightedOperation("GET /api/admin/accounts/{account_id}/users", 6, _list_users),
+    WeightedOperation("GET /api/admin/accounts/{account_id}", 4, _get_account),
+]
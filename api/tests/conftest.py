@@ -0,0 +1,60 @@
+import os
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _test_database() -> str:
+    database = os.getenv("TEST_PGDATABASE")
+    if not database:
+        pytest.skip("TEST_PGDATABASE não definido")
+    return database
+
+
+@pytest.fixture
+async def pg():
+    """Conexão com o banco de testes (já migrado), numa transação desfeita no final."""
+    conn = await asyncpg.connect(database=_test_database())
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        yield conn
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+@pytest.fixture
+async def session():
+    """AsyncSession dos serviços no banco de testes; os commits viram savepoints e tudo é desfeito."""
+    engine = create_async_engine("postgresql+asyncpg://", connect_args={"database": _test_database()})
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            async with AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint") as db:
+                yield db
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def account_id(pg) -> UUID:
+    return await pg.fetchval(
+        "INSERT INTO account (name, slug) VALUES ($1::text, $1::text) RETURNING id", f"teste-{uuid4().hex[:12]}"
+    )
+
+
+@pytest.fixture
+async def project_id(pg, account_id) -> UUID:
+    return await pg.fetchval(
+        "INSERT INTO project (account_id, key, name) VALUES ($1, 'TST', 'Projeto de teste') RETURNING id",
+        account_id,
+    )
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.tools.archive import archive_tasks
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_archive_moves_done_tasks_and_keeps_rollup(pg, account_id, project_id):
+    await pg.execute(
+        """
+        INSERT INTO task (account_id, project_id, title, status, completed_at)
+        VALUES ($1, $2, 'antiga', 'done', now() - interval '400 days'),
+               ($1, $2, 'recente', 'done', now()),
+               ($1, $2, 'aberta', 'backlog', NULL)
+        """,
+        account_id,
+        project_id,
+    )
+
+    result = await archive_tasks(pg, datetime.now(timezone.utc) - timedelta(days=180), account_id=account_id)
+
+    assert result.tasks == 1
+    assert await pg.fetchval("SELECT title FROM task_archive WHERE account_id = $1", account_id) == "antiga"
+    assert await pg.fetchval("SELECT count(*) FROM task WHERE account_id = $1", account_id) == 2
+    # Arquivar não desconta: o rollup continua com as três tarefas
+    assert await pg.fetchval("SELECT tasks_total FROM project_rollup WHERE project_id = $1", project_id) == 3
@@ -0,0 +1,14 @@
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+
+
+def test_read_your_writes_window_covers_replica_lag_by_default():
+    settings = Settings(db_replica_max_lag_seconds=10, db_replica_health_interval=5)
+    assert settings.read_your_writes_window_seconds == 15
+
+
+def test_read_your_writes_window_shorter_than_replica_lag_is_rejected():
+    with pytest.raises(ValidationError, match="READ_YOUR_WRITES_WINDOW_SECONDS"):
+        Settings(db_replica_max_lag_seconds=10, read_your_writes_window_seconds=5)
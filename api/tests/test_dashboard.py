@@ -0,0 +1,47 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import dashboard
+
+pytestmark = pytest.mark.anyio
+
+
+async def _fast_panel(session, account_id):
+    return [{"ok": True}]
+
+
+def _sessionmaker(wait_seconds):
+    """Fábrica que demora a entregar a sessão, como a fila justa de uma conta saturada."""
+
+    @asynccontextmanager
+    async def factory():
+        await asyncio.sleep(wait_seconds)
+        async with AsyncSession() as session:
+            yield session
+
+    return factory
+
+
+async def test_panel_deadline_covers_waiting_for_a_session(monkeypatch):
+    monkeypatch.setattr(dashboard, "PANELS", {"slow_slot": _fast_panel})
+
+    started = time.perf_counter()
+    result = await dashboard.build_dashboard(_sessionmaker(5), uuid4(), timeout_ms=50)
+
+    assert time.perf_counter() - started < 1
+    assert result["panels"] == {"slow_slot": None}
+    assert result["errors"] == {"slow_slot": "Tempo limite de 50 ms excedido"}
+
+
+async def test_panel_within_deadline_returns_data(monkeypatch):
+    monkeypatch.setattr(dashboard, "PANELS", {"fast": _fast_panel})
+
+    result = await dashboard.build_dashboard(_sessionmaker(0), uuid4(), timeout_ms=500)
+
+    assert result["panels"] == {"fast": [{"ok": True}]}
+    assert result["errors"] == {}
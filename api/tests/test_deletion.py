@@ -0,0 +1,161 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.models import area  # noqa: F401 - registra Area, usada pelos relacionamentos de UserApp
+from app.services import admin as admin_service
+from app.services import meeting as meeting_service
+from app.services import sprint as sprint_service
+from app.services import task as task_service
+from app.tools.deletion import run_job
+
+pytestmark = pytest.mark.anyio
+
+
+async def _insert(session, sql, **params):
+    return (await session.execute(text(sql), params)).scalar_one()
+
+
+@pytest.fixture
+async def tenant(session):
+    """Conta com dois projetos, cada um com tarefa, sprint e reunião."""
+    account_id = await _insert(
+        session, "INSERT INTO account (name, slug) VALUES ('Exclusão', 'exclusao-teste') RETURNING id"
+    )
+    meeting_type_id = await _insert(
+        session,
+        "INSERT INTO meeting_type (account_id, key, name) VALUES (:account, 'daily', 'Daily') RETURNING id",
+        account=account_id,
+    )
+    data = {"account_id": account_id}
+    for key in ("gone", "kept"):
+        project_id = await _insert(
+            session,
+            "INSERT INTO project (account_id, key, name) VALUES (:account, :key, :key) RETURNING id",
+            account=account_id,
+            key=key.upper(),
+        )
+        data[key] = {
+            "project": project_id,
+            "task": await _insert(
+                session,
+                "INSERT INTO task (account_id, project_id, title) VALUES (:account, :project, :key) RETURNING id",
+                account=account_id,
+                project=project_id,
+                key=key,
+            ),
+            "sprint": await _insert(
+                session,
+                """
+                INSERT INTO sprint (account_id, project_id, name, starts_at, ends_at)
+                VALUES (:account, :project, :key, :starts, :ends) RETURNING id
+                """,
+                account=account_id,
+                project=project_id,
+                key=key,
+                starts=date(2025, 3, 3),
+                ends=date(2025, 3, 14),
+            ),
+            "meeting": await _insert(
+                session,
+                """
+                INSERT INTO meeting (account_id, project_id, meeting_type_id, title, occurred_at, retention_months)
+                VALUES (:account, :project, :type, :key, :occurred, 0) RETURNING id
+                """,
+                account=account_id,
+                project=project_id,
+                type=meeting_type_id,
+                key=key,
+                occurred=datetime(2025, 3, 5, tzinfo=timezone.utc),
+            ),
+        }
+    await session.commit()
+    return data
+
+
+async def test_project_children_are_hidden_before_the_worker_runs(session, tenant):
+    account_id, gone, kept = tenant["account_id"], tenant["gone"], tenant["kept"]
+
+    job = await admin_service.delete_project(session, account_id, gone["project"])
+    job_id = job.id
+    assert job.status == "pending"
+
+    tasks = await task_service.list_tasks(session, account_id=account_id)
+    assert [task.id for task in tasks] == [kept["task"]]
+    with pytest.raises(ValueError):
+        await task_service.get_task(session, gone["task"], account_id)
+    assert await sprint_service.list_tasks_for_project(session, account_id=account_id, project_id=gone["project"]) == []
+
+    sprints = await sprint_service.list_sprints(session, account_id=account_id)
+    assert [sprint.id for sprint in sprints] == [kept["sprint"]]
+    with pytest.raises(LookupError):
+        await sprint_service.get_sprint(session, gone["sprint"])
+
+    meetings = await meeting_service.list_meetings(session, account_id)
+    assert [meeting.id for meeting in meetings] == [kept["meeting"]]
+    with pytest.raises(LookupError):
+        await meeting_service.get_meeting(session, gone["meeting"])
+
+    # O job apaga as tarefas e desvincula reuniões e sprints, que voltam a aparecer sem projeto
+    conn = (await (await session.connection()).get_raw_connection()).driver_connection
+    await run_job(conn, job_id, batch_size=1)
+    session.expire_all()
+    finished = await admin_service.get_deletion_job(session, job_id)
+    await session.refresh(finished)
+    assert finished.status == "done"
+    assert finished.processed["task"] == 1
+    assert await session.scalar(text("SELECT count(*) FROM project WHERE id = :id"), {"id": gone["project"]}) == 0
+    sprint = await sprint_service.get_sprint(session, gone["sprint"])
+    assert sprint.project_id is None
+
+
+async def test_account_children_are_hidden_before_the_worker_runs(session, tenant):
+    account_id, kept = tenant["account_id"], tenant["kept"]
+
+    await admin_service.delete_account(session, account_id)
+
+    assert await task_service.list_tasks(session, account_id=account_id) == []
+    assert await sprint_service.list_sprints(session, account_id=account_id) == []
+    assert await meeting_service.list_meetings(session, account_id) == []
+    with pytest.raises(ValueError):
+        await task_service.get_task(session, kept["task"], account_id)
+    with pytest.raises(LookupError):
+        await meeting_service.get_meeting(session, kept["meeting"])
+
+
+async def test_project_deletion_job_writes_outbox_events(session, tenant):
+    account_id, gone = tenant["account_id"], tenant["gone"]
+
+    job = await admin_service.delete_project(session, account_id, gone["project"])
+    job_id = job.id
+    conn = (await (await session.connection()).get_raw_connection()).driver_connection
+    await conn.execute("DELETE FROM outbox WHERE account_id = $1", account_id)
+    await run_job(conn, job_id, batch_size=1)
+
+    events = await conn.fetch(
+        "SELECT entity, entity_id, op FROM outbox WHERE account_id = $1 AND entity <> 'project' ORDER BY id",
+        account_id,
+    )
+    assert [(event["entity"], event["entity_id"], event["op"]) for event in events] == [
+        ("task", gone["task"], "delete"),
+        ("meeting", gone["meeting"], "update"),
+        ("sprint", gone["sprint"], "update"),
+    ]
+
+
+async def test_account_pending_deletion_hides_users_and_refuses_new_children(session, tenant):
+    account_id = tenant["account_id"]
+    user = await admin_service.create_user(
+        session, account_id, {"email": "exclusao@example.com", "full_name": "Exclusão", "password": "segredo-123"}
+    )
+    assert await admin_service.authenticate_user(session, account_id, user.email, "segredo-123") is not None
+
+    await admin_service.delete_account(session, account_id)
+
+    assert await admin_service.list_users(session, account_id) == []
+    assert await admin_service.authenticate_user(session, account_id, user.email, "segredo-123") is None
+    with pytest.raises(ValueError, match="em exclusão"):
+        await admin_service.create_project(session, account_id, {"key": "NEW", "name": "Novo"})
+    with pytest.raises(ValueError, match="em exclusão"):
+        await admin_service.create_user(session, account_id, {"email": "novo@example.com", "full_name": "Novo"})
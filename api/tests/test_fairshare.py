@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from app.fairshare import FairShareScheduler, PoolTimeoutError
+
+pytestmark = pytest.mark.anyio
+
+
+async def _settle():
+    """Deixa as tasks pendentes chegarem até a fila."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _hold(scheduler, account, order, release):
+    async with scheduler.slot(account):
+        order.append(account)
+        await release.wait()
+
+
+async def test_free_slot_is_granted_immediately_and_released():
+    scheduler = FairShareScheduler("test", 2, timeout=1)
+
+    async with scheduler.slot("a"):
+        assert scheduler.in_use == 1
+        assert scheduler.stats()["accounts"][0]["queued"] == 0
+
+    assert scheduler.in_use == 0
+
+
+async def test_released_slot_goes_to_account_with_fewest_active_sessions():
+    scheduler = FairShareScheduler("test", 2, max_per_account=2, timeout=1)
+    first = scheduler.slot("a")
+    second = scheduler.slot("a")
+    await first.__aenter__()
+    await second.__aenter__()
+
+    order, release = [], asyncio.Event()
+    waiters = [asyncio.create_task(_hold(scheduler, "a", order, release))]
+    await _settle()
+    waiters.append(asyncio.create_task(_hold(scheduler, "b", order, release)))
+    await _settle()
+    assert order == []
+
+    # "a" chegou primeiro, mas já tem uma sessão aberta; "b", nenhuma
+    await first.__aexit__(None, None, None)
+    await _settle()
+    assert order == ["b"]
+
+    await second.__aexit__(None, None, None)
+    await _settle()
+    assert order == ["b", "a"]
+
+    release.set()
+    await asyncio.gather(*waiters)
+    assert scheduler.in_use == 0
+
+
+async def test_weight_lets_an_account_hold_more_sessions():
+    scheduler = FairShareScheduler("test", 3, max_per_account=3, timeout=1)
+    scheduler.load_plans({"a": {"weight": 3}})
+    held = [scheduler.slot(account) for account in ("a", "a", "b")]
+    for slot in held:
+        await slot.__aenter__()
+
+    order, release = [], asyncio.Event()
+    waiters = [asyncio.create_task(_hold(scheduler, account, order, release)) for account in ("b", "a")]
+    await _settle()
+
+    # Com uma vaga de "a" devolvida: 1/3 ("a", peso 3) < 1/1 ("b", peso 1)
+    await held[0].__aexit__(None, None, None)
+    await _settle()
+    assert order == ["a"]
+
+    release.set()
+    for slot in held[1:]:
+        await slot.__aexit__(None, None, None)
+    await asyncio.gather(*waiters)
+    assert order == ["a", "b"]
+
+
+async def test_requests_of_one_account_are_served_in_arrival_order():
+    scheduler = FairShareScheduler("test", 1, timeout=1)
+    held = scheduler.slot("a")
+    await held.__aenter__()
+
+    order, release = [], asyncio.Event()
+    release.set()
+    waiters = []
+    for index in range(3):
+        waiters.append(asyncio.create_task(_hold(scheduler, "b", order, release)))
+        waiters[-1].set_name(str(index))
+    await _settle()
+
+    finished = []
+    for task in waiters:
+        task.add_done_callback(lambda task: finished.append(task.get_name()))
+    await held.__aexit__(None, None, None)
+    await asyncio.gather(*waiters)
+    assert finished == ["0", "1", "2"]
+
+
+async def test_account_ceiling_applies_even_with_free_slots():
+    scheduler = FairShareScheduler("test", 4, max_per_account=1, timeout=0.05)
+
+    async with scheduler.slot("a"):
+        with pytest.raises(PoolTimeoutError, match="Conta a esperou mais de 0.05s"):
+            async with scheduler.slot("a"):
+                pass
+        # Outra conta ainda entra na hora
+        async with scheduler.slot("b"):
+            assert scheduler.in_use == 2
+
+    stats = scheduler.stats()
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    timeouts = {account["account"]: account["timeouts"] for account in stats["accounts"]}
+    assert timeouts == {"a": 1, "b": 0}
+
+
+async def test_plan_ceiling_overrides_the_default():
+    scheduler = FairShareScheduler("test", 4, max_per_account=1, timeout=0.05)
+    scheduler.load_plans({"a": {"max_concurrency": 2}, "b": {"max_concurrency": 0}})
+
+    async with scheduler.slot("a"), scheduler.slot("a"):
+        assert scheduler.in_use == 2
+    # max_concurrency inválido é ignorado: "b" fica com o teto padrão
+    assert scheduler.limit(scheduler._tenant("b")) == 1
+
+
+async def test_slot_granted_to_a_cancelled_waiter_goes_to_the_next_one():
+    scheduler = FairShareScheduler("test", 1, timeout=1)
+    held = scheduler.slot("a")
+    await held.__aenter__()
+
+    order, release = [], asyncio.Event()
+    cancelled = asyncio.create_task(_hold(scheduler, "b", order, release))
+    await _settle()
+    next_waiter = asyncio.create_task(_hold(scheduler, "b", order, release))
+    await _settle()
+
+    # A vaga é entregue ao primeiro da fila, que é cancelado antes de voltar a rodar
+    await held.__aexit__(None, None, None)
+    cancelled.cancel()
+    await _settle()
+
+    assert cancelled.cancelled()
+    assert order == ["b"]
+    assert scheduler.in_use == 1
+
+    release.set()
+    await next_waiter
+    assert scheduler.in_use == 0
+    assert scheduler.stats()["waiting"] == 0
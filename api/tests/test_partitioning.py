@@ -0,0 +1,46 @@
+import asyncpg
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _partition_of(pg, task_id):
+    return await pg.fetchval("SELECT tableoid::regclass::text FROM task WHERE id = $1", task_id)
+
+
+async def test_task_insert_and_project_move_on_partitioned_task(pg, account_id, project_id):
+    assert await pg.fetchval("SELECT relkind FROM pg_class WHERE oid = 'task'::regclass") == b"p"
+
+    task_id = await pg.fetchval(
+        "INSERT INTO task (account_id, project_id, title) VALUES ($1, $2, 't') RETURNING id", account_id, project_id
+    )
+    before = await _partition_of(pg, task_id)
+
+    # Projeto de outra conta: o trigger de UPDATE acompanha a conta e a linha muda de partição
+    for attempt in range(8):
+        other_account = await pg.fetchval(
+            "INSERT INTO account (name, slug) VALUES ($1::text, $1::text) RETURNING id", f"outra-{attempt}-{account_id}"
+        )
+        other_project = await pg.fetchval(
+            "INSERT INTO project (account_id, key, name) VALUES ($1, 'OUT', 'Outro') RETURNING id", other_account
+        )
+        await pg.execute("UPDATE task SET project_id = $2 WHERE id = $1", task_id, other_project)
+        if await _partition_of(pg, task_id) != before:
+            break
+    assert await pg.fetchval("SELECT account_id FROM task WHERE id = $1", task_id) == other_account
+    assert await _partition_of(pg, task_id) != before
+
+
+async def test_insert_without_account_is_rejected_by_not_null(pg, project_id):
+    with pytest.raises(asyncpg.NotNullViolationError):
+        await pg.execute("INSERT INTO task (project_id, title) VALUES ($1, 'sem conta')", project_id)
+
+
+async def test_child_foreign_keys_are_not_per_partition_clones(pg):
+    clones = await pg.fetchval(
+        """
+        SELECT count(*) FROM pg_constraint
+        WHERE contype = 'f' AND conparentid = 0 AND confrelid::regclass::text ~ '^task_p[0-9]+$'
+        """
+    )
+    assert clones == 0
@@ -0,0 +1,25 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+_ROLLUP = "SELECT tasks_total, status_backlog, status_done FROM project_rollup WHERE project_id = $1"
+
+
+async def test_task_insert_update_and_delete_keep_rollup_in_sync(pg, account_id, project_id):
+    await pg.execute(
+        """
+        INSERT INTO task (account_id, project_id, title, due_date)
+        VALUES ($1, $2, 'a', current_date), ($1, $2, 'b', NULL)
+        """,
+        account_id,
+        project_id,
+    )
+    assert tuple(await pg.fetchrow(_ROLLUP, project_id)) == (2, 2, 0)
+    assert await pg.fetchval("SELECT open_tasks FROM project_rollup_due WHERE project_id = $1", project_id) == 1
+
+    await pg.execute("UPDATE task SET status = 'done' WHERE project_id = $1 AND title = 'a'", project_id)
+    assert tuple(await pg.fetchrow(_ROLLUP, project_id)) == (2, 1, 1)
+    assert await pg.fetchval("SELECT count(*) FROM project_rollup_due WHERE project_id = $1", project_id) == 0
+
+    await pg.execute("DELETE FROM task WHERE project_id = $1", project_id)
+    assert tuple(await pg.fetchrow(_ROLLUP, project_id)) == (0, 0, 0)
@@ -0,0 +1,59 @@
+import sys
+import types
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.slow_query import SlowQueryLog
+
+pytestmark = pytest.mark.anyio
+
+# Serviço de mentira: o log identifica o chamador pelo módulo em `app.services.*`
+_SERVICE_SOURCE = """
+from sqlalchemy import text
+
+async def list_everything(session):
+    return (await session.execute(text("SELECT 1"))).scalar()
+"""
+
+
+@pytest.fixture
+def fake_service(monkeypatch):
+    module = types.ModuleType("app.services.fake_report")
+    exec(_SERVICE_SOURCE, module.__dict__)
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    return module
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    yield engine
+    await engine.dispose()
+
+
+async def test_caller_is_the_service_behind_greenlet_spawn(engine, fake_service):
+    log = SlowQueryLog(threshold_ms=0.000001)
+    log.install(engine)
+
+    async with AsyncSession(engine) as session:
+        assert await fake_service.list_everything(session) == 1
+
+    [entry] = log.entries()
+    assert entry.caller == "app.services.fake_report.list_everything"
+
+
+async def test_failed_statement_does_not_leak_start_time(engine):
+    log = SlowQueryLog(threshold_ms=0.000001)
+    log.install(engine)
+
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM tabela_que_nao_existe"))
+        await conn.execute(text("SELECT 1"))
+        info = (await conn.get_raw_connection()).info
+        assert info["slow_query_started"] == []
+    assert len(log.entries()) == 1
@@ -195,8 +195,8 @@ function AccountsTab({
     async (accountId: string, name: string) => {
       if (!confirm(`Remover a conta "${name}"?`)) return;
       try {
-        await deleteAccount.mutateAsync(accountId);
-        onSuccess("Conta removida com sucesso");
+        const { detail } = await deleteAccount.mutateAsync(accountId);
+        onSuccess(detail);
       } catch (error) {
         onError(error, "Não foi possível remover a conta");
       }
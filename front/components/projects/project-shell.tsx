@@ -122,8 +122,8 @@ export function ProjectShell() {
     async (project: Project) => {
       if (!confirm(`Remover o projeto "${project.name}"?`)) return;
       try {
-        await deleteProject.mutateAsync(project.id);
-        showFeedback("Projeto removido com sucesso", "success");
+        const { detail } = await deleteProject.mutateAsync(project.id);
+        showFeedback(detail, "success");
       } catch (error) {
         const message = error instanceof Error ? error.message : "Não foi possível remover o projeto";
         showFeedback(message, "error");
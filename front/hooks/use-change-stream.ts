@@ -0,0 +1,40 @@
+import { useEffect } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { getApiBaseUrl } from "@/lib/api-client";
+
+type ChangeEvent = {
+  entity: "task" | "meeting" | "sprint";
+  id: string;
+  project_id?: string;
+  op: "insert" | "update" | "delete";
+  version: number;
+};
+
+const keysByEntity: Record<ChangeEvent["entity"], string[][]> = {
+  task: [["tasks"], ["task"], ["sprint-tasks"]],
+  meeting: [["meetings"], ["meeting"]],
+  sprint: [["sprints"], ["sprint"], ["sprint-tasks"]],
+};
+
+// Mantém as listas em cache atualizadas com o stream de mudanças da conta (/api/stream).
+export function useChangeStream(accountId?: string) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!accountId) return;
+    const params = new URLSearchParams({ account_id: accountId });
+    const source = new EventSource(`${getApiBaseUrl()}/api/stream?${params.toString()}`);
+
+    source.addEventListener("change", (message) => {
+      const event = JSON.parse((message as MessageEvent<string>).data) as ChangeEvent;
+      for (const queryKey of keysByEntity[event.entity] ?? []) {
+        queryClient.invalidateQueries({ queryKey });
+      }
+    });
+    source.addEventListener("resync", () => {
+      queryClient.invalidateQueries();
+    });
+
+    return () => source.close();
+  }, [accountId, queryClient]);
+}
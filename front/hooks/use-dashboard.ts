@@ -0,0 +1,10 @@
+import { useQuery } from "@tanstack/react-query";
+import { fetchDashboard } from "@/lib/dashboard-api";
+
+export function useDashboard(accountId: string | undefined) {
+  return useQuery({
+    queryKey: ["dashboard", accountId],
+    queryFn: () => fetchDashboard(accountId!),
+    enabled: !!accountId,
+  });
+}
@@ -5,6 +5,8 @@ import type {
   CreatePlanInput,
   CreateProjectInput,
   CreateUserInput,
+  DeletionAccepted,
+  DeletionJob,
   Plan,
   Project,
   UpdateAccountInput,
@@ -65,11 +67,19 @@ export async function updateAccount(accountId: string, payload: UpdateAccountInp
 }
 
 export async function deleteAccount(accountId: string) {
-  return apiFetch<{ detail: string }>(`/api/admin/accounts/${accountId}`, {
+  return apiFetch<DeletionAccepted>(`/api/admin/accounts/${accountId}`, {
     method: "DELETE",
   });
 }
 
+export async function getDeletionJobs(accountId: string) {
+  return apiFetch<DeletionJob[]>(`/api/admin/accounts/${accountId}/deletion-jobs`);
+}
+
+export async function getDeletionJob(jobId: string) {
+  return apiFetch<DeletionJob>(`/api/admin/deletion-jobs/${jobId}`);
+}
+
 export async function getProjects(accountId: string) {
   return apiFetch<Project[]>(`/api/admin/accounts/${accountId}/projects`);
 }
@@ -89,7 +99,7 @@ export async function updateProject(accountId: string, projectId: string, payloa
 }
 
 export async function deleteProject(accountId: string, projectId: string) {
-  return apiFetch<{ detail: string }>(`/api/admin/accounts/${accountId}/projects/${projectId}`, {
+  return apiFetch<DeletionAccepted>(`/api/admin/accounts/${accountId}/projects/${projectId}`, {
     method: "DELETE",
   });
 }
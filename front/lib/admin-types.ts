@@ -73,6 +73,29 @@ export type CreateProjectInput = {
 
 export type UpdateProjectInput = Partial<CreateProjectInput>;
 
+export type DeletionJob = {
+  id: string;
+  kind: "account" | "project";
+  account_id: string;
+  project_id: string | null;
+  status: "pending" | "running" | "done" | "failed";
+  step: number;
+  steps_total: number;
+  current_table: string | null;
+  processed: Record<string, number>;
+  failures: number;
+  error: string | null;
+  requested_at: string;
+  started_at: string | null;
+  updated_at: string;
+  finished_at: string | null;
+};
+
+export type DeletionAccepted = {
+  detail: string;
+  job: DeletionJob;
+};
+
 export type User = {
   id: string;
   account_id: string;
@@ -1,4 +1,10 @@
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://localhost:8080";
+const LAST_WRITE_HEADER = "X-Last-Write";
+
+// Instante da última escrita devolvido pela API. Reenviado nas requisições seguintes para que
+// a API sirva as leituras pelo primário enquanto as réplicas podem não ter a escrita (o cookie
+// HttpOnly não atravessa origens). Só no navegador: no servidor seria compartilhado entre usuários.
+let lastWrite: string | null = null;
 
 type RequestOptions = Omit<RequestInit, "body"> & {
   body?: unknown;
@@ -21,11 +27,17 @@ export async function apiFetch<T>(path: string, options: RequestOptions = {}): P
     ...rest,
     headers: {
       "Content-Type": "application/json",
+      ...(lastWrite ? { [LAST_WRITE_HEADER]: lastWrite } : {}),
       ...(headers ?? {}),
     },
     body: body !== undefined ? JSON.stringify(body) : undefined,
   });
 
+  const writeStamp = response.headers.get(LAST_WRITE_HEADER);
+  if (writeStamp && typeof window !== "undefined") {
+    lastWrite = writeStamp;
+  }
+
   const isJson = response.headers.get("content-type")?.includes("application/json");
   const payload = isJson ? await response.json() : await response.text();
 
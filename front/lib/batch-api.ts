@@ -0,0 +1,21 @@
+import { apiFetch } from "@/lib/api-client";
+
+export type BatchItem = {
+  id: string;
+  path: string;
+};
+
+export type BatchResult<T = unknown> = {
+  status: number;
+  body: T;
+};
+
+export const batchApi = {
+  // Agrupa vários GETs da API em uma única requisição (POST /api/batch).
+  run(requests: BatchItem[]) {
+    return apiFetch<{ responses: Record<string, BatchResult> }>("/api/batch", {
+      method: "POST",
+      body: { requests: requests.map((request) => ({ ...request, method: "GET" })) },
+    }).then((payload) => payload.responses);
+  },
+};
@@ -0,0 +1,83 @@
+import { apiFetch } from "@/lib/api-client";
+
+export type DashboardProjectHealth = {
+  id: string;
+  name: string;
+  status: string;
+  health: "on-track" | "at-risk" | "critical";
+  progress: number;
+  effort: number;
+  due: string | null;
+  owner: string | null;
+  tasks_total: number;
+  tasks_done: number;
+  tasks_blocked: number;
+  tasks_overdue: number;
+};
+
+export type DashboardSprintCapacity = {
+  id: string;
+  name: string;
+  project_id: string | null;
+  starts_at: string;
+  ends_at: string;
+  committed: number;
+  remaining: number;
+  velocity: number;
+  capacity_hours: number;
+  focus: number;
+};
+
+export type DashboardTaskRow = {
+  id: string;
+  title: string;
+  status: string;
+  priority: string;
+  project_id: string;
+  task_type: string | null;
+  estimate_hours: number | null;
+  story_points: number | null;
+  assignee: string | null;
+  due: string | null;
+};
+
+export type DashboardMeetingSlice = {
+  id: string;
+  title: string;
+  type: string;
+  project_id: string | null;
+  occurred_at: string;
+  duration_minutes: number | null;
+  sentiment: number | null;
+  status: string;
+  participants: number;
+};
+
+export type DashboardInsight = {
+  id: string;
+  kind: "task_blocked" | "task_overdue" | "meeting_sentiment";
+  impact: "high" | "medium" | "low";
+  title: string;
+  entity: "task" | "meeting";
+  entity_id: string;
+  assignee: string | null;
+  due: string | null;
+};
+
+export type Dashboard = {
+  account_id: string;
+  generated_at: string;
+  // Painéis lentos ou com erro vêm como null, com o motivo em `errors`.
+  panels: {
+    project_health: DashboardProjectHealth[] | null;
+    sprint_capacity: DashboardSprintCapacity[] | null;
+    task_grid: DashboardTaskRow[] | null;
+    meeting_timeline: DashboardMeetingSlice[] | null;
+    insight_stream: DashboardInsight[] | null;
+  };
+  errors: Record<string, string>;
+};
+
+export async function fetchDashboard(accountId: string): Promise<Dashboard> {
+  return apiFetch(`/api/dashboard?account_id=${accountId}`);
+}
@@ -6,6 +6,7 @@ const buildQuery = (accountId: string, filters?: TaskFilters) => {
   if (filters?.project_id) params.append("project_id", filters.project_id);
   if (filters?.status) params.append("status", filters.status);
   if (filters?.priority) params.append("priority", filters.priority);
+  if (filters?.include_archived) params.append("include_archived", "true");
   return params;
 };
 
@@ -19,6 +19,7 @@ export type Task = {
   created_at: string;
   updated_at: string;
   task_type?: TaskType | null;
+  archived_at?: string | null;
 };
 
 export type CreateTaskInput = {
@@ -49,4 +50,5 @@ export type TaskFilters = {
   project_id?: string | null;
   status?: string | null;
   priority?: string | null;
+  include_archived?: boolean;
 };
@@ -61,10 +61,13 @@ CREATE TABLE IF NOT EXISTS account (
   locale          text NOT NULL DEFAULT 'pt-BR',
   timezone        text NOT NULL DEFAULT 'America/Sao_Paulo',
   settings        jsonb NOT NULL DEFAULT '{}',
+  deletion_requested_at timestamptz, -- exclusão em andamento (deletion_job); some das leituras
   created_at      timestamptz NOT NULL DEFAULT now(),
   updated_at      timestamptz NOT NULL DEFAULT now()
 );
 
+CREATE INDEX IF NOT EXISTS idx_account_deletion_requested ON account (id) WHERE deletion_requested_at IS NOT NULL;
+
 -- ===== Áreas (departamentos/times) =====
 CREATE TABLE IF NOT EXISTS area (
   id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -100,6 +103,7 @@ CREATE TABLE IF NOT EXISTS user_app (
 );
 
 CREATE INDEX IF NOT EXISTS idx_user_app_area ON user_app(area_id);
+CREATE INDEX IF NOT EXISTS idx_user_app_account_name ON user_app(account_id, full_name);
 
 -- ===== Perfil de acesso (papéis simples por conta) =====
 CREATE TABLE IF NOT EXISTS profile (
@@ -137,11 +141,14 @@ CREATE TABLE IF NOT EXISTS project (
   end_date        date,
   created_by      uuid REFERENCES user_app(id),
   updated_by      uuid REFERENCES user_app(id),
+  deletion_requested_at timestamptz, -- exclusão em andamento (deletion_job); some das leituras
   created_at      timestamptz NOT NULL DEFAULT now(),
   updated_at      timestamptz NOT NULL DEFAULT now(),
   UNIQUE (account_id, key)
 );
 
+CREATE INDEX IF NOT EXISTS idx_project_deletion_requested ON project (id) WHERE deletion_requested_at IS NOT NULL;
+
 -- Comentários de projeto
 CREATE TABLE IF NOT EXISTS project_comment (
   id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -172,18 +179,31 @@ CREATE TABLE IF NOT EXISTS sprint (
 
 CREATE INDEX IF NOT EXISTS idx_sprint_project ON sprint(project_id);
 CREATE INDEX IF NOT EXISTS idx_sprint_dates ON sprint(starts_at, ends_at);
+CREATE INDEX IF NOT EXISTS idx_sprint_account_starts ON sprint(account_id, starts_at);
 
+-- Particionada por hash da conta, como task (migrations/20250320_partition_tenant_tables.py)
 CREATE TABLE IF NOT EXISTS sprint_task (
   sprint_id       uuid NOT NULL REFERENCES sprint(id) ON DELETE CASCADE,
-  task_id         uuid NOT NULL REFERENCES task(id) ON DELETE CASCADE,
+  task_id         uuid NOT NULL,
   account_id      uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
   planned_hours   integer,
   planned_points  numeric(6,2),
   status          text NOT NULL DEFAULT 'committed',
   notes           text,
   position        integer,
-  PRIMARY KEY (sprint_id, task_id)
-);
+  PRIMARY KEY (account_id, sprint_id, task_id),
+  CONSTRAINT sprint_task_task_fkey FOREIGN KEY (account_id, task_id)
+    REFERENCES task(account_id, id) ON UPDATE CASCADE ON DELETE CASCADE
+) PARTITION BY HASH (account_id);
+
+DO $$
+BEGIN
+  FOR r IN 0..15 LOOP
+    EXECUTE format('CREATE TABLE IF NOT EXISTS sprint_task_p%s PARTITION OF sprint_task FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+                   lpad(r::text, 2, '0'), r);
+  END LOOP;
+END
+$$;
 
 CREATE INDEX IF NOT EXISTS idx_sprint_task_task ON sprint_task(task_id);
 
@@ -224,10 +244,12 @@ CREATE TABLE IF NOT EXISTS task_type (
 );
 
 -- ===== Tarefas =====
+-- Particionada por hash da conta: a conta faz parte da PK e de toda FK para task
 CREATE TABLE IF NOT EXISTS task (
-  id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  id              uuid NOT NULL DEFAULT gen_random_uuid(),
   project_id      uuid NOT NULL REFERENCES project(id) ON DELETE CASCADE,
-  parent_id       uuid REFERENCES task(id) ON DELETE SET NULL,
+  account_id      uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE, -- desnormalizado de project.account_id
+  parent_id       uuid,
   task_type_id    uuid REFERENCES task_type(id) ON DELETE SET NULL,
   external_ref    text, -- id do ADO/Jira/etc
   title           text NOT NULL,
@@ -244,24 +266,109 @@ CREATE TABLE IF NOT EXISTS task (
   created_by      uuid REFERENCES user_app(id),
   updated_by      uuid REFERENCES user_app(id),
   created_at      timestamptz NOT NULL DEFAULT now(),
-  updated_at      timestamptz NOT NULL DEFAULT now()
-);
+  updated_at      timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, id),
+  CONSTRAINT task_parent_fkey FOREIGN KEY (account_id, parent_id)
+    REFERENCES task(account_id, id) ON UPDATE CASCADE ON DELETE SET NULL (parent_id)
+) PARTITION BY HASH (account_id);
 
-CREATE INDEX IF NOT EXISTS idx_task_project ON task(project_id);
+DO $$
+BEGIN
+  FOR r IN 0..15 LOOP
+    EXECUTE format('CREATE TABLE IF NOT EXISTS task_p%s PARTITION OF task FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+                   lpad(r::text, 2, '0'), r);
+  END LOOP;
+END
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_task_project_created ON task(project_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_task_account_created ON task(account_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_task_account_status_created ON task(account_id, status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_task_account_priority_created ON task(account_id, priority, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_task_status ON task(status);
 CREATE INDEX IF NOT EXISTS idx_task_priority ON task(priority);
 CREATE INDEX IF NOT EXISTS idx_task_due ON task(due_date);
+CREATE INDEX IF NOT EXISTS idx_task_parent ON task(account_id, parent_id) WHERE parent_id IS NOT NULL;
+
+-- Rollup por projeto, mantido por triggers em task (funções em migrations/20250315_add_project_rollup.sql)
+CREATE TABLE IF NOT EXISTS project_rollup (
+  project_id              uuid PRIMARY KEY REFERENCES project(id) ON DELETE CASCADE,
+  account_id              uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
+  tasks_total             integer NOT NULL DEFAULT 0,
+  status_backlog          integer NOT NULL DEFAULT 0,
+  status_planned          integer NOT NULL DEFAULT 0,
+  status_in_progress      integer NOT NULL DEFAULT 0,
+  status_review           integer NOT NULL DEFAULT 0,
+  status_blocked          integer NOT NULL DEFAULT 0,
+  status_done             integer NOT NULL DEFAULT 0,
+  open_priority_low       integer NOT NULL DEFAULT 0,
+  open_priority_medium    integer NOT NULL DEFAULT 0,
+  open_priority_high      integer NOT NULL DEFAULT 0,
+  open_priority_critical  integer NOT NULL DEFAULT 0,
+  estimate_hours          bigint NOT NULL DEFAULT 0,
+  actual_hours            bigint NOT NULL DEFAULT 0,
+  updated_at              timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_project_rollup_account ON project_rollup(account_id);
+
+CREATE TABLE IF NOT EXISTS project_rollup_due (
+  project_id  uuid NOT NULL REFERENCES project(id) ON DELETE CASCADE,
+  due_date    date NOT NULL,
+  open_tasks  integer NOT NULL,
+  PRIMARY KEY (project_id, due_date)
+);
 
 -- Comentários de tarefa
 CREATE TABLE IF NOT EXISTS task_comment (
   id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-  task_id         uuid NOT NULL REFERENCES task(id) ON DELETE CASCADE,
+  task_id         uuid NOT NULL,
+  account_id      uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
   author_id       uuid NOT NULL REFERENCES user_app(id) ON DELETE CASCADE,
   body            text NOT NULL,
   created_at      timestamptz NOT NULL DEFAULT now(),
-  updated_at      timestamptz NOT NULL DEFAULT now()
+  updated_at      timestamptz NOT NULL DEFAULT now(),
+  CONSTRAINT task_comment_task_fkey FOREIGN KEY (account_id, task_id)
+    REFERENCES task(account_id, id) ON UPDATE CASCADE ON DELETE CASCADE
 );
 
+CREATE INDEX IF NOT EXISTS idx_task_comment_task ON task_comment (account_id, task_id);
+
+-- Arquivo de tarefas concluídas (`python -m app.tools.archive run`, ver
+-- migrations/20250326_add_task_archive.sql): mesmas colunas das originais + archived_at
+CREATE TABLE IF NOT EXISTS task_archive (
+  LIKE task INCLUDING DEFAULTS,
+  archived_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, id),
+  CONSTRAINT task_archive_project_fkey FOREIGN KEY (project_id) REFERENCES project(id) ON DELETE CASCADE,
+  CONSTRAINT task_archive_account_fkey FOREIGN KEY (account_id) REFERENCES account(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_archive_project_created ON task_archive (project_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_task_archive_account_created ON task_archive (account_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS sprint_task_archive (
+  LIKE sprint_task INCLUDING DEFAULTS,
+  archived_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, sprint_id, task_id),
+  CONSTRAINT sprint_task_archive_sprint_fkey FOREIGN KEY (sprint_id) REFERENCES sprint(id) ON DELETE CASCADE,
+  CONSTRAINT sprint_task_archive_task_fkey FOREIGN KEY (account_id, task_id)
+    REFERENCES task_archive(account_id, id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_sprint_task_archive_task ON sprint_task_archive (account_id, task_id);
+CREATE INDEX IF NOT EXISTS idx_sprint_task_archive_sprint ON sprint_task_archive (sprint_id);
+
+CREATE TABLE IF NOT EXISTS task_comment_archive (
+  LIKE task_comment INCLUDING DEFAULTS,
+  archived_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (id),
+  CONSTRAINT task_comment_archive_task_fkey FOREIGN KEY (account_id, task_id)
+    REFERENCES task_archive(account_id, id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_comment_archive_task ON task_comment_archive (account_id, task_id);
+
 CREATE TABLE IF NOT EXISTS meeting_type (
   id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   account_id      uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
@@ -277,8 +384,25 @@ CREATE TABLE IF NOT EXISTS meeting_type (
 
 CREATE INDEX IF NOT EXISTS idx_meeting_type_account ON meeting_type(account_id);
 
+-- Prazo de retenção do plano: features.retention_months (meses; ausente ou 0 = sem prazo)
+CREATE OR REPLACE FUNCTION plan_retention_months(features jsonb) RETURNS smallint
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT greatest(coalesce((features ->> 'retention_months')::numeric, 0), 0)::smallint
+$$;
+
+CREATE OR REPLACE FUNCTION account_retention_months(account uuid) RETURNS smallint
+LANGUAGE sql STABLE AS $$
+  SELECT coalesce(
+    (SELECT plan_retention_months(p.features) FROM account a JOIN plan p ON p.id = a.plan_id WHERE a.id = account),
+    0
+  )::smallint
+$$;
+
+-- meeting e doc_chunk: RANGE mensal em occurred_at e, em cada mês, LIST por retention_months.
+-- Aqui só a partição DEFAULT; os meses (meeting_AAAA_MM_r<prazo>) são criados pela API ou por
+-- `python -m app.tools.retention ensure`, que também descarta os expirados (`apply`).
 CREATE TABLE IF NOT EXISTS meeting (
-  id                  uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  id                  uuid NOT NULL DEFAULT gen_random_uuid(),
   account_id          uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
   meeting_type_id     uuid NOT NULL REFERENCES meeting_type(id) ON DELETE RESTRICT,
   project_id          uuid REFERENCES project(id) ON DELETE SET NULL,
@@ -292,28 +416,43 @@ CREATE TABLE IF NOT EXISTS meeting (
   status              text NOT NULL DEFAULT 'processed',
   metadata            jsonb NOT NULL DEFAULT '{}'::jsonb,
   notes               text,
+  retention_months    smallint NOT NULL,
   created_at          timestamptz NOT NULL DEFAULT now(),
-  updated_at          timestamptz NOT NULL DEFAULT now()
-);
+  updated_at          timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (id, occurred_at, retention_months)
+) PARTITION BY RANGE (occurred_at);
+
+CREATE TABLE IF NOT EXISTS meeting_default PARTITION OF meeting DEFAULT;
 
-CREATE INDEX IF NOT EXISTS idx_meeting_account ON meeting(account_id);
+CREATE INDEX IF NOT EXISTS idx_meeting_account_occurred ON meeting(account_id, occurred_at DESC);
 CREATE INDEX IF NOT EXISTS idx_meeting_project ON meeting(project_id);
 CREATE INDEX IF NOT EXISTS idx_meeting_occurred_at ON meeting(occurred_at);
 
+-- Sem FK para meeting (particionada por mês): a API apaga os participantes com a reunião
 CREATE TABLE IF NOT EXISTS meeting_participant (
-  meeting_id       uuid NOT NULL REFERENCES meeting(id) ON DELETE CASCADE,
+  meeting_id       uuid NOT NULL,
   display_name     text NOT NULL,
+  account_id       uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
   user_id          uuid REFERENCES user_app(id) ON DELETE SET NULL,
   email            text,
   role             text,
   joined_at        timestamptz,
   left_at          timestamptz,
-  PRIMARY KEY (meeting_id, display_name)
-);
+  PRIMARY KEY (account_id, meeting_id, display_name)
+) PARTITION BY HASH (account_id);
+
+DO $$
+BEGIN
+  FOR r IN 0..15 LOOP
+    EXECUTE format('CREATE TABLE IF NOT EXISTS meeting_participant_p%s PARTITION OF meeting_participant FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+                   lpad(r::text, 2, '0'), r);
+  END LOOP;
+END
+$$;
 
 CREATE TABLE IF NOT EXISTS doc_chunk (
-  id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-  meeting_id      uuid REFERENCES meeting(id) ON DELETE CASCADE,
+  id              uuid NOT NULL DEFAULT gen_random_uuid(),
+  meeting_id      uuid,
   project_id      uuid REFERENCES project(id) ON DELETE SET NULL,
   account_id      uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
   source_type     text NOT NULL,
@@ -326,12 +465,82 @@ CREATE TABLE IF NOT EXISTS doc_chunk (
   end_time        numeric(10,2),
   participants    text[],
   metadata        jsonb NOT NULL DEFAULT '{}'::jsonb,
-  created_at      timestamptz NOT NULL DEFAULT now()
-);
+  occurred_at     timestamptz NOT NULL,
+  retention_months smallint NOT NULL,
+  created_at      timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, id, occurred_at, retention_months)
+) PARTITION BY RANGE (occurred_at);
+
+CREATE TABLE IF NOT EXISTS doc_chunk_default PARTITION OF doc_chunk DEFAULT;
 
-CREATE INDEX IF NOT EXISTS idx_doc_chunk_meeting ON doc_chunk(meeting_id);
+CREATE INDEX IF NOT EXISTS idx_doc_chunk_meeting_source ON doc_chunk(meeting_id, source_type);
 CREATE INDEX IF NOT EXISTS idx_doc_chunk_account ON doc_chunk(account_id);
 
+-- ===== Outbox de mudanças =====
+-- Preenchida por triggers em task, meeting, sprint, sprint_task e project e drenada por
+-- `python -m app.tools.outbox publish` (triggers em migrations/20250329_add_outbox.sql)
+CREATE TABLE IF NOT EXISTS outbox (
+  id          bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  entity      text NOT NULL,
+  entity_id   uuid NOT NULL,
+  account_id  uuid,
+  project_id  uuid,
+  op          text NOT NULL,
+  data        jsonb,
+  version     bigint NOT NULL DEFAULT txid_current(),
+  created_at  timestamptz NOT NULL DEFAULT now()
+)
+WITH (autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 10000, autovacuum_vacuum_cost_delay = 0);
+
+-- ===== Uso por conta =====
+-- Estoque (projetos, usuários, tarefas) e consumo mensal (minutos de reunião, tokens de trechos),
+-- mantidos por triggers nas escritas (funções em migrations/20250331_add_account_usage.sql)
+CREATE TABLE IF NOT EXISTS account_usage (
+  account_id  uuid PRIMARY KEY REFERENCES account(id) ON DELETE CASCADE,
+  projects    bigint NOT NULL DEFAULT 0,
+  users       bigint NOT NULL DEFAULT 0,
+  tasks       bigint NOT NULL DEFAULT 0,
+  updated_at  timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS account_usage_monthly (
+  account_id       uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
+  month            date NOT NULL,
+  meeting_minutes  bigint NOT NULL DEFAULT 0,
+  chunk_tokens     bigint NOT NULL DEFAULT 0,
+  updated_at       timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, month)
+);
+
+-- ===== Exclusão em segundo plano =====
+-- Jobs de exclusão de contas e projetos, executados em lotes por app.tools.deletion
+-- (migrations/20250402_add_deletion_jobs.sql). Sem FK: o job fica como histórico.
+CREATE TABLE IF NOT EXISTS deletion_job (
+  id            uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  kind          text NOT NULL CHECK (kind IN ('account', 'project')),
+  account_id    uuid NOT NULL,
+  project_id    uuid,
+  status        text NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+  step          integer NOT NULL DEFAULT 0,
+  cursor        text,
+  processed     jsonb NOT NULL DEFAULT '{}'::jsonb,
+  failures      integer NOT NULL DEFAULT 0,
+  error         text,
+  requested_at  timestamptz NOT NULL DEFAULT now(),
+  started_at    timestamptz,
+  updated_at    timestamptz NOT NULL DEFAULT now(),
+  finished_at   timestamptz,
+  CHECK ((kind = 'project') = (project_id IS NOT NULL))
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_deletion_job_active
+  ON deletion_job (kind, account_id, coalesce(project_id, account_id))
+  WHERE status IN ('pending', 'running');
+CREATE INDEX IF NOT EXISTS idx_deletion_job_queue
+  ON deletion_job (requested_at)
+  WHERE status IN ('pending', 'running');
+CREATE INDEX IF NOT EXISTS idx_deletion_job_account ON deletion_job (account_id, requested_at DESC);
+
 -- RLS desabilitado durante o desenvolvimento. Reative conforme necessário ao preparar o ambiente produtivo.
 
 -- ===== Views úteis (opcionais) =====
@@ -0,0 +1,31 @@
+-- Índices compostos para os formatos de query mais frequentes dos serviços
+--   list_tasks            -> task(project_id, created_at desc)
+--   list_meetings         -> meeting(account_id, occurred_at desc)
+--   update_meeting/chunks -> doc_chunk(meeting_id, source_type)
+--   list_sprints          -> sprint(account_id, starts_at)
+--   list_users            -> user_app(account_id, full_name)
+--
+-- ATENÇÃO: CREATE/DROP INDEX CONCURRENTLY não pode rodar dentro de transação.
+-- O runner (`python -m app.tools.migrate`) executa este arquivo em autocommit por causa da linha abaixo.
+-- migrate: no-transaction
+-- Se um build concorrente falhar, o índice fica INVALID: remova-o e rode o arquivo novamente.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_project_created
+  ON task (project_id, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_meeting_account_occurred
+  ON meeting (account_id, occurred_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doc_chunk_meeting_source
+  ON doc_chunk (meeting_id, source_type);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sprint_account_starts
+  ON sprint (account_id, starts_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_app_account_name
+  ON user_app (account_id, full_name);
+
+-- Índices de coluna única cobertos pelo prefixo dos novos compostos (só custam escrita)
+DROP INDEX CONCURRENTLY IF EXISTS idx_task_project;
+DROP INDEX CONCURRENTLY IF EXISTS idx_meeting_account;
+DROP INDEX CONCURRENTLY IF EXISTS idx_doc_chunk_meeting;
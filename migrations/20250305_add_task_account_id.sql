@@ -0,0 +1,99 @@
+-- Desnormaliza task.account_id para filtrar tarefas por conta sem join em project.
+--
+-- ATENÇÃO: este arquivo usa CALL com COMMIT por lote e CREATE INDEX CONCURRENTLY,
+-- portanto NÃO pode rodar dentro de transação; o runner (`python -m app.tools.migrate`)
+-- executa este arquivo statement a statement em autocommit por causa da linha abaixo.
+-- migrate: no-transaction
+-- Todos os passos são idempotentes; se algo falhar no meio, basta rodar novamente.
+
+-- 1) Coluna nula (instantâneo, sem reescrever a tabela)
+ALTER TABLE task
+  ADD COLUMN IF NOT EXISTS account_id uuid REFERENCES account(id) ON DELETE CASCADE;
+
+-- 2) Mantém a coluna em inserts e quando a tarefa muda de projeto
+CREATE OR REPLACE FUNCTION task_set_account_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' OR NEW.project_id IS DISTINCT FROM OLD.project_id OR NEW.account_id IS NULL THEN
+    SELECT p.account_id INTO NEW.account_id FROM project p WHERE p.id = NEW.project_id;
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_task_set_account_id ON task;
+CREATE TRIGGER trg_task_set_account_id
+  BEFORE INSERT OR UPDATE OF project_id, account_id ON task
+  FOR EACH ROW EXECUTE FUNCTION task_set_account_id();
+
+-- ... e quando um projeto é transferido de conta
+CREATE OR REPLACE FUNCTION project_propagate_account_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  UPDATE task SET account_id = NEW.account_id WHERE project_id = NEW.id;
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_project_propagate_account_id ON project;
+CREATE TRIGGER trg_project_propagate_account_id
+  AFTER UPDATE OF account_id ON project
+  FOR EACH ROW WHEN (NEW.account_id IS DISTINCT FROM OLD.account_id)
+  EXECUTE FUNCTION project_propagate_account_id();
+
+-- 3) Backfill em lotes ordenados pela PK, com commit por lote (retomável: só pega linhas nulas)
+CREATE OR REPLACE PROCEDURE backfill_task_account_id(batch_size integer DEFAULT 5000, pause_seconds double precision DEFAULT 0.05)
+LANGUAGE plpgsql AS $$
+DECLARE
+  last_id uuid := '00000000-0000-0000-0000-000000000000';
+  batch_last uuid;
+BEGIN
+  LOOP
+    WITH batch AS (
+      SELECT t.id
+      FROM task t
+      WHERE t.id > last_id AND t.account_id IS NULL
+      ORDER BY t.id
+      LIMIT batch_size
+    ), updated AS (
+      UPDATE task t
+      SET account_id = p.account_id
+      FROM batch b, project p
+      WHERE t.id = b.id AND p.id = t.project_id
+      RETURNING t.id
+    )
+    SELECT id INTO batch_last FROM updated ORDER BY id DESC LIMIT 1;
+
+    EXIT WHEN batch_last IS NULL;
+    last_id := batch_last;
+    COMMIT;
+    PERFORM pg_sleep(pause_seconds);
+  END LOOP;
+  COMMIT;
+END
+$$;
+
+CALL backfill_task_account_id();
+
+-- 4) NOT NULL sem bloquear a tabela durante a validação:
+--    CHECK NOT VALID + VALIDATE (lock leve) permite ao SET NOT NULL pular o scan completo.
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'task_account_id_not_null') THEN
+    ALTER TABLE task ADD CONSTRAINT task_account_id_not_null CHECK (account_id IS NOT NULL) NOT VALID;
+  END IF;
+END
+$$;
+ALTER TABLE task VALIDATE CONSTRAINT task_account_id_not_null;
+ALTER TABLE task ALTER COLUMN account_id SET NOT NULL;
+ALTER TABLE task DROP CONSTRAINT IF EXISTS task_account_id_not_null;
+
+-- 5) Índices compostos por conta
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_account_created
+  ON task (account_id, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_account_status_created
+  ON task (account_id, status, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_account_priority_created
+  ON task (account_id, priority, created_at DESC);
@@ -0,0 +1,54 @@
+-- Publica mudanças de task, meeting e sprint no canal `pulsehub_changes` (LISTEN/NOTIFY),
+-- consumido pelo stream `GET /api/stream`. O NOTIFY só é entregue no COMMIT.
+--
+-- Payload compacto (bem abaixo do limite de 8000 bytes do NOTIFY):
+--   {"entity": "task", "id": "...", "account_id": "...", "project_id": "...", "op": "update", "version": 123}
+-- `version` é o txid da transação que fez a mudança (crescente), útil para descartar eventos repetidos.
+--
+-- Cargas em massa (seed, backfills) podem desligar a publicação na sessão/transação com:
+--   SET pulsehub.skip_notify = 'on';
+
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  row_data jsonb;
+BEGIN
+  IF coalesce(current_setting('pulsehub.skip_notify', true), '') = 'on' THEN
+    RETURN NULL;
+  END IF;
+  row_data := to_jsonb(CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END);
+  PERFORM pg_notify(
+    'pulsehub_changes',
+    json_build_object(
+      'entity', TG_ARGV[0],
+      'id', row_data ->> TG_ARGV[1],
+      'account_id', row_data ->> 'account_id',
+      'project_id', row_data ->> 'project_id',
+      'op', CASE WHEN TG_ARGV[0] <> TG_TABLE_NAME THEN 'update' ELSE lower(TG_OP) END,
+      'version', txid_current()
+    )::text
+  );
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_task_notify_change ON task;
+CREATE TRIGGER trg_task_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON task
+  FOR EACH ROW EXECUTE FUNCTION notify_change('task', 'id');
+
+DROP TRIGGER IF EXISTS trg_meeting_notify_change ON meeting;
+CREATE TRIGGER trg_meeting_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON meeting
+  FOR EACH ROW EXECUTE FUNCTION notify_change('meeting', 'id');
+
+DROP TRIGGER IF EXISTS trg_sprint_notify_change ON sprint;
+CREATE TRIGGER trg_sprint_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON sprint
+  FOR EACH ROW EXECUTE FUNCTION notify_change('sprint', 'id');
+
+-- Alterar as tarefas de um sprint é uma mudança do sprint
+DROP TRIGGER IF EXISTS trg_sprint_task_notify_change ON sprint_task;
+CREATE TRIGGER trg_sprint_task_notify_change
+  AFTER INSERT OR UPDATE OR DELETE ON sprint_task
+  FOR EACH ROW EXECUTE FUNCTION notify_change('sprint', 'sprint_id');
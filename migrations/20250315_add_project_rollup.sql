@@ -0,0 +1,265 @@
+-- Rollup por projeto (contagens por status/prioridade, horas e tarefas abertas por prazo),
+-- mantido incrementalmente por triggers de statement em `task`. O dashboard e
+-- `GET /api/admin/accounts/{id}/projects/rollup` leem só estas tabelas, sem varrer `task`.
+--
+-- Os triggers usam tabelas de transição: um INSERT/UPDATE/DELETE (ou COPY) de N tarefas
+-- gera um único upsert por projeto afetado, e não N. Atrasos dependem da data de hoje,
+-- por isso ficam em `project_rollup_due` (tarefas abertas por prazo) e são somados na leitura.
+--
+-- Reparo (recalcula a partir de `task`): `python -m app.tools.rollup repair`.
+
+CREATE TABLE IF NOT EXISTS project_rollup (
+  project_id              uuid PRIMARY KEY REFERENCES project(id) ON DELETE CASCADE,
+  account_id              uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
+  tasks_total             integer NOT NULL DEFAULT 0,
+  status_backlog          integer NOT NULL DEFAULT 0,
+  status_planned          integer NOT NULL DEFAULT 0,
+  status_in_progress      integer NOT NULL DEFAULT 0,
+  status_review           integer NOT NULL DEFAULT 0,
+  status_blocked          integer NOT NULL DEFAULT 0,
+  status_done             integer NOT NULL DEFAULT 0,
+  open_priority_low       integer NOT NULL DEFAULT 0,
+  open_priority_medium    integer NOT NULL DEFAULT 0,
+  open_priority_high      integer NOT NULL DEFAULT 0,
+  open_priority_critical  integer NOT NULL DEFAULT 0,
+  estimate_hours          bigint NOT NULL DEFAULT 0,
+  actual_hours            bigint NOT NULL DEFAULT 0,
+  updated_at              timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_project_rollup_account ON project_rollup(account_id);
+
+CREATE TABLE IF NOT EXISTS project_rollup_due (
+  project_id  uuid NOT NULL REFERENCES project(id) ON DELETE CASCADE,
+  due_date    date NOT NULL,
+  open_tasks  integer NOT NULL,
+  PRIMARY KEY (project_id, due_date)
+);
+
+-- Aplica a diferença entre as versões novas (`added`) e antigas (`removed`) das tarefas.
+-- A linha de `project_rollup` é sempre travada antes de `project_rollup_due`, na ordem de
+-- project_id, para não haver deadlock entre escritores nem com o reparo.
+CREATE OR REPLACE FUNCTION project_rollup_apply(added task[], removed task[]) RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF added IS NULL AND removed IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO project_rollup AS r (
+    project_id, account_id, tasks_total,
+    status_backlog, status_planned, status_in_progress, status_review, status_blocked, status_done,
+    open_priority_low, open_priority_medium, open_priority_high, open_priority_critical,
+    estimate_hours, actual_hours
+  )
+  SELECT
+    d.project_id,
+    (array_agg(d.account_id ORDER BY d.sign DESC))[1],
+    sum(d.sign),
+    sum(CASE WHEN d.status = 'backlog' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status = 'planned' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status = 'in_progress' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status = 'review' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status = 'blocked' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status = 'done' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status <> 'done' AND d.priority = 'low' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status <> 'done' AND d.priority = 'medium' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status <> 'done' AND d.priority = 'high' THEN d.sign ELSE 0 END),
+    sum(CASE WHEN d.status <> 'done' AND d.priority = 'critical' THEN d.sign ELSE 0 END),
+    sum(d.sign * coalesce(d.estimate_hours, 0)),
+    sum(d.sign * coalesce(d.actual_hours, 0))
+  FROM (
+    SELECT a.project_id, a.account_id, a.status, a.priority, a.estimate_hours, a.actual_hours, 1 AS sign
+    FROM unnest(added) AS a
+    UNION ALL
+    SELECT o.project_id, o.account_id, o.status, o.priority, o.estimate_hours, o.actual_hours, -1
+    FROM unnest(removed) AS o
+  ) AS d
+  -- Na exclusão em cascata de um projeto, as tarefas somem depois dele: nada a manter.
+  WHERE EXISTS (SELECT 1 FROM project p WHERE p.id = d.project_id)
+  GROUP BY d.project_id
+  ORDER BY d.project_id
+  ON CONFLICT (project_id) DO UPDATE SET
+    account_id = EXCLUDED.account_id,
+    tasks_total = r.tasks_total + EXCLUDED.tasks_total,
+    status_backlog = r.status_backlog + EXCLUDED.status_backlog,
+    status_planned = r.status_planned + EXCLUDED.status_planned,
+    status_in_progress = r.status_in_progress + EXCLUDED.status_in_progress,
+    status_review = r.status_review + EXCLUDED.status_review,
+    status_blocked = r.status_blocked + EXCLUDED.status_blocked,
+    status_done = r.status_done + EXCLUDED.status_done,
+    open_priority_low = r.open_priority_low + EXCLUDED.open_priority_low,
+    open_priority_medium = r.open_priority_medium + EXCLUDED.open_priority_medium,
+    open_priority_high = r.open_priority_high + EXCLUDED.open_priority_high,
+    open_priority_critical = r.open_priority_critical + EXCLUDED.open_priority_critical,
+    estimate_hours = r.estimate_hours + EXCLUDED.estimate_hours,
+    actual_hours = r.actual_hours + EXCLUDED.actual_hours,
+    updated_at = now();
+
+  INSERT INTO project_rollup_due AS r (project_id, due_date, open_tasks)
+  SELECT d.project_id, d.due_date, sum(d.sign)
+  FROM (
+    SELECT a.project_id, a.due_date, 1 AS sign FROM unnest(added) AS a WHERE a.status <> 'done'
+    UNION ALL
+    SELECT o.project_id, o.due_date, -1 FROM unnest(removed) AS o WHERE o.status <> 'done'
+  ) AS d
+  WHERE d.due_date IS NOT NULL AND EXISTS (SELECT 1 FROM project p WHERE p.id = d.project_id)
+  GROUP BY d.project_id, d.due_date
+  HAVING sum(d.sign) <> 0
+  ORDER BY d.project_id, d.due_date
+  ON CONFLICT (project_id, due_date) DO UPDATE SET open_tasks = r.open_tasks + EXCLUDED.open_tasks;
+
+  DELETE FROM project_rollup_due
+  WHERE open_tasks = 0
+    AND project_id IN (
+      SELECT a.project_id FROM unnest(added) AS a
+      UNION
+      SELECT o.project_id FROM unnest(removed) AS o
+    );
+END
+$$;
+
+CREATE OR REPLACE FUNCTION project_rollup_on_task_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  added task[];
+BEGIN
+  -- Sem a variável tipada, array_agg de uma transition table vira record[] e não casa com
+  -- a assinatura de project_rollup_apply
+  SELECT array_agg(n) INTO added FROM new_rows n;
+  PERFORM project_rollup_apply(added, NULL);
+  RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION project_rollup_on_task_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  removed task[];
+BEGIN
+  SELECT array_agg(o) INTO removed FROM old_rows o;
+  PERFORM project_rollup_apply(NULL, removed);
+  RETURN NULL;
+END
+$$;
+
+-- Só as tarefas em que algum campo do rollup mudou entram no delta (editar título não custa nada).
+CREATE OR REPLACE FUNCTION project_rollup_on_task_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  added task[];
+  removed task[];
+BEGIN
+  SELECT array_agg(n), array_agg(o) INTO added, removed
+  FROM new_rows n
+  JOIN old_rows o ON o.id = n.id
+  WHERE (o.project_id, o.account_id, o.status, o.priority, o.due_date, o.estimate_hours, o.actual_hours)
+    IS DISTINCT FROM (n.project_id, n.account_id, n.status, n.priority, n.due_date, n.estimate_hours, n.actual_hours);
+  PERFORM project_rollup_apply(added, removed);
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_task_rollup_insert ON task;
+CREATE TRIGGER trg_task_rollup_insert
+  AFTER INSERT ON task
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION project_rollup_on_task_insert();
+
+DROP TRIGGER IF EXISTS trg_task_rollup_update ON task;
+CREATE TRIGGER trg_task_rollup_update
+  AFTER UPDATE ON task
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION project_rollup_on_task_update();
+
+DROP TRIGGER IF EXISTS trg_task_rollup_delete ON task;
+CREATE TRIGGER trg_task_rollup_delete
+  AFTER DELETE ON task
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION project_rollup_on_task_delete();
+
+-- Projeto novo já nasce com linha zerada; transferência de conta acompanha o projeto.
+CREATE OR REPLACE FUNCTION project_rollup_on_project() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO project_rollup (project_id, account_id)
+  VALUES (NEW.id, NEW.account_id)
+  ON CONFLICT (project_id) DO UPDATE SET account_id = EXCLUDED.account_id, updated_at = now();
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_project_rollup ON project;
+CREATE TRIGGER trg_project_rollup
+  AFTER INSERT OR UPDATE OF account_id ON project
+  FOR EACH ROW EXECUTE FUNCTION project_rollup_on_project();
+
+-- Recalcula do zero o rollup dos projetos informados. Primeiro garante e trava as linhas
+-- de `project_rollup` (esperando escritas em andamento nesses projetos e segurando as
+-- próximas até o commit); cada statement seguinte enxerga um snapshot novo, então o
+-- recálculo inclui tudo o que já foi confirmado e nada se perde nem conta duas vezes.
+CREATE OR REPLACE FUNCTION project_rollup_rebuild(p_projects uuid[]) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+  rebuilt integer;
+BEGIN
+  INSERT INTO project_rollup (project_id, account_id)
+  SELECT p.id, p.account_id FROM project p WHERE p.id = ANY(p_projects) ORDER BY p.id
+  ON CONFLICT (project_id) DO NOTHING;
+
+  PERFORM 1 FROM project_rollup WHERE project_id = ANY(p_projects) ORDER BY project_id FOR UPDATE;
+
+  UPDATE project_rollup r SET
+    account_id = c.account_id,
+    tasks_total = c.tasks_total,
+    status_backlog = c.status_backlog,
+    status_planned = c.status_planned,
+    status_in_progress = c.status_in_progress,
+    status_review = c.status_review,
+    status_blocked = c.status_blocked,
+    status_done = c.status_done,
+    open_priority_low = c.open_priority_low,
+    open_priority_medium = c.open_priority_medium,
+    open_priority_high = c.open_priority_high,
+    open_priority_critical = c.open_priority_critical,
+    estimate_hours = c.estimate_hours,
+    actual_hours = c.actual_hours,
+    updated_at = now()
+  FROM (
+    SELECT
+      p.id AS project_id,
+      p.account_id,
+      count(t.id) AS tasks_total,
+      count(t.id) FILTER (WHERE t.status = 'backlog') AS status_backlog,
+      count(t.id) FILTER (WHERE t.status = 'planned') AS status_planned,
+      count(t.id) FILTER (WHERE t.status = 'in_progress') AS status_in_progress,
+      count(t.id) FILTER (WHERE t.status = 'review') AS status_review,
+      count(t.id) FILTER (WHERE t.status = 'blocked') AS status_blocked,
+      count(t.id) FILTER (WHERE t.status = 'done') AS status_done,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'low') AS open_priority_low,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'medium') AS open_priority_medium,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'high') AS open_priority_high,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'critical') AS open_priority_critical,
+      coalesce(sum(t.estimate_hours), 0) AS estimate_hours,
+      coalesce(sum(t.actual_hours), 0) AS actual_hours
+    FROM project p
+    LEFT JOIN task t ON t.project_id = p.id AND t.account_id = p.account_id
+    WHERE p.id = ANY(p_projects)
+    GROUP BY p.id, p.account_id
+  ) AS c
+  WHERE r.project_id = c.project_id;
+  GET DIAGNOSTICS rebuilt = ROW_COUNT;
+
+  DELETE FROM project_rollup_due WHERE project_id = ANY(p_projects);
+  INSERT INTO project_rollup_due (project_id, due_date, open_tasks)
+  SELECT t.project_id, t.due_date, count(*)
+  FROM task t
+  WHERE t.project_id = ANY(p_projects) AND t.status <> 'done' AND t.due_date IS NOT NULL
+  GROUP BY t.project_id, t.due_date;
+
+  RETURN rebuilt;
+END
+$$;
+
+-- Carga inicial na mesma transação que criou os triggers: nenhuma escrita fica de fora.
+SELECT project_rollup_rebuild(coalesce(array_agg(id), '{}')) FROM project;
@@ -0,0 +1,171 @@
+-- Prepara o particionamento por conta (migrations/20250320_partition_tenant_tables.py):
+-- toda tabela que será particionada ou que referencia uma tabela particionada precisa de
+-- `account_id`, e as FKs para `task` passam a ser compostas (account_id, task_id), já que
+-- a chave de uma tabela particionada por hash inclui a coluna de partição.
+--
+-- migrate: no-transaction
+-- Todos os passos são idempotentes; se algo falhar no meio, basta rodar novamente.
+
+-- 1) meeting_participant.account_id, preenchido a partir da reunião
+ALTER TABLE meeting_participant
+  ADD COLUMN IF NOT EXISTS account_id uuid REFERENCES account(id) ON DELETE CASCADE;
+
+-- Só completa quando o chamador não informa a conta. Depois do particionamento o insert
+-- precisa trazer a conta (um trigger BEFORE não pode mudar a partição de destino).
+CREATE OR REPLACE FUNCTION meeting_participant_set_account_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.account_id IS NULL THEN
+    SELECT m.account_id INTO NEW.account_id FROM meeting m WHERE m.id = NEW.meeting_id;
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_meeting_participant_set_account_id ON meeting_participant;
+CREATE TRIGGER trg_meeting_participant_set_account_id
+  BEFORE INSERT ON meeting_participant
+  FOR EACH ROW EXECUTE FUNCTION meeting_participant_set_account_id();
+
+CREATE OR REPLACE PROCEDURE backfill_meeting_participant_account_id(batch_size integer DEFAULT 5000, pause_seconds double precision DEFAULT 0.05)
+LANGUAGE plpgsql AS $$
+DECLARE
+  last_meeting uuid := '00000000-0000-0000-0000-000000000000';
+  batch_last uuid;
+BEGIN
+  -- Lotes por reunião (prefixo da PK), para que todas as linhas de uma reunião saiam juntas
+  LOOP
+    WITH batch AS (
+      SELECT m.id, m.account_id
+      FROM meeting m
+      WHERE m.id > last_meeting
+      ORDER BY m.id
+      LIMIT batch_size
+    ), updated AS (
+      UPDATE meeting_participant mp
+      SET account_id = b.account_id
+      FROM batch b
+      WHERE mp.meeting_id = b.id AND mp.account_id IS NULL
+    )
+    SELECT id INTO batch_last FROM batch ORDER BY id DESC LIMIT 1;
+
+    EXIT WHEN batch_last IS NULL;
+    last_meeting := batch_last;
+    COMMIT;
+    PERFORM pg_sleep(pause_seconds);
+  END LOOP;
+  COMMIT;
+END
+$$;
+
+CALL backfill_meeting_participant_account_id();
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'meeting_participant_account_id_not_null') THEN
+    ALTER TABLE meeting_participant
+      ADD CONSTRAINT meeting_participant_account_id_not_null CHECK (account_id IS NOT NULL) NOT VALID;
+  END IF;
+END
+$$;
+ALTER TABLE meeting_participant VALIDATE CONSTRAINT meeting_participant_account_id_not_null;
+ALTER TABLE meeting_participant ALTER COLUMN account_id SET NOT NULL;
+ALTER TABLE meeting_participant DROP CONSTRAINT IF EXISTS meeting_participant_account_id_not_null;
+
+-- 2) task_comment.account_id, preenchido a partir da tarefa
+ALTER TABLE task_comment
+  ADD COLUMN IF NOT EXISTS account_id uuid REFERENCES account(id) ON DELETE CASCADE;
+
+CREATE OR REPLACE FUNCTION task_comment_set_account_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.account_id IS NULL THEN
+    SELECT t.account_id INTO NEW.account_id FROM task t WHERE t.id = NEW.task_id;
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_task_comment_set_account_id ON task_comment;
+CREATE TRIGGER trg_task_comment_set_account_id
+  BEFORE INSERT ON task_comment
+  FOR EACH ROW EXECUTE FUNCTION task_comment_set_account_id();
+
+CREATE OR REPLACE PROCEDURE backfill_task_comment_account_id(batch_size integer DEFAULT 5000, pause_seconds double precision DEFAULT 0.05)
+LANGUAGE plpgsql AS $$
+DECLARE
+  last_id uuid := '00000000-0000-0000-0000-000000000000';
+  batch_last uuid;
+BEGIN
+  LOOP
+    WITH batch AS (
+      SELECT c.id
+      FROM task_comment c
+      WHERE c.id > last_id AND c.account_id IS NULL
+      ORDER BY c.id
+      LIMIT batch_size
+    ), updated AS (
+      UPDATE task_comment c
+      SET account_id = t.account_id
+      FROM batch b, task t
+      WHERE c.id = b.id AND t.id = c.task_id
+      RETURNING c.id
+    )
+    SELECT id INTO batch_last FROM updated ORDER BY id DESC LIMIT 1;
+
+    EXIT WHEN batch_last IS NULL;
+    last_id := batch_last;
+    COMMIT;
+    PERFORM pg_sleep(pause_seconds);
+  END LOOP;
+  COMMIT;
+END
+$$;
+
+CALL backfill_task_comment_account_id();
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'task_comment_account_id_not_null') THEN
+    ALTER TABLE task_comment
+      ADD CONSTRAINT task_comment_account_id_not_null CHECK (account_id IS NOT NULL) NOT VALID;
+  END IF;
+END
+$$;
+ALTER TABLE task_comment VALIDATE CONSTRAINT task_comment_account_id_not_null;
+ALTER TABLE task_comment ALTER COLUMN account_id SET NOT NULL;
+ALTER TABLE task_comment DROP CONSTRAINT IF EXISTS task_comment_account_id_not_null;
+
+-- 3) Chave (account_id, id) em task, alvo das FKs compostas
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_task_account_id ON task (account_id, id);
+
+-- 4) FKs compostas para task. ON UPDATE CASCADE acompanha a troca de conta do projeto
+--    (trg_project_propagate_account_id); SET NULL (parent_id) exige PostgreSQL 15+.
+--    NOT VALID + VALIDATE evita travar as tabelas durante a verificação.
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'sprint_task_task_fkey') THEN
+    ALTER TABLE sprint_task
+      ADD CONSTRAINT sprint_task_task_fkey FOREIGN KEY (account_id, task_id)
+      REFERENCES task (account_id, id) ON UPDATE CASCADE ON DELETE CASCADE NOT VALID;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'task_comment_task_fkey') THEN
+    ALTER TABLE task_comment
+      ADD CONSTRAINT task_comment_task_fkey FOREIGN KEY (account_id, task_id)
+      REFERENCES task (account_id, id) ON UPDATE CASCADE ON DELETE CASCADE NOT VALID;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'task_parent_fkey') THEN
+    ALTER TABLE task
+      ADD CONSTRAINT task_parent_fkey FOREIGN KEY (account_id, parent_id)
+      REFERENCES task (account_id, id) ON UPDATE CASCADE ON DELETE SET NULL (parent_id) NOT VALID;
+  END IF;
+END
+$$;
+
+ALTER TABLE sprint_task VALIDATE CONSTRAINT sprint_task_task_fkey;
+ALTER TABLE task_comment VALIDATE CONSTRAINT task_comment_task_fkey;
+ALTER TABLE task VALIDATE CONSTRAINT task_parent_fkey;
+
+ALTER TABLE sprint_task DROP CONSTRAINT IF EXISTS sprint_task_task_id_fkey;
+ALTER TABLE task_comment DROP CONSTRAINT IF EXISTS task_comment_task_id_fkey;
+ALTER TABLE task DROP CONSTRAINT IF EXISTS task_parent_id_fkey;
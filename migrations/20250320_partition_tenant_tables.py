@@ -0,0 +1,44 @@
+"""Particiona por hash de `account_id` as tabelas de alto volume por tenant.
+
+Depende de `20250318_add_account_keys_for_partitioning.sql` (account_id nas chaves e FKs
+compostas para `task`). `task` vai primeiro: as FKs de `sprint_task` passam a apontar para a
+tabela particionada antes de `sprint_task` ser copiada. Cada tabela é copiada online e trocada
+em uma transação curta (ver `app.tools.partition`); as antigas ficam como
+`<tabela>_unpartitioned` até serem descartadas manualmente.
+
+Depois da troca, um trigger BEFORE INSERT não pode mais mudar a partição de destino: quem
+insere em `task` ou `meeting_participant` precisa informar `account_id` (os serviços e o seed
+já informam; sem ela, o NOT NULL recusa o insert). Por isso os triggers que completavam a conta
+deixam de rodar no INSERT. Em `task`, o trigger continua nos UPDATEs de `project_id`, porque
+lá o Postgres move a linha de partição.
+"""
+
+from app.tools.partition import HashPartitioning, partition_table, print_progress
+
+TRANSACTIONAL = False
+
+PARTITIONS = 16
+
+TABLES = [
+    HashPartitioning(table="task", primary_key=("id",), partitions=PARTITIONS),
+    HashPartitioning(table="sprint_task", primary_key=("sprint_id", "task_id"), partitions=PARTITIONS),
+    HashPartitioning(table="meeting_participant", primary_key=("meeting_id", "display_name"), partitions=PARTITIONS),
+    HashPartitioning(table="doc_chunk", primary_key=("id",), partitions=PARTITIONS),
+]
+
+ACCOUNT_TRIGGERS = """
+DROP TRIGGER IF EXISTS trg_task_set_account_id ON task;
+CREATE TRIGGER trg_task_set_account_id
+  BEFORE UPDATE OF project_id, account_id ON task
+  FOR EACH ROW EXECUTE FUNCTION task_set_account_id();
+DROP TRIGGER IF EXISTS trg_meeting_participant_set_account_id ON meeting_participant;
+"""
+
+
+async def upgrade(conn):
+    for spec in TABLES:
+        result = await partition_table(conn, spec, on_batch=print_progress)
+        if result.swapped:
+            print(f"  {spec.table}: {result.rows_copied:,} linhas em {spec.partitions} partições")
+    async with conn.transaction():
+        await conn.execute(ACCOUNT_TRIGGERS)
@@ -0,0 +1,182 @@
+-- Prepara o particionamento mensal com retenção por plano
+-- (migrations/20250324_partition_meetings_by_month.py): `meeting` e `doc_chunk` ganham
+-- `retention_months`, o prazo do plano da conta no momento do registro (0 = sem prazo), e
+-- `doc_chunk` ganha `occurred_at` (data da reunião; para trechos avulsos, a criação). São
+-- as colunas de partição das duas tabelas.
+--
+-- migrate: no-transaction
+-- Todos os passos são idempotentes; se algo falhar no meio, basta rodar novamente.
+
+-- 1) Prazo de retenção: plan.features.retention_months (meses; ausente ou 0 = para sempre)
+CREATE OR REPLACE FUNCTION plan_retention_months(features jsonb) RETURNS smallint
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT greatest(coalesce((features ->> 'retention_months')::numeric, 0), 0)::smallint
+$$;
+
+CREATE OR REPLACE FUNCTION account_retention_months(account uuid) RETURNS smallint
+LANGUAGE sql STABLE AS $$
+  SELECT coalesce(
+    (SELECT plan_retention_months(p.features) FROM account a JOIN plan p ON p.id = a.plan_id WHERE a.id = account),
+    0
+  )::smallint
+$$;
+
+-- 2) meeting.retention_months
+ALTER TABLE meeting ADD COLUMN IF NOT EXISTS retention_months smallint;
+
+-- Só até o particionamento (que remove estes triggers): depois dele o insert precisa trazer
+-- as colunas de partição, como já faz a API.
+CREATE OR REPLACE FUNCTION meeting_set_retention() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.retention_months IS NULL THEN
+    NEW.retention_months := account_retention_months(NEW.account_id);
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_meeting_set_retention ON meeting;
+CREATE TRIGGER trg_meeting_set_retention
+  BEFORE INSERT ON meeting
+  FOR EACH ROW EXECUTE FUNCTION meeting_set_retention();
+
+CREATE OR REPLACE PROCEDURE backfill_meeting_retention(batch_size integer DEFAULT 5000, pause_seconds double precision DEFAULT 0.05)
+LANGUAGE plpgsql AS $$
+DECLARE
+  last_id uuid := '00000000-0000-0000-0000-000000000000';
+  batch_last uuid;
+BEGIN
+  LOOP
+    WITH batch AS (
+      SELECT m.id
+      FROM meeting m
+      WHERE m.id > last_id
+      ORDER BY m.id
+      LIMIT batch_size
+    ), updated AS (
+      UPDATE meeting m
+      SET retention_months = account_retention_months(m.account_id)
+      FROM batch b
+      WHERE m.id = b.id AND m.retention_months IS NULL
+    )
+    SELECT id INTO batch_last FROM batch ORDER BY id DESC LIMIT 1;
+
+    EXIT WHEN batch_last IS NULL;
+    last_id := batch_last;
+    COMMIT;
+    PERFORM pg_sleep(pause_seconds);
+  END LOOP;
+  COMMIT;
+END
+$$;
+
+CALL backfill_meeting_retention();
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'meeting_retention_months_not_null') THEN
+    ALTER TABLE meeting
+      ADD CONSTRAINT meeting_retention_months_not_null CHECK (retention_months IS NOT NULL) NOT VALID;
+  END IF;
+END
+$$;
+ALTER TABLE meeting VALIDATE CONSTRAINT meeting_retention_months_not_null;
+ALTER TABLE meeting ALTER COLUMN retention_months SET NOT NULL;
+ALTER TABLE meeting DROP CONSTRAINT IF EXISTS meeting_retention_months_not_null;
+
+-- 3) doc_chunk.occurred_at e doc_chunk.retention_months, copiados da reunião
+ALTER TABLE doc_chunk ADD COLUMN IF NOT EXISTS occurred_at timestamptz;
+ALTER TABLE doc_chunk ADD COLUMN IF NOT EXISTS retention_months smallint;
+
+CREATE OR REPLACE FUNCTION doc_chunk_set_retention() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.occurred_at IS NULL OR NEW.retention_months IS NULL THEN
+    SELECT coalesce(NEW.occurred_at, m.occurred_at), coalesce(NEW.retention_months, m.retention_months)
+      INTO NEW.occurred_at, NEW.retention_months
+      FROM meeting m WHERE m.id = NEW.meeting_id;
+    NEW.occurred_at := coalesce(NEW.occurred_at, NEW.created_at, now());
+    NEW.retention_months := coalesce(NEW.retention_months, account_retention_months(NEW.account_id));
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_doc_chunk_set_retention ON doc_chunk;
+CREATE TRIGGER trg_doc_chunk_set_retention
+  BEFORE INSERT ON doc_chunk
+  FOR EACH ROW EXECUTE FUNCTION doc_chunk_set_retention();
+
+CREATE OR REPLACE PROCEDURE backfill_doc_chunk_retention(batch_size integer DEFAULT 5000, pause_seconds double precision DEFAULT 0.05)
+LANGUAGE plpgsql AS $$
+DECLARE
+  last_account uuid := '00000000-0000-0000-0000-000000000000';
+  last_id uuid := '00000000-0000-0000-0000-000000000000';
+  batch_account uuid;
+  batch_id uuid;
+BEGIN
+  -- Lotes pela PK (account_id, id) da tabela particionada por conta
+  LOOP
+    WITH batch AS (
+      SELECT c.account_id, c.id
+      FROM doc_chunk c
+      WHERE (c.account_id, c.id) > (last_account, last_id)
+      ORDER BY c.account_id, c.id
+      LIMIT batch_size
+    ), updated AS (
+      UPDATE doc_chunk c
+      SET occurred_at = coalesce((SELECT m.occurred_at FROM meeting m WHERE m.id = c.meeting_id), c.created_at),
+          retention_months = coalesce(
+            (SELECT m.retention_months FROM meeting m WHERE m.id = c.meeting_id),
+            account_retention_months(c.account_id)
+          )
+      FROM batch b
+      WHERE c.account_id = b.account_id AND c.id = b.id
+        AND (c.occurred_at IS NULL OR c.retention_months IS NULL)
+    )
+    SELECT account_id, id INTO batch_account, batch_id FROM batch ORDER BY account_id DESC, id DESC LIMIT 1;
+
+    EXIT WHEN batch_account IS NULL;
+    last_account := batch_account;
+    last_id := batch_id;
+    COMMIT;
+    PERFORM pg_sleep(pause_seconds);
+  END LOOP;
+  COMMIT;
+END
+$$;
+
+CALL backfill_doc_chunk_retention();
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'doc_chunk_retention_not_null') THEN
+    ALTER TABLE doc_chunk
+      ADD CONSTRAINT doc_chunk_retention_not_null
+      CHECK (occurred_at IS NOT NULL AND retention_months IS NOT NULL) NOT VALID;
+  END IF;
+END
+$$;
+ALTER TABLE doc_chunk VALIDATE CONSTRAINT doc_chunk_retention_not_null;
+ALTER TABLE doc_chunk ALTER COLUMN occurred_at SET NOT NULL;
+ALTER TABLE doc_chunk ALTER COLUMN retention_months SET NOT NULL;
+ALTER TABLE doc_chunk DROP CONSTRAINT IF EXISTS doc_chunk_retention_not_null;
+
+-- 4) Sem FKs para meeting: a chave de uma tabela particionada por mês inclui occurred_at, e
+--    um DETACH de partição referenciada faria o Postgres varrer as tabelas que a referenciam.
+--    A API apaga participantes e trechos junto com a reunião (cascade do ORM) e a retenção
+--    descarta as partições de doc_chunk junto com as de meeting.
+DO $$
+DECLARE
+  fk record;
+BEGIN
+  FOR fk IN
+    SELECT conrelid::regclass AS table_name, conname
+    FROM pg_constraint
+    WHERE confrelid = 'meeting'::regclass AND contype = 'f' AND conparentid = 0
+  LOOP
+    EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.table_name, fk.conname);
+  END LOOP;
+END
+$$;
@@ -0,0 +1,40 @@
+"""Particiona `meeting` e `doc_chunk` por mês de `occurred_at` e, em cada mês, por prazo de retenção.
+
+Depende de `20250322_add_retention_columns.sql` (colunas de partição preenchidas e sem FKs
+para `meeting`). Os prazos vêm dos planos existentes; prazos novos ganham partição pelo
+`ensure` de `app.tools.retention`. `doc_chunk` deixa o hash por conta de
+`20250320_partition_tenant_tables.py`: a tabela anterior fica como `doc_chunk_by_account`, e
+`meeting` como `meeting_unpartitioned`, até serem descartadas manualmente.
+
+Rode depois de publicar a versão da API que grava `retention_months`/`occurred_at` nos
+inserts: os triggers que preenchiam essas colunas saem antes da cópia, porque numa tabela
+particionada um trigger BEFORE não pode mudar a partição de destino.
+"""
+
+from app.tools.partition import MonthlyPartitioning, partition_table, print_progress
+from app.tools.retention import MONTHS_AHEAD, plan_tiers
+
+TRANSACTIONAL = False
+
+
+async def upgrade(conn):
+    await conn.execute("DROP TRIGGER IF EXISTS trg_meeting_set_retention ON meeting")
+    await conn.execute("DROP TRIGGER IF EXISTS trg_doc_chunk_set_retention ON doc_chunk")
+    await conn.execute("DROP FUNCTION IF EXISTS meeting_set_retention()")
+    await conn.execute("DROP FUNCTION IF EXISTS doc_chunk_set_retention()")
+
+    tiers = await plan_tiers(conn)
+    tables = [
+        MonthlyPartitioning(table="meeting", primary_key=("id",), tiers=tiers, months_ahead=MONTHS_AHEAD),
+        MonthlyPartitioning(
+            table="doc_chunk",
+            primary_key=("account_id", "id"),
+            tiers=tiers,
+            months_ahead=MONTHS_AHEAD,
+            retired_suffix="_by_account",
+        ),
+    ]
+    for spec in tables:
+        result = await partition_table(conn, spec, on_batch=print_progress)
+        if result.swapped:
+            print(f"  {spec.table}: {result.rows_copied:,} linhas, prazos {', '.join(map(str, tiers))}")
@@ -0,0 +1,127 @@
+-- Arquivo frio de tarefas concluídas: `python -m app.tools.archive run` move para estas
+-- tabelas as tarefas `done` há mais de N dias, com as linhas de `sprint_task` e os
+-- comentários, e as apaga de `task`. Os índices de `task` passam a cobrir só o que a grade
+-- mostra; `GET /api/tasks/{id}` e `GET /api/tasks?include_archived=true` leem também daqui.
+--
+-- As tabelas de arquivo têm as mesmas colunas das originais mais `archived_at`, sem
+-- particionamento e só com os índices das leituras por conta/projeto. Coluna nova em `task`,
+-- `sprint_task` ou `task_comment` precisa ser adicionada aqui também (o arquivamento recusa
+-- rodar se faltar alguma).
+
+CREATE TABLE IF NOT EXISTS task_archive (
+  LIKE task INCLUDING DEFAULTS,
+  archived_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, id),
+  CONSTRAINT task_archive_project_fkey FOREIGN KEY (project_id) REFERENCES project(id) ON DELETE CASCADE,
+  CONSTRAINT task_archive_account_fkey FOREIGN KEY (account_id) REFERENCES account(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_archive_project_created ON task_archive (project_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_task_archive_account_created ON task_archive (account_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS sprint_task_archive (
+  LIKE sprint_task INCLUDING DEFAULTS,
+  archived_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, sprint_id, task_id),
+  CONSTRAINT sprint_task_archive_sprint_fkey FOREIGN KEY (sprint_id) REFERENCES sprint(id) ON DELETE CASCADE,
+  CONSTRAINT sprint_task_archive_task_fkey FOREIGN KEY (account_id, task_id)
+    REFERENCES task_archive(account_id, id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_sprint_task_archive_task ON sprint_task_archive (account_id, task_id);
+CREATE INDEX IF NOT EXISTS idx_sprint_task_archive_sprint ON sprint_task_archive (sprint_id);
+
+CREATE TABLE IF NOT EXISTS task_comment_archive (
+  LIKE task_comment INCLUDING DEFAULTS,
+  archived_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (id),
+  CONSTRAINT task_comment_archive_task_fkey FOREIGN KEY (account_id, task_id)
+    REFERENCES task_archive(account_id, id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_comment_archive_task ON task_comment_archive (account_id, task_id);
+
+-- Rollup: arquivar não muda a saúde do projeto. O delete feito pelo arquivamento (com
+-- `pulsehub.archiving = 'on'` na transação) não desconta as tarefas, e o recálculo soma
+-- `task` e `task_archive`.
+CREATE OR REPLACE FUNCTION project_rollup_on_task_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  removed task[];
+BEGIN
+  IF coalesce(current_setting('pulsehub.archiving', true), '') = 'on' THEN
+    RETURN NULL;
+  END IF;
+  SELECT array_agg(o) INTO removed FROM old_rows o;
+  PERFORM project_rollup_apply(NULL, removed);
+  RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION project_rollup_rebuild(p_projects uuid[]) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+  rebuilt integer;
+BEGIN
+  INSERT INTO project_rollup (project_id, account_id)
+  SELECT p.id, p.account_id FROM project p WHERE p.id = ANY(p_projects) ORDER BY p.id
+  ON CONFLICT (project_id) DO NOTHING;
+
+  PERFORM 1 FROM project_rollup WHERE project_id = ANY(p_projects) ORDER BY project_id FOR UPDATE;
+
+  UPDATE project_rollup r SET
+    account_id = c.account_id,
+    tasks_total = c.tasks_total,
+    status_backlog = c.status_backlog,
+    status_planned = c.status_planned,
+    status_in_progress = c.status_in_progress,
+    status_review = c.status_review,
+    status_blocked = c.status_blocked,
+    status_done = c.status_done,
+    open_priority_low = c.open_priority_low,
+    open_priority_medium = c.open_priority_medium,
+    open_priority_high = c.open_priority_high,
+    open_priority_critical = c.open_priority_critical,
+    estimate_hours = c.estimate_hours,
+    actual_hours = c.actual_hours,
+    updated_at = now()
+  FROM (
+    SELECT
+      p.id AS project_id,
+      p.account_id,
+      count(t.id) AS tasks_total,
+      count(t.id) FILTER (WHERE t.status = 'backlog') AS status_backlog,
+      count(t.id) FILTER (WHERE t.status = 'planned') AS status_planned,
+      count(t.id) FILTER (WHERE t.status = 'in_progress') AS status_in_progress,
+      count(t.id) FILTER (WHERE t.status = 'review') AS status_review,
+      count(t.id) FILTER (WHERE t.status = 'blocked') AS status_blocked,
+      count(t.id) FILTER (WHERE t.status = 'done') AS status_done,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'low') AS open_priority_low,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'medium') AS open_priority_medium,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'high') AS open_priority_high,
+      count(t.id) FILTER (WHERE t.status <> 'done' AND t.priority = 'critical') AS open_priority_critical,
+      coalesce(sum(t.estimate_hours), 0) AS estimate_hours,
+      coalesce(sum(t.actual_hours), 0) AS actual_hours
+    FROM project p
+    LEFT JOIN (
+      SELECT id, project_id, account_id, status, priority, estimate_hours, actual_hours FROM task
+      UNION ALL
+      SELECT id, project_id, account_id, status, priority, estimate_hours, actual_hours FROM task_archive
+    ) AS t ON t.project_id = p.id AND t.account_id = p.account_id
+    WHERE p.id = ANY(p_projects)
+    GROUP BY p.id, p.account_id
+  ) AS c
+  WHERE r.project_id = c.project_id;
+  GET DIAGNOSTICS rebuilt = ROW_COUNT;
+
+  -- Tarefas arquivadas estão concluídas: não entram nos prazos em aberto
+  DELETE FROM project_rollup_due WHERE project_id = ANY(p_projects);
+  INSERT INTO project_rollup_due (project_id, due_date, open_tasks)
+  SELECT t.project_id, t.due_date, count(*)
+  FROM task t
+  WHERE t.project_id = ANY(p_projects) AND t.status <> 'done' AND t.due_date IS NOT NULL
+  GROUP BY t.project_id, t.due_date;
+
+  RETURN rebuilt;
+END
+$$;
@@ -0,0 +1,17 @@
+"""Índice das subtarefas: `task (account_id, parent_id) WHERE parent_id IS NOT NULL`.
+
+Sem ele, apagar uma tarefa (o `ON DELETE SET NULL` de `task_parent_fkey`) e o arquivamento
+(`app.tools.archive`, que não move tarefas com subtarefas) procuram filhos varrendo todas
+as partições de `task`. Parcial porque só as subtarefas têm `parent_id`. Construído com
+CONCURRENTLY em cada partição (ver `app.tools.partition.create_index_concurrently`).
+"""
+
+from app.tools.partition import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+async def upgrade(conn):
+    await create_index_concurrently(
+        conn, "task", "idx_task_parent", "(account_id, parent_id) WHERE parent_id IS NOT NULL"
+    )
@@ -0,0 +1,85 @@
+-- Outbox transacional: cada mudança em task, meeting, sprint (e sprint_task) e project grava
+-- um evento em `outbox` na mesma transação, por triggers de statement (um INSERT por
+-- statement, lendo as tabelas de transição). `python -m app.tools.outbox publish` drena a
+-- tabela em lotes ordenados por id com `FOR UPDATE SKIP LOCKED`, entrega a um sink (arquivo
+-- NDJSON ou webhook) e apaga o lote no mesmo commit: entrega pelo menos uma vez.
+--
+-- Evento: entity, entity_id, account_id, project_id, op (insert/update/delete), data (a linha
+-- nova como JSON; nulo em delete e em mudanças de sprint_task, publicadas como `update` do
+-- sprint) e version (txid da transação). Cargas que não são mudança de negócio (seed,
+-- backfills, arquivamento) pulam a outbox com `SET pulsehub.skip_notify = 'on'`, como o
+-- stream de mudanças. Partições descartadas pela retenção (DROP) não geram eventos.
+
+CREATE TABLE IF NOT EXISTS outbox (
+  id          bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  entity      text NOT NULL,
+  entity_id   uuid NOT NULL,
+  account_id  uuid,
+  project_id  uuid,
+  op          text NOT NULL,
+  data        jsonb,
+  version     bigint NOT NULL DEFAULT txid_current(),
+  created_at  timestamptz NOT NULL DEFAULT now()
+)
+-- Fila: linhas entram e saem o tempo todo; vacuum frequente mantém o índice da PK enxuto
+WITH (autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 10000, autovacuum_vacuum_cost_delay = 0);
+
+-- TG_ARGV: entidade publicada e a coluna com o id dela
+CREATE OR REPLACE FUNCTION outbox_capture() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  child boolean := TG_ARGV[0] <> TG_TABLE_NAME;
+BEGIN
+  IF coalesce(current_setting('pulsehub.skip_notify', true), '') = 'on' THEN
+    RETURN NULL;
+  END IF;
+  IF TG_OP = 'DELETE' THEN
+    INSERT INTO outbox (entity, entity_id, account_id, project_id, op)
+    SELECT TG_ARGV[0], (r ->> TG_ARGV[1])::uuid, (r ->> 'account_id')::uuid, (r ->> 'project_id')::uuid,
+           CASE WHEN child THEN 'update' ELSE 'delete' END
+    FROM (SELECT to_jsonb(o) AS r FROM old_rows o) AS changed;
+  ELSE
+    INSERT INTO outbox (entity, entity_id, account_id, project_id, op, data)
+    SELECT TG_ARGV[0], (r ->> TG_ARGV[1])::uuid, (r ->> 'account_id')::uuid, (r ->> 'project_id')::uuid,
+           CASE WHEN child THEN 'update' ELSE lower(TG_OP) END,
+           CASE WHEN child THEN NULL ELSE r END
+    FROM (SELECT to_jsonb(n) AS r FROM new_rows n) AS changed;
+  END IF;
+  RETURN NULL;
+END
+$$;
+
+DO $$
+DECLARE
+  source record;
+BEGIN
+  FOR source IN
+    SELECT * FROM (VALUES
+      ('task', 'task', 'id'),
+      ('meeting', 'meeting', 'id'),
+      ('sprint', 'sprint', 'id'),
+      ('sprint_task', 'sprint', 'sprint_id'),
+      ('project', 'project', 'id')
+    ) AS t(table_name, entity, id_column)
+  LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source.table_name || '_outbox_insert', source.table_name);
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION outbox_capture(%L, %L)',
+      'trg_' || source.table_name || '_outbox_insert', source.table_name, source.entity, source.id_column
+    );
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source.table_name || '_outbox_update', source.table_name);
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING NEW TABLE AS new_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION outbox_capture(%L, %L)',
+      'trg_' || source.table_name || '_outbox_update', source.table_name, source.entity, source.id_column
+    );
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source.table_name || '_outbox_delete', source.table_name);
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION outbox_capture(%L, %L)',
+      'trg_' || source.table_name || '_outbox_delete', source.table_name, source.entity, source.id_column
+    );
+  END LOOP;
+END
+$$;
@@ -0,0 +1,182 @@
+-- Uso por conta, mantido por triggers de statement nas escritas (mesma transação), para
+-- a checagem de quotas do plano (`features.quotas`, ver `app/quotas.py`) e para
+-- `GET /api/admin/accounts/{id}/usage` não precisarem contar linhas.
+--
+-- `account_usage` guarda o estoque: projetos, usuários e tarefas existentes. Tarefas
+-- arquivadas continuam contando, como no rollup de projetos (o delete do arquivamento roda
+-- com `pulsehub.archiving = 'on'`). `account_usage_monthly` guarda o consumo do mês: minutos
+-- de reunião e tokens de trechos indexados. Apagar reuniões ou trechos, inclusive pela
+-- retenção, não devolve consumo. Mudar a duração de uma reunião aplica a diferença no mês
+-- corrente. Trechos sem `token_count` contam ceil(caracteres / 4), a mesma estimativa da API.
+--
+-- Reparo (recalcula o estoque a partir das tabelas): `python -m app.tools.usage repair`.
+
+CREATE TABLE IF NOT EXISTS account_usage (
+  account_id  uuid PRIMARY KEY REFERENCES account(id) ON DELETE CASCADE,
+  projects    bigint NOT NULL DEFAULT 0,
+  users       bigint NOT NULL DEFAULT 0,
+  tasks       bigint NOT NULL DEFAULT 0,
+  updated_at  timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS account_usage_monthly (
+  account_id       uuid NOT NULL REFERENCES account(id) ON DELETE CASCADE,
+  month            date NOT NULL,
+  meeting_minutes  bigint NOT NULL DEFAULT 0,
+  chunk_tokens     bigint NOT NULL DEFAULT 0,
+  updated_at       timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (account_id, month)
+);
+
+-- Linhas que entram (+) e saem (-) no statement. As tabelas de transição só existem nos
+-- eventos que as declaram, então a consulta é montada por operação.
+CREATE OR REPLACE FUNCTION account_usage_changes(op text, amount text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT CASE op
+    WHEN 'INSERT' THEN format('SELECT r.account_id, %s AS amount FROM new_rows r', amount)
+    WHEN 'DELETE' THEN format('SELECT r.account_id, -(%s) AS amount FROM old_rows r', amount)
+    ELSE format(
+      'SELECT r.account_id, %1$s AS amount FROM new_rows r UNION ALL SELECT r.account_id, -(%1$s) FROM old_rows r',
+      amount
+    )
+  END
+$$;
+
+-- TG_ARGV[0]: coluna de `account_usage` (projects, users ou tasks). Um upsert por conta
+-- afetada, na ordem de account_id, para escritores concorrentes não se travarem em ciclo.
+-- Num UPDATE só contam linhas que mudaram de conta (as demais somam zero). Na exclusão em
+-- cascata de uma conta os filhos somem depois dela: nada a manter.
+CREATE OR REPLACE FUNCTION account_usage_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'DELETE' AND coalesce(current_setting('pulsehub.archiving', true), '') = 'on' THEN
+    RETURN NULL;
+  END IF;
+  EXECUTE format(
+    $sql$
+    INSERT INTO account_usage AS u (account_id, %1$I)
+    SELECT d.account_id, sum(d.amount)
+    FROM (%2$s) AS d
+    WHERE EXISTS (SELECT 1 FROM account a WHERE a.id = d.account_id)
+    GROUP BY d.account_id
+    HAVING sum(d.amount) <> 0
+    ORDER BY d.account_id
+    ON CONFLICT (account_id) DO UPDATE SET %1$I = u.%1$I + EXCLUDED.%1$I, updated_at = now()
+    $sql$,
+    TG_ARGV[0],
+    account_usage_changes(TG_OP, '1')
+  );
+  RETURN NULL;
+END
+$$;
+
+-- TG_ARGV[0]: coluna de `account_usage_monthly`; TG_ARGV[1]: expressão do consumo de uma
+-- linha `r` (duração da reunião, tokens do trecho). Só INSERT e UPDATE: apagar não devolve.
+CREATE OR REPLACE FUNCTION account_usage_consume() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  EXECUTE format(
+    $sql$
+    INSERT INTO account_usage_monthly AS u (account_id, month, %1$I)
+    SELECT d.account_id, date_trunc('month', now())::date, sum(d.amount)
+    FROM (%2$s) AS d
+    WHERE EXISTS (SELECT 1 FROM account a WHERE a.id = d.account_id)
+    GROUP BY d.account_id
+    HAVING sum(d.amount) <> 0
+    ORDER BY d.account_id
+    ON CONFLICT (account_id, month) DO UPDATE SET %1$I = u.%1$I + EXCLUDED.%1$I, updated_at = now()
+    $sql$,
+    TG_ARGV[0],
+    account_usage_changes(TG_OP, TG_ARGV[1])
+  );
+  RETURN NULL;
+END
+$$;
+
+DO $$
+DECLARE
+  source record;
+  op text;
+BEGIN
+  FOR source IN
+    SELECT * FROM (VALUES ('project', 'projects'), ('user_app', 'users'), ('task', 'tasks')) AS t(table_name, target)
+  LOOP
+    FOREACH op IN ARRAY ARRAY['insert', 'update', 'delete'] LOOP
+      EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source.table_name || '_usage_' || op, source.table_name);
+    END LOOP;
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION account_usage_count(%L)',
+      'trg_' || source.table_name || '_usage_insert', source.table_name, source.target
+    );
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION account_usage_count(%L)',
+      'trg_' || source.table_name || '_usage_update', source.table_name, source.target
+    );
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION account_usage_count(%L)',
+      'trg_' || source.table_name || '_usage_delete', source.table_name, source.target
+    );
+  END LOOP;
+
+  FOR source IN
+    SELECT * FROM (VALUES
+      ('meeting', 'meeting_minutes', 'coalesce(r.duration_minutes, 0)'),
+      ('doc_chunk', 'chunk_tokens', 'coalesce(r.token_count, ceil(length(r.content) / 4.0)::bigint)')
+    ) AS t(table_name, target, amount)
+  LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source.table_name || '_usage_insert', source.table_name);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || source.table_name || '_usage_update', source.table_name);
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION account_usage_consume(%L, %L)',
+      'trg_' || source.table_name || '_usage_insert', source.table_name, source.target, source.amount
+    );
+    EXECUTE format(
+      'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+      'FOR EACH STATEMENT EXECUTE FUNCTION account_usage_consume(%L, %L)',
+      'trg_' || source.table_name || '_usage_update', source.table_name, source.target, source.amount
+    );
+  END LOOP;
+END
+$$;
+
+-- Recalcula do zero o estoque das contas informadas. Como no rollup de projetos: garante e
+-- trava as linhas antes de contar, então escritas concorrentes esperam e nada conta duas vezes.
+CREATE OR REPLACE FUNCTION account_usage_rebuild(p_accounts uuid[]) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+  rebuilt integer;
+BEGIN
+  INSERT INTO account_usage (account_id)
+  SELECT a.id FROM account a WHERE a.id = ANY(p_accounts) ORDER BY a.id
+  ON CONFLICT (account_id) DO NOTHING;
+
+  PERFORM 1 FROM account_usage WHERE account_id = ANY(p_accounts) ORDER BY account_id FOR UPDATE;
+
+  UPDATE account_usage u SET
+    projects = (SELECT count(*) FROM project p WHERE p.account_id = u.account_id),
+    users = (SELECT count(*) FROM user_app x WHERE x.account_id = u.account_id),
+    tasks = (SELECT count(*) FROM task t WHERE t.account_id = u.account_id)
+          + (SELECT count(*) FROM task_archive t WHERE t.account_id = u.account_id),
+    updated_at = now()
+  WHERE u.account_id = ANY(p_accounts);
+  GET DIAGNOSTICS rebuilt = ROW_COUNT;
+  RETURN rebuilt;
+END
+$$;
+
+-- Carga inicial na mesma transação que criou os triggers. O consumo do mês corrente parte
+-- das reuniões e trechos criados neste mês.
+SELECT account_usage_rebuild(coalesce(array_agg(id), '{}')) FROM account;
+
+INSERT INTO account_usage_monthly (account_id, month, meeting_minutes, chunk_tokens)
+SELECT a.id, date_trunc('month', now())::date,
+       (SELECT coalesce(sum(m.duration_minutes), 0) FROM meeting m
+        WHERE m.account_id = a.id AND m.created_at >= date_trunc('month', now())),
+       (SELECT coalesce(sum(coalesce(c.token_count, ceil(length(c.content) / 4.0)::bigint)), 0) FROM doc_chunk c
+        WHERE c.account_id = a.id AND c.created_at >= date_trunc('month', now()))
+FROM account a
+ON CONFLICT (account_id, month) DO NOTHING;
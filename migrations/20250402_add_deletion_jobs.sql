@@ -0,0 +1,86 @@
+-- Exclusão de contas e projetos em segundo plano (ver `app/tools/deletion.py`).
+--
+-- `DELETE /api/admin/accounts/{id}` e `DELETE .../projects/{id}` só marcam a linha com
+-- `deletion_requested_at`, o que já a tira das leituras (junto com tarefas, reuniões e sprints
+-- dela, filtrados pelos índices parciais abaixo), e enfileiram um `deletion_job`. O
+-- worker apaga os filhos em lotes pela ordem de uma chave indexada, cada lote numa transação
+-- curta que também grava o avanço do job (passo, cursor e linhas por tabela). Depois de uma
+-- queda, o job continua do último lote confirmado. O `DELETE` final da conta ou do projeto
+-- só leva pelo cascade o que sobrou.
+--
+-- O job não tem FK para a conta nem para o projeto: fica como histórico depois que eles somem.
+--
+-- Os lotes ligam `pulsehub.skip_notify` (o stream não recebe milhares de eventos), mas a
+-- exclusão é mudança de negócio: os consumidores da outbox precisam dos `delete` das tarefas e
+-- dos `update` das reuniões e sprints desvinculados. Por isso a outbox passa a ter a própria
+-- chave, `pulsehub.skip_outbox`, ligada só pelas cargas em massa (seed, backfills, arquivamento).
+--
+-- O índice em `task_comment (account_id, task_id)` evita que cada tarefa apagada varra a tabela
+-- inteira no cascade da FK. Ele é criado com CONCURRENTLY, então o arquivo roda em autocommit:
+-- migrate: no-transaction
+-- Todos os statements são idempotentes. Se o build concorrente falhar, o índice fica INVALID:
+-- remova-o e rode o arquivo novamente.
+
+ALTER TABLE account ADD COLUMN IF NOT EXISTS deletion_requested_at timestamptz;
+ALTER TABLE project ADD COLUMN IF NOT EXISTS deletion_requested_at timestamptz;
+
+CREATE TABLE IF NOT EXISTS deletion_job (
+  id            uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  kind          text NOT NULL CHECK (kind IN ('account', 'project')),
+  account_id    uuid NOT NULL,
+  project_id    uuid,
+  status        text NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+  step          integer NOT NULL DEFAULT 0,
+  cursor        text,
+  processed     jsonb NOT NULL DEFAULT '{}'::jsonb,
+  failures      integer NOT NULL DEFAULT 0,
+  error         text,
+  requested_at  timestamptz NOT NULL DEFAULT now(),
+  started_at    timestamptz,
+  updated_at    timestamptz NOT NULL DEFAULT now(),
+  finished_at   timestamptz,
+  CHECK ((kind = 'project') = (project_id IS NOT NULL))
+);
+
+-- Um job ativo por alvo: pedir de novo devolve o mesmo job
+CREATE UNIQUE INDEX IF NOT EXISTS uq_deletion_job_active
+  ON deletion_job (kind, account_id, coalesce(project_id, account_id))
+  WHERE status IN ('pending', 'running');
+CREATE INDEX IF NOT EXISTS idx_deletion_job_queue
+  ON deletion_job (requested_at)
+  WHERE status IN ('pending', 'running');
+CREATE INDEX IF NOT EXISTS idx_deletion_job_account ON deletion_job (account_id, requested_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_comment_task ON task_comment (account_id, task_id);
+
+-- Contas e projetos com exclusão pedida, para as leituras dos filhos esconderem os dois
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_account_deletion_requested
+  ON account (id) WHERE deletion_requested_at IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_project_deletion_requested
+  ON project (id) WHERE deletion_requested_at IS NOT NULL;
+
+-- Mesma função de `20250329_add_outbox.sql`, agora com `pulsehub.skip_outbox`.
+-- TG_ARGV: entidade publicada e a coluna com o id dela
+CREATE OR REPLACE FUNCTION outbox_capture() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  child boolean := TG_ARGV[0] <> TG_TABLE_NAME;
+BEGIN
+  IF coalesce(current_setting('pulsehub.skip_outbox', true), '') = 'on' THEN
+    RETURN NULL;
+  END IF;
+  IF TG_OP = 'DELETE' THEN
+    INSERT INTO outbox (entity, entity_id, account_id, project_id, op)
+    SELECT TG_ARGV[0], (r ->> TG_ARGV[1])::uuid, (r ->> 'account_id')::uuid, (r ->> 'project_id')::uuid,
+           CASE WHEN child THEN 'update' ELSE 'delete' END
+    FROM (SELECT to_jsonb(o) AS r FROM old_rows o) AS changed;
+  ELSE
+    INSERT INTO outbox (entity, entity_id, account_id, project_id, op, data)
+    SELECT TG_ARGV[0], (r ->> TG_ARGV[1])::uuid, (r ->> 'account_id')::uuid, (r ->> 'project_id')::uuid,
+           CASE WHEN child THEN 'update' ELSE lower(TG_OP) END,
+           CASE WHEN child THEN NULL ELSE r END
+    FROM (SELECT to_jsonb(n) AS r FROM new_rows n) AS changed;
+  END IF;
+  RETURN NULL;
+END
+$$;